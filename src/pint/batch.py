@@ -0,0 +1,475 @@
+"""Fit timing models for many pulsars in one go.
+
+Fitting a large number of pulsars by looping over
+:func:`pint.models.get_model_and_toas` and :func:`pint.fitter.Fitter.auto`
+in a script pays the cost of loading ephemerides, clock files and the
+observatory registry separately for each pulsar (and again for every new
+process). :func:`pint.batch.fit_batch` instead distributes the fits over
+long-lived worker processes (or any :class:`concurrent.futures.Executor`),
+loads the shared resources once per worker, streams the per-pulsar results
+to disk as they arrive, and reports how long each stage took.
+
+Example usage::
+
+    >>> from pint.batch import fit_batch
+    >>> results = fit_batch(
+    ...     [("J0613-0200.par", "J0613-0200.tim"), ("B1855+09.par", "B1855+09.tim")],
+    ...     outdir="fits",
+    ...     ncpu=4,
+    ... )
+    >>> for r in results:
+    ...     print(r.name, r.reduced_chi2, r.timings)
+
+For each pulsar, ``outdir`` will contain the post-fit par file
+(``<stem>.par``) and the fit summary (``<stem>.summary.txt``), where
+``<stem>`` is the name of the input par file, extended with the name of the
+tim file (and, if that is not enough, the index of the pair) when several
+pairs share a par file name; one line of JSON per pulsar is appended to
+``outdir/batch_results.jsonl`` as soon as its fit finishes, so that partial
+results of a long batch can be inspected while it is running.
+"""
+
+import collections
+import concurrent.futures
+import json
+import multiprocessing
+import time
+from pathlib import Path
+
+from loguru import logger as log
+
+try:
+    from tqdm import tqdm
+except ModuleNotFoundError:
+    tqdm = None
+
+import pint.fitter
+from pint.logging import share_log
+from pint.models import get_model_and_toas
+import pint.observatory
+from pint.observatory import get_observatory
+from pint.solar_system_ephemerides import load_kernel
+
+__all__ = [
+    "BatchFitResult",
+    "fit_one",
+    "fit_batch",
+    "worker_initializer",
+    "timing_report",
+]
+
+stages = ["load", "fit", "summary"]
+
+
+class BatchFitResult:
+    """Outcome of fitting a single pulsar in a batch.
+
+    Only plain Python objects are stored here so that results can be cheaply
+    sent back from worker processes and serialized to JSON.
+
+    Attributes
+    ----------
+    name : str
+        Pulsar name (the ``PSR`` parameter, or the par file name if that is not available)
+    parfile : str
+    timfile : str
+    fitter : str
+        Name of the fitter class used
+    ntoas : int
+    chi2 : float
+    dof : int
+    reduced_chi2 : float
+    converged : bool
+    error : str or None
+        Description of the exception raised while loading or fitting, if any
+    timings : dict
+        Wall-clock time in seconds spent in each stage (``load``, ``fit`` and ``summary``)
+    postfit_par : str or None
+        Post-fit par file contents
+    summary : str or None
+        Output of :meth:`pint.fitter.Fitter.get_summary`
+    """
+
+    def __init__(self, parfile, timfile):
+        self.name = Path(str(parfile)).stem
+        self.parfile = str(parfile)
+        self.timfile = str(timfile)
+        self.fitter = None
+        self.ntoas = None
+        self.chi2 = None
+        self.dof = None
+        self.reduced_chi2 = None
+        self.converged = None
+        self.error = None
+        self.timings = {}
+        self.postfit_par = None
+        self.summary = None
+
+    @property
+    def success(self):
+        return self.error is None
+
+    def as_dict(self):
+        """Summary of the result as a dictionary, excluding the par file and fit summary text."""
+        return {
+            "name": self.name,
+            "parfile": self.parfile,
+            "timfile": self.timfile,
+            "fitter": self.fitter,
+            "ntoas": self.ntoas,
+            "chi2": self.chi2,
+            "dof": self.dof,
+            "reduced_chi2": self.reduced_chi2,
+            "converged": self.converged,
+            "error": self.error,
+            "timings": self.timings,
+        }
+
+    def __repr__(self):
+        return (
+            f"<BatchFitResult {self.name}: "
+            + (
+                f"chi2={self.chi2} dof={self.dof}"
+                if self.success
+                else f"error={self.error}"
+            )
+            + ">"
+        )
+
+
+def _init_worker(ephems=(), observatories=(), logger_=None):
+    """Load resources shared by all the fits done in one process.
+
+    Ephemerides and observatory clock files are kept by PINT (and astropy) at
+    module level, so once they are loaded here every subsequent fit in the
+    same process reuses them.
+    """
+    if logger_ is not None:
+        # copy the log to all imported modules (including this one)
+        # this makes them respect the logger settings
+        share_log(logger_)
+    for ephem in ephems:
+        try:
+            load_kernel(ephem)
+        except Exception as e:
+            log.warning(f"Unable to preload ephemeris {ephem}: {e}")
+    if len(observatories) > 0:
+        try:
+            pint.observatory._load_gps_clock()
+            pint.observatory._load_bipm_clock(pint.observatory.bipm_default)
+        except Exception as e:
+            log.warning(f"Unable to preload GPS and BIPM clock corrections: {e}")
+    for obs in observatories:
+        try:
+            o = get_observatory(obs)
+            # Loading of clock files happens on first use
+            if hasattr(o, "_load_clock_corrections"):
+                o._load_clock_corrections()
+        except Exception as e:
+            log.warning(f"Unable to preload observatory {obs}: {e}")
+
+
+def fit_one(
+    parfile,
+    timfile,
+    fitter=None,
+    downhill=True,
+    loadargs={},
+    fitargs={},
+    return_text=True,
+):
+    """Load and fit one pulsar, catching any errors.
+
+    Parameters
+    ----------
+    parfile : str or Path
+    timfile : str or Path
+    fitter : subclass of pint.fitter.Fitter, optional
+        Fitter class to use. If None, use :func:`pint.fitter.Fitter.auto`.
+    downhill : bool, optional
+        Passed to :func:`pint.fitter.Fitter.auto` if ``fitter`` is None
+    loadargs : dict, optional
+        Additional arguments passed to :func:`pint.models.get_model_and_toas`
+    fitargs : dict, optional
+        Additional arguments passed to ``fit_toas()``
+    return_text : bool, optional
+        Whether to include the post-fit par file and the fit summary in the result
+
+    Returns
+    -------
+    BatchFitResult
+    """
+    result = BatchFitResult(parfile, timfile)
+
+    t0 = time.perf_counter()
+    try:
+        model, toas = get_model_and_toas(parfile, timfile, **loadargs)
+    except Exception as e:
+        log.warning(f"Unable to load {parfile}, {timfile}: {e}")
+        result.error = f"{e.__class__.__name__}: {e}"
+        result.timings["load"] = time.perf_counter() - t0
+        return result
+    t1 = time.perf_counter()
+    result.timings["load"] = t1 - t0
+    if getattr(model, "PSR", None) is not None and model.PSR.value is not None:
+        result.name = model.PSR.value
+    result.ntoas = toas.ntoas
+
+    try:
+        if fitter is None:
+            f = pint.fitter.Fitter.auto(toas, model, downhill=downhill)
+        else:
+            f = fitter(toas, model)
+        result.fitter = f.__class__.__name__
+        try:
+            f.fit_toas(**fitargs)
+            result.converged = getattr(f, "converged", True)
+        except (pint.fitter.ConvergenceFailure, pint.fitter.InvalidModelParameters):
+            log.warning(f"Fit may not be converged for {result.name}, but continuing")
+            result.converged = False
+        result.chi2 = float(f.resids.chi2)
+        result.dof = int(f.resids.dof)
+        result.reduced_chi2 = float(f.resids.reduced_chi2)
+    except Exception as e:
+        log.warning(f"Unexpected exception fitting {result.name}: {e}")
+        result.error = f"{e.__class__.__name__}: {e}"
+        result.timings["fit"] = time.perf_counter() - t1
+        return result
+    t2 = time.perf_counter()
+    result.timings["fit"] = t2 - t1
+
+    if return_text:
+        try:
+            result.postfit_par = f.model.as_parfile()
+            result.summary = f.get_summary()
+        except Exception as e:
+            log.warning(f"Unable to summarize fit for {result.name}: {e}")
+    result.timings["summary"] = time.perf_counter() - t2
+    return result
+
+
+def _ephems_from_parfiles(parfiles):
+    """Find the ephemerides requested by a collection of par files, without parsing them fully."""
+    ephems = set()
+    for parfile in parfiles:
+        try:
+            with open(parfile) as fh:
+                for line in fh:
+                    k = line.split()
+                    if len(k) > 1 and k[0].upper() == "EPHEM":
+                        ephems.add(k[1].lower())
+        except (OSError, TypeError):
+            continue
+    return sorted(ephems)
+
+
+def _output_stems(pairs):
+    """Distinct names for the output files of each (par file, tim file) pair."""
+    stems = [Path(str(p)).stem for p, _ in pairs]
+    counts = collections.Counter(stems)
+    stems = [
+        s if counts[s] == 1 else f"{s}_{Path(str(t)).stem}"
+        for s, (_, t) in zip(stems, pairs)
+    ]
+    counts = collections.Counter(stems)
+    return [s if counts[s] == 1 else f"{s}_{i}" for i, s in enumerate(stems)]
+
+
+def _write_result(result, outdir, stem):
+    """Write the outputs of one fit to ``outdir``."""
+    if result.postfit_par is not None:
+        with open(outdir / f"{stem}.par", "w") as fh:
+            fh.write(result.postfit_par)
+    if result.summary is not None:
+        with open(outdir / f"{stem}.summary.txt", "w") as fh:
+            fh.write(result.summary)
+    with open(outdir / "batch_results.jsonl", "a") as fh:
+        fh.write(json.dumps(result.as_dict()) + "\n")
+
+
+def fit_batch(
+    pairs,
+    outdir=None,
+    fitter=None,
+    downhill=True,
+    executor=None,
+    ncpu=None,
+    ephems=None,
+    observatories=(),
+    printprogress=True,
+    loadargs={},
+    **fitargs,
+):
+    """Fit a list of pulsars, possibly in parallel.
+
+    Parameters
+    ----------
+    pairs : list of tuple
+        (par file, tim file) pairs, one per pulsar
+    outdir : str or Path, optional
+        Directory to stream results into as they become available
+        (see :mod:`pint.batch` for the names of the files). It is created if needed.
+    fitter : subclass of pint.fitter.Fitter, optional
+        Fitter class to use for all pulsars. If None, use :func:`pint.fitter.Fitter.auto`.
+    downhill : bool, optional
+        Passed to :func:`pint.fitter.Fitter.auto` if ``fitter`` is None
+    executor : concurrent.futures.Executor or None, optional
+        Executor object to run multiple processes in parallel
+        If None, will use default :class:`concurrent.futures.ProcessPoolExecutor`, unless overridden by ``ncpu=1``
+    ncpu : int, optional
+        If an existing Executor is not supplied, one will be created with this number of workers.
+        If 1, will run single-processor version
+        If None, will use :func:`multiprocessing.cpu_count`
+    ephems : list of str, optional
+        Solar system ephemerides to load once per worker. If None, use the
+        ``EPHEM`` values found in the par files.
+    observatories : list of str, optional
+        Observatories whose clock corrections are loaded once per worker.
+        Observatories not listed here are loaded the first time a worker needs
+        them and reused by subsequent fits in that worker.
+    printprogress : bool, optional
+        Print indications of progress (requires :mod:`tqdm`)
+    loadargs : dict, optional
+        Additional arguments passed to :func:`pint.models.get_model_and_toas`
+    fitargs :
+        additional arguments pass to fit_toas()
+
+    Returns
+    -------
+    list of BatchFitResult
+        In the same order as ``pairs``. Failed fits are included, with their ``error`` attribute set.
+
+    Notes
+    -----
+    The behavior for different combinations of ``executor`` and ``ncpu`` is the
+    same as for :func:`pint.gridutils.grid_chisq`. If an existing executor is
+    supplied, it is responsible for its own worker initialization; use
+    :func:`pint.batch.worker_initializer` to obtain a suitable initializer and
+    arguments.
+
+    If you are running this as a script you may need something like::
+
+        import multiprocessing
+
+        if __name__ == "__main__":
+            multiprocessing.freeze_support()
+            ...
+            fit_batch(...)
+    """
+    pairs = [(p, t) for p, t in pairs]
+    if ephems is None:
+        ephems = _ephems_from_parfiles([p for p, _ in pairs])
+    initializer, initargs = worker_initializer(ephems, observatories)
+
+    if isinstance(executor, concurrent.futures.Executor):
+        # the executor has already been created
+        executor = executor
+    elif executor is None and (ncpu is None or ncpu > 1):
+        # make the default type of Executor
+        if ncpu is None:
+            ncpu = multiprocessing.cpu_count()
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=min(ncpu, max(len(pairs), 1)),
+            initializer=initializer,
+            initargs=initargs,
+        )
+
+    if outdir is not None:
+        outdir = Path(outdir)
+        outdir.mkdir(parents=True, exist_ok=True)
+        stems = _output_stems(pairs)
+
+    t_start = time.perf_counter()
+    results = [None] * len(pairs)
+    return_text = outdir is not None
+    if executor is not None:
+        with executor as e:
+            futures = {
+                e.submit(
+                    fit_one,
+                    p,
+                    t,
+                    fitter=fitter,
+                    downhill=downhill,
+                    loadargs=loadargs,
+                    fitargs=fitargs,
+                    return_text=return_text,
+                ): i
+                for i, (p, t) in enumerate(pairs)
+            }
+            done = concurrent.futures.as_completed(futures)
+            if printprogress and tqdm is not None:
+                done = tqdm(done, total=len(futures), ascii=True)
+            for future in done:
+                i = futures[future]
+                results[i] = future.result()
+                if outdir is not None:
+                    _write_result(results[i], outdir, stems[i])
+    else:
+        initializer(*initargs)
+        indices = range(len(pairs))
+        if printprogress and tqdm is not None:
+            indices = tqdm(indices, ascii=True)
+        for i in indices:
+            p, t = pairs[i]
+            results[i] = fit_one(
+                p,
+                t,
+                fitter=fitter,
+                downhill=downhill,
+                loadargs=loadargs,
+                fitargs=fitargs,
+                return_text=return_text,
+            )
+            if outdir is not None:
+                _write_result(results[i], outdir, stems[i])
+
+    log.info(timing_report(results, time.perf_counter() - t_start))
+    return results
+
+
+def worker_initializer(ephems=(), observatories=()):
+    """Initializer and arguments for workers used by :func:`pint.batch.fit_batch`.
+
+    These can be passed on to executors created by the user, for example::
+
+        initializer, initargs = worker_initializer(["de440"], ["gbt", "ao"])
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=8, initializer=initializer, initargs=initargs
+        )
+
+    Returns
+    -------
+    initializer : callable
+    initargs : tuple
+    """
+    return _init_worker, (tuple(ephems), tuple(observatories), log)
+
+
+def timing_report(results, elapsed=None):
+    """Summarize the time spent in each stage of a batch of fits.
+
+    Parameters
+    ----------
+    results : list of BatchFitResult
+    elapsed : float, optional
+        Total wall-clock time taken by the batch, in seconds
+
+    Returns
+    -------
+    str
+    """
+    ok = [r for r in results if r is not None and r.success]
+    failed = [r for r in results if r is not None and not r.success]
+    lines = [f"Fitted {len(ok)} pulsars ({len(failed)} failed)"]
+    for stage in stages:
+        t = [r.timings[stage] for r in results if r is not None and stage in r.timings]
+        if len(t) > 0:
+            lines.append(
+                f"  {stage:<8} total {sum(t):10.2f} s, mean {sum(t) / len(t):8.2f} s, max {max(t):8.2f} s"
+            )
+    if elapsed is not None:
+        lines.append(f"  wall-clock {elapsed:.2f} s")
+    for r in failed:
+        lines.append(f"  {r.name} failed: {r.error}")
+    return "\n".join(lines)
@@ -1,12 +1,18 @@
 """Bayesian interface providing the pulsar timing likelihood, prior and posterior functions."""
 
-from copy import deepcopy
+import concurrent.futures
+import multiprocessing
+import uuid
+import weakref
+from copy import copy, deepcopy
 
 import numpy as np
+import scipy.linalg
 from scipy.stats import norm, uniform
 
 from pint.models.priors import Prior, UniformUnboundedRV
 from pint.residuals import Residuals, WidebandTOAResiduals
+from pint.utils import normalize_designmatrix
 
 
 class BayesianTiming:
@@ -28,6 +34,11 @@ class BayesianTiming:
     prior_info : dict, optional
         A dict containing the prior information on free parameters. This parameter
         supersedes any priors present in the model.
+    marginalize : list of str, optional
+        Free timing parameters to marginalize over analytically. These are
+        assumed to enter the timing model linearly, with the design matrix
+        evaluated once at the input model, and to have flat priors. They are
+        excluded from `param_labels`, and stay at their input values in `model`.
 
     Notes
     -----
@@ -40,7 +51,14 @@ class BayesianTiming:
 
     3. Both narrow-band and wide-band TOAs are supported.
 
-    4. Currently, only uniform and normal distributions are supported in prior_info. More
+    4. When `marginalize` is given, the likelihood is that of the residuals after
+       projecting out the marginalized parameters, i.e., chisq is computed using
+       ``N^-1 - N^-1 M (M^T N^-1 M)^-1 M^T N^-1`` and the normalization includes
+       ``log det(M^T N^-1 M)/2`` (up to a constant). When the TOA residuals have their
+       mean subtracted, so do the columns of the design matrix. The conditional estimates of the
+       marginalized parameters can be recovered using `linear_param_estimates`.
+
+    5. Currently, only uniform and normal distributions are supported in prior_info. More
        general priors should be set directly in the TimingModel object before creating the
        BayesianTiming object. Here is an example prior_info object::
 
@@ -62,7 +80,9 @@ class BayesianTiming:
     See `examples/bayesian-example-NGC6440E.py` and `examples/bayesian-wideband-example` for detailed examples.
     """
 
-    def __init__(self, model, toas, use_pulse_numbers=False, prior_info=None):
+    def __init__(
+        self, model, toas, use_pulse_numbers=False, prior_info=None, marginalize=None
+    ):
         # Make a deep copy to not mess up the original model.
         self.model = deepcopy(model)
         self.toas = toas
@@ -74,7 +94,10 @@ class BayesianTiming:
 
         self.is_wideband = toas.is_wideband()
 
-        self.param_labels = self.model.free_params
+        self.marginalized_labels = list(marginalize) if marginalize is not None else []
+        self.param_labels = [
+            par for par in self.model.free_params if par not in self.marginalized_labels
+        ]
         self.params = [getattr(self.model, par) for par in self.param_labels]
         self.nparams = len(self.param_labels)
 
@@ -96,6 +119,9 @@ class BayesianTiming:
 
         self.likelihood_method = self._decide_likelihood_method()
 
+        if self.marginalized_labels:
+            self._setup_marginalization()
+
     def _validate_priors(self):
         for param in self.params:
             if not hasattr(param, "prior") or param.prior is None:
@@ -105,6 +131,115 @@ class BayesianTiming:
                     f"Unbounded uniform priors are not supported. (param : {param.name})"
                 )
 
+    def _setup_marginalization(self):
+        """Compute the (normalized) design matrix of the marginalized parameters."""
+        noise_params = self.model.get_params_of_component_type("NoiseComponent")
+        for par in self.marginalized_labels:
+            if par not in self.model.free_params:
+                raise ValueError(
+                    f"Cannot marginalize over {par} because it is not a free parameter."
+                )
+            if par in noise_params:
+                raise ValueError(
+                    f"Cannot analytically marginalize over the noise parameter {par}."
+                )
+
+        M, names, _ = self.model.designmatrix(self.toas, incoffset=False)
+        M = M[:, [names.index(par) for par in self.marginalized_labels]]
+        if self.is_wideband:
+            M_dm = np.transpose(
+                [
+                    (
+                        self.model.d_dm_d_param(self.toas, par)
+                        * getattr(self.model, par).units
+                    ).si.value
+                    for par in self.marginalized_labels
+                ]
+            )
+            M = np.vstack([M, M_dm])
+
+        self._marg_M, self._marg_norm = normalize_designmatrix(
+            M, self.marginalized_labels
+        )
+        # The TOA residuals have their weighted mean subtracted unless there is
+        # an explicit phase offset, so the same must be done for the design matrix.
+        self._marg_subtract_mean = "PhaseOffset" not in self.model.components
+
+    def _marginalized_solution(self, resids, sigmas):
+        """Project the marginalized parameters out of the residuals.
+
+        Returns the reduction in chisq, the conditional offsets of the marginalized
+        parameters from their reference values, their covariance matrix, and
+        log det(M^T N^-1 M).
+        """
+        M = self._marg_M
+        if self._marg_subtract_mean:
+            ntoas = len(self.toas)
+            w = 1 / sigmas[:ntoas] ** 2
+            M = M.copy()
+            M[:ntoas] -= w @ M[:ntoas] / np.sum(w)
+        Mw = M / sigmas[:, None]
+        cf = scipy.linalg.cho_factor(Mw.T @ Mw)
+        b = Mw.T @ (resids / sigmas)
+        xhat = scipy.linalg.cho_solve(cf, b)
+        cov = scipy.linalg.cho_solve(cf, np.eye(len(b)))
+        logdet = 2 * np.sum(np.log(np.diag(cf[0]))) + 2 * np.sum(
+            np.log(self._marg_norm)
+        )
+        return (
+            b @ xhat,
+            xhat / self._marg_norm,
+            cov / np.outer(self._marg_norm, self._marg_norm),
+            logdet,
+        )
+
+    def _resids_and_sigmas(self, params):
+        """Residuals and scaled uncertainties (TOAs followed by DMs if wideband)."""
+        params_dict = dict(zip(self.param_labels, params))
+        self.model.set_param_values(params_dict)
+        if self.is_wideband:
+            res = WidebandTOAResiduals(
+                self.toas, self.model, toa_resid_args={"track_mode": self.track_mode}
+            )
+            resids = np.concatenate(
+                [res.toa.time_resids.si.value, res.dm.resids.si.value]
+            )
+            sigmas = np.concatenate(
+                [
+                    self.model.scaled_toa_uncertainty(self.toas).si.value,
+                    self.model.scaled_dm_uncertainty(self.toas).si.value,
+                ]
+            )
+        else:
+            res = Residuals(self.toas, self.model, track_mode=self.track_mode)
+            resids = res.time_resids.si.value
+            sigmas = self.model.scaled_toa_uncertainty(self.toas).si.value
+        return resids, sigmas
+
+    def linear_param_estimates(self, params):
+        """Conditional estimates of the marginalized parameters.
+
+        Given the values of the sampled parameters, the marginalized parameters
+        have a Gaussian conditional posterior, whose mean and covariance are returned.
+        Drawing from it for each posterior sample recovers the joint posterior.
+
+        Args:
+            params (array-like): Parameters
+
+        Returns:
+            ndarray: The conditional means of the marginalized parameters
+            ndarray: Their conditional covariance matrix
+        """
+        if not self.marginalized_labels:
+            raise ValueError("No parameters are marginalized over.")
+        resids, sigmas = self._resids_and_sigmas(params)
+        _, dx, cov, _ = self._marginalized_solution(resids, sigmas)
+        ref = np.array(
+            [getattr(self.model, par).value for par in self.marginalized_labels],
+            dtype=np.longdouble,
+        )
+        return ref + dx, cov
+
     def _decide_likelihood_method(self):
         """Weighted least squares with normalization term (wls), or Generalized least
         squares with normalization term (gls), for narrow-band (nb) or wide-band (wb)
@@ -126,26 +261,25 @@ class BayesianTiming:
         More complex priors must be separately implemented.
 
         Args:
-            params (array-like): Parameters
+            params (array-like): Parameters, or an (N, nparams) array of N parameter vectors
 
         Returns:
-            float: Value of the log-prior at params
+            float or ndarray: Value of the log-prior at params (one for each row if 2-D)
         """
-        if len(params) != self.nparams:
+        params = np.asarray(params)
+        if params.shape[-1] != self.nparams:
             raise IndexError(
-                f"The number of input parameters ({len(params)}) should be the same "
+                f"The number of input parameters ({params.shape[-1]}) should be the same "
                 f"as the number of free parameters ({self.nparams})."
             )
 
-        lnsum = 0.0
-        for param_val, param in zip(params, self.params):
-            lnpr = param.prior_pdf(param_val, logpdf=True)
-            if lnpr in (np.nan, -np.inf):
-                return -np.inf
-            else:
-                lnsum += lnpr
+        batch = np.atleast_2d(params)
+        lnsum = np.zeros(len(batch))
+        for param_vals, param in zip(batch.T, self.params):
+            lnsum += param.prior_pdf(param_vals, logpdf=True)
+        lnsum[~np.isfinite(lnsum)] = -np.inf
 
-        return lnsum
+        return lnsum if params.ndim == 2 else lnsum[0]
 
     def prior_transform(self, cube):
         """Basic implementation of prior transform for a factorized prior.
@@ -153,12 +287,19 @@ class BayesianTiming:
 
         Args:
             cube (array-like): Sample drawn from a uniform distribution defined in an
-            nparams-dimensional unit hypercube.
+            nparams-dimensional unit hypercube, or an (N, nparams) array of such samples.
 
         Returns:
-            ndarray : Sample drawn from the prior distribution
+            ndarray : Sample drawn from the prior distribution (one for each row if 2-D)
         """
-        return np.array([param.prior._rv.ppf(x) for x, param in zip(cube, self.params)])
+        cube = np.asarray(cube)
+        return np.stack(
+            [
+                param.prior._rv.ppf(x)
+                for x, param in zip(np.moveaxis(cube, -1, 0), self.params)
+            ],
+            axis=-1,
+        )
 
     def lnlikelihood(self, params):
         """The Log-likelihood function. If the model does not contain any noise components or
@@ -173,7 +314,9 @@ class BayesianTiming:
         Returns:
             float: The value of the log-likelihood at params
         """
-        if self.likelihood_method == "wls":
+        if self.likelihood_method == "wls" and self.marginalized_labels:
+            return self._wls_marginalized_lnlikelihood(params)
+        elif self.likelihood_method == "wls":
             return (
                 self._wls_wb_lnlikelihood(params)
                 if self.is_wideband
@@ -199,6 +342,96 @@ class BayesianTiming:
         lnpr = self.lnprior(params)
         return lnpr + self.lnlikelihood(params) if np.isfinite(lnpr) else -np.inf
 
+    def lnposterior_batch(self, params, executor=None, chunksize=None, nchunks=None):
+        """Log-posterior function for an ensemble of parameter vectors.
+
+        The priors are evaluated for all the rows at once, and the likelihood
+        only for the rows with a nonzero prior, in chunks that can be spread
+        over the workers of an executor.  The timing model itself is still
+        evaluated for one parameter vector at a time.  This can be passed to
+        samplers that accept vectorized posteriors (e.g.,
+        ``emcee.EnsembleSampler(..., vectorize=True)``).
+
+        Args:
+            params (array-like): (N, nparams) array of parameter vectors
+            executor (concurrent.futures.Executor, optional): Executor over which to
+                spread the likelihood evaluations. An executor created with
+                :meth:`make_executor` holds a copy of this object in each worker,
+                so only the parameter vectors are sent; with any other executor this
+                object is sent along with each chunk.
+            chunksize (int, optional): Number of parameter vectors per task. By default
+                the rows are split evenly into ``nchunks`` chunks.
+            nchunks (int, optional): Number of tasks to split the rows into if
+                ``chunksize`` is not given, normally the number of workers of the
+                executor. By default, the number of workers of an executor created
+                with :meth:`make_executor`, :func:`multiprocessing.cpu_count` for
+                any other executor, and 1 without an executor.
+
+        Returns:
+            ndarray: The values of the log-posterior for each row of params
+        """
+        params = np.atleast_2d(params)
+        lnpost = self.lnprior(params)
+        good = np.flatnonzero(np.isfinite(lnpost))
+        if len(good) == 0:
+            return lnpost
+
+        if chunksize is None:
+            if nchunks is None:
+                if executor is None:
+                    nchunks = 1
+                elif executor in _worker_tokens:
+                    nchunks = _worker_tokens[executor][2]
+                else:
+                    nchunks = multiprocessing.cpu_count()
+            chunksize = int(np.ceil(len(good) / max(nchunks, 1)))
+        chunks = [good[i : i + chunksize] for i in range(0, len(good), chunksize)]
+
+        if executor is None:
+            lnls = [self._lnlikelihood_chunk(params[c]) for c in chunks]
+        elif _worker_tokens.get(executor, (None,))[0] == id(self):
+            token = _worker_tokens[executor][1]
+            lnls = executor.map(
+                _worker_lnlikelihood_chunk,
+                [token] * len(chunks),
+                [params[c] for c in chunks],
+            )
+        else:
+            lnls = executor.map(
+                _copy_lnlikelihood_chunk,
+                [self] * len(chunks),
+                [params[c] for c in chunks],
+            )
+
+        for c, lnl in zip(chunks, lnls):
+            lnpost[c] += lnl
+        return lnpost
+
+    def make_executor(self, ncpu=None):
+        """Create a process pool for :meth:`lnposterior_batch`.
+
+        Each worker receives a copy of this object once, when it starts.
+
+        Args:
+            ncpu (int, optional): Number of worker processes; if None, use
+                :func:`multiprocessing.cpu_count`.
+
+        Returns:
+            concurrent.futures.ProcessPoolExecutor
+        """
+        token = uuid.uuid4().hex
+        ncpu = ncpu or multiprocessing.cpu_count()
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=ncpu,
+            initializer=_init_worker,
+            initargs=(self, token),
+        )
+        _worker_tokens[executor] = (id(self), token, ncpu)
+        return executor
+
+    def _lnlikelihood_chunk(self, params):
+        return np.array([self.lnlikelihood(p) for p in params])
+
     def _wls_nb_lnlikelihood(self, params):
         """Implementation of Log-Likelihood function for uncorrelated noise only for
         narrow-band TOAs. `wls' stands for weighted least squares. Also includes the
@@ -250,3 +483,46 @@ class BayesianTiming:
         lnL_dm = -chi2_dm / 2 - np.sum(np.log(sigmas_dm))
 
         return lnL_toa + lnL_dm
+
+    def _wls_marginalized_lnlikelihood(self, params):
+        """Implementation of Log-Likelihood function for uncorrelated noise only,
+        analytically marginalized over the linear parameters in `marginalized_labels`.
+
+        Args:
+            params : (array-like)
+                Parameters
+
+        Returns:
+            float :
+                The value of the log-likelihood at params
+        """
+        resids, sigmas = self._resids_and_sigmas(params)
+        chi2 = np.sum((resids / sigmas) ** 2)
+        dchi2, _, _, logdet = self._marginalized_solution(resids, sigmas)
+        return -(chi2 - dchi2) / 2 - np.sum(np.log(sigmas)) - logdet / 2
+
+
+# Executors made by BayesianTiming.make_executor(), the (id, token) of the
+# BayesianTiming object their workers hold, and their number of workers
+_worker_tokens = weakref.WeakKeyDictionary()
+_worker_bt = None
+
+
+def _init_worker(bt, token):
+    global _worker_bt
+    _worker_bt = (token, bt)
+
+
+def _copy_lnlikelihood_chunk(bt, params):
+    # The model is modified by every evaluation, so tasks that may run
+    # concurrently in threads each need their own
+    bt = copy(bt)
+    bt.model = deepcopy(bt.model)
+    bt.params = [getattr(bt.model, par) for par in bt.param_labels]
+    return bt._lnlikelihood_chunk(params)
+
+
+def _worker_lnlikelihood_chunk(token, params):
+    if _worker_bt is None or _worker_bt[0] != token:
+        raise RuntimeError("This worker does not hold the expected BayesianTiming")
+    return _worker_bt[1]._lnlikelihood_chunk(params)
@@ -69,6 +69,8 @@ __all__ = [
     "get_RXTE_TOAs",
     "get_Swift_TOAs",
     "get_XMM_TOAs",
+    "iter_fits_TOAs",
+    "iter_event_TOAs",
 ]
 
 
@@ -192,9 +194,9 @@ def _default_obs_and_scale(mission, timesys, timeref):
     return obs, scale
 
 
-def _get_columns_from_fits(hdu, cols):
+def _get_columns_from_fits(hdu, cols, rows=None):
     new_dict = {}
-    event_dat = hdu.data
+    event_dat = hdu.data if rows is None else hdu.data[rows]
     default_val = np.zeros(len(event_dat))
     # Parse and retrieve default values from the FITS columns listed in config
     for col in cols.keys():
@@ -370,8 +372,129 @@ def get_fits_TOAs(
     -------
     pint.toa.TOAs
     """
-    # Load photon times from event file
-    hdulist = pyfits.open(eventname)
+    hdulist, mission, timeref, obs, scale = _open_fits_events(
+        eventname, mission, extension, timesys, timeref
+    )
+    mjds, new_kwargs, _ = _read_fits_events(
+        hdulist[1], mission, weights=weights, minmjd=minmjd, maxmjd=maxmjd
+    )
+    hdulist.close()
+
+    return _make_event_TOAs(
+        mjds,
+        new_kwargs,
+        obs,
+        scale,
+        timeref,
+        ephem=ephem,
+        planets=planets,
+        include_bipm=include_bipm,
+        errors=errors,
+    )
+
+
+def iter_fits_TOAs(
+    eventname,
+    mission,
+    chunksize=1000000,
+    weights=None,
+    extension=None,
+    timesys=None,
+    timeref=None,
+    minmjd=-np.inf,
+    maxmjd=np.inf,
+    ephem=None,
+    planets=False,
+    include_bipm=False,
+    errors=_default_uncertainty["default"],
+    rows=None,
+):
+    """
+    Read photon event times out of a FITS file as a sequence of :class:`pint.toa.TOAs` objects
+
+    The FITS file is memory-mapped and read in chunks of ``chunksize`` rows, so
+    that only one chunk of events (and the corresponding TOAs) is in memory at a
+    time. Chunks with no events between minmjd and maxmjd are skipped.
+
+    Parameters
+    ----------
+    eventname : str
+        File name of the FITS event list
+    mission : str
+        Name of the mission (e.g. RXTE, XMM)
+    chunksize : int
+        Number of rows of the FITS table in each chunk
+    weights : array or None
+        The array has to be of the same size as the event list. Overwrites
+        possible weight lists from mission-specific FITS files
+    extension : str
+        FITS extension to read
+    timesys : str, default None
+        Force this time system
+    timeref : str, default None
+        Forse this time reference
+    minmjd : float, default "-infinity"
+        minimum MJD timestamp to return
+    maxmjd : float, default "infinity"
+        maximum MJD timestamp to return
+    ephem : str, optional
+        The name of the solar system ephemeris to use; defaults to "DE421".
+    planets : bool, optional
+        Whether to apply Shapiro delays based on planet positions.
+    include_bipm : bool, optional
+        Use TT(BIPM) instead of TT(TAI)
+    errors : astropy.units.Quantity or float, optional
+        The uncertainty on the TOA; if it's a float it is assumed to be
+        in microseconds
+    rows : slice, optional
+        Only read this range of rows of the FITS table
+
+    Yields
+    ------
+    rows : numpy.ndarray
+        The indices of the events of this chunk in the FITS table
+    toas : pint.toa.TOAs
+        The TOAs of these events
+
+    See Also
+    --------
+    :func:`get_fits_TOAs`
+    """
+    hdulist, mission, timeref, obs, scale = _open_fits_events(
+        eventname, mission, extension, timesys, timeref, memmap=True
+    )
+    try:
+        first, last, _ = (rows or slice(None)).indices(hdulist[1].header["NAXIS2"])
+        for start in range(first, last, chunksize):
+            chunk = slice(start, min(start + chunksize, last))
+            mjds, new_kwargs, idx = _read_fits_events(
+                hdulist[1],
+                mission,
+                weights=weights,
+                minmjd=minmjd,
+                maxmjd=maxmjd,
+                rows=chunk,
+            )
+            if len(mjds) == 0:
+                continue
+            yield np.flatnonzero(idx) + start, _make_event_TOAs(
+                mjds,
+                new_kwargs,
+                obs,
+                scale,
+                timeref,
+                ephem=ephem,
+                planets=planets,
+                include_bipm=include_bipm,
+                errors=errors,
+            )
+    finally:
+        hdulist.close()
+
+
+def _open_fits_events(eventname, mission, extension, timesys, timeref, memmap=None):
+    """Open an event file and work out its time system, observatory and scale."""
+    hdulist = pyfits.open(eventname, memmap=memmap)
     if mission not in mission_config:
         log.warning("Mission not recognized. Using generic")
         mission = "generic"
@@ -401,21 +524,26 @@ def get_fits_TOAs(
         log.error(f"Raw spacecraft TOAs not yet supported for {mission}")
 
     obs, scale = _default_obs_and_scale(mission, timesys, timeref)
+    return hdulist, mission, timeref, obs, scale
+
 
+def _read_fits_events(
+    hdu, mission, weights=None, minmjd=-np.inf, maxmjd=np.inf, rows=None
+):
+    """Read the times and mission-specific columns of (some rows of) an events table.
+
+    Returns the MJDs and columns of the events between minmjd and maxmjd, and
+    the mask that selects them among the rows read.
+    """
     # Read time column from FITS file
-    mjds = read_fits_event_mjds_tuples(hdulist[1])
+    mjds = read_fits_event_mjds_tuples(hdu, rows=rows)
 
     new_kwargs = _get_columns_from_fits(
-        hdulist[1], mission_config[mission]["fits_columns"]
+        hdu, mission_config[mission]["fits_columns"], rows=rows
     )
 
-    hdulist.close()
-
     if weights is not None:
-        new_kwargs["weights"] = weights
-
-    if not isinstance(errors, u.Quantity):
-        errors = errors * u.microsecond
+        new_kwargs["weights"] = weights if rows is None else weights[rows]
 
     # mask out times/columns outside of mjd range
     mjds_float = np.asarray([r[0] + r[1] for r in mjds])
@@ -423,6 +551,22 @@ def get_fits_TOAs(
     mjds = mjds[idx]
     for key in new_kwargs.keys():
         new_kwargs[key] = new_kwargs[key][idx]
+    return mjds, new_kwargs, idx
+
+
+def _make_event_TOAs(
+    mjds,
+    new_kwargs,
+    obs,
+    scale,
+    timeref,
+    ephem=None,
+    planets=False,
+    include_bipm=False,
+    errors=_default_uncertainty["default"],
+):
+    if not isinstance(errors, u.Quantity):
+        errors = errors * u.microsecond
 
     location = EarthLocation(0, 0, 0) if timeref == "GEOCENTRIC" else None
 
@@ -587,6 +731,53 @@ def get_event_TOAs(
     )
 
 
+def iter_event_TOAs(
+    eventname,
+    mission,
+    chunksize=1000000,
+    weights=None,
+    minmjd=-np.inf,
+    maxmjd=np.inf,
+    ephem=None,
+    planets=False,
+    include_bipm=False,
+    errors=_default_uncertainty["default"],
+    rows=None,
+):
+    """
+    Read photon event times out of a FITS file as a sequence of :class:`pint.toa.TOAs` objects
+
+    This is the chunked version of :func:`get_event_TOAs`; see
+    :func:`iter_fits_TOAs` for details.
+
+    Yields
+    ------
+    rows : numpy.ndarray
+        The indices of the events of this chunk in the FITS table
+    toas : pint.toa.TOAs
+        The TOAs of these events
+    """
+    try:
+        extension = mission_config[mission]["fits_extension"]
+    except ValueError:
+        log.warning("Mission name (TELESCOP) not recognized, using generic!")
+        extension = mission_config["generic"]["fits_extension"]
+    return iter_fits_TOAs(
+        eventname,
+        mission,
+        chunksize=chunksize,
+        weights=weights,
+        extension=extension,
+        minmjd=minmjd,
+        maxmjd=maxmjd,
+        ephem=ephem,
+        planets=planets,
+        include_bipm=include_bipm,
+        errors=errors,
+        rows=rows,
+    )
+
+
 # generic docstring for these functions
 _load_event_docstring = """
     Read photon event times out of a {} file as PINT :class:`~pint.toa.TOA` objects.
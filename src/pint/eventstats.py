@@ -11,6 +11,8 @@ __all__ = [
     "sig2sigma",
     "sigma2sig",
     "sigma_trials",
+    "harmonic_sums",
+    "phasor_sums",
     "z2m",
     "z2mw",
     "cosm",
@@ -130,27 +132,79 @@ def sigma_trials(sigma, trials):
     return 0 if p >= 1 else sig2sigma(p)
 
 
-def z2m(phases, m=2):
-    """Return the Z^2_m test for each harmonic up to the specified m.
-    See de Jager et al. 1989 for definition.
+# Target number of phase values (photons times trial phase sets) handled at a
+# time by harmonic_sums; bounds the size of the temporary arrays.
+_CHUNK_ELEMENTS = 2**18
+
+
+def harmonic_sums(phases, m, weights=None):
+    """Return the (weighted) trigonometric sums for harmonics 1 to m.
+
+    The sums are S_k = sum_j w_j exp(2 pi i k phi_j), so that Re(S_k) and
+    Im(S_k) are the cosine and sine sums of harmonic k.  The harmonic
+    statistics follow from them, e.g. Z^2_m = 2/n sum_{k<=m} |S_k|^2, and
+    since the sums over several sets of photons add up, they can be
+    accumulated for photons that are processed in chunks.  ``phases`` may have
+    leading dimensions (e.g. many trial phase sets of the same photons);
+    the sums run over the last axis and the result has shape
+    ``phases.shape[:-1] + (m,)``.  ``weights`` must broadcast against
+    ``phases``.
+
+    Rather than evaluating m sines and cosines per photon, all harmonics
+    are obtained from exp(2 pi i phi) by the recurrence
+    z_k = z_{k-1} exp(2 pi i phi), processing the photons in chunks so
+    that memory use does not grow with the number of photons.
+    """
+    phases = np.asarray(phases, dtype=float)
+    if weights is not None:
+        weights = np.broadcast_to(np.asarray(weights, dtype=float), phases.shape)
+    lead = phases.shape[:-1]
+    n = phases.shape[-1]
+    sums = np.zeros(lead + (m,), dtype=complex)
+    step = max(1, _CHUNK_ELEMENTS // max(1, int(np.prod(lead))))
+    for lo in range(0, n, step):
+        sums += phasor_sums(
+            np.exp(1j * TWOPI * phases[..., lo : lo + step]),
+            m,
+            None if weights is None else weights[..., lo : lo + step],
+        )
+    return sums
+
+
+def phasor_sums(z1, m, weights=None):
+    """Return sum_j w_j z1_j**k over the last axis for k = 1 to m.
+
+    ``z1`` are unit phasors exp(2 pi i phi); the powers are built up by
+    repeated multiplication.  This is :func:`harmonic_sums` for callers
+    that already have the phasors, e.g. because they step them from one
+    trial frequency to the next instead of recomputing exp(2 pi i phi).
+    Unlike :func:`harmonic_sums` it does not split the photons into chunks,
+    so the caller bounds the size of ``z1``.
     """
+    zk = z1 if weights is None else weights * z1
+    sums = np.empty(z1.shape[:-1] + (m,), dtype=complex)
+    for k in range(m):
+        sums[..., k] = zk.sum(axis=-1)
+        if k < m - 1:
+            zk = zk * z1
+    return sums
 
-    phases = np.asarray(phases) * TWOPI  # phase in radians
-    n = len(phases)
 
-    if (
-        n < 5e3
-    ):  # faster for 100s to 1000s of phases, but requires ~20x memory of alternative
-        s = (np.cos(np.outer(np.arange(1, m + 1), phases))).sum(axis=1) ** 2 + (
-            np.sin(np.outer(np.arange(1, m + 1), phases))
-        ).sum(axis=1) ** 2
+def _sum_weights_squared(phases, weights):
+    phases = np.asarray(phases)
+    weights = np.broadcast_to(np.asarray(weights, dtype=float), phases.shape)
+    return (weights**2).sum(axis=-1)
 
-    else:
-        s = (np.asarray([(np.cos(k * phases)).sum() for k in range(1, m + 1)])) ** 2 + (
-            np.asarray([(np.sin(k * phases)).sum() for k in range(1, m + 1)])
-        ) ** 2
 
-    return (2.0 / n) * np.cumsum(s)
+def z2m(phases, m=2):
+    """Return the Z^2_m test for each harmonic up to the specified m.
+    See de Jager et al. 1989 for definition.
+
+    ``phases`` may be 2-D, with one set of phases per row, in which case
+    the result has one row per phase set.
+    """
+    s = np.abs(harmonic_sums(phases, m)) ** 2
+    return (2.0 / np.shape(phases)[-1]) * np.cumsum(s, axis=-1)
 
 
 def z2mw(phases, weights, m=2):
@@ -159,33 +213,21 @@ def z2mw(phases, weights, m=2):
     The user provides a list of weights.  In the case that they are
     well-distributed or assumed to be fixed, the CLT applies and the
     statistic remains calibrated.  Nice!
-    """
 
-    phases = np.asarray(phases) * (2 * np.pi)  # phase in radians
-
-    s = (
-        np.asarray([(np.cos(k * phases) * weights).sum() for k in range(1, m + 1)])
-    ) ** 2 + (
-        np.asarray([(np.sin(k * phases) * weights).sum() for k in range(1, m + 1)])
-    ) ** 2
-
-    return np.cumsum(s) * (2.0 / (weights**2).sum())
+    ``phases`` (and ``weights``) may be 2-D, with one set of phases per row.
+    """
+    s = np.abs(harmonic_sums(phases, m, weights=weights)) ** 2
+    return (
+        np.cumsum(s, axis=-1) * (2.0 / _sum_weights_squared(phases, weights))[..., None]
+    )
 
 
 def cosm(phases, m=2):
     """Return the cosine test for each harmonic up to the specified m.
     See de Jager et al. 1994 for definition
     """
-
-    phases = np.asarray(phases) * TWOPI  # phase in radians
-    n = len(phases)
-
-    if n < 5e3:
-        s = (np.cos(np.outer(np.arange(1, m + 1), phases))).sum(axis=1)
-    else:
-        s = np.asarray([np.cos(k * phases).sum() for k in range(1, m + 1)])
-
-    return (2.0 / n) * np.cumsum(s)
+    s = harmonic_sums(phases, m).real
+    return (2.0 / np.shape(phases)[-1]) * np.cumsum(s, axis=-1)
 
 
 def sf_z2m(ts, m=2):
@@ -202,26 +244,18 @@ def sf_z2m(ts, m=2):
 
 def best_m(phases, weights=None, m=100):
     z = z2mw(phases, np.ones_like(phases) if weights is None else weights, m=m)
-    return np.arange(1, m + 1)[np.argmax(z - 4 * np.arange(0, m))]
+    return np.argmax(z - 4 * np.arange(0, m), axis=-1) + 1
 
 
 def em_four(phases, m=2, weights=None):
     """Return the empirical Fourier coefficients up to the mth harmonic.
     These are derived from the empirical trignometric moments."""
-
-    phases = np.asarray(phases) * TWOPI  # phase in radians
-
-    n = len(phases) if weights is None else weights.sum()
-    weights = 1.0 if weights is None else weights
-
-    aks = (1.0 / n) * np.asarray(
-        [(weights * np.cos(k * phases)).sum() for k in range(1, m + 1)]
-    )
-    bks = (1.0 / n) * np.asarray(
-        [(weights * np.sin(k * phases)).sum() for k in range(1, m + 1)]
-    )
-
-    return aks, bks
+    sums = harmonic_sums(phases, m, weights=weights)
+    if weights is None:
+        n = np.shape(phases)[-1]
+    else:
+        n = np.broadcast_to(weights, np.shape(phases)).sum(axis=-1)[..., None]
+    return sums.real / n, sums.imag / n
 
 
 def em_lc(coeffs, dom):
@@ -242,14 +276,11 @@ def hm(phases, m=20, c=4):
     H_m = max(Z^2_k - c*(k-1)), 1 <= k <= m
     m == maximum search harmonic
     c == offset for each successive harmonic
-    """
-    phases = np.asarray(phases) * (2 * np.pi)  # phase in radians
-
-    s = (np.asarray([(np.cos(k * phases)).sum() for k in range(1, m + 1)])) ** 2 + (
-        np.asarray([(np.sin(k * phases)).sum() for k in range(1, m + 1)])
-    ) ** 2
 
-    return ((2.0 / len(phases)) * np.cumsum(s) - c * np.arange(0, m)).max()
+    ``phases`` may be 2-D, with one set of phases per row, in which case
+    one H statistic per row is returned.
+    """
+    return (z2m(phases, m=m) - c * np.arange(0, m)).max(axis=-1)
 
 
 def hmw(phases, weights, m=20, c=4):
@@ -257,16 +288,7 @@ def hmw(phases, weights, m=20, c=4):
     sine/cosine with the weights in the argument.  The distribution
     is corrected such that the CLT still applies, i.e., it maintains
     the same calibration as the unweighted version."""
-
-    phases = np.asarray(phases) * (2 * np.pi)  # phase in radians
-
-    s = (
-        np.asarray([(weights * np.cos(k * phases)).sum() for k in range(1, m + 1)])
-    ) ** 2 + (
-        np.asarray([(weights * np.sin(k * phases)).sum() for k in range(1, m + 1)])
-    ) ** 2
-
-    return ((2.0 / (weights**2).sum()) * np.cumsum(s) - c * np.arange(0, m)).max()
+    return (z2mw(phases, weights, m=m) - c * np.arange(0, m)).max(axis=-1)
 
 
 # @vec
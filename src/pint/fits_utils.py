@@ -8,15 +8,21 @@ from erfa import DAYSEC as SECS_PER_DAY
 from pint.pulsar_mjd import fortran_float
 
 
-__all__ = ["read_fits_event_mjds", "read_fits_event_mjds_tuples"]
+__all__ = [
+    "read_fits_event_mjds",
+    "read_fits_event_mjds_tuples",
+    "iter_fits_event_mjds",
+]
 
 
-def read_fits_event_mjds_tuples(event_hdu, timecolumn="TIME"):
+def read_fits_event_mjds_tuples(event_hdu, timecolumn="TIME", rows=None):
     """Read a set of MJDs from a FITS HDU, with proper conversion of times to MJD
 
     The FITS time format is defined here:
     https://heasarc.gsfc.nasa.gov/docs/journal/timing3.html
 
+    If rows (a slice or an index array) is given, only those rows are read.
+
     Returns
     -------
     mjds: MJDs returned are tuples of two doubles (jd1, jd2), as use by
@@ -25,7 +31,7 @@ def read_fits_event_mjds_tuples(event_hdu, timecolumn="TIME"):
     """
 
     event_hdr = event_hdu.header
-    event_dat = event_hdu.data
+    event_dat = event_hdu.data if rows is None else event_hdu.data[rows]
 
     # Collect TIMEZERO
     # IMPORTANT: TIMEZERO is in SECONDS (not days)!
@@ -63,17 +69,19 @@ def read_fits_event_mjds_tuples(event_hdu, timecolumn="TIME"):
     )
 
 
-def read_fits_event_mjds(event_hdu, timecolumn="TIME"):
+def read_fits_event_mjds(event_hdu, timecolumn="TIME", rows=None):
     """Read a set of MJDs from a FITS HDU, with proper conversion of times to MJD
 
     The FITS time format is defined here:
     https://heasarc.gsfc.nasa.gov/docs/journal/timing3.html
 
+    If rows (a slice or an index array) is given, only those rows are read.
+
     MJDs returned are double precision floats
     """
 
     event_hdr = event_hdu.header
-    event_dat = event_hdu.data
+    event_dat = event_hdu.data if rows is None else event_hdu.data[rows]
 
     # Collect TIMEZERO
     # IMPORTANT: TIMEZERO is in SECONDS (not days)!
@@ -105,3 +113,38 @@ def read_fits_event_mjds(event_hdu, timecolumn="TIME"):
     return (
         np.array(event_dat.field(timecolumn), dtype=float) + TIMEZERO
     ) / SECS_PER_DAY + MJDREF
+
+
+def iter_fits_event_mjds(event_hdu, chunksize=1000000, timecolumn="TIME", columns=()):
+    """Iterate over the MJDs of the events in a FITS HDU, in chunks of rows
+
+    When the FITS file is memory-mapped (the default for :func:`astropy.io.fits.open`),
+    only the rows of the current chunk are read into memory.
+
+    Parameters
+    ----------
+    event_hdu : astropy.io.fits.BinTableHDU
+        The events table
+    chunksize : int
+        Maximum number of events in each chunk
+    timecolumn : str
+        Name of the column containing the event times
+    columns : list of str
+        Other columns (e.g., energies or weights) to read along with the times
+
+    Yields
+    ------
+    rows : slice
+        The rows of the table in this chunk
+    mjds : numpy.ndarray
+        The double precision MJDs of these events
+    data : dict
+        The requested columns for these events
+    """
+    nrows = event_hdu.header["NAXIS2"]
+    for start in range(0, nrows, chunksize):
+        rows = slice(start, min(start + chunksize, nrows))
+        chunk = event_hdu.data[rows]
+        yield rows, read_fits_event_mjds(event_hdu, timecolumn, rows=rows), {
+            col: np.array(chunk.field(col)) for col in columns
+        }
@@ -67,7 +67,7 @@ import numpy as np
 import scipy.linalg
 import scipy.optimize as opt
 from loguru import logger as log
-from numdifftools import Hessian
+from numdifftools import Hessian, Jacobian
 
 import pint
 import pint.utils
@@ -82,10 +82,13 @@ from pint.pint_matrix import (
     CovarianceMatrix,
     CovarianceMatrixMaker,
     DesignMatrixMaker,
+    StructuredCovarianceMatrix,
+    StructuredCovarianceMatrixMaker,
     combine_covariance_matrix,
     combine_design_matrices_by_param,
     combine_design_matrices_by_quantity,
 )
+from pint.noise_likelihood import NoiseLikelihood
 from pint.residuals import Residuals, WidebandTOAResiduals
 from pint.toa import TOAs
 from pint.utils import FTest, normalize_designmatrix
@@ -670,7 +673,12 @@ class Fitter:
                 If full_output is True and a wideband timing fitter is used, returns the
                 Weighted RMS of the DM residuals of the tested model fit. Will be in units of
                 pc/cm^3 as an astropy quantity.
+
+        See :func:`pint.model_selection.evaluate_candidates` for comparing many
+        candidate changes at once.
         """
+        from pint.model_selection import Candidate
+
         # Check if Wideband or not
         NB = not self.is_wideband
         # Copy the fitter that we do not change the initial model and fitter
@@ -694,62 +702,15 @@ class Fitter:
             raise RuntimeError(
                 "Number of input parameters must match number of input components."
             )
-        # Now check if we want to remove or add components; start with removing
+        # Make the change to the copied model and refit
+        Candidate(parameter, component, remove=remove).apply(fitter_copy.model)
+        fitter_copy.fit_toas(maxiter=maxiter)
+        # FIXME: check convergence
+        # Now get the new values
         if remove:
-            # Set values to zero and freeze them
-            for p in parameter:
-                getattr(fitter_copy.model, "{:}".format(p.name)).value = 0.0
-                getattr(fitter_copy.model, "{:}".format(p.name)).uncertainty_value = 0.0
-                getattr(fitter_copy.model, "{:}".format(p.name)).frozen = True
-            # validate and setup model
-            fitter_copy.model.validate()
-            fitter_copy.model.setup()
-            # Now refit
-            fitter_copy.fit_toas(maxiter=maxiter)
-            # FIXME: check convergence
-            # Now get the new values
             dof_1 = fitter_copy.resids.dof
             chi2_1 = fitter_copy.resids.chi2
         else:
-            # Dictionary of parameters to check to makes sure input value isn't zero
-            check_params = {
-                "M2": 0.25,
-                "SINI": 0.8,
-                "PB": 10.0,
-                "T0": 54000.0,
-                "FB0": 1.1574e-6,
-            }
-            # Add the parameters
-            for ii in range(len(parameter)):
-                # Check if parameter already exists in model
-                if hasattr(fitter_copy.model, "{:}".format(parameter[ii].name)):
-                    # Set frozen to False
-                    getattr(
-                        fitter_copy.model, "{:}".format(parameter[ii].name)
-                    ).frozen = False
-                    # Check if parameter is one that needs to be checked
-                    if (
-                        parameter[ii].name in check_params
-                        and parameter[ii].value == 0.0
-                    ):
-                        log.warning(
-                            f"Default value for {parameter[ii].name} cannot be 0, resetting to {check_params[parameter[ii].name]}"
-                        )
-                        parameter[ii].value = check_params[parameter[ii].name]
-                    getattr(
-                        fitter_copy.model, "{:}".format(parameter[ii].name)
-                    ).value = parameter[ii].value
-                else:
-                    fitter_copy.model.components[component[ii]].add_param(
-                        parameter[ii], setup=True
-                    )
-            # validate and setup model
-            fitter_copy.model.validate()
-            fitter_copy.model.setup()
-            # Now refit
-            fitter_copy.fit_toas(maxiter=maxiter)
-            # FIXME: check convergence
-            # Now get the new values
             dof_2 = fitter_copy.resids.dof
             chi2_2 = fitter_copy.resids.chi2
         # Now run the actual F-test
@@ -1229,7 +1190,14 @@ class DownhillFitter(Fitter):
         """Estimate noise parameters and their uncertainties. Noise parameters
         are estimated by numerically maximizing the log-likelihood function including
         the normalization term. The uncertainties thereof are computed using the
-        numerically-evaluated Hessian."""
+        numerically-evaluated Hessian.
+
+        If all the free noise parameters are supported by
+        :class:`pint.noise_likelihood.NoiseLikelihood`, the log-likelihood and its
+        gradient are computed together from a single factorization, and the Hessian
+        is obtained by differentiating the analytic gradient. Otherwise, the
+        log-likelihood is evaluated using :meth:`pint.residuals.Residuals.lnlikelihood`.
+        """
         free_noise_params = self._get_free_noise_params()
 
         xs0 = [getattr(self.model, fp).value for fp in free_noise_params]
@@ -1237,6 +1205,29 @@ class DownhillFitter(Fitter):
         model1 = copy.deepcopy(self.model)
         res = Residuals(self.toas, model1)
 
+        try:
+            noise_likelihood = NoiseLikelihood(
+                self.toas, model1, params=free_noise_params, resids=res
+            )
+        except NotImplementedError as e:
+            log.debug(f"Falling back on numerical noise likelihood: {e}")
+        else:
+            maxlike_result = opt.minimize(
+                noise_likelihood.mloglike_and_grad,
+                xs0,
+                method=noisefit_method,
+                jac=True,
+            )
+
+            if uncertainty:
+                hess = Jacobian(lambda xs: noise_likelihood.mloglike_and_grad(xs)[1])(
+                    maxlike_result.x
+                )
+                hess = 0.5 * (hess + hess.T)
+                errs = np.sqrt(np.diag(np.linalg.pinv(hess)))
+
+            return (maxlike_result.x, errs) if uncertainty else maxlike_result.x
+
         def _mloglike(xs):
             """Negative of the log-likelihood function."""
             for fp, x in zip(free_noise_params, xs):
@@ -1608,14 +1599,41 @@ class DownhillGLSFitter(DownhillFitter):
 
 
 class WidebandState(ModelState):
-    def __init__(self, fitter, model, full_cov=False, threshold=None):
+    def __init__(
+        self, fitter, model, full_cov=False, threshold=None, broyden_from=None
+    ):
         super().__init__(fitter, model)
         self.threshold = threshold
         self.full_cov = full_cov
         self.add_args = {}  # for adding arguments to residual creation
+        # If given as (previous state, step), the design matrix is not
+        # recomputed but obtained from the previous state's by a rank-one
+        # Broyden update.
+        self._broyden_from = broyden_from
+        self.approximate_jacobian = broyden_from is not None
+        self.broyden_updates = (
+            broyden_from[0].broyden_updates + 1 if self.approximate_jacobian else 0
+        )
+
+    def exact(self):
+        """Return this state with the design matrix computed exactly.
+
+        Residuals and chi-squared already computed are reused.
+        """
+        if not self.approximate_jacobian:
+            return self
+        new_state = WidebandState(
+            self.fitter, self.model, full_cov=self.full_cov, threshold=self.threshold
+        )
+        for k in ["resids", "chi2"]:
+            if k in self.__dict__:
+                new_state.__dict__[k] = self.__dict__[k]
+        return new_state
 
     @cached_property
     def M_params_units_norm(self):
+        if self.approximate_jacobian:
+            return self._broyden_update()
         # Define the linear system
         d_matrix = combine_design_matrices_by_quantity(
             [
@@ -1668,6 +1686,38 @@ class WidebandState(ModelState):
 
         return M, params, units, norm
 
+    def _broyden_update(self):
+        """Update the previous state's design matrix with the observed secant.
+
+        With dx the (normalized) step taken and dr the resulting change in
+        the residuals, the new design matrix is M + (-dr - M dx) dx^T / |dx|^2.
+        Only the timing model parameters enter dx; the offset and the noise
+        basis amplitudes do not change the residuals.
+        """
+        old, step = self._broyden_from
+        M, params, units, norm = old.M_params_units_norm
+        ntmpar = len(self.model.free_params) + 1
+        dx = np.zeros(M.shape[1])
+        dx[:ntmpar] = step[:ntmpar] * norm[:ntmpar]
+        dx[[i for i, p in enumerate(params[:ntmpar]) if p == "Offset"]] = 0
+        dr = np.hstack(
+            (
+                self.resids.toa.time_resids.to_value(u.s)
+                - old.resids.toa.time_resids.to_value(u.s),
+                self.resids.dm.resids_value - old.resids.dm.resids_value,
+            )
+        )
+        dx2 = np.dot(dx, dx)
+        M = M.copy()
+        if dx2 > 0:
+            M += np.outer(-dr - M @ dx, dx / dx2)
+        if not self.full_cov:
+            self.phiinv = old.phiinv
+        self.fac = norm
+        # Don't keep a chain of states alive
+        self._broyden_from = None
+        return M, params, units, norm
+
     @cached_property
     def M(self):
         return self.M_params_units_norm[0]
@@ -1693,16 +1743,18 @@ class WidebandState(ModelState):
 
         # compute covariance matrices
         if self.full_cov:
-            cov = combine_covariance_matrix(
+            # The TOA and DM blocks are uncorrelated; solve them separately
+            cov = StructuredCovarianceMatrix(
                 [
-                    CovarianceMatrixMaker("toa", u.s)(self.fitter.toas, self.model),
-                    CovarianceMatrixMaker("dm", u.pc / u.cm**3)(
+                    StructuredCovarianceMatrixMaker("toa", u.s)(
+                        self.fitter.toas, self.model
+                    ),
+                    StructuredCovarianceMatrixMaker("dm", u.pc / u.cm**3)(
                         self.fitter.toas, self.model
                     ),
                 ]
-            ).matrix
-            cf = scipy.linalg.cho_factor(cov)
-            cm = scipy.linalg.cho_solve(cf, self.M)
+            )
+            cm = cov.solve(self.M)
             mtcm = np.dot(self.M.T, cm)
             mtcy = np.dot(cm.T, residuals)
             mtcmplain = mtcm
@@ -1785,9 +1837,33 @@ class WidebandState(ModelState):
         # compute absolute estimates, normalized errors, covariance matrix
         return self.xhat / self.norm
 
-    def take_step(self, step, lambda_=1):
+    def predicted_chi2(self, step, lambda_=1):
+        """Predict the chi2 after taking a step based on the linear approximation
+
+        The noise basis amplitudes are marginalized over, as they are in
+        the chi2 computed from the residuals.
+        """
+        dx = step * lambda_ * self.norm
+        ntmpar = len(self.model.free_params) + 1
+        b_n = self.mtcy[ntmpar:]
+        # chi2 of the linearized problem at the start, minimized over the noise
+        chi2_0 = self.chi2 + np.dot(
+            b_n, scipy.linalg.solve(self.mtcm[ntmpar:, ntmpar:], b_n)
+        )
+        return chi2_0 - 2 * np.dot(dx, self.mtcy) + np.dot(dx, self.mtcm @ dx)
+
+    def take_step(self, step, lambda_=1, broyden=False):
+        """Return a new state moved by lambda_*step.
+
+        If ``broyden`` is True, the new state's design matrix is not
+        recomputed but approximated by a Broyden update of this one.
+        """
         return WidebandState(
-            self.fitter, self.take_step_model(step, lambda_), threshold=self.threshold
+            self.fitter,
+            self.take_step_model(step, lambda_),
+            full_cov=self.full_cov,
+            threshold=self.threshold,
+            broyden_from=(self, step * lambda_) if broyden else None,
         )
 
     @cached_property
@@ -2354,6 +2430,10 @@ class WidebandTOAFitter(Fitter):  # Is GLSFitter the best here?
             CovarianceMatrixMaker(data_resids.residual_type, data_resids.unit)
             for data_resids in self.resids.residual_objs.values()
         ]
+        self.structured_covariancematrix_makers = [
+            StructuredCovarianceMatrixMaker(data_resids.residual_type, data_resids.unit)
+            for data_resids in self.resids.residual_objs.values()
+        ]
         self.is_wideband = True
         self.method = "General_Data_Fitter"
 
@@ -2410,6 +2490,31 @@ class WidebandTOAFitter(Fitter):  # Is GLSFitter the best here?
             )
         return combine_covariance_matrix(cov_matrixs)
 
+    def get_structured_noise_covariancematrix(self):
+        """Get the noise covariance matrix with each data type's block kept separate.
+
+        This is equivalent to :meth:`get_noise_covariancematrix`, but the
+        blocks are not combined into a dense matrix and are represented as
+        diagonal plus low-rank where possible.
+
+        Returns
+        -------
+        :class:`pint.pint_matrix.StructuredCovarianceMatrix`
+        """
+        if len(self.fit_data) == 1:
+            blocks = [
+                cmatrix_maker(self.fit_data[0], self.model)
+                for cmatrix_maker in self.structured_covariancematrix_makers
+            ]
+        else:
+            blocks = [
+                cmatrix_maker(self.fit_data[ii], self.model)
+                for ii, cmatrix_maker in enumerate(
+                    self.structured_covariancematrix_makers
+                )
+            ]
+        return StructuredCovarianceMatrix(blocks)
+
     def get_data_uncertainty(self, data_name, data_obj):
         """Get the data uncertainty from the data  object.
 
@@ -2525,9 +2630,8 @@ class WidebandTOAFitter(Fitter):  # Is GLSFitter the best here?
 
             # compute covariance matrices
             if full_cov:
-                cov = self.get_noise_covariancematrix().matrix
-                cf = scipy.linalg.cho_factor(cov)
-                cm = scipy.linalg.cho_solve(cf, M)
+                cov = self.get_structured_noise_covariancematrix()
+                cm = cov.solve(M)
                 mtcm = np.dot(M.T, cm)
                 mtcy = np.dot(cm.T, residuals)
 
@@ -2574,7 +2678,7 @@ class WidebandTOAFitter(Fitter):  # Is GLSFitter the best here?
             newres = residuals - np.dot(M, xhat)
             # compute linearized chisq
             if full_cov:
-                chi2 = np.dot(newres, scipy.linalg.cho_solve(cf, newres))
+                chi2 = np.dot(newres, cov.solve(newres))
             else:
                 chi2 = np.dot(newres, cinv * newres) + np.dot(xhat, phiinv * xhat)
 
@@ -2648,9 +2752,25 @@ class LMFitter(Fitter):
         lambda_factor_invalid=10,
         threshold=1e-14,
         min_lambda=0.5,
+        max_broyden_updates=0,
+        min_broyden_agreement=0.5,
         debug=False,
     ):
+        """Carry out a Levenberg-Marquardt fit.
+
+        Computing the design matrix is usually the most expensive part of
+        each iteration. If ``max_broyden_updates`` is positive, up to that
+        many consecutive steps reuse the previous design matrix, corrected by
+        a rank-one Broyden update from the observed change in the residuals.
+        Whenever the actual chi-squared decrease obtained with such an
+        approximate design matrix is less than ``min_broyden_agreement``
+        times the decrease predicted by the linearized model, the design
+        matrix is recomputed exactly and the step is retried. The final
+        state always uses the exact design matrix. The number of exact
+        design matrix computations is recorded in ``self.jacobian_evaluations``.
+        """
         current_state = self.create_state()
+        self.jacobian_evaluations = 0
         try:
             try:
                 current_state.chi2
@@ -2659,6 +2779,7 @@ class LMFitter(Fitter):
             self.converged = False
             lambda_ = min_lambda
             for i in range(maxiter):
+                self._count_jacobian(current_state)
                 lf = lambda_ if lambda_ > min_lambda else 0
                 # Attempt: do not scale the phiinv penalty factor by lambda
                 A = current_state.mtcm + lf * np.diag(np.diag(current_state.mtcmplain))
@@ -2703,9 +2824,27 @@ class LMFitter(Fitter):
                 # derivative matches the function and guide changes in lambda_
                 # predicted_chi2 = current_state.predicted_chi2(dx)
                 log.trace(f"Iteration {i}: Trying step with lambda_ = {lambda_}")
-                new_state = current_state.take_step(step)
+                if max_broyden_updates > 0:
+                    new_state = current_state.take_step(
+                        step,
+                        broyden=current_state.broyden_updates < max_broyden_updates,
+                    )
+                else:
+                    new_state = current_state.take_step(step)
                 try:
                     chi2_decrease = current_state.chi2 - new_state.chi2
+                    if getattr(current_state, "approximate_jacobian", False):
+                        predicted_decrease = (
+                            current_state.chi2 - current_state.predicted_chi2(step)
+                        )
+                        if chi2_decrease < min_broyden_agreement * predicted_decrease:
+                            log.debug(
+                                f"Iteration {i}: chi2 decrease {chi2_decrease} does not "
+                                f"match the predicted {predicted_decrease}, "
+                                f"recomputing the design matrix"
+                            )
+                            current_state = current_state.exact()
+                            continue
                     if chi2_decrease < -min_chi2_decrease:
                         lambda_ *= (
                             lambda_factor_invalid
@@ -2755,11 +2894,25 @@ class LMFitter(Fitter):
             # could be a finally I suppose? but I'm not sure we want to update if something
             # seriou went wrong.
             log.info("KeyboardInterrupt detected, updating Fitter")
-            self.update_from_state(current_state, debug=debug)
+            self.update_from_state(self._exact_state(current_state), debug=debug)
             raise
-        self.update_from_state(current_state, debug=debug)
+        self.update_from_state(self._exact_state(current_state), debug=debug)
         return self.converged
 
+    def _exact_state(self, state):
+        # The covariance matrix should not come from an approximate design matrix
+        if getattr(state, "approximate_jacobian", False):
+            state = state.exact()
+        self._count_jacobian(state)
+        return state
+
+    def _count_jacobian(self, state):
+        # Called just before the state's design matrix is first needed
+        if "M_params_units_norm" not in state.__dict__ and not getattr(
+            state, "approximate_jacobian", False
+        ):
+            self.jacobian_evaluations += 1
+
 
 class WidebandLMFitter(LMFitter):
     """Fitter for wideband data based on Levenberg-Marquardt.
@@ -1,11 +1,24 @@
 """Tools for building chi-squared grids."""
 import concurrent.futures
 import copy
+import functools
+import gc
+import hashlib
+import io
+import itertools
+import json
 import multiprocessing
+import multiprocessing.util
+import pickle
 import subprocess
 import sys
+from multiprocessing import shared_memory
+from pathlib import Path
 
+import astropy.units as u
 import numpy as np
+import scipy.linalg
+import scipy.stats
 
 from loguru import logger as log
 
@@ -17,9 +30,20 @@ except ModuleNotFoundError:
 from astropy.utils.console import ProgressBar
 
 from pint import fitter
+from pint.logging import share_log
 from pint.observatory import clock_file
+from pint.residuals import Residuals
+from pint.utils import normalize_designmatrix
 
-__all__ = ["doonefit", "grid_chisq", "grid_chisq_derived"]
+__all__ = [
+    "doonefit",
+    "grid_chisq",
+    "grid_chisq_adaptive",
+    "grid_chisq_derived",
+    "grid_chisq_linearized",
+    "GridStore",
+    "SharedTOAs",
+]
 
 
 def hostinfo():
@@ -64,13 +88,51 @@ class WrappedFitter:
         extraparvalues : list
         """
         # Make a full copy of the fitter to work with
-        myftr = copy.deepcopy(self.ftr)
+        myftr = self._copy_fitter()
         # copy the log to all imported modules
         # this makes them respect the logger settings
-        for m in sys.modules:
-            if m.startswith("pint") and hasattr(sys.modules[m], "log"):
-                setattr(sys.modules[m], "log", log)
+        share_log(log)
+        return self._fit(myftr, parnames, parvalues, extraparnames)
 
+    def dopath(self, parnames, path, extraparnames=[], start=None):
+        """Worker process that fits a sequence of grid points, warm-starting each fit
+
+        Every fit starts from the fitted values of the free parameters at the
+        previous point along `path` (or from `start` for the first point), so
+        for neighboring grid points only a small correction remains to be fit.
+
+        Parameters
+        ----------
+        parnames : list
+            Names of the parameters to grid over
+        path : list
+            List of tuples of parameter values (each should be :class:`astropy.units.Quantity`)
+        extraparnames : list, optional
+            Names of other parameters to return
+        start : dict, optional
+            Starting values of the free parameters for the first point
+
+        Returns
+        -------
+        list
+            Tuples of (chi2, extraparvalues, solution) for each point, where `solution`
+            is a dict of the fitted values of the free parameters
+        """
+        myftr = self._copy_fitter()
+        share_log(log)
+        if start is None:
+            start = _get_solution(myftr.model)
+        results = []
+        for parvalues in path:
+            _set_solution(myftr.model, start)
+            chi2, extraparvalues = self._fit(myftr, parnames, parvalues, extraparnames)
+            solution = _get_solution(myftr.model)
+            if np.isfinite(chi2):
+                start = solution
+            results.append((chi2, extraparvalues, solution))
+        return results
+
+    def _fit(self, myftr, parnames, parvalues, extraparnames):
         parstrings = []
         for parname, parvalue in zip(parnames, parvalues):
             # Freeze the  params we are going to grid over and set their values
@@ -105,6 +167,434 @@ class WrappedFitter:
             extraparvalues.append(getattr(myftr.model, extrapar).quantity)
         return chi2, extraparvalues
 
+    def _copy_fitter(self):
+        return copy.deepcopy(self.ftr)
+
+
+class GridStore:
+    """On-disk storage of grid results, written as they are computed
+
+    The results are appended to a JSON-lines file: a header line, with a
+    hash identifying the model, TOAs, fitter and grid, followed by one line
+    per grid point (its grid indices, chisq, and the values of the extra
+    parameters) as soon as it has been fit.  An interrupted run can be
+    resumed by passing the same file again: points already in the file are
+    not fit again.  The partial results can be read at any time with
+    :meth:`read`.
+
+    Parameters
+    ----------
+    filename : str or pathlib.Path
+
+    Examples
+    --------
+    >>> chi2, extra = pint.gridutils.grid_chisq(f, ("F0", "F1"), (F0, F1), store="grid.jsonl")
+    >>> # meanwhile, or after an interruption
+    >>> chi2, extra, header = pint.gridutils.GridStore("grid.jsonl").read()
+    """
+
+    def __init__(self, filename):
+        self.filename = Path(filename)
+
+    def _lines(self):
+        if not self.filename.exists():
+            return
+        with open(self.filename) as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # a line cut short by an interruption
+                    log.warning(f"Ignoring incomplete line in {self.filename}")
+
+    def header(self):
+        """The header of the file (None if the file is empty)"""
+        return next(self._lines(), None)
+
+    def open(self, header):
+        """Start a new file, or check that an existing one is for the same grid
+
+        Parameters
+        ----------
+        header : dict
+            Must contain ``key`` (identifying the model, TOAs, fitter and grid) and ``shape``
+        """
+        existing = self.header()
+        if existing is None:
+            with open(self.filename, "w") as f:
+                f.write(json.dumps(header) + "\n")
+        elif existing["key"] != header["key"]:
+            raise ValueError(
+                f"{self.filename} holds results for a different model, TOAs, fitter or grid"
+            )
+        else:
+            with open(self.filename, "rb+") as f:
+                f.seek(-1, 2)
+                if f.read(1) != b"\n":
+                    # terminate a line cut short by an interruption
+                    f.write(b"\n")
+
+    def completed(self):
+        """Results already stored
+
+        Returns
+        -------
+        dict
+            (chi2, extraparvalues) keyed by tuples of grid indices
+        """
+        lines = self._lines()
+        header = next(lines, None)
+        if header is None:
+            return {}
+        results = {}
+        for line in lines:
+            extraparvalues = [
+                np.array(v, dtype=dtype)[()] * u.Unit(unit)
+                for v, dtype, unit in zip(
+                    line["extra"], header["extradtypes"], header["extraunits"]
+                )
+            ]
+            results[tuple(line["index"])] = (line["chi2"], extraparvalues)
+        return results
+
+    def write(self, index, chi2, extraparvalues):
+        """Append the result for one grid point"""
+        line = {
+            "index": [int(i) for i in index],
+            "chi2": float(chi2),
+            # as strings, to keep the precision of long doubles
+            "extra": [str(v.value) for v in extraparvalues],
+        }
+        with open(self.filename, "a") as f:
+            f.write(json.dumps(line) + "\n")
+
+    def read(self):
+        """Read the (possibly partial) results
+
+        Returns
+        -------
+        chi2 : np.ndarray
+            chisq values, NaN for points not yet computed
+        extraout : dict of np.ndarray
+            Values for the extra parameters, NaN for points not yet computed
+        header : dict
+        """
+        header = self.header()
+        if header is None:
+            raise ValueError(f"{self.filename} holds no results")
+        shape = tuple(header["shape"])
+        chi2 = np.full(shape, np.nan)
+        extraout = {
+            p: np.full(shape, np.nan, dtype=dtype) * u.Unit(unit)
+            for p, dtype, unit in zip(
+                header["extraparnames"], header["extradtypes"], header["extraunits"]
+            )
+        }
+        for index, (c, extraparvalues) in self.completed().items():
+            chi2[index] = c
+            for p, v in zip(header["extraparnames"], extraparvalues):
+                extraout[p][index] = v
+        return chi2, extraout, header
+
+
+def _grid_key(ftr, parnames, points, extraparnames, fitargs):
+    """Hash identifying the model, TOAs, fitter and grid of a run"""
+    h = hashlib.sha256()
+    h.update(type(ftr).__name__.encode())
+    h.update(ftr.model.as_parfile(include_info=False).encode())
+    toas = ftr.toas
+    h.update(np.asarray(toas.table["mjd_float"], dtype=float).tobytes())
+    h.update(np.asarray(toas.get_errors().to_value(u.us), dtype=float).tobytes())
+    h.update(np.asarray(toas.get_freqs().to_value(u.MHz), dtype=float).tobytes())
+    h.update(",".join(toas.get_obss()).encode())
+    h.update(
+        repr((list(parnames), list(extraparnames), sorted(fitargs.items()))).encode()
+    )
+    for point in points:
+        h.update(",".join(str(v) for v in point).encode())
+    return h.hexdigest()
+
+
+def _run_fits(
+    ftr,
+    executor,
+    fitfunc,
+    shared,
+    parnames,
+    points,
+    shape,
+    extraparnames,
+    chunksize,
+    printprogress,
+    fitargs,
+    store=None,
+):
+    """Fit at each of `points` (tuples of values for `parnames`)
+
+    Points already in `store` are skipped, and new results are written to it
+    as they arrive.
+
+    Returns
+    -------
+    list
+        (chi2, extraparvalues) for each point
+    """
+    indices = list(np.ndindex(shape))
+    results = [None] * len(points)
+    if store is not None:
+        if not isinstance(store, GridStore):
+            store = GridStore(store)
+        store.open(
+            {
+                "key": _grid_key(ftr, parnames, points, extraparnames, fitargs),
+                "parnames": list(parnames),
+                "shape": list(shape),
+                "extraparnames": list(extraparnames),
+                "extraunits": [
+                    getattr(ftr.model, p).quantity.unit.to_string()
+                    for p in extraparnames
+                ],
+                "extradtypes": [
+                    getattr(ftr.model, p).quantity.dtype.name for p in extraparnames
+                ],
+            }
+        )
+        completed = store.completed()
+        for j, i in enumerate(indices):
+            results[j] = completed.get(i)
+        if completed:
+            log.info(f"Resuming from {len(completed)} points in {store.filename}")
+    todo = [j for j in range(len(points)) if results[j] is None]
+
+    def record(j, result):
+        results[j] = result
+        if store is not None:
+            store.write(indices[j], *result)
+
+    if executor is not None:
+        try:
+            with executor as e:
+                result = e.map(
+                    fitfunc,
+                    (parnames,) * len(todo),
+                    [points[j] for j in todo],
+                    (extraparnames,) * len(todo),
+                    chunksize=chunksize,
+                )
+                if printprogress and tqdm is not None:
+                    result = tqdm(result, total=len(todo), ascii=True)
+                for j, r in zip(todo, result):
+                    record(j, r)
+        finally:
+            if shared is not None:
+                shared.close()
+    else:
+        if printprogress:
+            todo = tqdm(todo, ascii=True) if tqdm is not None else ProgressBar(todo)
+        for j in todo:
+            for parname, parvalue in zip(parnames, points[j]):
+                getattr(ftr.model, parname).quantity = parvalue
+            ftr.fit_toas(**fitargs)
+            record(
+                j,
+                (
+                    ftr.resids.chi2,
+                    [getattr(ftr.model, p).quantity for p in extraparnames],
+                ),
+            )
+    return results
+
+
+def _get_solution(model):
+    return {p: getattr(model, p).quantity for p in model.free_params}
+
+
+def _set_solution(model, solution):
+    for p, q in solution.items():
+        getattr(model, p).quantity = q
+
+
+class _WorkerFitter(WrappedFitter):
+    """Fitter built once in a worker process, sharing its TOAs between grid points
+
+    The TOAs are not copied for each grid point: their numeric columns
+    live in read-only shared memory (see :class:`SharedTOAs`), so only the
+    model and residuals are copied.
+    """
+
+    def _copy_fitter(self):
+        return copy.deepcopy(self.ftr, {id(self.ftr.toas): self.ftr.toas})
+
+
+class SharedTOAs:
+    """TOAs whose numeric table columns are placed in shared memory
+
+    Creating this object copies each numeric column of ``toas.table`` into a
+    :class:`multiprocessing.shared_memory.SharedMemory` block once.  Pickling
+    it (e.g., to send it to a worker process) then only transfers the
+    remaining (object and string) columns and the names of the blocks, and
+    :meth:`attach` rebuilds a :class:`~pint.toa.TOAs` object whose numeric
+    columns are read-only views of the shared memory.
+
+    The process that created the object must call :meth:`close` when the
+    workers are done, which releases the shared memory.  Processes that
+    called :meth:`attach` should call :meth:`detach` once they no longer
+    use the TOAs.
+
+    Parameters
+    ----------
+    toas : pint.toa.TOAs
+    """
+
+    def __init__(self, toas):
+        self._blocks = []
+        self.columns = []
+        self.toas = copy.copy(toas)
+        self.toas.table = toas.table.copy(copy_data=False)
+        for index, name in enumerate(toas.table.colnames):
+            col = toas.table[name]
+            if col.dtype.kind not in "biufc" or col.nbytes == 0:
+                continue
+            block = shared_memory.SharedMemory(create=True, size=col.nbytes)
+            np.ndarray(col.shape, dtype=col.dtype, buffer=block.buf)[...] = col
+            self._blocks.append(block)
+            # a zero-length copy keeps the unit, description, format, and meta
+            self.columns.append((index, block.name, col.shape, col.dtype, col[:0]))
+        self.toas.table.remove_columns(
+            [self.toas.table.colnames[c[0]] for c in self.columns]
+        )
+        self._attached = False
+        self._attached_blocks = []
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_blocks"] = []
+        state["_attached_blocks"] = []
+        return state
+
+    def attach(self):
+        """Return the TOAs, with numeric columns backed by the shared memory
+
+        Returns
+        -------
+        pint.toa.TOAs
+        """
+        if not self._attached:
+            for index, blockname, shape, dtype, template in self.columns:
+                block = shared_memory.SharedMemory(name=blockname)
+                # the arrays do not keep the block alive, so it must stay open
+                # until detach() removes them
+                self._attached_blocks.append(block)
+                data = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+                data.flags.writeable = False
+                self.toas.table.add_column(
+                    template.copy(data=data, copy_data=False), index=index, copy=False
+                )
+            self._attached = True
+        return self.toas
+
+    def detach(self):
+        """Close the shared memory opened by :meth:`attach`
+
+        The numeric columns are removed from the TOAs returned by
+        :meth:`attach`, which must not be used afterwards.  Blocks whose data
+        is still referenced elsewhere are left open.
+        """
+        if self._attached:
+            self.toas.table.remove_columns([c[4].info.name for c in self.columns])
+            self._attached = False
+        gc.collect()
+        for block in self._attached_blocks:
+            try:
+                block.close()
+            except BufferError:
+                log.debug(f"Shared memory block {block.name} is still in use")
+        self._attached_blocks = []
+
+    def close(self):
+        """Release the shared memory (only to be called by its creator)"""
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+
+_worker_fitter = None
+
+
+def _init_worker(payload, shared, fitargs, logger_):
+    """Build the fitter for a worker process a single time"""
+    global _worker_fitter
+    set_log(logger_)
+    toas = shared.attach()
+    # atexit handlers do not run in forked worker processes, but these
+    # finalizers do
+    multiprocessing.util.Finalize(None, _detach_worker, args=(shared,), exitpriority=0)
+    unpickler = pickle.Unpickler(io.BytesIO(payload))
+    unpickler.persistent_load = lambda pid: toas
+    _worker_fitter = _WorkerFitter(unpickler.load(), **fitargs)
+
+
+def _detach_worker(shared):
+    """Drop the worker's fitter and close the shared memory its TOAs use"""
+    global _worker_fitter
+    _worker_fitter = None
+    shared.detach()
+
+
+def _worker_call(method, *args):
+    return getattr(_worker_fitter, method)(*args)
+
+
+def _pickle_without_toas(ftr):
+    """Pickle a fitter, leaving out its TOAs (which are shipped separately)"""
+    buffer = io.BytesIO()
+    pickler = pickle.Pickler(buffer, protocol=pickle.HIGHEST_PROTOCOL)
+    pickler.persistent_id = lambda obj: "toas" if obj is ftr.toas else None
+    pickler.dump(ftr)
+    return buffer.getvalue()
+
+
+def _get_executor(ftr, executor, ncpu, share_toas, fitargs, method="doonefit"):
+    """Set up the executor and the function to map over the grid points
+
+    The function is the `method` of :class:`WrappedFitter`, run either on a
+    copy of `ftr` sent with each task or on the fitter built by each worker.
+
+    Returns
+    -------
+    executor : concurrent.futures.Executor or None
+        None if the single-processor version should be run
+    function : callable
+    shared : SharedTOAs or None
+        Shared memory to release once the executor is done
+    """
+    if isinstance(executor, concurrent.futures.Executor):
+        # the executor has already been created
+        return executor, getattr(WrappedFitter(ftr, **fitargs), method), None
+    if executor is not None or (ncpu is not None and ncpu <= 1):
+        return executor, getattr(WrappedFitter(ftr, **fitargs), method), None
+    # make the default type of Executor
+    if ncpu is None:
+        ncpu = multiprocessing.cpu_count()
+    if not share_toas:
+        wftr = WrappedFitter(ftr, **fitargs)
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=ncpu, initializer=set_log, initargs=(log,)
+        )
+        return executor, getattr(wftr, method), None
+    shared = SharedTOAs(ftr.toas)
+    try:
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=ncpu,
+            initializer=_init_worker,
+            initargs=(_pickle_without_toas(ftr), shared, fitargs, log),
+        )
+    except Exception:
+        shared.close()
+        raise
+    return executor, functools.partial(_worker_call, method), shared
+
 
 def doonefit(ftr, parnames, parvalues, extraparnames=[]):
     """Worker process that computes one fit with specified parameters fixed
@@ -162,6 +652,8 @@ def grid_chisq(
     ncpu=None,
     chunksize=1,
     printprogress=True,
+    share_toas=True,
+    store=None,
     **fitargs,
 ):
     """Compute chisq over a grid of parameters
@@ -188,6 +680,14 @@ def grid_chisq(
         Ignored for :class:`concurrent.futures.ThreadPoolExecutor`
     printprogress : bool, optional
         Print indications of progress (requires :mod:`tqdm` for `ncpu`>1)
+    share_toas : bool, optional
+        If a default executor is created, place the numeric TOA columns in shared memory
+        (see :class:`SharedTOAs`) and build each worker's fitter once, when the worker starts,
+        so only the parameter values are sent for each grid point.
+        If False, the whole fitter is sent to the workers and copied for each grid point.
+    store : str or pathlib.Path or GridStore, optional
+        File to write each result to as soon as it is computed (see :class:`GridStore`).
+        If it already holds results for the same model, TOAs and grid, those points are not fit again.
     fitargs :
         additional arguments pass to fit_toas()
 
@@ -270,6 +770,8 @@ def grid_chisq(
 
     If an instantiated :class:`~concurrent.futures.Executor` is passed instead, it will be used as-is.
 
+    For fine grids, :func:`grid_chisq_adaptive` gives the same arrays while only fitting near the minimum.
+
     The behavior for different combinations of `executor` and `ncpu` is:
     +-----------------+--------+------------------------+
     | `executor`      | `ncpu` | result                 |
@@ -304,18 +806,7 @@ def grid_chisq(
     for parname in parnames:
         getattr(ftr.model, parname).frozen = True
 
-    wftr = WrappedFitter(ftr, **fitargs)
-
-    if isinstance(executor, concurrent.futures.Executor):
-        # the executor has already been created
-        executor = executor
-    elif executor is None and (ncpu is None or ncpu > 1):
-        # make the default type of Executor
-        if ncpu is None:
-            ncpu = multiprocessing.cpu_count()
-        executor = concurrent.futures.ProcessPoolExecutor(
-            max_workers=ncpu, initializer=set_log, initargs=(log,)
-        )
+    executor, fitfunc, shared = _get_executor(ftr, executor, ncpu, share_toas, fitargs)
 
     # All other unfrozen parameters will be fitted for at each grid point
     out = np.meshgrid(*parvalues)
@@ -328,57 +819,535 @@ def grid_chisq(
             * getattr(ftr.model, extrapar).quantity.unit
         )
 
-    # at this point, if the executor is None then run single-processor version
-    if executor is not None:
-        with executor as e:
-            if printprogress and tqdm is not None:
-                result = list(
-                    tqdm(
-                        e.map(
-                            wftr.doonefit,
-                            (parnames,) * len(out[0].flatten()),
-                            list(zip(*[x.flatten() for x in out])),
-                            (extraparnames,) * len(out[0].flatten()),
-                            chunksize=chunksize,
-                        ),
-                        total=len(out[0].flatten()),
-                        ascii=True,
-                    )
-                )
+    results = _run_fits(
+        ftr,
+        executor,
+        fitfunc,
+        shared,
+        parnames,
+        list(zip(*[x.flatten() for x in out])),
+        chi2.shape,
+        extraparnames,
+        chunksize,
+        printprogress,
+        fitargs,
+        store=store,
+    )
+    for i, r in zip(np.ndindex(chi2.shape), results):
+        chi2[i] = r[0]
+        for extrapar, extraparvalue in zip(extraparnames, r[1]):
+            extraout[extrapar][i] = extraparvalue
+
+    # Restore saved model
+    ftr.model = savemod
+    return chi2, extraout
+
+
+def grid_chisq_adaptive(
+    ftr,
+    parnames,
+    parvalues,
+    extraparnames=[],
+    coarse_step=4,
+    threshold=None,
+    executor=None,
+    ncpu=None,
+    segments=None,
+    printprogress=True,
+    share_toas=True,
+    **fitargs,
+):
+    """Compute chisq over a grid of parameters, fitting only near the minimum
+
+    This returns the same arrays as :func:`grid_chisq`, but only fits a
+    subset of the grid points.  The grid is first fit at every
+    `coarse_step`-th point along each axis.  Then the step is repeatedly
+    halved, fitting the new points only in the cells of the previous grid
+    where some corner has a chisq within `threshold` of the minimum (so the
+    minimum and the confidence contours are fully resolved), until the full
+    resolution is reached.  The chisq at points that are never fit is
+    interpolated (multilinearly) from the fitted ones, and the `extraparnames`
+    are taken from the nearest fitted point.
+
+    The fits are also warm-started: the points are visited along a
+    boustrophedon ("snake") path through the grid, which is split into
+    `segments` pieces that are fit in parallel.  Each fit starts from the
+    fitted parameters of the previous point on the path, and the first point
+    of each piece starts from the nearest point that has already been fit.
+
+    Parameters
+    ----------
+    ftr : pint.fitter.Fitter
+        The base fitter to use.
+    parnames : list
+        Names of the parameters to grid over
+    parvalues : list
+        List of parameter values to grid over (each should be 1D array of :class:`astropy.units.Quantity`)
+    extraparnames : list, optional
+        Names of other parameters to return
+    coarse_step : int, optional
+        Step (in grid points along each axis) of the initial coarse grid
+    threshold : float, optional
+        Refine the grid where chisq is within this of the minimum.  If None, use the
+        3-sigma confidence level for ``len(parnames)`` parameters.
+    executor : concurrent.futures.Executor or None, optional
+        Executor object to run multiple processes in parallel
+        If None, will use default :class:`concurrent.futures.ProcessPoolExecutor`, unless overridden by ``ncpu=1``
+    ncpu : int, optional
+        If an existing Executor is not supplied, one will be created with this number of workers.
+        If 1, will run single-processor version
+        If None, will use :func:`multiprocessing.cpu_count`
+        With an existing Executor, this is the number of workers it has (see `segments`).
+    segments : int, optional
+        Number of pieces the path through the new points is split into at each stage.
+        If None, use `ncpu` (or :func:`multiprocessing.cpu_count` if that is None).
+    printprogress : bool, optional
+        Print indications of progress (requires :mod:`tqdm`)
+    share_toas : bool, optional
+        If a default executor is created, place the numeric TOA columns in shared memory
+        (see :class:`SharedTOAs`) and build each worker's fitter once, when the worker starts.
+    fitargs :
+        additional arguments pass to fit_toas()
+
+    Returns
+    -------
+    np.ndarray : array of chisq values
+    extraout : dict of np.ndarray
+        Parameter values computed at each grid point for `extraparnames`
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> import pint.config
+    >>> import pint.gridutils
+    >>> from pint.fitter import WLSFitter
+    >>> from pint.models.model_builder import get_model_and_toas
+    >>> parfile = pint.config.examplefile("NGC6440E.par")
+    >>> timfile = pint.config.examplefile("NGC6440E.tim")
+    >>> m, t = get_model_and_toas(parfile, timfile)
+    >>> f = WLSFitter(t, m)
+    >>> f.fit_toas()
+    >>> F0 = np.linspace(f.model.F0.quantity - 3 * f.model.F0.uncertainty,f.model.F0.quantity + 3 * f.model.F0.uncertainty,41)
+    >>> F1 = np.linspace(f.model.F1.quantity - 3 * f.model.F1.uncertainty,f.model.F1.quantity + 3 * f.model.F1.uncertainty,41)
+    >>> chi2grid, _ = pint.gridutils.grid_chisq_adaptive(f, ("F0", "F1"), (F0, F1))
+
+    Notes
+    -----
+    A strongly multimodal chisq surface may have minima that are missed by
+    the coarse grid; use a smaller `coarse_step` (``coarse_step=1`` fits every
+    point, still with warm starts).
+    """
+    if threshold is None:
+        threshold = scipy.stats.chi2(len(parnames)).ppf(scipy.stats.chi2(1).cdf(9))
+    if segments is None:
+        segments = multiprocessing.cpu_count() if ncpu is None else max(ncpu, 1)
+
+    # Save the current model so we can tweak it for gridding, then restore it at the end
+    savemod = ftr.model
+    gridmod = copy.deepcopy(ftr.model)
+    ftr.model = gridmod
+
+    # Freeze the  params we are going to grid over
+    for parname in parnames:
+        getattr(ftr.model, parname).frozen = True
+
+    executor, fitfunc, shared = _get_executor(
+        ftr, executor, ncpu, share_toas, fitargs, method="dopath"
+    )
+
+    out = np.meshgrid(*parvalues)
+    shape = out[0].shape
+    fitted = np.zeros(shape, dtype=bool)
+    chi2 = np.zeros(shape)
+    extras = {}
+    solutions = {}
+
+    def fit_points(e, points):
+        path = _snake_order(points)
+        pieces = [p for p in np.array_split(path, min(segments, len(path)))]
+        done = np.argwhere(fitted)
+        starts = []
+        for piece in pieces:
+            if len(done) > 0:
+                nearest = done[np.argmin(((done - piece[0]) ** 2).sum(axis=1))]
+                starts.append(solutions[tuple(nearest)])
             else:
-                result = e.map(
-                    wftr.doonefit,
-                    (parnames,) * len(out[0].flatten()),
-                    list(zip(*[x.flatten() for x in out])),
-                    (extraparnames,) * len(out[0].flatten()),
-                    chunksize=chunksize,
-                )
-        it = np.ndindex(chi2.shape)
-        for i, r in zip(it, result):
-            chi2[i] = r[0]
-            for extrapar, extraparvalue in zip(extraparnames, r[1]):
-                extraout[extrapar][i] = extraparvalue
+                starts.append(None)
+        args = (
+            (parnames,) * len(pieces),
+            [[tuple(x[tuple(i)] for x in out) for i in piece] for piece in pieces],
+            (extraparnames,) * len(pieces),
+            starts,
+        )
+        results = e.map(fitfunc, *args) if e is not None else map(fitfunc, *args)
+        if printprogress and tqdm is not None:
+            results = tqdm(results, total=len(pieces), ascii=True)
+        for piece, result in zip(pieces, results):
+            for i, (c, extraparvalues, solution) in zip(piece, result):
+                i = tuple(i)
+                fitted[i] = True
+                chi2[i] = c
+                extras[i] = extraparvalues
+                solutions[i] = solution
+
+    def run(e):
+        step = max(int(coarse_step), 1)
+        lattice = [_lattice(n, step) for n in shape]
+        fit_points(e, list(itertools.product(*lattice)))
+        estimate = _interpolate_lattice(chi2[np.ix_(*lattice)], lattice, shape)
+        while step > 1:
+            best = np.nanmin(chi2[fitted])
+            # lowest chisq at the corners of each cell of the current lattice
+            cellmin = estimate[np.ix_(*lattice)] - best
+            for axis, points in enumerate(lattice):
+                if len(points) > 1:
+                    n = len(points)
+                    cellmin = np.fmin(
+                        cellmin.take(range(n - 1), axis),
+                        cellmin.take(range(1, n), axis),
+                    )
+            region = np.zeros(shape, dtype=bool)
+            for cell in np.argwhere(cellmin <= threshold):
+                region[
+                    tuple(
+                        slice(p[c], p[min(c + 1, len(p) - 1)] + 1)
+                        for c, p in zip(cell, lattice)
+                    )
+                ] = True
+            step = max(step // 2, 1)
+            lattice = [_lattice(n, step) for n in shape]
+            new = np.zeros(shape, dtype=bool)
+            new[np.ix_(*lattice)] = True
+            new &= region & ~fitted
+            if new.any():
+                fit_points(e, [tuple(i) for i in np.argwhere(new)])
+            estimate = _interpolate_lattice(
+                np.where(fitted, chi2, estimate)[np.ix_(*lattice)], lattice, shape
+            )
+        return np.where(fitted, chi2, estimate)
+
+    if executor is not None:
+        try:
+            with executor as e:
+                chi2 = run(e)
+        finally:
+            if shared is not None:
+                shared.close()
     else:
-        indices = list(np.ndindex(out[0].shape))
-        if printprogress:
-            if tqdm is not None:
-                indices = tqdm(indices, ascii=True)
-            else:
-                indices = ProgressBar(indices)
+        chi2 = run(None)
+    log.info(f"Fit {fitted.sum()} of {fitted.size} grid points")
 
-        for i in indices:
-            for parnum, parname in enumerate(parnames):
-                getattr(ftr.model, parname).quantity = out[parnum][i]
-            ftr.fit_toas(**fitargs)
-            chi2[i] = ftr.resids.chi2
-            for extrapar in extraparnames:
-                extraout[extrapar] = getattr(ftr.model, extrapar).quantity
+    extraout = {}
+    done = np.argwhere(fitted)
+    for j, extrapar in enumerate(extraparnames):
+        extraout[extrapar] = (
+            np.zeros(shape, dtype=getattr(ftr.model, extrapar).quantity.dtype)
+            * getattr(ftr.model, extrapar).quantity.unit
+        )
+        for i in np.ndindex(shape):
+            nearest = done[np.argmin(((done - i) ** 2).sum(axis=1))]
+            extraout[extrapar][i] = extras[tuple(nearest)][j]
 
     # Restore saved model
     ftr.model = savemod
     return chi2, extraout
 
 
+def _lattice(n, step):
+    """Indices of every `step`-th point along an axis of length `n`, including the last"""
+    return np.unique(np.r_[np.arange(0, n, step), n - 1])
+
+
+def _snake_order(indices):
+    """Order grid indices along a boustrophedon path
+
+    The direction along each axis reverses whenever the position along the
+    preceding axes advances, so consecutive points are neighbors.
+    """
+    indices = np.asarray(indices)
+    ranks = np.column_stack(
+        [
+            np.unique(indices[:, k], return_inverse=True)[1].ravel()
+            for k in range(indices.shape[1])
+        ]
+    )
+    keys = np.empty_like(ranks)
+    parity = np.zeros(len(ranks), dtype=int)
+    for k in range(ranks.shape[1]):
+        keys[:, k] = np.where(parity % 2, -ranks[:, k], ranks[:, k])
+        parity += ranks[:, k]
+    return indices[np.lexsort(keys.T[::-1])]
+
+
+def _interpolate_lattice(values, lattice, shape):
+    """Multilinearly interpolate values on a sub-lattice of indices to the full grid"""
+    for axis, points in enumerate(lattice):
+        values = np.apply_along_axis(
+            lambda v: np.interp(np.arange(shape[axis]), points, v), axis, values
+        )
+    return values
+
+
+def _linearized_system(toas, model, track_mode=None):
+    """Residuals, normalized design matrix and noise of a model linearized about its current parameters
+
+    The design matrix includes the offset and, if the model has correlated
+    noise, the noise basis, whose amplitudes get a Gaussian prior.
+
+    Returns
+    -------
+    r : np.ndarray
+        Time residuals in seconds
+    M : np.ndarray
+        Design matrix, with each column normalized
+    params : list of str
+        Parameter of each column (empty for the noise basis)
+    norm : np.ndarray
+        Normalization of each column
+    Nvec : np.ndarray
+        White noise variances in s^2
+    phiinv : np.ndarray
+        Inverse prior variance of each (normalized) column, zero for the timing parameters
+    """
+    r = Residuals(toas, model, track_mode=track_mode).time_resids.to_value(u.s)
+    M, params, _ = model.designmatrix(toas=toas, incfrozen=False, incoffset=True)
+    Nvec = model.scaled_toa_uncertainty(toas).to_value(u.s) ** 2
+    phiinv = np.zeros(M.shape[1])
+    if model.has_correlated_errors:
+        Mn = model.noise_model_designmatrix(toas)
+        phi = model.noise_model_basis_weight(toas)
+        M = np.hstack((M, Mn))
+        phiinv = np.concatenate((phiinv, 1 / phi))
+        params = params + [""] * Mn.shape[1]
+    M, norm = normalize_designmatrix(M, params)
+    phiinv /= norm**2
+    return r, M, params, norm, Nvec, phiinv
+
+
+class _Linearization:
+    """Profiled chi2 of a model linearized about its current parameters
+
+    The timing residuals are approximated as ``r - Mg dg - Mf df``, where
+    ``dg`` are the changes in the gridded parameters and ``df`` those of the
+    other free parameters (plus the offset and the correlated-noise
+    amplitudes, which have a Gaussian prior).  Minimizing over ``df`` gives a
+    chi2 that is quadratic in ``dg``, so all the grid points can be evaluated
+    at once from a single design matrix and noise covariance.
+    """
+
+    def __init__(self, toas, model, parnames, track_mode=None):
+        self.model = model
+        r, M, params, norm, Nvec, phiinv = _linearized_system(
+            toas, model, track_mode=track_mode
+        )
+
+        ig = [params.index(p) for p in parnames]
+        ifree = [i for i in range(len(params)) if i not in ig]
+        # the fitted timing model parameters, whose shifts are reported
+        self.parnames = parnames
+        self.freenames = [params[i] for i in ifree if params[i] in model.free_params]
+        self.ifree_timing = [
+            j for j, i in enumerate(ifree) if params[i] in model.free_params
+        ]
+        self.norm_g = norm[ig]
+        self.norm_f = norm[ifree][self.ifree_timing]
+        self.values_g = np.array(
+            [getattr(model, p).value for p in parnames], dtype=np.longdouble
+        )
+
+        Mg, Mf = M[:, ig], M[:, ifree]
+        W = 1 / Nvec
+        # a pseudo-inverse, as the fitters do, to tolerate degenerate parameters
+        Ainv = scipy.linalg.pinvh(Mf.T @ (Mf * W[:, None]) + np.diag(phiinv[ifree]))
+        b0 = Mf.T @ (r * W)
+        Bg = Mf.T @ (Mg * W[:, None])
+        self.Ainv_b0 = Ainv @ b0
+        self.Ainv_Bg = Ainv @ Bg
+        self.chi2_0 = np.dot(r, r * W) - np.dot(b0, self.Ainv_b0)
+        self.grad = Mg.T @ (r * W) - Bg.T @ self.Ainv_b0
+        self.hess = Mg.T @ (Mg * W[:, None]) - Bg.T @ self.Ainv_Bg
+
+        # parameter uncertainties of the full (unprofiled) linearized fit
+        cov = scipy.linalg.pinvh(M.T @ (M * W[:, None]) + np.diag(phiinv)) / np.outer(
+            norm, norm
+        )
+        self.sigma = {
+            params[i]: np.sqrt(cov[i, i])
+            for i in range(len(params))
+            if params[i] in model.free_params or params[i] in parnames
+        }
+
+    def predict(self, gridvalues):
+        """Profiled chi2 and parameter shifts at an array of gridded parameter values
+
+        Parameters
+        ----------
+        gridvalues : np.ndarray
+            Values of the gridded parameters (in their internal units), shape ``(npoints, len(parnames))``
+
+        Returns
+        -------
+        chi2 : np.ndarray
+        dg : np.ndarray
+            Shifts of the gridded parameters
+        df : np.ndarray
+            Shifts of the other free parameters (``self.freenames``) at the profile minimum
+        """
+        dg = (gridvalues - self.values_g).astype(float)
+        x = dg * self.norm_g
+        chi2 = (
+            self.chi2_0 - 2 * x @ self.grad + np.einsum("ij,jk,ik->i", x, self.hess, x)
+        )
+        df = (self.Ainv_b0 - x @ self.Ainv_Bg.T)[:, self.ifree_timing] / self.norm_f
+        return chi2, dg, df
+
+    def shift(self, dg, df):
+        """Largest predicted shift, in units of the parameter uncertainties"""
+        s = np.abs(dg) / np.array([self.sigma[p] for p in self.parnames])
+        if len(self.freenames) > 0:
+            s = np.hstack(
+                (s, np.abs(df) / np.array([self.sigma[p] for p in self.freenames]))
+            )
+        return s.max(axis=1)
+
+    def move(self, toas, gridvalues, df, track_mode=None):
+        """Linearize again at one grid point, starting from the predicted parameters"""
+        model = copy.deepcopy(self.model)
+        for p, v in zip(self.parnames, gridvalues):
+            getattr(model, p).value = v
+        for p, d in zip(self.freenames, df):
+            getattr(model, p).value += d
+        return _Linearization(toas, model, self.parnames, track_mode=track_mode)
+
+
+def grid_chisq_linearized(
+    ftr,
+    parnames,
+    parvalues,
+    extraparnames=[],
+    tolerance=1,
+    max_linearizations=100,
+):
+    """Compute the profiled chisq over a grid of parameters without refitting
+
+    Instead of running a fit at each grid point, the timing model is
+    linearized (one design matrix and noise factorization) about the
+    current parameters of `ftr` (which should be the best fit), and the
+    chisq minimized over all other free parameters is evaluated
+    analytically for every grid point at once.
+
+    If the parameter shifts predicted for a grid point exceed `tolerance`
+    times the parameter uncertainties, the model is linearized again at
+    that grid point (starting from the predicted parameters), and each
+    point is evaluated with the linearization that predicts the smallest
+    shift, until all predicted shifts are within `tolerance` (or
+    `max_linearizations` is reached).  Where the other parameters respond
+    almost linearly this gives the same result as :func:`grid_chisq` with
+    a small fraction of the work.
+
+    Parameters
+    ----------
+    ftr : pint.fitter.Fitter
+        The base (narrowband) fitter to use, at its best fit
+    parnames : list
+        Names of the parameters to grid over
+    parvalues : list
+        List of parameter values to grid over (each should be 1D array of :class:`astropy.units.Quantity`)
+    extraparnames : list, optional
+        Names of other parameters to return
+    tolerance : float, optional
+        Largest allowed predicted shift of any parameter from the point of linearization,
+        in units of its uncertainty
+    max_linearizations : int, optional
+        Maximum number of times to linearize the model
+
+    Returns
+    -------
+    np.ndarray : array of chisq values
+    extraout : dict of np.ndarray
+        Parameter values predicted at each grid point for `extraparnames`
+
+    Example
+    -------
+    >>> F0 = np.linspace(f.model.F0.quantity - 3 * f.model.F0.uncertainty,f.model.F0.quantity + 3 * f.model.F0.uncertainty,101)
+    >>> F1 = np.linspace(f.model.F1.quantity - 3 * f.model.F1.uncertainty,f.model.F1.quantity + 3 * f.model.F1.uncertainty,101)
+    >>> chi2grid, _ = pint.gridutils.grid_chisq_linearized(f, ("F0", "F1"), (F0, F1))
+    """
+    if ftr.is_wideband:
+        raise NotImplementedError(
+            "Linearized chisq grids are only implemented for narrowband TOAs"
+        )
+    model = copy.deepcopy(ftr.model)
+    for parname in parnames:
+        getattr(model, parname).frozen = False
+
+    out = np.meshgrid(*parvalues)
+    shape = out[0].shape
+    units = [getattr(model, p).units for p in parnames]
+    gridvalues = np.column_stack(
+        [
+            np.asarray(x.to_value(un), dtype=np.longdouble).ravel()
+            for x, un in zip(out, units)
+        ]
+    )
+
+    lin0 = _Linearization(ftr.toas, model, parnames, track_mode=ftr.track_mode)
+    linearizations = [lin0]
+    predictions = [lin0.predict(gridvalues)]
+    shifts = [lin0.shift(*predictions[0][1:])]
+    # points that have been linearized at are done, even if the new
+    # linearization still predicts a shift
+    anchored = np.zeros(len(gridvalues), dtype=bool)
+    while True:
+        best = np.argmin(shifts, axis=0)
+        shift = np.take_along_axis(np.array(shifts), best[None, :], axis=0)[0]
+        shift[anchored] = 0
+        worst = np.argmax(shift)
+        if shift[worst] <= tolerance:
+            break
+        if len(linearizations) >= max_linearizations:
+            log.warning(
+                f"Predicted shifts up to {shift[worst]:.3g} sigma remain after "
+                f"{len(linearizations)} linearizations"
+            )
+            break
+        lin = linearizations[best[worst]].move(
+            ftr.toas,
+            gridvalues[worst],
+            predictions[best[worst]][2][worst],
+            track_mode=ftr.track_mode,
+        )
+        # measure all shifts in units of the same (best-fit) uncertainties
+        lin.sigma = lin0.sigma
+        anchored[worst] = True
+        linearizations.append(lin)
+        predictions.append(lin.predict(gridvalues))
+        shifts.append(lin.shift(*predictions[-1][1:]))
+    log.info(f"Used {len(linearizations)} linearizations for {len(gridvalues)} points")
+
+    chi2 = np.zeros(len(gridvalues))
+    extraout = {
+        extrapar: np.zeros(
+            len(gridvalues), dtype=getattr(model, extrapar).quantity.dtype
+        )
+        * getattr(model, extrapar).quantity.unit
+        for extrapar in extraparnames
+    }
+    for j, (lin, (c, dg, df)) in enumerate(zip(linearizations, predictions)):
+        use = best == j
+        chi2[use] = c[use]
+        for extrapar in extraparnames:
+            par = getattr(lin.model, extrapar)
+            if extrapar in parnames:
+                value = gridvalues[use, parnames.index(extrapar)]
+            elif extrapar in lin.freenames:
+                value = par.value + df[use, lin.freenames.index(extrapar)]
+            else:
+                value = par.value
+            extraout[extrapar][use] = value * par.units
+    return chi2.reshape(shape), {k: v.reshape(shape) for k, v in extraout.items()}
+
+
 def grid_chisq_derived(
     ftr,
     parnames,
@@ -389,6 +1358,8 @@ def grid_chisq_derived(
     ncpu=None,
     chunksize=1,
     printprogress=True,
+    share_toas=True,
+    store=None,
     **fitargs,
 ):
     """Compute chisq over a grid of derived parameters
@@ -417,6 +1388,14 @@ def grid_chisq_derived(
         Ignored for :class:`concurrent.futures.ThreadPoolExecutor`
     printprogress : bool, optional
         Print indications of progress (requires :mod:`tqdm` for `ncpu`>1)
+    share_toas : bool, optional
+        If a default executor is created, place the numeric TOA columns in shared memory
+        (see :class:`SharedTOAs`) and build each worker's fitter once, when the worker starts,
+        so only the parameter values are sent for each grid point.
+        If False, the whole fitter is sent to the workers and copied for each grid point.
+    store : str or pathlib.Path or GridStore, optional
+        File to write each result to as soon as it is computed (see :class:`GridStore`).
+        If it already holds results for the same model, TOAs and grid, those points are not fit again.
     fitargs :
         additional arguments pass to fit_toas()
 
@@ -487,15 +1466,6 @@ def grid_chisq_derived(
     .. [1] https://mpi4py.readthedocs.io/en/stable/mpi4py.futures.html#mpipoolexecutor
     .. [2] https://github.com/sampsyo/clusterfutures
     """
-    if isinstance(executor, concurrent.futures.Executor):
-        # the executor has already been created
-        executor = executor
-    elif executor is None and (ncpu is None or ncpu > 1):
-        # make the default type of Executor
-        if ncpu is None:
-            ncpu = multiprocessing.cpu_count()
-        executor = concurrent.futures.ProcessPoolExecutor(max_workers=ncpu)
-
     # Save the current model so we can tweak it for gridding, then restore it at the end
     savemod = ftr.model
     gridmod = copy.deepcopy(ftr.model)
@@ -505,7 +1475,7 @@ def grid_chisq_derived(
     for parname in parnames:
         getattr(ftr.model, parname).frozen = True
 
-    wftr = WrappedFitter(ftr, **fitargs)
+    executor, fitfunc, shared = _get_executor(ftr, executor, ncpu, share_toas, fitargs)
 
     # All other unfrozen parameters will be fitted for at each grid point
     grid = np.meshgrid(*gridvalues)
@@ -521,54 +1491,24 @@ def grid_chisq_derived(
             * getattr(ftr.model, extrapar).quantity.unit
         )
 
-    # at this point, if the executor is None then run single-processor version
-    if executor is not None:
-        with executor as e:
-            if printprogress and tqdm is not None:
-                result = list(
-                    tqdm(
-                        e.map(
-                            wftr.doonefit,
-                            # (ftr,) * len(out[0].flatten()),
-                            (parnames,) * len(out[0].flatten()),
-                            list(zip(*[x.flatten() for x in out])),
-                            (extraparnames,) * len(out[0].flatten()),
-                            chunksize=chunksize,
-                        ),
-                        total=len(out[0].flatten()),
-                        ascii=True,
-                    )
-                )
-            else:
-                result = e.map(
-                    wftr.doonefit,
-                    # (ftr,) * len(out[0].flatten()),
-                    (parnames,) * len(out[0].flatten()),
-                    list(zip(*[x.flatten() for x in out])),
-                    (extraparnames,) * len(out[0].flatten()),
-                    chunksize=chunksize,
-                )
-
-        it = np.ndindex(chi2.shape)
-        for i, r in zip(it, result):
-            chi2[i] = r[0]
-            for extrapar, extraparvalue in zip(extraparnames, r[1]):
-                extraout[extrapar][i] = extraparvalue
-    else:
-        indices = list(np.ndindex(grid[0].shape))
-        if printprogress:
-            if tqdm is not None:
-                indices = tqdm(indices, ascii=True)
-            else:
-                indices = ProgressBar(indices)
-
-        for i in indices:
-            for parnum, parname in enumerate(parnames):
-                getattr(ftr.model, parname).quantity = out[parnum][i]
-            ftr.fit_toas(**fitargs)
-            chi2[i] = ftr.resids.chi2
-            for extrapar in extraparnames:
-                extraout[extrapar] = getattr(ftr.model, extrapar).quantity
+    results = _run_fits(
+        ftr,
+        executor,
+        fitfunc,
+        shared,
+        parnames,
+        list(zip(*[x.flatten() for x in out])),
+        chi2.shape,
+        extraparnames,
+        chunksize,
+        printprogress,
+        fitargs,
+        store=store,
+    )
+    for i, r in zip(np.ndindex(chi2.shape), results):
+        chi2[i] = r[0]
+        for extrapar, extraparvalue in zip(extraparnames, r[1]):
+            extraout[extrapar][i] = extraparvalue
 
     # Restore saved model
     ftr.model = savemod
@@ -584,6 +1524,8 @@ def tuple_chisq(
     ncpu=None,
     chunksize=1,
     printprogress=True,
+    share_toas=True,
+    store=None,
     **fitargs,
 ):
     """Compute chisq over a list of parameter tuples
@@ -610,6 +1552,14 @@ def tuple_chisq(
         Ignored for :class:`concurrent.futures.ThreadPoolExecutor`
     printprogress : bool, optional
         Print indications of progress (requires :mod:`tqdm` for `ncpu`>1)
+    share_toas : bool, optional
+        If a default executor is created, place the numeric TOA columns in shared memory
+        (see :class:`SharedTOAs`) and build each worker's fitter once, when the worker starts,
+        so only the parameter values are sent for each grid point.
+        If False, the whole fitter is sent to the workers and copied for each grid point.
+    store : str or pathlib.Path or GridStore, optional
+        File to write each result to as soon as it is computed (see :class:`GridStore`).
+        If it already holds results for the same model, TOAs and grid, those points are not fit again.
     fitargs :
         additional arguments pass to fit_toas()
 
@@ -679,15 +1629,6 @@ def tuple_chisq(
     .. [1] https://mpi4py.readthedocs.io/en/stable/mpi4py.futures.html#mpipoolexecutor
     .. [2] https://github.com/sampsyo/clusterfutures
     """
-    if isinstance(executor, concurrent.futures.Executor):
-        # the executor has already been created
-        executor = executor
-    elif executor is None and (ncpu is None or ncpu > 1):
-        # make the default type of Executor
-        if ncpu is None:
-            ncpu = multiprocessing.cpu_count()
-        executor = concurrent.futures.ProcessPoolExecutor(max_workers=ncpu)
-
     # Save the current model so we can tweak it for gridding, then restore it at the end
     savemod = ftr.model
     gridmod = copy.deepcopy(ftr.model)
@@ -697,7 +1638,7 @@ def tuple_chisq(
     for parname in parnames:
         getattr(ftr.model, parname).frozen = True
 
-    wftr = WrappedFitter(ftr, **fitargs)
+    executor, fitfunc, shared = _get_executor(ftr, executor, ncpu, share_toas, fitargs)
 
     # All other unfrozen parameters will be fitted for at each grid point
     chi2 = np.zeros(len(parvalues))
@@ -709,51 +1650,24 @@ def tuple_chisq(
             * getattr(ftr.model, extrapar).quantity.unit
         )
 
-    # at this point, if the executor is None then run single-processor version
-    if executor is not None:
-        with executor as e:
-            if printprogress and tqdm is not None:
-                result = list(
-                    tqdm(
-                        e.map(
-                            wftr.doonefit,
-                            (parnames,) * len(chi2),
-                            parvalues,
-                            (extraparnames,) * len(chi2),
-                            chunksize=chunksize,
-                        ),
-                        total=len(chi2),
-                        ascii=True,
-                    )
-                )
-            else:
-                result = e.map(
-                    wftr.doonefit,
-                    (parnames,) * len(chi2),
-                    parvalues,
-                    (extraparnames,) * len(chi2),
-                    chunksize=chunksize,
-                )
-        it = np.ndindex(chi2.shape)
-        for i, r in zip(it, result):
-            chi2[i] = r[0]
-            for extrapar, extraparvalue in zip(extraparnames, r[1]):
-                extraout[extrapar][i] = extraparvalue
-    else:
-        indices = list(np.ndindex(chi2.shape))
-        if printprogress:
-            if tqdm is not None:
-                indices = tqdm(indices, ascii=True)
-            else:
-                indices = ProgressBar(indices)
-
-        for i in indices:
-            for parnum, parname in enumerate(parnames):
-                getattr(ftr.model, parname).quantity = parvalues[i[0]][parnum]
-            ftr.fit_toas(**fitargs)
-            chi2[i[0]] = ftr.resids.chi2
-            for extrapar in extraparnames:
-                extraout[extrapar][i[0]] = getattr(ftr.model, extrapar).quantity
+    results = _run_fits(
+        ftr,
+        executor,
+        fitfunc,
+        shared,
+        parnames,
+        parvalues,
+        chi2.shape,
+        extraparnames,
+        chunksize,
+        printprogress,
+        fitargs,
+        store=store,
+    )
+    for i, r in zip(np.ndindex(chi2.shape), results):
+        chi2[i] = r[0]
+        for extrapar, extraparvalue in zip(extraparnames, r[1]):
+            extraout[extrapar][i] = extraparvalue
 
     # Restore saved model
     ftr.model = savemod
@@ -770,6 +1684,8 @@ def tuple_chisq_derived(
     ncpu=None,
     chunksize=1,
     printprogress=True,
+    share_toas=True,
+    store=None,
     **fitargs,
 ):
     """Compute chisq over a list of derived parameter tuples
@@ -798,6 +1714,14 @@ def tuple_chisq_derived(
         Ignored for :class:`concurrent.futures.ThreadPoolExecutor`
     printprogress : bool, optional
         Print indications of progress (requires :mod:`tqdm` for `ncpu`>1)
+    share_toas : bool, optional
+        If a default executor is created, place the numeric TOA columns in shared memory
+        (see :class:`SharedTOAs`) and build each worker's fitter once, when the worker starts,
+        so only the parameter values are sent for each grid point.
+        If False, the whole fitter is sent to the workers and copied for each grid point.
+    store : str or pathlib.Path or GridStore, optional
+        File to write each result to as soon as it is computed (see :class:`GridStore`).
+        If it already holds results for the same model, TOAs and grid, those points are not fit again.
     fitargs :
         additional arguments pass to fit_toas()
 
@@ -870,15 +1794,6 @@ def tuple_chisq_derived(
     .. [1] https://mpi4py.readthedocs.io/en/stable/mpi4py.futures.html#mpipoolexecutor
     .. [2] https://github.com/sampsyo/clusterfutures
     """
-    if isinstance(executor, concurrent.futures.Executor):
-        # the executor has already been created
-        executor = executor
-    elif executor is None and (ncpu is None or ncpu > 1):
-        # make the default type of Executor
-        if ncpu is None:
-            ncpu = multiprocessing.cpu_count()
-        executor = concurrent.futures.ProcessPoolExecutor(max_workers=ncpu)
-
     # Save the current model so we can tweak it for gridding, then restore it at the end
     savemod = ftr.model
     gridmod = copy.deepcopy(ftr.model)
@@ -888,7 +1803,7 @@ def tuple_chisq_derived(
     for parname in parnames:
         getattr(ftr.model, parname).frozen = True
 
-    wftr = WrappedFitter(ftr, **fitargs)
+    executor, fitfunc, shared = _get_executor(ftr, executor, ncpu, share_toas, fitargs)
 
     # All other unfrozen parameters will be fitted for at each grid point
     chi2 = np.zeros(len(parvalues))
@@ -904,52 +1819,24 @@ def tuple_chisq_derived(
             * getattr(ftr.model, extrapar).quantity.unit
         )
 
-    # at this point, if the executor is None then run single-processor version
-    if executor is not None:
-        with executor as e:
-            if printprogress and tqdm is not None:
-                result = list(
-                    tqdm(
-                        e.map(
-                            wftr.doonefit,
-                            (parnames,) * len(chi2),
-                            out,
-                            (extraparnames,) * len(chi2),
-                            chunksize=chunksize,
-                        ),
-                        total=len(chi2),
-                        ascii=True,
-                    )
-                )
-            else:
-                result = e.map(
-                    wftr.doonefit,
-                    (parnames,) * len(chi2),
-                    out,
-                    (extraparnames,) * len(chi2),
-                    chunksize=chunksize,
-                )
-
-        it = np.ndindex(chi2.shape)
-        for i, r in zip(it, result):
-            chi2[i] = r[0]
-            for extrapar, extraparvalue in zip(extraparnames, r[1]):
-                extraout[extrapar][i] = extraparvalue
-    else:
-        indices = list(np.ndindex(chi2.shape))
-        if printprogress:
-            if tqdm is not None:
-                indices = tqdm(indices, ascii=True)
-            else:
-                indices = ProgressBar(indices)
-
-        for i in indices:
-            for parnum, parname in enumerate(parnames):
-                getattr(ftr.model, parname).quantity = out[i[0]][parnum]
-            ftr.fit_toas(**fitargs)
-            chi2[i[0]] = ftr.resids.chi2
-            for extrapar in extraparnames:
-                extraout[extrapar][i[0]] = getattr(ftr.model, extrapar).quantity
+    results = _run_fits(
+        ftr,
+        executor,
+        fitfunc,
+        shared,
+        parnames,
+        out,
+        chi2.shape,
+        extraparnames,
+        chunksize,
+        printprogress,
+        fitargs,
+        store=store,
+    )
+    for i, r in zip(np.ndindex(chi2.shape), results):
+        chi2[i] = r[0]
+        for extrapar, extraparvalue in zip(extraparnames, r[1]):
+            extraout[extrapar][i] = extraparvalue
 
     # Restore saved model
     ftr.model = savemod
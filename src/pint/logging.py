@@ -57,7 +57,7 @@ from loguru import logger as log
 
 from erfa import ErfaWarning
 
-__all__ = ["LogFilter", "setup", "format", "levels", "get_level"]
+__all__ = ["LogFilter", "setup", "format", "levels", "get_level", "share_log"]
 
 # defaults can be overridden using $LOGURU_LEVEL and $LOGURU_FORMAT
 # default for an individual level can be overridden by $LOGURU_DEBUG_COLOR etc
@@ -354,3 +354,20 @@ def get_level(starting_level_name, verbosity, quietness):
         len(levels) - 1,
     )
     return levels[level]
+
+
+def share_log(logger_):
+    """Use ``logger_`` as the log of all imported pint modules
+
+    This is meant for worker processes (e.g., in the initializer of a
+    :class:`concurrent.futures.ProcessPoolExecutor`), so that they respect
+    the logger settings of the process that started them.
+
+    Parameters
+    ----------
+    logger_ : loguru.Logger
+        Logger to use, normally the ``log`` of the parent process
+    """
+    for m in sys.modules:
+        if m.startswith("pint") and hasattr(sys.modules[m], "log"):
+            setattr(sys.modules[m], "log", logger_)
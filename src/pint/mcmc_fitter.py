@@ -310,7 +310,9 @@ class MCMCFitter(Fitter):
 
         return -lnlikelihood
 
-    def fit_toas(self, maxiter=100, pos=None, errfact=0.1, priorerrfact=10.0):
+    def fit_toas(
+        self, maxiter=100, pos=None, errfact=0.1, priorerrfact=10.0, autocorr=None
+    ):
         """Fitting function - calls sampler.run_mcmc to converge using MCMC approach
 
         Parameters
@@ -324,6 +326,8 @@ class MCMCFitter(Fitter):
             Multiplicative factor for errors in get_intial_pos
         priorerrfact : float, optional
             Error factor in setting prior widths
+        autocorr : pint.sampler.AutocorrConvergence, optional
+            Convergence check used to stop the sampler before maxiter iterations
 
         """
         # Set model priors if it hasn't been done yet
@@ -343,11 +347,20 @@ class MCMCFitter(Fitter):
         # If template exists, make sure that template params are within tbound
         pos = self.clip_template_params(pos)
 
-        # Initialize sampler
-        self.sampler.initialize_sampler(self.lnposterior, self.n_fit_params)
-
-        # Run sampler for some number of iterations
-        self.sampler.run_mcmc(pos, maxiter)
+        # Initialize sampler, and run it for some number of iterations; any
+        # worker processes it starts are shut down when it is done
+        try:
+            self.sampler.initialize_sampler(self.lnposterior, self.n_fit_params)
+            self.sampler.run_mcmc(pos, maxiter, autocorr=autocorr)
+        finally:
+            self.sampler.close()
+
+        # The posterior may have been evaluated in other processes (or in a
+        # previous run, when resuming from a checkpoint), so find the best
+        # point in the chains as well
+        best = self.sampler.get_max_lnposterior()
+        if best is not None and best[0] > self.maxpost:
+            self.maxpost, self.maxpost_fitvals = best
 
         # Process results and get chi2 for new parameters
         self.set_params(dict(zip(self.fitkeys, self.maxpost_fitvals)))
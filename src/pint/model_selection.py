@@ -0,0 +1,440 @@
+"""Compare candidate changes to a timing model.
+
+Deciding which parameters a timing model needs usually involves trying many
+candidate additions (FD terms, higher orbital frequency derivatives, WaveX
+harmonics, extra DMX bins, ...) and removals, refitting for each one and
+comparing the results. :func:`pint.model_selection.evaluate_candidates` does
+this for a list of candidates at once: the candidates are fitted
+concurrently on an executor (sharing the fitter's TOAs rather than copying
+them for each candidate), and the results are returned as a table of
+:math:`\\Delta\\chi^2`, F-test probability, AIC and BIC, ranked by AIC.
+
+Optionally, the candidates can first be screened using the linearized fit,
+which only needs the design matrix at the current parameter values, and only
+the promising ones refitted.
+
+Example usage::
+
+    >>> from pint.model_selection import Candidate, evaluate_candidates
+    >>> candidates = [
+    ...     Candidate(F2, "Spindown"),
+    ...     Candidate([FD3, FD4], ["FD", "FD"], name="FD3+FD4"),
+    ...     Candidate("PX", remove=True),
+    ... ]
+    >>> table = evaluate_candidates(f, candidates, ncpu=4)
+    >>> table.pprint()
+
+Here ``f`` is a fitter that has already been fitted, and ``F2``, ``FD3`` and
+``FD4`` are :class:`pint.models.parameter.Parameter` objects, exactly as they
+would be passed to :func:`pint.fitter.Fitter.ftest`.
+"""
+
+import concurrent.futures
+import copy
+import multiprocessing
+
+import numpy as np
+import scipy.linalg
+from astropy.table import Table
+from loguru import logger as log
+
+try:
+    from tqdm import tqdm
+except ModuleNotFoundError:
+    tqdm = None
+
+from pint.gridutils import _linearized_system
+from pint.logging import share_log
+from pint.utils import (
+    FTest,
+    akaike_information_criterion,
+    bayesian_information_criterion,
+)
+
+__all__ = ["Candidate", "evaluate_candidates", "linearized_chi2"]
+
+# Nonzero starting values for parameters for which zero is not allowed
+check_params = {
+    "M2": 0.25,
+    "SINI": 0.8,
+    "PB": 10.0,
+    "T0": 54000.0,
+    "FB0": 1.1574e-6,
+}
+
+# Fitter used by worker processes; set once per worker by the initializer
+_worker_fitter = None
+
+
+class Candidate:
+    """A candidate change to a timing model.
+
+    Parameters
+    ----------
+    parameters : pint.models.parameter.Parameter or str, or list of these
+        Parameters to add to (or remove from) the model. Parameters to be
+        added must be given as parameter objects; parameters to be removed
+        may be given by name.
+    components : str or list of str, optional
+        Names of the components the parameters should be added to, one per
+        parameter. Only needed for parameters that are not already present
+        in the model.
+    remove : bool, optional
+        If True, remove the parameters (set them to zero and freeze them)
+        instead of adding them.
+    name : str, optional
+        Name to use for this candidate in the results. Defaults to the
+        parameter names, prefixed with "-" for removals.
+    """
+
+    def __init__(self, parameters, components=None, remove=False, name=None):
+        if not isinstance(parameters, (list, tuple)):
+            parameters = [parameters]
+        if components is None:
+            components = [None] * len(parameters)
+        elif not isinstance(components, (list, tuple)):
+            components = [components]
+        if len(parameters) != len(components):
+            raise ValueError(
+                "Number of input parameters must match number of input components."
+            )
+        self.parameters = list(parameters)
+        self.components = list(components)
+        self.remove = remove
+        self.param_names = [p if isinstance(p, str) else p.name for p in parameters]
+        if name is None:
+            name = ("-" if remove else "+") + "+".join(self.param_names)
+        self.name = name
+
+    def __repr__(self):
+        return f"Candidate({self.name!r})"
+
+    def apply(self, model):
+        """Make the change to ``model``, in place.
+
+        Parameters
+        ----------
+        model : pint.models.timing_model.TimingModel
+
+        Returns
+        -------
+        pint.models.timing_model.TimingModel
+            The modified model
+        """
+        if self.remove:
+            # Set values to zero and freeze them
+            for p in self.param_names:
+                getattr(model, p).value = 0.0
+                getattr(model, p).uncertainty_value = 0.0
+                getattr(model, p).frozen = True
+        else:
+            for p, c in zip(self.parameters, self.components):
+                if isinstance(p, str):
+                    raise ValueError(
+                        f"Parameter {p} to be added must be given as a parameter object"
+                    )
+                if hasattr(model, p.name):
+                    pm = getattr(model, p.name)
+                    pm.frozen = False
+                    value = p.value
+                    if p.name in check_params and value == 0.0:
+                        log.warning(
+                            f"Default value for {p.name} cannot be 0, resetting to {check_params[p.name]}"
+                        )
+                        value = check_params[p.name]
+                    pm.value = value
+                else:
+                    if c not in model.components:
+                        raise ValueError(
+                            f"Cannot add {p.name}: component {c} is not in the model"
+                        )
+                    model.components[c].add_param(copy.deepcopy(p), setup=True)
+        model.validate()
+        model.setup()
+        return model
+
+
+def linearized_chi2(toas, model, track_mode=None):
+    """Chi-squared of the linearized fit about the model's current parameters.
+
+    This is the chi-squared that a single (GLS) fitting step would reach,
+    computed from the residuals and the design matrix only.
+
+    Parameters
+    ----------
+    toas : pint.toa.TOAs
+        Narrowband TOAs
+    model : pint.models.timing_model.TimingModel
+    track_mode : str, optional
+        Passed to :class:`pint.residuals.Residuals`
+
+    Returns
+    -------
+    float
+    """
+    r, M, _, _, Nvec, phiinv = _linearized_system(toas, model, track_mode=track_mode)
+    mtcm = M.T @ (M / Nvec[:, None]) + np.diag(phiinv)
+    mtcy = M.T @ (r / Nvec)
+    xhat = scipy.linalg.lstsq(mtcm, mtcy)[0]
+    return np.dot(r, r / Nvec) - np.dot(mtcy, xhat)
+
+
+def _evaluate(candidate, linearized, maxiter, fitargs, ftr=None):
+    """Worker function: evaluate one candidate.
+
+    Returns a dictionary of plain values so that results are cheap to send
+    back from worker processes.
+    """
+    if ftr is None:
+        ftr = _worker_fitter
+    model = candidate.apply(copy.deepcopy(ftr.model))
+    k = len(model.free_params)
+    if linearized:
+        return {
+            "lin_chi2": linearized_chi2(ftr.toas, model, track_mode=ftr.track_mode),
+            "k": k,
+        }
+
+    # A shallow copy shares the TOAs (and everything else that fitting
+    # does not replace) with the original fitter
+    myftr = copy.copy(ftr)
+    myftr.model = model
+    myftr.update_resids()
+    result = {"k": k, "converged": True, "error": ""}
+    try:
+        if maxiter is not None:
+            fitargs = dict(fitargs, maxiter=maxiter)
+        myftr.fit_toas(**fitargs)
+    except Exception as e:
+        # Keep whatever the fitter reached, but flag it
+        log.warning(f"Fit for candidate {candidate.name} failed: {e!r}")
+        result["converged"] = False
+        result["error"] = repr(e)
+    else:
+        result["converged"] = bool(getattr(myftr, "converged", True))
+    result["chi2"] = float(myftr.resids.chi2)
+    result["dof"] = int(myftr.resids.dof)
+    result["aic"], result["bic"] = _information_criteria(myftr)
+    return result
+
+
+def _information_criteria(ftr):
+    try:
+        return (
+            akaike_information_criterion(ftr.model, ftr.toas),
+            bayesian_information_criterion(ftr.model, ftr.toas),
+        )
+    except NotImplementedError:
+        return np.nan, np.nan
+
+
+def _init_worker(ftr, logger_=None):
+    global _worker_fitter
+    _worker_fitter = ftr
+    if logger_ is not None:
+        # copy the log to all imported modules (including this one)
+        # this makes them respect the logger settings
+        share_log(logger_)
+
+
+def _run(
+    executor, has_fitter, ftr, candidates, linearized, maxiter, fitargs, printprogress
+):
+    if executor is None:
+        it = candidates
+        if printprogress and tqdm is not None:
+            it = tqdm(it, ascii=True)
+        return [_evaluate(c, linearized, maxiter, fitargs, ftr=ftr) for c in it]
+    results = [None] * len(candidates)
+    futures = {
+        # Workers started by evaluate_candidates hold the fitter already
+        executor.submit(
+            _evaluate, c, linearized, maxiter, fitargs, None if has_fitter else ftr
+        ): i
+        for i, c in enumerate(candidates)
+    }
+    done = concurrent.futures.as_completed(futures)
+    if printprogress and tqdm is not None:
+        done = tqdm(done, total=len(futures), ascii=True)
+    for future in done:
+        results[futures[future]] = future.result()
+    return results
+
+
+def evaluate_candidates(
+    ftr,
+    candidates,
+    maxiter=None,
+    screen=None,
+    sort_by="aic",
+    executor=None,
+    ncpu=None,
+    printprogress=False,
+    **fitargs,
+):
+    """Refit a timing model with each of several candidate changes and rank the results.
+
+    Each candidate is compared with the model currently in ``ftr``, which
+    should already have been fitted. For additions the F-test probability is
+    that of the candidate over the current model; for removals it is that of
+    the current model over the candidate (as in :func:`pint.fitter.Fitter.ftest`).
+
+    Parameters
+    ----------
+    ftr : pint.fitter.Fitter
+        The fitter with the base model. It is not modified.
+    candidates : list
+        :class:`pint.model_selection.Candidate` objects, or tuples of
+        arguments to construct them, such as ``(parameter, component)`` or
+        ``(parameter, component, True)`` for a removal.
+    maxiter : int, optional
+        Passed to ``fit_toas()`` for each candidate; if None, the fitter's default is used
+    screen : float, optional
+        If given, first evaluate all candidates with the linearized fit (see
+        :func:`pint.model_selection.linearized_chi2`, narrowband only) and
+        only refit those whose linearized change in AIC is below this value
+        (so ``screen=0`` refits only candidates expected to improve the AIC).
+    sort_by : str, optional
+        Column of the output table to sort on (ascending)
+    executor : concurrent.futures.Executor or None, optional
+        Executor object to run multiple processes in parallel
+        If None, will use default :class:`concurrent.futures.ProcessPoolExecutor`, unless overridden by ``ncpu=1``
+    ncpu : int, optional
+        If an existing Executor is not supplied, one will be created with this number of workers.
+        If 1, will run single-processor version
+        If None, will use :func:`multiprocessing.cpu_count`
+    printprogress : bool, optional
+        Print indications of progress (requires :mod:`tqdm`)
+    fitargs :
+        additional arguments pass to fit_toas()
+
+    Returns
+    -------
+    astropy.table.Table
+        One row per candidate with columns ``name``, ``remove``, ``dk``
+        (change in the number of free parameters), ``chi2``, ``dof``,
+        ``delta_chi2``, ``ftest``, ``aic``, ``bic``, ``delta_aic``,
+        ``delta_bic``, ``converged`` and ``error``; with screening, also
+        ``lin_delta_chi2``, ``lin_delta_aic`` and ``screened`` (True for
+        candidates that were not refitted; their fit columns are NaN).
+        Changes are candidate minus base model. The base model's ``chi2``,
+        ``dof``, ``aic`` and ``bic`` are in the table's ``meta``.
+
+    Notes
+    -----
+    The behavior for different combinations of ``executor`` and ``ncpu`` is
+    the same as for :func:`pint.gridutils.grid_chisq`. Executors created
+    here send the fitter (and so its TOAs) to each worker process once;
+    with a user-supplied executor the fitter is sent with each candidate.
+    AIC and BIC are not available for wideband fitters and are NaN there.
+
+    If you are running this as a script you may need something like::
+
+        import multiprocessing
+
+        if __name__ == "__main__":
+            multiprocessing.freeze_support()
+            ...
+            evaluate_candidates(...)
+    """
+    candidates = [c if isinstance(c, Candidate) else Candidate(*c) for c in candidates]
+    base_k = len(ftr.model.free_params)
+    base_chi2 = float(ftr.resids.chi2)
+    base_dof = int(ftr.resids.dof)
+    base_aic, base_bic = _information_criteria(ftr)
+
+    own_executor = False
+    if isinstance(executor, concurrent.futures.Executor):
+        # the executor has already been created
+        executor = executor
+    elif executor is None and (ncpu is None or ncpu > 1):
+        # make the default type of Executor
+        if ncpu is None:
+            ncpu = multiprocessing.cpu_count()
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=min(ncpu, max(len(candidates), 1)),
+            initializer=_init_worker,
+            initargs=(ftr, log),
+        )
+        own_executor = True
+
+    try:
+        to_fit = list(range(len(candidates)))
+        lin = None
+        if screen is not None:
+            if ftr.is_wideband:
+                raise NotImplementedError(
+                    "Linearized screening is not implemented for wideband fitters"
+                )
+            base_lin_chi2 = linearized_chi2(ftr.toas, ftr.model, ftr.track_mode)
+            lin = _run(
+                executor, own_executor, ftr, candidates, True, maxiter, fitargs, False
+            )
+            lin_delta_chi2 = np.array([r["lin_chi2"] - base_lin_chi2 for r in lin])
+            lin_delta_aic = lin_delta_chi2 + 2 * np.array(
+                [r["k"] - base_k for r in lin]
+            )
+            to_fit = [i for i in to_fit if lin_delta_aic[i] < screen]
+            log.info(
+                f"Refitting {len(to_fit)} of {len(candidates)} candidates after linearized screening"
+            )
+        fits = _run(
+            executor,
+            own_executor,
+            ftr,
+            [candidates[i] for i in to_fit],
+            False,
+            maxiter,
+            fitargs,
+            printprogress,
+        )
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+    nan = np.full(len(candidates), np.nan)
+    chi2, aic, bic = nan.copy(), nan.copy(), nan.copy()
+    dof = np.full(len(candidates), -1)
+    converged = np.zeros(len(candidates), dtype=bool)
+    error = [""] * len(candidates)
+    dk = np.array([len(c.param_names) * (-1 if c.remove else 1) for c in candidates])
+    for i, r in zip(to_fit, fits):
+        chi2[i], dof[i], aic[i], bic[i] = r["chi2"], r["dof"], r["aic"], r["bic"]
+        converged[i], error[i] = r["converged"], r["error"]
+        dk[i] = r["k"] - base_k
+    ftest = nan.copy()
+    for i in to_fit:
+        if candidates[i].remove:
+            ftest[i] = FTest(chi2[i], dof[i], base_chi2, base_dof)
+        else:
+            ftest[i] = FTest(base_chi2, base_dof, chi2[i], dof[i])
+
+    table = Table(
+        {
+            "name": [c.name for c in candidates],
+            "remove": [c.remove for c in candidates],
+            "dk": dk,
+            "chi2": chi2,
+            "dof": dof,
+            "delta_chi2": chi2 - base_chi2,
+            "ftest": ftest,
+            "aic": aic,
+            "bic": bic,
+            "delta_aic": aic - base_aic,
+            "delta_bic": bic - base_bic,
+            "converged": converged,
+            "error": error,
+        },
+        meta={"chi2": base_chi2, "dof": base_dof, "aic": base_aic, "bic": base_bic},
+    )
+    if lin is not None:
+        table["lin_delta_chi2"] = lin_delta_chi2
+        table["lin_delta_aic"] = lin_delta_aic
+        table["screened"] = [i not in to_fit for i in range(len(candidates))]
+    if sort_by is not None:
+        key = np.asarray(table[sort_by])
+        if key.dtype.kind == "f":
+            # NaNs (screened out or unavailable) go last
+            key = np.where(np.isnan(key), np.inf, key)
+        table = table[np.argsort(key, kind="stable")]
+    return table
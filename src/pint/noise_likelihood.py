@@ -0,0 +1,405 @@
+"""Fast evaluation of the timing log-likelihood as a function of noise parameters.
+
+The log-likelihood of the timing residuals :math:`r` is
+
+.. math::
+
+    \\ln L = -\\frac{1}{2}\\left(r^T C^{-1} r + \\ln\\det C\\right),
+
+where :math:`C = N + U \\Phi U^T`, :math:`N` is the diagonal white noise
+covariance matrix set by EFACs and EQUADs, and :math:`U` and :math:`\\Phi`
+are the basis and weights of the correlated noise components (ECORR, red noise,
+DM noise). This is the same quantity as :meth:`pint.residuals.Residuals.lnlikelihood`.
+
+:class:`pint.noise_likelihood.NoiseLikelihood` computes this log-likelihood and
+its gradient with respect to all free noise parameters from a single Cholesky
+factorization of :math:`\\Sigma = \\Phi^{-1} + U^T N^{-1} U`. The TOAs are split
+into blocks that share the same set of EFACs and EQUADs. Within a block the
+white noise variance is :math:`\\mathrm{EFAC}^2 (\\sigma^2 + \\mathrm{EQUAD}^2)`,
+so the block's contribution to :math:`U^T N^{-1} U` (and the other reductions
+over TOAs) only needs to be recomputed when the block's EQUAD changes; a change
+of EFAC is a simple rescaling. After the first evaluation, the cost of each
+likelihood and gradient evaluation is therefore independent of the number of TOAs
+as long as the EQUADs are held fixed.
+
+Example usage::
+
+    >>> nl = NoiseLikelihood(toas, model)
+    >>> lnl, grad = nl.lnlikelihood_and_gradient(nl.get_values())
+
+The residuals are held fixed; they are computed once when the object is created.
+"""
+
+import astropy.units as u
+import numpy as np
+import scipy.linalg
+from loguru import logger as log
+
+from pint.models.noise_model import (
+    EcorrNoise,
+    PLDMNoise,
+    PLRedNoise,
+    get_ecorr_nweights,
+    get_rednoise_freqs,
+)
+from pint.models.parameter import maskParameter
+from pint.residuals import Residuals
+
+__all__ = ["NoiseLikelihood"]
+
+# Reference frequency used by :func:`pint.models.noise_model.powerlaw`
+_fyr = 1 / 3.16e7
+
+
+class NoiseLikelihood:
+    """Log-likelihood and its gradient with respect to noise parameters.
+
+    Supported free parameters are EFAC, EQUAD, ECORR and the power-law
+    red noise and DM noise amplitudes and spectral indices (TNREDAMP,
+    TNREDGAM, RNAMP, RNIDX, TNDMAMP, TNDMGAM). A ``NotImplementedError``
+    is raised for any other free noise parameter.
+
+    Parameters
+    ----------
+    toas: pint.toa.TOAs
+        The TOAs.
+    model: pint.models.timing_model.TimingModel
+        The timing model. Its noise parameter values are modified by
+        :meth:`NoiseLikelihood.set_values`; pass a copy if this is not
+        desired.
+    params: list of str, optional
+        The noise parameters with respect to which the likelihood is
+        evaluated. Defaults to the free noise parameters of the model.
+    resids: pint.residuals.Residuals, optional
+        Residuals to use. If not given, they are computed from ``toas``
+        and ``model``.
+    """
+
+    def __init__(self, toas, model, params=None, resids=None):
+        self.toas = toas
+        self.model = model
+        if params is None:
+            params = [
+                p
+                for p in model.get_params_of_component_type("NoiseComponent")
+                if not getattr(model, p).frozen
+            ]
+        self.params = list(params)
+        for p in self.params:
+            self._check_supported(p)
+
+        if resids is None:
+            resids = Residuals(toas, model)
+        self.r = np.asarray(resids.time_resids.to_value(u.s), dtype=float)
+        self.sigma = toas.get_errors().to_value(u.s)
+
+        self._setup_white_noise_blocks()
+        self._setup_correlated_noise()
+
+        self._block_cache = [None] * len(self._blocks)
+
+    def _check_supported(self, param):
+        par = getattr(self.model, param)
+        if isinstance(par, maskParameter) and par.prefix in ["EFAC", "EQUAD", "ECORR"]:
+            return
+        if param in [
+            "TNREDAMP",
+            "TNREDGAM",
+            "RNAMP",
+            "RNIDX",
+            "TNDMAMP",
+            "TNDMGAM",
+        ]:
+            return
+        raise NotImplementedError(
+            f"Analytic likelihood gradient is not available for parameter {param}."
+        )
+
+    def _setup_white_noise_blocks(self):
+        """Partition the TOAs into blocks sharing the same EFACs and EQUADs."""
+        ntoa = len(self.sigma)
+        if "ScaleToaError" in self.model.components:
+            comp = self.model.components["ScaleToaError"]
+            self._efacs = list(comp.EFACs)
+            self._equads = list(comp.EQUADs)
+        else:
+            self._efacs, self._equads = [], []
+
+        membership = np.zeros((ntoa, len(self._efacs) + len(self._equads)), dtype=bool)
+        for ii, pn in enumerate(self._efacs + self._equads):
+            membership[getattr(self.model, pn).select_toa_mask(self.toas), ii] = True
+        patterns, inverse = np.unique(membership, axis=0, return_inverse=True)
+        inverse = np.asarray(inverse).reshape(-1)
+
+        nef = len(self._efacs)
+        self._blocks = [np.flatnonzero(inverse == b) for b in range(len(patterns))]
+        self._block_efacs = [
+            [self._efacs[i] for i in np.flatnonzero(pat[:nef])] for pat in patterns
+        ]
+        self._block_equads = [
+            [self._equads[i] for i in np.flatnonzero(pat[nef:])] for pat in patterns
+        ]
+
+        # The second-order pieces are only needed for blocks touched by a free EQUAD.
+        free_equads = {p for p in self.params if p in self._equads}
+        self._block_needs_equad_grad = [
+            bool(free_equads.intersection(beq)) for beq in self._block_equads
+        ]
+
+    def _setup_correlated_noise(self):
+        """Compute the correlated noise basis and the information needed to
+        evaluate its weights and their derivatives."""
+        m = self.model
+        self.U = (
+            m.noise_model_designmatrix(self.toas) if m.has_correlated_errors else None
+        )
+        self._phi_slices = {}
+        self._phi_components = {}
+        self._ecorr_nweights = None
+        self._offset_column = False
+        if self.U is None:
+            return
+
+        t = (self.toas.table["tdbld"].quantity * u.day).to_value(u.s)
+        self._ln_fyr_f = {}
+        offset = 0
+        for nc in m.NoiseComponent_list:
+            if len(nc.basis_funcs) == 0:
+                continue
+            if isinstance(nc, EcorrNoise):
+                self._ecorr_nweights = [
+                    get_ecorr_nweights(t[ec.select_toa_mask(self.toas)])
+                    for ec in nc.get_ecorrs()
+                ]
+                nbf = sum(self._ecorr_nweights)
+                ecoff = offset
+                for ec, nn in zip(nc.get_ecorrs(), self._ecorr_nweights):
+                    self._phi_slices[ec.name] = slice(ecoff, ecoff + nn)
+                    ecoff += nn
+            else:
+                nbf = len(nc.get_noise_weights(self.toas))
+                if isinstance(nc, (PLRedNoise, PLDMNoise)):
+                    nf = nc.get_pl_vals()[2]
+                    self._ln_fyr_f[nc.category] = np.log(
+                        _fyr / get_rednoise_freqs(t, nf)
+                    )
+                    for p in nc.params:
+                        self._phi_slices[p] = slice(offset, offset + nbf)
+                        self._phi_components[p] = nc
+            offset += nbf
+
+        # Marginalize over the overall phase offset, as in
+        # :meth:`pint.residuals.Residuals._calc_gls_chi2`.
+        self._offset_column = "PHOFF" not in m.free_params
+        if self._offset_column:
+            self.U = np.append(self.U, np.ones((len(self.toas), 1)), axis=1)
+        elif self.U.shape[1] == 0:
+            self.U = None
+
+    def get_values(self):
+        """Current values of the noise parameters."""
+        return np.array([getattr(self.model, p).value for p in self.params])
+
+    def set_values(self, values):
+        """Set the values of the noise parameters in the model."""
+        for p, v in zip(self.params, values):
+            getattr(self.model, p).value = v
+
+    def _phi(self):
+        """Weights of the correlated noise basis."""
+        phis = []
+        for nc in self.model.NoiseComponent_list:
+            if len(nc.basis_funcs) == 0:
+                continue
+            if isinstance(nc, EcorrNoise):
+                phis.append(
+                    nc.get_noise_weights(self.toas, nweights=self._ecorr_nweights)
+                )
+            else:
+                phis.append(nc.get_noise_weights(self.toas))
+        if self._offset_column:
+            phis.append([1e40])
+        return np.hstack(phis)
+
+    def _d_phi_d_param(self, param, phi):
+        """Derivative of the correlated noise weights with respect to a parameter."""
+        result = np.zeros_like(phi)
+        sl = self._phi_slices.get(param)
+        if sl is None:
+            return result
+        par = getattr(self.model, param)
+        if isinstance(par, maskParameter):
+            # ECORR: phi = ECORR**2, in s**2.
+            conv = (1 * par.units).to_value(u.s)
+            result[sl] = 2 * par.value * conv**2
+            return result
+
+        comp = self._phi_components[param]
+        ln_fyr_f = self._ln_fyr_f[comp.category]
+        if isinstance(comp, PLRedNoise):
+            tn = comp.TNREDAMP.value is not None and comp.TNREDGAM.value is not None
+            if param == "TNREDAMP" and tn:
+                result[sl] = 2 * np.log(10) * phi[sl]
+            elif param == "TNREDGAM" and tn:
+                result[sl] = phi[sl] * ln_fyr_f
+            elif param == "RNAMP" and not tn:
+                result[sl] = 2 * phi[sl] / par.value
+            elif param == "RNIDX" and not tn:
+                result[sl] = -phi[sl] * ln_fyr_f
+        elif param == "TNDMAMP":
+            result[sl] = 2 * np.log(10) * phi[sl]
+        elif param == "TNDMGAM":
+            result[sl] = phi[sl] * ln_fyr_f
+        return result
+
+    def _block_factors(self, b):
+        """EFAC**2 and EQUAD**2 (in s**2) of a block."""
+        efac_sq = np.prod(
+            [getattr(self.model, p).value ** 2 for p in self._block_efacs[b]]
+        )
+        equad_sq = sum(
+            getattr(self.model, p).quantity.to_value(u.s) ** 2
+            for p in self._block_equads[b]
+            if getattr(self.model, p).quantity is not None
+        )
+        return efac_sq, equad_sq
+
+    def _block_pieces(self, b, equad_sq):
+        """Reductions over the TOAs of a block that depend only on its EQUAD.
+
+        These are cached and only recomputed when the EQUAD changes.
+        """
+        cached = self._block_cache[b]
+        if cached is not None and cached[0] == equad_sq:
+            return cached[1]
+
+        idx = self._blocks[b]
+        r = self.r[idx]
+        D = 1 / (self.sigma[idx] ** 2 + equad_sq)
+        pieces = {
+            "n": len(idx),
+            "logdet": np.sum(-np.log(D)),
+            "rr": np.dot(r, D * r),
+            "tD": np.sum(D),
+        }
+        if self.U is not None:
+            Ub = self.U[idx]
+            pieces["G"] = Ub.T @ (D[:, None] * Ub)
+            pieces["y"] = Ub.T @ (D * r)
+        if self._block_needs_equad_grad[b]:
+            D2 = D**2
+            pieces["rr2"] = np.dot(r, D2 * r)
+            if self.U is not None:
+                pieces["H"] = Ub.T @ (D2[:, None] * Ub)
+                pieces["y2"] = Ub.T @ (D2 * r)
+        self._block_cache[b] = (equad_sq, pieces)
+        return pieces
+
+    def lnlikelihood_and_gradient(self, values=None, gradient=True):
+        """Compute the log-likelihood and its gradient.
+
+        Parameters
+        ----------
+        values: array-like, optional
+            Values of the noise parameters (in the units of the parameters).
+            If not given, the current values in the model are used.
+        gradient: bool
+            Whether to compute the gradient.
+
+        Returns
+        -------
+        lnlikelihood: float
+        gradient: numpy.ndarray
+            Derivatives of the log-likelihood with respect to ``self.params``,
+            in inverse units of the parameters. Only returned if ``gradient``
+            is True.
+        """
+        if values is not None:
+            self.set_values(values)
+
+        nblocks = len(self._blocks)
+        factors = [self._block_factors(b) for b in range(nblocks)]
+        pieces = [self._block_pieces(b, factors[b][1]) for b in range(nblocks)]
+        scales = [1 / f[0] for f in factors]
+
+        rNr = sum(s * p["rr"] for s, p in zip(scales, pieces))
+        logdet_N = sum(
+            p["n"] * np.log(f[0]) + p["logdet"] for f, p in zip(factors, pieces)
+        )
+
+        if self.U is not None:
+            phi = self._phi()
+            A = sum(s * p["G"] for s, p in zip(scales, pieces))
+            y = sum(s * p["y"] for s, p in zip(scales, pieces))
+            Sigma = A + np.diag(1 / phi)
+            Sigma_cf = scipy.linalg.cho_factor(Sigma)
+            x = scipy.linalg.cho_solve(Sigma_cf, y)
+            chi2 = rNr - np.dot(y, x)
+            logdet_C = (
+                logdet_N
+                + np.sum(np.log(phi))
+                + 2 * np.sum(np.log(np.diag(Sigma_cf[0])))
+            )
+        else:
+            chi2 = rNr
+            logdet_C = logdet_N
+
+        lnl = -0.5 * (chi2 + logdet_C)
+        if not gradient:
+            return lnl
+
+        if self.U is not None:
+            Sigma_inv = scipy.linalg.cho_solve(Sigma_cf, np.eye(len(phi)))
+
+        grad = np.zeros(len(self.params))
+        for ii, param in enumerate(self.params):
+            par = getattr(self.model, param)
+            if param in self._efacs:
+                # dN/dEFAC = 2 N / EFAC
+                for b in range(nblocks):
+                    if param not in self._block_efacs[b]:
+                        continue
+                    p, s = pieces[b], scales[b]
+                    q = p["rr"]
+                    t = p["n"]
+                    if self.U is not None:
+                        q = q - 2 * np.dot(x, p["y"]) + x @ p["G"] @ x
+                        t = t - s * np.sum(Sigma_inv * p["G"])
+                    grad[ii] += (s * q - t) / par.value
+            elif param in self._equads:
+                # dN/dEQUAD = 2 EFAC**2 EQUAD
+                conv = (1 * par.units).to_value(u.s)
+                for b in range(nblocks):
+                    if param not in self._block_equads[b]:
+                        continue
+                    p, s = pieces[b], scales[b]
+                    q = p["rr2"]
+                    t = p["tD"]
+                    if self.U is not None:
+                        q = q - 2 * np.dot(x, p["y2"]) + x @ p["H"] @ x
+                        t = t - s * np.sum(Sigma_inv * p["H"])
+                    grad[ii] += par.value * conv**2 * (s * q - t)
+            elif self.U is not None:
+                dphi = self._d_phi_d_param(param, phi)
+                grad[ii] = 0.5 * np.sum(
+                    dphi * ((x / phi) ** 2 - 1 / phi + np.diag(Sigma_inv) / phi**2)
+                )
+        return lnl, grad
+
+    def lnlikelihood(self, values=None):
+        """Compute the log-likelihood."""
+        return self.lnlikelihood_and_gradient(values, gradient=False)
+
+    def gradient(self, values=None):
+        """Compute the gradient of the log-likelihood with respect to ``self.params``."""
+        return self.lnlikelihood_and_gradient(values)[1]
+
+    def mloglike_and_grad(self, values):
+        """Negative of the log-likelihood and its gradient, for use with
+        :func:`scipy.optimize.minimize` and ``jac=True``."""
+        try:
+            lnl, grad = self.lnlikelihood_and_gradient(values)
+        except (np.linalg.LinAlgError, ValueError) as e:
+            log.debug(f"Noise likelihood evaluation failed at {values}: {e}")
+            return np.inf, np.zeros(len(self.params))
+        return -lnl, -grad
@@ -1,19 +1,28 @@
 """Observatories at special (non-Earth) locations."""
 
+import os
+import tempfile
+import warnings
+from pathlib import Path
+
 import astropy.constants as const
 import astropy.io.fits as pyfits
 import astropy.units as u
 import numpy as np
+from astropy.config import get_cache_dir
 from astropy.coordinates import EarthLocation
 from astropy.table import Table, vstack
 from loguru import logger as log
-from scipy.interpolate import InterpolatedUnivariateSpline
+from scipy.interpolate import CubicSpline
 
+from pint import JD_MJD
 from pint.fits_utils import read_fits_event_mjds
 from pint.observatory import bipm_default
 from pint.observatory.special_locations import SpecialLocation
 from pint.solar_system_ephemerides import objPosVel_wrt_SSB
-from pint.utils import PosVel
+from pint.utils import PosVel, compute_hash
+
+_orbit_columns = ("MJD_TT", "X", "Y", "Z", "Vx", "Vy", "Vz")
 
 
 def load_Fermi_FT2(ft2_filename):
@@ -240,7 +249,51 @@ def load_nustar_orbit(orb_filename):
     )
 
 
-def load_orbit(obs_name, orb_filename):
+def _orbit_cache_file(obs_name, orb_filename, cache):
+    """Name of the binary cache file for an orbit file
+
+    The file is identified by the hash of its contents, so renamed copies
+    share a cache entry and modified files get a new one.
+    """
+    if cache is True:
+        cache = Path(get_cache_dir()) / "pint" / "orbits"
+    cache = Path(cache)
+    cache.mkdir(parents=True, exist_ok=True)
+    key = compute_hash(orb_filename).hex()
+    return cache / f"{obs_name.lower()}-{key}.npz"
+
+
+def _save_orbit_table(filename, orb_table):
+    units = [str(orb_table[c].unit or "") for c in _orbit_columns]
+    # write to a unique temporary file in the same directory and move it into
+    # place, so concurrent writers never see (or leave) a partial cache file
+    with tempfile.NamedTemporaryFile(
+        dir=filename.parent, prefix=f"{filename.stem}-", suffix=".npz", delete=False
+    ) as f:
+        try:
+            np.savez(
+                f,
+                units=np.array(units),
+                name=np.array(orb_table.meta.get("name", "")),
+                **{c: np.asarray(orb_table[c]) for c in _orbit_columns},
+            )
+        except BaseException:
+            f.close()
+            os.remove(f.name)
+            raise
+    os.replace(f.name, filename)
+
+
+def _load_orbit_table(filename):
+    with np.load(filename, allow_pickle=False) as f:
+        return Table(
+            [f[c] * u.Unit(unit) for c, unit in zip(_orbit_columns, f["units"])],
+            names=_orbit_columns,
+            meta={"name": str(f["name"])},
+        )
+
+
+def load_orbit(obs_name, orb_filename, cache=None):
     """Generalized function to load one or more orbit files.
 
     Parameters
@@ -250,6 +303,11 @@ def load_orbit(obs_name, orb_filename):
     orb_filename : str
         An FT2-like file tabulating orbit position.  If the first character
         is @, interpreted as a metafile listing multiple orbit files.
+    cache : bool or str or pathlib.Path, optional
+        If given, keep a binary copy of the parsed orbit table, keyed by the
+        hash of the orbit file, in this directory (``True`` for a ``pint/orbits``
+        subdirectory of the astropy cache directory) and use it instead of
+        reading the orbit file again.
 
     Returns
     -------
@@ -260,12 +318,21 @@ def load_orbit(obs_name, orb_filename):
     if str(orb_filename).startswith("@"):
         # Read multiple orbit files names
         fnames = [ll.strip() for ll in open(orb_filename[1:]).readlines()]
-        orb_list = [load_orbit(obs_name, fn) for fn in fnames]
+        orb_list = [load_orbit(obs_name, fn, cache=cache) for fn in fnames]
         full_orb = vstack(orb_list)
         # Make sure full table is sorted
         full_orb.sort("MJD_TT")
         return full_orb
 
+    if cache is not None and cache is not False:
+        cache_file = _orbit_cache_file(obs_name, orb_filename, cache)
+        if cache_file.exists():
+            log.info(f"Using cached orbit table {cache_file} for {orb_filename}")
+            return _load_orbit_table(cache_file)
+        orb_table = load_orbit(obs_name, orb_filename)
+        _save_orbit_table(cache_file, orb_table)
+        return orb_table
+
     lower_name = obs_name.lower()
     if "fermi" in lower_name:
         return load_Fermi_FT2(orb_filename)
@@ -281,6 +348,80 @@ def load_orbit(obs_name, orb_filename):
         raise ValueError(f"Unrecognized satellite observatory {obs_name}.")
 
 
+class OrbitSpline:
+    """Cubic spline interpolation of tabulated S/C positions and velocities
+
+    All six components share one set of breakpoints and one coefficient
+    array, so an evaluation does a single interval search and a single
+    (vectorized) Horner evaluation for all of them.  Times are handled as
+    seconds since an integer reference MJD, computed from the two-part
+    representation of :class:`astropy.time.Time`, so no precision is lost
+    for times far from MJD 0.
+
+    The spline is the same not-a-knot cubic interpolant as
+    :class:`scipy.interpolate.InterpolatedUnivariateSpline` and is
+    extrapolated with the end polynomials.
+
+    Parameters
+    ----------
+    mjd_tt : numpy.ndarray
+        Strictly increasing times of the table (TT MJD)
+    values : numpy.ndarray
+        Tabulated values, shape ``(len(mjd_tt), ncomponents)``
+    """
+
+    def __init__(self, mjd_tt, values):
+        mjd_tt = np.asarray(mjd_tt, dtype=np.longdouble)
+        self.mjd0 = np.floor(mjd_tt[0])
+        self.breaks = ((mjd_tt - self.mjd0) * 86400).astype(float)
+        spline = CubicSpline(self.breaks, np.asarray(values, dtype=float), axis=0)
+        # shape (4, len(breaks) - 1, ncomponents), highest power first
+        self.coeffs = spline.c
+
+    def seconds(self, t):
+        """Seconds since the reference MJD of an astropy.Time (TT)"""
+        tt = t.tt
+        return ((tt.jd1 - (JD_MJD + float(self.mjd0))) + tt.jd2) * 86400
+
+    def intervals(self, x):
+        """Spline interval for each time ``x`` (in seconds)
+
+        Sorted times (as in event files) are located with one search of the
+        breakpoints in the times rather than one search per time.
+        """
+        x = np.atleast_1d(x)
+        m = len(self.breaks) - 1
+        if len(x) > 1 and np.all(x[1:] >= x[:-1]):
+            edges = np.searchsorted(x, self.breaks[1:-1], side="left")
+            return np.repeat(np.arange(m), np.diff(edges, prepend=0, append=len(x)))
+        return np.clip(np.searchsorted(self.breaks, x, side="right") - 1, 0, m - 1)
+
+    def node_distance(self, x, idx=None):
+        """Distance (in seconds) from each time to the closest table entry"""
+        x = np.atleast_1d(x)
+        if idx is None:
+            idx = self.intervals(x)
+        return np.minimum(
+            np.abs(x - self.breaks[idx]), np.abs(self.breaks[idx + 1] - x)
+        )
+
+    def evaluate(self, x, idx=None):
+        """Interpolated values at times ``x`` (in seconds), shape ``x.shape + (ncomponents,)``"""
+        shape = np.shape(x)
+        x = np.atleast_1d(x)
+        if idx is None:
+            idx = self.intervals(x)
+        dx = (x - self.breaks[idx])[:, None]
+        out = self.coeffs[0, idx]
+        for c in self.coeffs[1:]:
+            out = out * dx + c[idx]
+        return out.reshape(shape + (self.coeffs.shape[-1],))
+
+    def __call__(self, t):
+        """Interpolated values at astropy.Time ``t``"""
+        return self.evaluate(self.seconds(t))
+
+
 class SatelliteObs(SpecialLocation):
     """Generalized class for high-energy photon data and tabulated position/velocity.
 
@@ -299,6 +440,8 @@ class SatelliteObs(SpecialLocation):
         Whether to apply UTC(GPS)->UTC correction (e.g. if satellite clock is from a GPS receiver)
     overwrite: bool
         Replace the entry in the observatory table.
+    cache: bool or str or pathlib.Path, optional
+        Cache the parsed orbit file in binary form (see :func:`load_orbit`).
     """
 
     def __init__(
@@ -308,26 +451,83 @@ class SatelliteObs(SpecialLocation):
         maxextrap=2,
         apply_gps2utc=True,
         overwrite=False,
+        cache=None,
     ):
         super().__init__(
             name,
             apply_gps2utc=apply_gps2utc,
             overwrite=overwrite,
         )
-        self.FT2 = load_orbit(name, ft2name)
+        self.FT2 = load_orbit(name, ft2name, cache=cache)
+
+        tt = np.asarray(self.FT2["MJD_TT"])
+        good = np.diff(tt) > 0
+        if not np.all(good):
+            log.warning("Ignoring repeated times in the S/C orbit table.")
+            self.FT2 = self.FT2[np.concatenate(([True], good))]
+            tt = np.asarray(self.FT2["MJD_TT"])
 
         # Now build the interpolator.  This extrapolation will fail quickly,
         # which is where maxextrap comes in.
-        tt = self.FT2["MJD_TT"]
-        self.X = InterpolatedUnivariateSpline(tt, self.FT2["X"], ext="extrapolate")
-        self.Y = InterpolatedUnivariateSpline(tt, self.FT2["Y"], ext="extrapolate")
-        self.Z = InterpolatedUnivariateSpline(tt, self.FT2["Z"], ext="extrapolate")
-        self.Vx = InterpolatedUnivariateSpline(tt, self.FT2["Vx"], ext="extrapolate")
-        self.Vy = InterpolatedUnivariateSpline(tt, self.FT2["Vy"], ext="extrapolate")
-        self.Vz = InterpolatedUnivariateSpline(tt, self.FT2["Vz"], ext="extrapolate")
+        self._pos_unit = self.FT2["X"].unit
+        self._vel_unit = self.FT2["Vx"].unit
+        self._orbit = OrbitSpline(
+            tt,
+            np.column_stack(
+                [
+                    np.asarray(self.FT2[c].quantity.to_value(unit))
+                    for c, unit in zip(
+                        _orbit_columns[1:], [self._pos_unit] * 3 + [self._vel_unit] * 3
+                    )
+                ]
+            ),
+        )
         self._geocenter = EarthLocation.from_geocentric(0.0 * u.m, 0.0 * u.m, 0.0 * u.m)
         self._maxextrap = maxextrap
 
+    def _component_spline(self, name):
+        warnings.warn(
+            f"SatelliteObs.{name} is deprecated; use posvel_gcrs() instead.",
+            DeprecationWarning,
+        )
+        i = _orbit_columns.index(name) - 1
+
+        def spline(mjd_tt):
+            x = (np.asarray(mjd_tt, dtype=np.longdouble) - self._orbit.mjd0) * 86400
+            return self._orbit.evaluate(x.astype(float))[..., i]
+
+        return spline
+
+    @property
+    def X(self):
+        """Deprecated interpolator of the X position (TT MJD to FT2 units)"""
+        return self._component_spline("X")
+
+    @property
+    def Y(self):
+        """Deprecated interpolator of the Y position (TT MJD to FT2 units)"""
+        return self._component_spline("Y")
+
+    @property
+    def Z(self):
+        """Deprecated interpolator of the Z position (TT MJD to FT2 units)"""
+        return self._component_spline("Z")
+
+    @property
+    def Vx(self):
+        """Deprecated interpolator of the X velocity (TT MJD to FT2 units)"""
+        return self._component_spline("Vx")
+
+    @property
+    def Vy(self):
+        """Deprecated interpolator of the Y velocity (TT MJD to FT2 units)"""
+        return self._component_spline("Vy")
+
+    @property
+    def Vz(self):
+        """Deprecated interpolator of the Z velocity (TT MJD to FT2 units)"""
+        return self._component_spline("Vz")
+
     @property
     def timescale(self):
         return "tt"
@@ -351,19 +551,22 @@ class SatelliteObs(SpecialLocation):
         ----------
         t: an astropy.Time or array of astropy.Times
             Times to ensure are valid relative to S/C information.
+
+        Returns
+        -------
+        x : numpy.ndarray
+            Times in seconds since the reference of the orbit spline
+        idx : numpy.ndarray
+            Spline interval of each time
         """
-        ft2_tt = self.FT2["MJD_TT"]
-        in_tt = np.atleast_1d(t.tt.mjd)
-        i0 = np.searchsorted(ft2_tt, in_tt)
-        i0 = np.clip(i0, 1, len(ft2_tt) - 1, out=i0)
-        dright = np.abs(ft2_tt[i0] - in_tt)
-        dleft = np.abs(ft2_tt[i0 - 1] - in_tt)
-        min_duration = np.minimum(dright, dleft)
-        if np.any(min_duration > (self._maxextrap / (60 * 24))):
+        x = self._orbit.seconds(t)
+        idx = self._orbit.intervals(x)
+        if np.any(self._orbit.node_distance(x, idx) > self._maxextrap * 60):
             log.error(
                 "Extrapolating S/C position by more than %d minutes!" % self._maxextrap
             )
             raise ValueError("Bad extrapolation of S/C file.")
+        return x, idx
 
     def _get_TDB_default(self, t, ephem):
         # Add in correction term to t.tdb equal to r.v / c^2
@@ -386,11 +589,8 @@ class SatelliteObs(SpecialLocation):
         ----------
         t: an astropy.Time or array of astropy.Times
         """
-        self._check_bounds(t)
-        return (
-            np.array([self.X(t.tt.mjd), self.Y(t.tt.mjd), self.Z(t.tt.mjd)])
-            * self.FT2["X"].unit
-        )
+        pv = self._orbit.evaluate(*self._check_bounds(t))
+        return np.moveaxis(pv[..., :3], -1, 0) * self._pos_unit
 
     def posvel(self, t, ephem, group=None):
         """Return position and velocity vectors of satellite, wrt SSB.
@@ -411,17 +611,10 @@ class SatelliteObs(SpecialLocation):
 
         t is an astropy.Time or array of astropy.Times
         """
-        self._check_bounds(t)
         # Compute vector from Earth to satellite
-        sat_pos_geo = (
-            np.array([self.X(t.tt.mjd), self.Y(t.tt.mjd), self.Z(t.tt.mjd)])
-            * self.FT2["X"].unit
-        )
-        # log.debug("[{0}] sat_pos_geo {1}".format(self.name, sat_pos_geo[:, 0]))
-        sat_vel_geo = (
-            np.array([self.Vx(t.tt.mjd), self.Vy(t.tt.mjd), self.Vz(t.tt.mjd)])
-            * self.FT2["Vx"].unit
-        )
+        pv = np.moveaxis(self._orbit.evaluate(*self._check_bounds(t)), -1, 0)
+        sat_pos_geo = pv[:3] * self._pos_unit
+        sat_vel_geo = pv[3:] * self._vel_unit
         return PosVel(sat_pos_geo, sat_vel_geo, origin="earth", obj=self.name)
 
 
@@ -2,6 +2,7 @@
 """
 
 import numpy as np
+import scipy.linalg
 from itertools import combinations
 import astropy.units as u
 from collections import OrderedDict
@@ -15,6 +16,9 @@ __all__ = [
     "DesignMatrix",
     "CovarianceMatrix",
     "CorrelationMatrix",
+    "CovarianceBlock",
+    "StructuredCovarianceMatrix",
+    "StructuredCovarianceMatrixMaker",
     "combine_design_matrices_by_quantity",
     "combine_design_matrices_by_param",
 ]
@@ -867,6 +871,205 @@ class CovarianceMatrixMaker:
         return CovarianceMatrix(M, label)
 
 
+class CovarianceBlock:
+    """One data type's block of a structured covariance matrix.
+
+    The block is represented as ``diag(ndiag) + basis @ diag(weights) @ basis.T``
+    and is never formed as a dense matrix, unless it is given as one (``matrix``)
+    because no such representation is available.
+
+    Parameters
+    ----------
+    quantity : str
+        The data quantity name, e.g. 'toa' or 'dm'.
+    unit : `astropy.units.Unit`
+        The unit of the data quantity.
+    ndiag : numpy.ndarray, optional
+        The diagonal (white noise) part of the block, in unit**2.
+    basis : numpy.ndarray, optional
+        Low-rank basis, shape (size, k).
+    weights : numpy.ndarray, optional
+        Variances of the basis amplitudes, length k, in unit**2.
+    matrix : numpy.ndarray, optional
+        The dense block, used instead of ``ndiag``, ``basis`` and ``weights``.
+    """
+
+    def __init__(
+        self, quantity, unit, ndiag=None, basis=None, weights=None, matrix=None
+    ):
+        if (ndiag is None) == (matrix is None):
+            raise ValueError("Exactly one of 'ndiag' and 'matrix' must be given.")
+        self.quantity = quantity
+        self.unit = unit
+        self.ndiag = ndiag
+        self.matrix = matrix
+        if basis is not None and basis.shape[1] == 0:
+            basis = None
+        self.basis = basis
+        self.weights = weights
+        self.size = len(ndiag) if matrix is None else matrix.shape[0]
+        self._factor = None
+
+    def _get_factor(self):
+        if self._factor is None:
+            if self.matrix is not None:
+                self._factor = scipy.linalg.cho_factor(self.matrix)
+            elif self.basis is not None:
+                # Woodbury: the (k x k) matrix Phi^-1 + U^T N^-1 U
+                sigma = np.diag(1 / self.weights) + self.basis.T @ (
+                    self.basis / self.ndiag[:, None]
+                )
+                self._factor = scipy.linalg.cho_factor(sigma)
+        return self._factor
+
+    def solve(self, b):
+        """Compute C^-1 b for a vector or matrix b with the block's rows."""
+        if self.matrix is not None:
+            return scipy.linalg.cho_solve(self._get_factor(), b)
+        ninv = (1 / self.ndiag).reshape((-1,) + (1,) * (b.ndim - 1))
+        x = ninv * b
+        if self.basis is not None:
+            x -= ninv * (
+                self.basis
+                @ scipy.linalg.cho_solve(self._get_factor(), self.basis.T @ x)
+            )
+        return x
+
+    def logdet(self):
+        """The log-determinant of the block."""
+        cf = self._get_factor()
+        if self.matrix is not None:
+            return 2 * np.sum(np.log(np.diag(cf[0])))
+        result = np.sum(np.log(self.ndiag))
+        if self.basis is not None:
+            result += np.sum(np.log(self.weights)) + 2 * np.sum(np.log(np.diag(cf[0])))
+        return result
+
+    def to_dense(self):
+        """Return the block as a dense array."""
+        if self.matrix is not None:
+            return self.matrix
+        result = np.diag(self.ndiag)
+        if self.basis is not None:
+            result += (self.basis * self.weights) @ self.basis.T
+        return result
+
+
+class StructuredCovarianceMatrix:
+    """Block-diagonal covariance matrix of several data types.
+
+    This is the structured counterpart of the output of
+    :func:`pint.pint_matrix.combine_covariance_matrix` when there are no
+    cross terms: the blocks (see :class:`pint.pint_matrix.CovarianceBlock`)
+    are kept separate, so that solving with it costs about as much as
+    solving with each block on its own.
+
+    Parameters
+    ----------
+    blocks : list of `CovarianceBlock`
+        The diagonal blocks, in data order.
+    """
+
+    def __init__(self, blocks):
+        self.blocks = blocks
+        self.offsets = np.cumsum([0] + [b.size for b in blocks])
+
+    @property
+    def shape(self):
+        return (self.offsets[-1], self.offsets[-1])
+
+    @property
+    def labels(self):
+        label = [
+            (b.quantity, (o, o + b.size, b.unit**2))
+            for b, o in zip(self.blocks, self.offsets)
+        ]
+        return [label] * 2
+
+    def solve(self, b):
+        """Compute C^-1 b blockwise for a vector or matrix b."""
+        return np.concatenate(
+            [
+                blk.solve(b[o0:o1])
+                for blk, o0, o1 in zip(self.blocks, self.offsets, self.offsets[1:])
+            ]
+        )
+
+    def logdet(self):
+        """The log-determinant of the covariance matrix."""
+        return sum(b.logdet() for b in self.blocks)
+
+    def to_covariance_matrix(self):
+        """Return the equivalent dense `CovarianceMatrix`."""
+        return CovarianceMatrix(
+            scipy.linalg.block_diag(*[b.to_dense() for b in self.blocks]),
+            [OrderedDict(self.labels[0])] * 2,
+        )
+
+
+class StructuredCovarianceMatrixMaker(CovarianceMatrixMaker):
+    """Make a :class:`pint.pint_matrix.CovarianceBlock` for one data type.
+
+    The white noise part comes from the model's scaled uncertainties and,
+    for TOAs, the correlated part from the noise basis and weights. If the
+    model has a noise component that cannot be represented this way, the
+    dense covariance matrix is used for the block.
+
+    Parameters
+    ----------
+    covariance_quantity : str
+        The covariance quantity name, e.g. 'toa' or 'dm'.
+    quantity_unit : `astropy.units.unit` object
+        The unit of the quantity.
+    """
+
+    def _is_structured(self, model):
+        if self.covariance_quantity not in ["toa", "dm"]:
+            return False
+        if "NoiseComponent" not in model.component_types:
+            return True
+        for nc in model.NoiseComponent_list:
+            if self.covariance_quantity == "toa":
+                if nc.covariance_matrix_funcs and not (
+                    nc.basis_funcs or nc.scaled_toa_sigma_funcs
+                ):
+                    return False
+            elif nc.dm_covariance_matrix_funcs_component and not getattr(
+                nc, "scaled_dm_sigma_funcs", []
+            ):
+                return False
+        return True
+
+    def __call__(self, data, model):
+        """Make the covariance block.
+
+        Parameters
+        ----------
+        data : `pint.toa.TOAs` object or other data object
+            The data the covariance matrix is for.
+        model : `pint.models.TimingModel` object
+            The model that provides the noise.
+        """
+        if not self._is_structured(model):
+            return CovarianceBlock(
+                self.covariance_quantity,
+                self.quantity_unit,
+                matrix=super().__call__(data, model).matrix,
+            )
+        sigma = getattr(model, f"scaled_{self.covariance_quantity}_uncertainty")(data)
+        basis, weights = None, None
+        if self.covariance_quantity == "toa":
+            basis = model.noise_model_designmatrix(data)
+            weights = model.noise_model_basis_weight(data)
+        return CovarianceBlock(
+            self.covariance_quantity,
+            self.quantity_unit,
+            ndiag=sigma.to_value(self.quantity_unit) ** 2,
+            basis=basis,
+            weights=weights,
+        )
+
+
 def combine_covariance_matrix(covariance_matrices, crossterm={}, crossterm_padding=0.0):
     """A fast method to combine two covariance matrix diagonaly.
 
@@ -6,7 +6,7 @@ import astropy.units as u
 import astropy.time
 from loguru import logger as log
 
-__all__ = ["phaseogram", "phaseogram_binned", "plot_priors"]
+__all__ = ["phaseogram", "phaseogram_binned", "phaseogram_counts", "plot_priors"]
 
 
 def phaseogram(
@@ -133,18 +133,68 @@ def phaseogram_binned(
     else:
         mjds = mjds_in
 
-    years = (mjds.to(u.d).value - 51544.0) / 365.25 + 2000.0
+    mjds = mjds.to_value(u.d)
     phss = phases + rotate
     phss[phss >= 1.0] -= 1.0
+    ntoa = 64
+    counts, _, _ = np.histogram2d(
+        mjds,
+        phss,
+        bins=[ntoa, bins],
+        range=[[mjds.min(), mjds.max()], [0, 1]],
+        weights=weights,
+    )
+    phaseogram_counts(
+        counts,
+        mjds.min(),
+        mjds.max(),
+        weighted=weights is not None,
+        title=title,
+        width=width,
+        maxphs=maxphs,
+        plotfile=plotfile,
+    )
+
+
+def phaseogram_counts(
+    counts,
+    mjdmin,
+    mjdmax,
+    weighted=False,
+    title=None,
+    width=6,
+    maxphs=2.0,
+    plotfile=None,
+):
+    """Make a 2-panel phaseogram from binned counts
+
+    This plots the same figure as :func:`phaseogram_binned`, for photons that
+    have already been binned, so that it can be made for photons that are
+    processed in chunks without keeping all of them.
+
+    Parameters
+    ----------
+    counts : array
+        (Weighted) counts in equal-sized bins of time (first axis) and phase
+        (second axis), with the phase bins covering [0,1)
+    mjdmin, mjdmax : float
+        MJDs of the start of the first and the end of the last time bin
+    weighted : bool
+        Whether the counts are weighted (only used for the axis label)
+    """
+    counts = np.asarray(counts, dtype=float)
+    bins = counts.shape[1]
+    years = (np.array([mjdmin, mjdmax]) - 51544.0) / 365.25 + 2000.0
     plt.figure(figsize=(width, 8))
     ax1 = plt.subplot2grid((3, 1), (0, 0))
     ax2 = plt.subplot2grid((3, 1), (1, 0), rowspan=2)
-    wgts = None if weights is None else np.concatenate((weights, weights))
+    nph = int(maxphs * bins)
+    profile = np.tile(counts.sum(axis=0), int(np.ceil(maxphs)))[:nph]
+    edges = np.arange(nph + 1) / bins
     h, x, p = ax1.hist(
-        np.concatenate((phss, phss + 1.0)),
-        int(maxphs * bins),
-        range=[0, maxphs],
-        weights=wgts,
+        edges[:-1],
+        edges,
+        weights=profile,
         color="k",
         histtype="step",
         fill=False,
@@ -152,60 +202,22 @@ def phaseogram_binned(
     )
     ax1.set_xlim([0.0, maxphs])  # show 1 or more pulses
     ax1.set_ylim([0.0, 1.1 * h.max()])
-    if weights is not None:
+    if weighted:
         ax1.set_ylabel("Weighted Counts")
     else:
         ax1.set_ylabel("Counts")
     if title is not None:
         ax1.set_title(title)
-    SCATTER = False
-    if SCATTER:
-        if weights is None:
-            ax2.scatter(phss, mjds, s=size, color="k", alpha=alpha)
-            ax2.scatter(phss + 1.0, mjds, s=size, color="k", alpha=alpha)
-        else:
-            colarray = np.array([[0.0, 0.0, 0.0, w] for w in weights])
-            ax2.scatter(phss, mjds, s=size, color=colarray)
-            ax2.scatter(phss + 1.0, mjds, s=size, color=colarray)
-    else:
-        profile = np.zeros(bins, dtype=np.float_)
-        ntoa = 64
-        toadur = (mjds.max() - mjds.min()) / ntoa
-        mjdstarts = mjds.min() + toadur * np.arange(ntoa, dtype=np.float_)
-        mjdstops = mjdstarts + toadur
-        # Loop over blocks to process
-        a = []
-        for tstart, tstop in zip(mjdstarts, mjdstops):
-            # Clear profile array
-            profile = profile * 0.0
-
-            idx = (mjds > tstart) & (mjds < tstop)
-
-            if weights is not None:
-                for ph, ww in zip(phases[idx], weights[idx]):
-                    ibin = int(ph * bins)
-                    profile[ibin] += ww
-            else:
-                for ph in phases[idx]:
-                    ibin = int(ph * bins)
-                    profile[ibin] += 1
-
-            a.extend(profile[i] for i in range(bins))
-
-        a = np.array(a)
-        b = a.reshape(ntoa, bins)
-        c = np.hstack([b, b])
-        ax2.imshow(
-            c,
-            interpolation="nearest",
-            origin="lower",
-            cmap=plt.cm.binary,
-            extent=[0, 2.0, mjds.min().value, mjds.max().value],
-            aspect="auto",
-        )
-
+    ax2.imshow(
+        np.hstack([counts, counts]),
+        interpolation="nearest",
+        origin="lower",
+        cmap=plt.cm.binary,
+        extent=[0, 2.0, mjdmin, mjdmax],
+        aspect="auto",
+    )
     ax2.set_xlim([0.0, maxphs])  # show 1 or more pulses
-    ax2.set_ylim([mjds.min().value, mjds.max().value])
+    ax2.set_ylim([mjdmin, mjdmax])
     ax2.set_ylabel("MJD")
     ax2.get_yaxis().get_major_formatter().set_useOffset(False)
     ax2.get_yaxis().get_major_formatter().set_scientific(False)
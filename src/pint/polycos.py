@@ -33,9 +33,15 @@ References
 http://tempo.sourceforge.net/ref_man_sections/tz-polyco.txt
 """
 
+import hashlib
+import json
+import os
+from pathlib import Path
+
 import astropy.table as table
 import astropy.units as u
 import numpy as np
+from astropy.config import get_cache_dir
 from astropy.io import registry
 from astropy.time import Time
 from collections import OrderedDict
@@ -76,6 +82,7 @@ __all__ = [
     "tempo_polyco_table_reader",
     "tempo_polyco_table_writer",
     "Polycos",
+    "PolycoCache",
 ]
 
 MIN_PER_DAY = (1 * u.day).to_value(u.min)
@@ -477,6 +484,284 @@ _polycoFormats = [
 ]
 
 
+def _polyco_phases(model, mjds, obs, obsFreq, ephem, midmask):
+    """Absolute model phases (and orbital phases at segment midpoints) at the given MJDs
+
+    Module-level so that it can be used with process-based executors.
+    """
+    toas = toa.get_TOAs_array(
+        (np.modf(mjds)[1], np.modf(mjds)[0]),
+        obs=obs,
+        freqs=obsFreq,
+        ephem=ephem,
+    )
+    ph = model.phase(toas, abs_phase=True)
+    binphase = None
+    if model.is_binary:
+        binphase = (
+            np.asarray(model.orbital_phase(toas[midmask], radians=False))
+            if np.any(midmask)
+            else np.zeros(0)
+        )
+    return ph.int.value, ph.frac.value, binphase
+
+
+def _generate_polyco_entries(
+    model,
+    tmids,
+    obs,
+    segLength,
+    ncoeff,
+    obsFreq,
+    numNodes,
+    ephem,
+    progress=True,
+    executor=None,
+    chunksize=None,
+):
+    """Compute the polyco table rows for segments centred on ``tmids``
+
+    See :meth:`Polycos.generate_polycos` for the meaning of the arguments.
+    """
+    # Using tempo1 method to create polycos, but with all the segments at
+    # once: every midpoint and node goes into one set of TOAs, so the
+    # clock corrections, TDB conversion and ephemeris lookups are done in
+    # a single pass rather than twice per segment.
+    nseg = len(tmids)
+    dt = np.linspace(-segLength / 2, segLength / 2, numNodes).astype(np.longdouble)
+    nodes = tmids[:, None] + dt[None, :] / MIN_PER_DAY
+    mjds = np.concatenate((tmids, nodes.ravel()))
+    midmask = np.zeros(len(mjds), dtype=bool)
+    midmask[:nseg] = True
+
+    if chunksize is None:
+        chunksize = len(mjds)
+    bounds = list(range(0, len(mjds), int(chunksize))) + [len(mjds)]
+    chunks = [slice(lo, hi) for lo, hi in zip(bounds[:-1], bounds[1:])]
+    args = (
+        [model] * len(chunks),
+        [mjds[c] for c in chunks],
+        [obs] * len(chunks),
+        [obsFreq] * len(chunks),
+        [ephem] * len(chunks),
+        [midmask[c] for c in chunks],
+    )
+    if executor is not None:
+        results = executor.map(_polyco_phases, *args)
+    else:
+        results = map(_polyco_phases, *args)
+    results = list(tqdm(results, total=len(chunks), disable=not progress))
+
+    phInt = np.concatenate([r[0] for r in results])
+    phFrac = np.concatenate([r[1] for r in results])
+    refInt, refFrac = phInt[:nseg], phFrac[:nseg]
+    rdcPhase = (phInt[nseg:].reshape(nseg, numNodes) - refInt[:, None]) + (
+        phFrac[nseg:].reshape(nseg, numNodes) - refFrac[:, None]
+    )
+    rdcPhase -= dt[None, :] * model.F0.value * 60.0
+    # All segments share the same node offsets, so this is a single
+    # least-squares solve with one right-hand side per segment
+    coeffs = np.polyfit(dt.astype(float), rdcPhase.astype(float).T, ncoeff - 1)[::-1].T
+
+    if model.is_binary:
+        binphases = np.concatenate([r[2] for r in results])
+        b = model.get_components_by_category()["pulsar_system"][0]
+
+    entryList = []
+    isos = Time(tmids, format="mjd", scale="utc").iso
+    for i, tmid in enumerate(tmids):
+        date, hms = isos[i].split()
+        yy, mm, dd = date.split("-")
+        date = f"{dd}-{MONTHS[int(mm) - 1]}-{yy[-2:]}"
+        hms = float(hms.replace(":", ""))
+
+        entry = PolycoEntry(
+            tmid,
+            segLength,
+            refInt[i],
+            refFrac[i],
+            model.F0.value,
+            ncoeff,
+            coeffs[i],
+        )
+
+        entry_dict = OrderedDict()
+        entry_dict["psr"] = model.PSR.value
+        entry_dict["date"] = date
+        entry_dict["utc"] = hms
+        entry_dict["tmid"] = tmid
+        entry_dict["dm"] = model.DM.value
+        entry_dict["doppler"] = 0.0
+        entry_dict["logrms"] = 0.0
+        entry_dict["mjd_span"] = segLength
+        entry_dict["t_start"] = entry.tstart
+        entry_dict["t_stop"] = entry.tstop
+        entry_dict["obs"] = obs
+        entry_dict["obsfreq"] = obsFreq
+
+        if model.is_binary:
+            entry_dict["binary_phase"] = binphases[i]
+            entry_dict["f_orbit"] = 1 / b.PB.value
+
+        entry_dict["entry"] = entry
+        entryList.append(entry_dict)
+
+    return entryList
+
+
+def _entry_to_json(entry_dict):
+    """Serialize one polyco table row, keeping long doubles as exact strings"""
+    out = {}
+    for k, v in entry_dict.items():
+        if k == "entry":
+            out[k] = {
+                "tmid": str(v.tmid.value),
+                "rph_int": str(np.ravel(v.rphase.int.value)[0]),
+                "rph_frac": str(np.ravel(v.rphase.frac.value)[0]),
+                "f0": str(v.f0),
+                "ncoeff": int(v.ncoeff),
+                "coeffs": [str(c) for c in v.coeffs],
+            }
+        elif k in ("t_start", "t_stop"):
+            out[k] = None
+        elif isinstance(v, str):
+            out[k] = v
+        elif k == "mjd_span":
+            out[k] = int(v)
+        else:
+            out[k] = str(v)
+    return out
+
+
+def _entry_from_json(d):
+    """Inverse of :func:`_entry_to_json`"""
+    e = d["entry"]
+    entry = PolycoEntry(
+        np.longdouble(e["tmid"]),
+        d["mjd_span"],
+        np.longdouble(e["rph_int"]),
+        np.longdouble(e["rph_frac"]),
+        np.longdouble(e["f0"]),
+        e["ncoeff"],
+        np.array([np.longdouble(c) for c in e["coeffs"]]),
+    )
+    entry_dict = OrderedDict()
+    for k, v in d.items():
+        if k == "entry":
+            entry_dict[k] = entry
+        elif k == "t_start":
+            entry_dict[k] = entry.tstart
+        elif k == "t_stop":
+            entry_dict[k] = entry.tstop
+        elif k in ("psr", "date", "obs") or k == "mjd_span":
+            entry_dict[k] = v
+        elif k == "tmid":
+            entry_dict[k] = np.longdouble(v)
+        else:
+            entry_dict[k] = float(v)
+    return entry_dict
+
+
+class PolycoCache:
+    """On-disk cache of generated polyco segments
+
+    Polyco segments are stored per combination of timing model, observatory,
+    observing frequency, segment length, number of coefficients and number of
+    fit nodes, indexed by the (integer) minute of their midpoint.  Because
+    :meth:`Polycos.generate_polycos` places segment midpoints on a fixed grid,
+    any request overlapping a previously generated range reuses the segments
+    already computed and only generates (and then stores) the missing ones.
+
+    Each key is stored in its own JSON file; long double values are stored as
+    exact decimal strings so cached polycos are identical to freshly
+    generated ones.  When the total size of the cache exceeds ``max_size``
+    the least recently used files are removed.
+
+    Parameters
+    ----------
+    directory : str or pathlib.Path, optional
+        Where to store the cache.  Default is a ``pint/polycos`` subdirectory
+        of the astropy cache directory.
+    max_size : int, optional
+        Maximum total size of the cache in bytes.
+    """
+
+    def __init__(self, directory=None, max_size=100 * 1024**2):
+        if directory is None:
+            directory = Path(get_cache_dir()) / "pint" / "polycos"
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+
+    @staticmethod
+    def key(model, obs, obsFreq, segLength, ncoeff, numNodes):
+        """Hash identifying polycos generated with these settings
+
+        The model enters through its par file representation, so any change
+        of parameter values (including the TZR TOA) gives a different key.
+        """
+        h = hashlib.sha256()
+        h.update(model.as_parfile(include_info=False).encode())
+        h.update(
+            repr(
+                (str(obs), float(obsFreq), int(segLength), int(ncoeff), int(numNodes))
+            ).encode()
+        )
+        return h.hexdigest()
+
+    def _path(self, key):
+        return self.directory / f"{key}.json"
+
+    def get(self, key):
+        """Return the cached segments for ``key`` as a dict keyed by midpoint minute"""
+        path = self._path(key)
+        if not path.exists():
+            return {}
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            log.warning(f"Ignoring unreadable polyco cache file {path}: {e}")
+            return {}
+        # Mark as recently used for eviction
+        os.utime(path)
+        return {int(m): _entry_from_json(d) for m, d in data.items()}
+
+    def update(self, key, entries):
+        """Add segments (a dict keyed by midpoint minute) to the cache for ``key``"""
+        path = self._path(key)
+        data = {}
+        if path.exists():
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+        data.update({str(int(m)): _entry_to_json(e) for m, e in entries.items()})
+        tmpfile = path.with_suffix(f".tmp{os.getpid()}")
+        with open(tmpfile, "w") as f:
+            json.dump(data, f)
+        os.replace(tmpfile, path)
+        self.evict(keep=path)
+
+    def evict(self, keep=None):
+        """Remove least recently used files until the cache fits in ``max_size``"""
+        files = sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in files)
+        for p in files:
+            if total <= self.max_size:
+                break
+            if keep is not None and p == keep:
+                continue
+            total -= p.stat().st_size
+            p.unlink()
+
+    def clear(self):
+        """Remove all cached polycos"""
+        for p in self.directory.glob("*.json"):
+            p.unlink()
+
+
 class Polycos:
     """A class for polycos model.
 
@@ -688,6 +973,9 @@ class Polycos:
         method="TEMPO",
         numNodes=20,
         progress=True,
+        executor=None,
+        chunksize=None,
+        cache=None,
     ):
         """
         Generate the polyco data.
@@ -717,10 +1005,32 @@ class Polycos:
             coefficents. Default: 20
         progress : bool, optional
             Whether or not to show the progress bar during calculation
+        executor : concurrent.futures.Executor, optional
+            If given, the model phases are evaluated in parallel over chunks
+            of the sample times using this executor
+        chunksize : int, optional
+            Maximum number of sample times (segment midpoints and nodes) per
+            model evaluation.  Default is to evaluate all of them at once.
+        cache : bool or str or pathlib.Path or PolycoCache, optional
+            If given, previously generated segments are taken from (and newly
+            generated ones stored in) this :class:`PolycoCache`; ``True`` uses
+            the default cache location and a path a cache in that directory.
 
         Return
         ---------
         Polycos
+
+        Notes
+        -----
+        The midpoints and fit nodes of all segments are put into a single
+        :class:`pint.toa.TOAs` object (or one per chunk), and the coefficients
+        of all segments are obtained from one batched least-squares fit.
+
+        If the model has no ``AbsPhase`` component, a TZR TOA at the first
+        segment midpoint is added to it.  When a cache is used, the TZR TOA is
+        instead put at the minute nearest PEPOCH (if the model has one), so
+        that the cache key of such a model does not depend on the time range
+        requested; the clock corrections and ephemeris must then cover PEPOCH.
         """
         mjdStart = data2longdouble(mjdStart)
         mjdEnd = data2longdouble(mjdEnd)
@@ -739,100 +1049,73 @@ class Polycos:
         if numNodes < ncoeff:
             numNodes = ncoeff + 1
 
-        mjdSpan = data2longdouble(segLength / MIN_PER_DAY)
         # Generate "nice" MJDs for consistency with what tempo2 does
-        tmids = np.arange(
+        tminutes = np.arange(
             int(mjdStart * 24) * 60, int(mjdEnd * 24) * 60 + segLength, segLength
         )
-        tmids = data2longdouble(tmids) / MIN_PER_DAY
+        tmids = data2longdouble(tminutes) / MIN_PER_DAY
 
         if method != "TEMPO":
             raise NotImplementedError("Only TEMPO method has been implemented.")
-        entryList = []
         obsFreq = float(obsFreq)
 
-        # Using tempo1 method to create polycos
-        # If you want to disable the progress bar, add disable=True to the tqdm() call.
-        for tmid in tqdm(tmids, disable=not progress):
-            tStart = tmid - mjdSpan / 2
-            tStop = tmid + mjdSpan / 2
-            nodes = np.linspace(tStart, tStop, numNodes)
-
-            toaMid = toa.get_TOAs_array(
-                (np.modf(tmid)[1], np.modf(tmid)[0]),
-                obs=obs,
-                freqs=obsFreq,
-                ephem=ephem,
-            )
-            # toaMid = toa.get_TOAs_list(
-            #     [toa.TOA()],
-            # )
-
-            refPhase = model.phase(toaMid, abs_phase=True)
-
-            # Create node toas(Time sample using TOA class)
-            # toaList = [
-            #     toa.TOA(
-            #         (np.modf(toaNode)[1], np.modf(toaNode)[0]),
-            #         obs=obs,
-            #         freq=obsFreq,
-            #     )
-            #     for toaNode in nodes
-            # ]
-
-            # toas = toa.get_TOAs_list(toaList, ephem=ephem)
-            toas = toa.get_TOAs_array(
-                (np.modf(nodes)[0], np.modf(nodes)[1]),
-                obs=obs,
-                freqs=obsFreq,
-                ephem=ephem,
+        if cache is True:
+            cache = PolycoCache()
+        elif cache is not None and not isinstance(cache, PolycoCache):
+            cache = PolycoCache(cache)
+
+        if "AbsPhase" not in model.components:
+            # Fix the TZR TOA up front, so that every chunk (and worker) uses
+            # the same absolute phase reference.  With a cache, it is put at
+            # the minute nearest PEPOCH rather than in the requested range, so
+            # that it (and the cache key) does not depend on the request.
+            tzr = tmids[0]
+            if (
+                cache is not None
+                and "PEPOCH" in model.params
+                and model.PEPOCH.value is not None
+            ):
+                tzr = (
+                    data2longdouble(np.round(model.PEPOCH.quantity.mjd * MIN_PER_DAY))
+                    / MIN_PER_DAY
+                )
+            model.add_tzr_toa(
+                toa.get_TOAs_array(
+                    (np.modf([tzr])[1], np.modf([tzr])[0]),
+                    obs=obs,
+                    freqs=obsFreq,
+                    ephem=ephem,
+                )
             )
 
-            ph = model.phase(toas, abs_phase=True)
-            dt = (nodes - tmid) * MIN_PER_DAY
-            rdcPhase = ph - refPhase
-            rdcPhase = rdcPhase.int - (dt * model.F0.value * 60.0) + rdcPhase.frac
-            dtd = dt.astype(float)  # Truncate to double
-            rdcPhased = rdcPhase.astype(float)
-            coeffs = np.polyfit(dtd, rdcPhased, ncoeff - 1)[::-1]
-
-            date, hms = Time(tmid, format="mjd", scale="utc").iso.split()
-            yy, mm, dd = date.split("-")
-            date = f"{dd}-{MONTHS[int(mm) - 1]}-{yy[-2:]}"
-            hms = float(hms.replace(":", ""))
-
-            entry = PolycoEntry(
-                tmid,
+        entryList = [None] * len(tmids)
+        if cache is not None:
+            key = cache.key(model, obs, obsFreq, segLength, ncoeff, numNodes)
+            cached = cache.get(key)
+            entryList = [cached.get(int(m)) for m in tminutes]
+        missing = [i for i, e in enumerate(entryList) if e is None]
+        if cache is not None:
+            log.debug(
+                f"Reusing {len(tmids) - len(missing)} of {len(tmids)} polyco segments from cache"
+            )
+        if missing:
+            new_entries = _generate_polyco_entries(
+                model,
+                tmids[missing],
+                obs,
                 segLength,
-                refPhase.int,
-                refPhase.frac,
-                model.F0.value,
                 ncoeff,
-                coeffs,
+                obsFreq,
+                numNodes,
+                ephem,
+                progress=progress,
+                executor=executor,
+                chunksize=chunksize,
             )
-
-            entry_dict = OrderedDict()
-            entry_dict["psr"] = model.PSR.value
-            entry_dict["date"] = date
-            entry_dict["utc"] = hms
-            entry_dict["tmid"] = tmid
-            entry_dict["dm"] = model.DM.value
-            entry_dict["doppler"] = 0.0
-            entry_dict["logrms"] = 0.0
-            entry_dict["mjd_span"] = segLength
-            entry_dict["t_start"] = entry.tstart
-            entry_dict["t_stop"] = entry.tstop
-            entry_dict["obs"] = obs
-            entry_dict["obsfreq"] = obsFreq
-
-            if model.is_binary:
-                binphase = model.orbital_phase(toaMid, radians=False)[0]
-                entry_dict["binary_phase"] = binphase
-                b = model.get_components_by_category()["pulsar_system"][0]
-                entry_dict["f_orbit"] = 1 / b.PB.value
-
-            entry_dict["entry"] = entry
-            entryList.append(entry_dict)
+            for i, e in zip(missing, new_entries):
+                entryList[i] = e
+            if cache is not None:
+                cache.update(key, {int(tminutes[i]): entryList[i] for i in missing})
 
         pTable = table.Table(entryList, meta={"name": "Polyco Data Table"})
         out = cls()
@@ -897,40 +1180,136 @@ class Polycos:
             raise ValueError("Some input times not covered by Polyco entries.")
         return start_idx
 
-    def eval_phase(self, t):
+    def pack(self):
+        """Packed array representation of the polyco table.
+
+        The per-entry quantities are stored as arrays so that any number of
+        times can be evaluated with a single gather and Horner pass, rather
+        than entry by entry.  The result is cached until ``polycoTable`` is
+        replaced.
+
+        Returns
+        -------
+        dict
+            ``tstart``, ``tstop``, ``tmid`` (MJD), ``rphase_int``,
+            ``rphase_frac`` and ``f0`` arrays of length n_entries,
+            ``coeffs`` of shape (n_entries, ncoeff) (entries with fewer
+            coefficients are zero-padded) and ``order``, the indices that
+            sort the entries by start time
+        """
+        packed = getattr(self, "_packed", None)
+        if (
+            packed is not None
+            and packed["table"] is self.polycoTable
+            and len(packed["tmid"]) == len(self.polycoTable)
+        ):
+            return packed
+        entries = list(self.polycoTable["entry"])
+        ncoeff = max(e.ncoeff for e in entries)
+        coeffs = np.zeros((len(entries), ncoeff), dtype=np.longdouble)
+        for i, e in enumerate(entries):
+            coeffs[i, : e.ncoeff] = e.coeffs[: e.ncoeff]
+        tstart = np.array([e.tstart.value for e in entries], dtype=np.longdouble)
+        self._packed = {
+            "table": self.polycoTable,
+            "tstart": tstart,
+            "tstop": np.array([e.tstop.value for e in entries], dtype=np.longdouble),
+            "tmid": np.array([e.tmid.value for e in entries], dtype=np.longdouble),
+            "rphase_int": np.array(
+                [e.rphase.int.value[0] for e in entries], dtype=np.longdouble
+            ),
+            "rphase_frac": np.array(
+                [e.rphase.frac.value[0] for e in entries], dtype=np.longdouble
+            ),
+            "f0": np.array([e.f0 for e in entries], dtype=np.longdouble),
+            "coeffs": coeffs,
+            "order": np.argsort(tstart, kind="stable"),
+        }
+        return self._packed
+
+    def coverage(self, t):
+        """Find the entry for each input time, without requiring full coverage.
+
+        Parameters
+        ---------
+        t: numpy.ndarray or float
+           A time array in MJD, in any order.
+
+        Returns
+        -------
+        idx : numpy.ndarray
+            Index of the entry for each time (the latest-starting entry that
+            starts before it)
+        covered : numpy.ndarray
+            Boolean mask, True where the time lies within that entry
+        """
+        t = np.atleast_1d(np.asarray(t)).astype(np.longdouble)
+        packed = self.pack()
+        order = packed["order"]
+        i = np.searchsorted(packed["tstart"][order], t, side="right") - 1
+        idx = order[np.maximum(i, 0)]
+        covered = (i >= 0) & (t <= packed["tstop"][idx])
+        return idx, covered
+
+    def _prepare_eval(self, t, return_mask):
+        """Times as long doubles, entry indices, coverage mask and offsets in minutes"""
+        t = np.atleast_1d(np.asarray(t)).astype(np.longdouble)
+        idx, covered = self.coverage(t)
+        if not return_mask and not np.all(covered):
+            raise ValueError("Some input times not covered by Polyco entries.")
+        dt = (t - self.pack()["tmid"][idx]) * MIN_PER_DAY
+        return idx, covered, dt
+
+    def eval_phase(self, t, return_mask=False):
         """Polyco evaluation of fractional phase
 
         Parameters
         ---------
         t: numpy.ndarray or float
-           An time array in MJD. Time sample should be in order
+           An time array in MJD, in any order
+        return_mask : bool, optional
+            If True, times not covered by any entry are returned as NaN
+            together with the coverage mask, rather than raising an error
 
         Returns
         ---------
         numpy.ndarray
              Fractional phase
+        numpy.ndarray
+            Coverage mask (only if ``return_mask`` is True)
 
         Notes
         -----
         Returns fractional part of :meth:`pint.polycos.Polycos.eval_abs_phase`
         """
-        if not isinstance(t, np.ndarray) and not isinstance(t, list):
-            t = np.array([t])
+        if return_mask:
+            phase, covered = self.eval_abs_phase(t, return_mask=True)
+            return phase.frac, covered
         return self.eval_abs_phase(t).frac
 
-    def eval_abs_phase(self, t):
+    def eval_abs_phase(self, t, return_mask=False):
         """
         Polyco evaluate absolute phase for a time array.
 
         Parameters
         ---------
         t: numpy.ndarray or float
-           An time array in MJD. Time sample should be in order
+           An time array in MJD, in any order
+        return_mask : bool, optional
+            If True, times not covered by any entry are returned as NaN
+            together with the coverage mask, rather than raising an error
 
         Returns
         ---------
         pint.phase.Phase
              Polyco evaluated absolute phase for t.
+        numpy.ndarray
+            Coverage mask (only if ``return_mask`` is True)
+
+        Raises
+        ------
+        ValueError
+            If ``return_mask`` is False and some times are not covered by the polycos
 
         Notes
         -----
@@ -940,42 +1319,44 @@ class Polycos:
 
             \\phi = \\phi_0 + 60 \\Delta T f_0 + COEFF[1] + COEFF[2] \Delta T + COEFF[3] \Delta T^2 + \\ldots
 
-        Calculation done using :meth:`pint.polycos.PolycoEntry.evalabsphase`
+        All times are evaluated at once using the packed coefficients from
+        :meth:`pint.polycos.Polycos.pack`.
         """
-        if not isinstance(t, (np.ndarray, list)):
-            t = np.array([t])
+        idx, covered, dt = self._prepare_eval(t, return_mask)
+        packed = self.pack()
+        coeffs = packed["coeffs"]
+        poly = coeffs[idx, -1]
+        for k in range(coeffs.shape[1] - 2, -1, -1):
+            poly = poly * dt + coeffs[idx, k]
+        phase = Phase(packed["rphase_int"][idx], packed["rphase_frac"][idx]) + Phase(
+            poly + dt * 60.0 * packed["f0"][idx]
+        )
+        if return_mask:
+            phase = Phase(
+                np.where(covered, phase.int.value, np.nan),
+                np.where(covered, phase.frac.value, np.nan),
+            )
+            return phase, covered
+        return phase
 
-        entryIndex = self.find_entry(t)
-        phaseInt = ()
-        phaseFrac = ()
-        # Compute phase for time in each entry
-        for i in range(len(self.polycoTable)):
-            mask = np.where(entryIndex == i)  # Build mask for time in each entry
-            t_in_entry = t[mask]
-            if len(t_in_entry) == 0:
-                continue
-            # Calculate the phase as an array
-            absp = self.polycoTable["entry"][i].evalabsphase(t_in_entry)
-            phaseInt += (absp.int,)
-            phaseFrac += (absp.frac,)
-            # Maybe add sort function here, since the time has been masked.
-        phaseInt = np.hstack(phaseInt).value
-        phaseFrac = np.hstack(phaseFrac).value
-        return Phase(phaseInt, phaseFrac)
-
-    def eval_spin_freq(self, t):
+    def eval_spin_freq(self, t, return_mask=False):
         """
         Polyco evaluate spin frequency for a time array.
 
         Parameters
         ---------
         t: numpy.ndarray or float
-           An time array in MJD. Time samples should be in order
+           An time array in MJD, in any order
+        return_mask : bool, optional
+            If True, times not covered by any entry are returned as NaN
+            together with the coverage mask, rather than raising an error
 
         Returns
         ---------
         numpy.ndarray
              Polyco evaluated spin frequency [Hz] at time t.
+        numpy.ndarray
+            Coverage mask (only if ``return_mask`` is True)
 
         Notes
         -----
@@ -984,48 +1365,45 @@ class Polycos:
         .. math::
 
             f({\\rm Hz}) = f_0 + \\frac{1}{60}\\left(COEFF[2] + 2 \\Delta T COEFF[3] + 3 \\Delta T^2 COEFF[4] + \\ldots\\right)
-
-        Calculation done using :meth:`pint.polycos.PolycoEntry.evalfreq`
         """
-        if not isinstance(t, np.ndarray) and not isinstance(t, list):
-            t = np.array([t])
-
-        entryIndex = self.find_entry(t)
-        spinFreq = np.zeros(len(t), dtype=np.longdouble)
-
-        for i, idx in enumerate(entryIndex):
-            spinFreq[i] = self[idx]["entry"].evalfreq(t[i])
-
+        idx, covered, dt = self._prepare_eval(t, return_mask)
+        packed = self.pack()
+        coeffs = packed["coeffs"]
+        s = np.zeros(len(dt), dtype=np.longdouble)
+        for k in range(coeffs.shape[1] - 1, 0, -1):
+            s = s * dt + k * coeffs[idx, k]
+        spinFreq = packed["f0"][idx] + s / 60.0
+        if return_mask:
+            return np.where(covered, spinFreq, np.nan), covered
         return spinFreq
 
-    def eval_spin_freq_derivative(self, t):
+    def eval_spin_freq_derivative(self, t, return_mask=False):
         """
         Polyco evaluate spin frequency derivative for a time array.
 
         Parameters
         ---------
         t: numpy.ndarray or float
-           An time array in MJD. Time samples should be in order
+           An time array in MJD, in any order
+        return_mask : bool, optional
+            If True, times not covered by any entry are returned as NaN
+            together with the coverage mask, rather than raising an error
 
         Returns
         ---------
         numpy.ndarray
              Polyco evaluated spin frequency derivative [Hz/s] at time t.
-
-        Notes
-        -----
-
-        Calculation done using :meth:`pint.polycos.PolycoEntry.evalfreqderiv`
+        numpy.ndarray
+            Coverage mask (only if ``return_mask`` is True)
         """
-        if not isinstance(t, np.ndarray) and not isinstance(t, list):
-            t = np.array([t])
-
-        entryIndex = self.find_entry(t)
-        spinFreqDeriv = np.zeros(len(t), dtype=np.longdouble)
-
-        for i, idx in enumerate(entryIndex):
-            spinFreqDeriv[i] = self[idx]["entry"].evalfreqderiv(t[i])
-
+        idx, covered, dt = self._prepare_eval(t, return_mask)
+        coeffs = self.pack()["coeffs"]
+        s = np.zeros(len(dt), dtype=np.longdouble)
+        for k in range(coeffs.shape[1] - 1, 1, -1):
+            s = s * dt + k * (k - 1) * coeffs[idx, k]
+        spinFreqDeriv = s / (60.0 * 60.0)
+        if return_mask:
+            return np.where(covered, spinFreqDeriv, np.nan), covered
         return spinFreqDeriv
 
 
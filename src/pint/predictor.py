@@ -0,0 +1,759 @@
+"""Chebyshev phase predictors
+
+Two-dimensional Chebyshev predictors in time and observing frequency, in the
+style of tempo2's ``T2PREDICT`` library.  Each segment (a
+:class:`ChebyModel`) covers a time range ``[mjd_start, mjd_end]`` and a
+frequency range ``[freq_start, freq_end]``, and predicts the absolute pulse
+phase as:
+
+.. math::
+
+    x = 2 (t - t_{\\rm start}) / (t_{\\rm end} - t_{\\rm start}) - 1
+
+    y = 2 (f - f_{\\rm start}) / (f_{\\rm end} - f_{\\rm start}) - 1
+
+    \\phi(t, f) = {\\sum_{i}}' {\\sum_{j}}' C_{ij} T_i(x) T_j(y) + D / f^2
+
+where :math:`T_i` are Chebyshev polynomials of the first kind, the primes
+mean that the :math:`i=0` and :math:`j=0` terms are halved (the Numerical
+Recipes convention used by tempo2), :math:`f` is in MHz and :math:`D` is the
+dispersion constant.
+
+Compared to :class:`pint.polycos.Polycos`, a single predictor covers a range
+of observing frequencies, and the segment length is chosen adaptively to
+reach a requested accuracy.  :class:`ChebyPredictor` has the same evaluation
+methods as :class:`~pint.polycos.Polycos`, so it can be used in its place.
+
+Examples
+--------
+Generate a predictor from a timing model, write it and read it back:
+
+    >>> from pint.models import get_model
+    >>> from pint.predictor import ChebyPredictor
+    >>> model = get_model(filename)
+    >>> p = ChebyPredictor.generate(model, 55000, 55001, "gbt", 1100, 1900)
+    >>> p.write("t2pred.dat")
+    >>> p = ChebyPredictor.read("t2pred.dat")
+    >>> p.eval_abs_phase(mjds, freq=1400)
+
+References
+----------
+Hobbs, Edwards & Manchester 2006, MNRAS, 369, 655 (tempo2), and the
+``T2PREDICT`` library distributed with tempo2.
+"""
+
+import hashlib
+
+import astropy.units as u
+import numpy as np
+from loguru import logger as log
+from numpy.polynomial import chebyshev
+
+import pint.toa as toa
+from pint import DMconst
+from pint.phase import Phase
+from pint.pulsar_mjd import data2longdouble
+from pint.utils import open_or_use
+
+__all__ = [
+    "ChebyModel",
+    "ChebyPredictor",
+    "tempo2_predictor_reader",
+    "tempo2_predictor_writer",
+]
+
+MIN_PER_DAY = (1 * u.day).to_value(u.min)
+SECS_PER_DAY = (1 * u.day).to_value(u.s)
+
+
+class ChebyModel:
+    """One segment of a Chebyshev predictor.
+
+    Parameters
+    ----------
+    psrname : str
+        Pulsar name
+    sitename : str
+        Observatory code
+    mjd_start, mjd_end : float or numpy.longdouble
+        Time range covered by the segment (MJD)
+    freq_start, freq_end : float or numpy.longdouble
+        Observing frequency range covered by the segment (MHz).  If they are
+        equal the segment is for a single frequency and ``coeffs`` has one
+        column.
+    dispersion_constant : float or numpy.longdouble
+        Coefficient of the :math:`1/f^2` term (cycles MHz^2)
+    coeffs : numpy.ndarray
+        Coefficients of shape (ncoeff_time, ncoeff_freq), with the zeroth
+        order terms in each dimension doubled as in tempo2
+    """
+
+    def __init__(
+        self,
+        psrname,
+        sitename,
+        mjd_start,
+        mjd_end,
+        freq_start,
+        freq_end,
+        dispersion_constant,
+        coeffs,
+    ):
+        self.psrname = psrname
+        self.sitename = sitename
+        self.mjd_start = data2longdouble(mjd_start)
+        self.mjd_end = data2longdouble(mjd_end)
+        self.freq_start = data2longdouble(freq_start)
+        self.freq_end = data2longdouble(freq_end)
+        self.dispersion_constant = data2longdouble(dispersion_constant)
+        self.coeffs = np.atleast_2d(np.asarray(coeffs, dtype=np.longdouble))
+
+    @property
+    def ncoeff_time(self):
+        return self.coeffs.shape[0]
+
+    @property
+    def ncoeff_freq(self):
+        return self.coeffs.shape[1]
+
+    def __repr__(self):
+        return (
+            f"ChebyModel({self.psrname}, {self.sitename}, "
+            f"MJD {self.mjd_start}-{self.mjd_end}, "
+            f"{self.freq_start}-{self.freq_end} MHz, "
+            f"{self.ncoeff_time}x{self.ncoeff_freq} coefficients)"
+        )
+
+
+def _format_longdouble(x):
+    """Shortest string that reads back to the same long double"""
+    return np.format_float_scientific(np.longdouble(x), unique=True)
+
+
+def tempo2_predictor_reader(filename):
+    """Read a tempo2 predictor (``ChebyModelSet``) file.
+
+    The file format is::
+
+        ChebyModelSet <n> segments
+        ChebyModel BEGIN
+        PSRNAME <name>
+        SITENAME <site>
+        TIME_RANGE <mjd_start> <mjd_end>
+        FREQ_RANGE <freq_start> <freq_end>
+        DISPERSION_CONSTANT <D>
+        NCOEFF_TIME <nx>
+        NCOEFF_FREQ <ny>
+        COEFFS <c_00> ... <c_0(ny-1)>
+        ...    (nx COEFFS lines in total)
+        ChebyModel END
+        ...    (n segments in total)
+
+    Parameters
+    ----------
+    filename : str or ~pathlib.Path or file-like
+        Name of the input predictor file
+
+    Returns
+    -------
+    list of ChebyModel
+    """
+    segments = []
+    current = None
+    with open_or_use(filename, "r") as f:
+        for line in f:
+            fields = line.split()
+            if not fields:
+                continue
+            key = fields[0]
+            if key == "ChebyModelSet":
+                continue
+            elif key == "ChebyModel" and fields[1] == "BEGIN":
+                current = {"coeffs": []}
+            elif key == "ChebyModel" and fields[1] == "END":
+                coeffs = np.array(current["coeffs"], dtype=np.longdouble)
+                if coeffs.shape != (current["nx"], current["ny"]):
+                    raise ValueError(
+                        f"Predictor segment has {coeffs.shape} coefficients, "
+                        f"expected {(current['nx'], current['ny'])}"
+                    )
+                segments.append(
+                    ChebyModel(
+                        current["psrname"],
+                        current["sitename"],
+                        current["mjd"][0],
+                        current["mjd"][1],
+                        current["freq"][0],
+                        current["freq"][1],
+                        current["dispersion_constant"],
+                        coeffs,
+                    )
+                )
+                current = None
+            elif current is None:
+                raise ValueError(f"Unexpected line outside a ChebyModel: '{line}'")
+            elif key == "PSRNAME":
+                current["psrname"] = fields[1]
+            elif key == "SITENAME":
+                current["sitename"] = fields[1]
+            elif key == "TIME_RANGE":
+                current["mjd"] = [np.longdouble(x) for x in fields[1:3]]
+            elif key == "FREQ_RANGE":
+                current["freq"] = [np.longdouble(x) for x in fields[1:3]]
+            elif key == "DISPERSION_CONSTANT":
+                current["dispersion_constant"] = np.longdouble(fields[1])
+            elif key == "NCOEFF_TIME":
+                current["nx"] = int(fields[1])
+            elif key == "NCOEFF_FREQ":
+                current["ny"] = int(fields[1])
+            elif key == "COEFFS":
+                current["coeffs"].append([np.longdouble(x) for x in fields[1:]])
+            else:
+                raise ValueError(f"Unknown predictor keyword '{key}'")
+    return segments
+
+
+def tempo2_predictor_writer(segments, filename="t2pred.dat"):
+    """Write a tempo2 predictor (``ChebyModelSet``) file.
+
+    See :func:`pint.predictor.tempo2_predictor_reader` for the format.
+
+    Parameters
+    ----------
+    segments : list of ChebyModel
+        Predictor segments
+    filename : str or ~pathlib.Path or file-like
+        Destination for the output predictor file. Default is 't2pred.dat'.
+    """
+    if len(segments) == 0:
+        raise ValueError("No predictor segments to write.")
+    with open_or_use(filename, "w") as f:
+        f.write(f"ChebyModelSet {len(segments)} segments\n")
+        for s in segments:
+            f.write("ChebyModel BEGIN\n")
+            f.write(f"PSRNAME {s.psrname}\n")
+            f.write(f"SITENAME {s.sitename}\n")
+            f.write(
+                f"TIME_RANGE {_format_longdouble(s.mjd_start)} {_format_longdouble(s.mjd_end)}\n"
+            )
+            f.write(
+                f"FREQ_RANGE {_format_longdouble(s.freq_start)} {_format_longdouble(s.freq_end)}\n"
+            )
+            f.write(
+                f"DISPERSION_CONSTANT {_format_longdouble(s.dispersion_constant)}\n"
+            )
+            f.write(f"NCOEFF_TIME {s.ncoeff_time}\n")
+            f.write(f"NCOEFF_FREQ {s.ncoeff_freq}\n")
+            for row in s.coeffs:
+                f.write("COEFFS " + " ".join(_format_longdouble(c) for c in row) + "\n")
+            f.write("ChebyModel END\n")
+
+
+def _model_phases(model, mjds, freqs, obs, ephem):
+    """Absolute model phases at the given MJDs and frequencies
+
+    Module-level so that it can be used with process-based executors.
+    """
+    toas = toa.get_TOAs_array(
+        (np.modf(mjds)[1], np.modf(mjds)[0]), obs=obs, freqs=freqs, ephem=ephem
+    )
+    ph = model.phase(toas, abs_phase=True)
+    return ph.int.value, ph.frac.value
+
+
+def _freq_coordinate(freq, freq_start, freq_end):
+    """Map frequencies onto [-1, 1]; single-frequency segments map to 0"""
+    width = freq_end - freq_start
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(width > 0, 2 * (freq - freq_start) / width - 1, 0)
+
+
+class ChebyPredictor:
+    """A set of 2-D Chebyshev predictor segments.
+
+    Parameters
+    ----------
+    segments : list of ChebyModel
+        The predictor segments, which should not overlap in time
+    """
+
+    def __init__(self, segments=()):
+        self.segments = list(segments)
+
+    def __len__(self):
+        return len(self.segments)
+
+    def __getitem__(self, item):
+        return self.segments[item]
+
+    @classmethod
+    def read(cls, filename):
+        """Read a tempo2 predictor file.
+
+        Parameters
+        ----------
+        filename : str or ~pathlib.Path or file-like
+            The name of the input predictor file.
+
+        Returns
+        -------
+        ChebyPredictor
+        """
+        log.info(f"Reading predictor from '{filename}'")
+        segments = tempo2_predictor_reader(filename)
+        if len(segments) == 0:
+            raise ValueError("Zero predictor segments found")
+        return cls(segments)
+
+    def write(self, filename="t2pred.dat"):
+        """Write the predictor to a tempo2 predictor file.
+
+        Parameters
+        ----------
+        filename : str or ~pathlib.Path or file-like
+            The name of the predictor file. Default is 't2pred.dat'.
+        """
+        tempo2_predictor_writer(self.segments, filename)
+
+    @classmethod
+    def generate(
+        cls,
+        model,
+        mjdStart,
+        mjdEnd,
+        obs,
+        freqStart,
+        freqEnd=None,
+        ncoeff_time=12,
+        ncoeff_freq=2,
+        segLength=60,
+        minSegLength=1,
+        tolerance=None,
+        executor=None,
+        chunksize=None,
+    ):
+        """Generate a predictor from a timing model.
+
+        The time range is split into segments of at most ``segLength``
+        minutes.  For each segment the model phase is fit on a grid of
+        Chebyshev nodes and checked on a denser grid including the segment
+        edges; segments whose error exceeds ``tolerance`` are split in half
+        and refit, down to ``minSegLength``.  The model is evaluated for all
+        pending segments at once (optionally in parallel chunks), and all
+        of them are fit with one least-squares solve.
+
+        Parameters
+        ----------
+        model : TimingModel
+            TimingModel to generate the predictor from
+        mjdStart, mjdEnd : float or numpy.longdouble
+            Time range of the predictor (MJD)
+        obs : str
+            Observatory code
+        freqStart : float
+            Lowest observing frequency [MHz]
+        freqEnd : float, optional
+            Highest observing frequency [MHz]; if not given (or equal to
+            ``freqStart``), the predictor is for a single frequency
+        ncoeff_time : int, optional
+            Number of Chebyshev coefficients in time
+        ncoeff_freq : int, optional
+            Number of Chebyshev coefficients in frequency (ignored for a
+            single-frequency predictor).  The dispersion constant is fit for
+            each segment, but the Doppler shift of the dispersive phase
+            within a segment is not a function of frequency alone, so binary
+            pulsars over wide bands may need more coefficients.
+        segLength : float, optional
+            Maximum segment length [minutes]
+        minSegLength : float, optional
+            Minimum segment length [minutes]; segments this short are
+            accepted even if they do not reach ``tolerance``
+        tolerance : float, optional
+            Maximum allowed prediction error [s].  Model phases are computed
+            from long double MJDs, which limits their own precision to
+            ``4 * eps * mjdEnd`` days (a few nanoseconds for current MJDs,
+            with ``eps`` the long double machine epsilon).  The default
+            (None) is this floor; smaller values are raised to it.
+        executor : concurrent.futures.Executor, optional
+            If given, the model phases are evaluated in parallel over chunks
+            of the sample times using this executor
+        chunksize : int, optional
+            Maximum number of sample times per model evaluation.  Default is
+            to evaluate all of them at once.
+
+        Returns
+        -------
+        ChebyPredictor
+        """
+        mjdStart = data2longdouble(mjdStart)
+        mjdEnd = data2longdouble(mjdEnd)
+        if mjdEnd <= mjdStart:
+            raise ValueError("mjdEnd must be after mjdStart")
+        freqStart = np.longdouble(np.inf if freqStart == 0 else freqStart)
+        if freqEnd is None:
+            freqEnd = freqStart
+        freqEnd = np.longdouble(np.inf if freqEnd == 0 else freqEnd)
+        if freqEnd < freqStart:
+            raise ValueError("freqEnd must not be below freqStart")
+        if freqEnd == freqStart:
+            ncoeff_freq = 1
+        ephem = model.EPHEM.value if model.EPHEM.value is not None else "DE421"
+
+        F0 = model.F0.value
+        dispersion_constant = np.longdouble(0)
+        if "DM" in model and model.DM.value is not None:
+            dispersion_constant = -data2longdouble(
+                (model.F0.quantity * DMconst * model.DM.quantity).to_value(u.MHz**2)
+            )
+
+        # Normalized sample grids, identical for all segments
+        xfit = chebyshev.chebpts1(2 * ncoeff_time)
+        xtest = np.linspace(-1, 1, 2 * ncoeff_time + 1)
+        if ncoeff_freq > 1:
+            yfit = chebyshev.chebpts1(ncoeff_freq + 2)
+            ytest = np.array([-1.0, 1.0])
+        else:
+            yfit = ytest = np.array([0.0])
+        xs = np.concatenate((np.repeat(xfit, len(yfit)), np.repeat(xtest, len(ytest))))
+        ys = np.concatenate((np.tile(yfit, len(xfit)), np.tile(ytest, len(xtest))))
+        nfit = len(xfit) * len(yfit)
+        V = chebyshev.chebvander2d(xs, ys, [ncoeff_time - 1, ncoeff_freq - 1])
+        if ncoeff_freq > 1:
+            sample_freqs = freqStart + (ys + 1) / 2 * (freqEnd - freqStart)
+            # The dispersive phase scales with the apparent spin frequency, so
+            # the dispersion constant is also fit for each segment
+            V = np.hstack((V, ((freqStart / sample_freqs) ** 2).astype(float)[:, None]))
+        else:
+            sample_freqs = np.full(len(ys), freqStart)
+
+        if "AbsPhase" not in model.components:
+            # Fix the TZR TOA up front, so that every segment (and worker)
+            # uses the same absolute phase reference
+            model.add_tzr_toa(
+                toa.get_TOAs_array(
+                    (np.modf(mjdStart)[1], np.modf(mjdStart)[0]),
+                    obs=obs,
+                    freqs=freqStart,
+                    ephem=ephem,
+                )
+            )
+
+        nseg = max(int(np.ceil((mjdEnd - mjdStart) * MIN_PER_DAY / segLength)), 1)
+        edges = mjdStart + (mjdEnd - mjdStart) * np.arange(nseg + 1) / nseg
+        pending = list(zip(edges[:-1], edges[1:]))
+        done = []
+        worst = 0.0
+        # Model phases are computed from long double MJDs, so errors below a
+        # few units in the last place of the MJD (in seconds) are just noise
+        floor = 4 * float(np.finfo(np.longdouble).eps * mjdEnd) * SECS_PER_DAY
+        if tolerance is None:
+            tolerance = floor
+        elif tolerance < floor:
+            log.info(
+                f"Raising tolerance {tolerance:.3g} s to the precision floor "
+                f"of the model phases ({floor:.3g} s)"
+            )
+            tolerance = floor
+        while pending:
+            starts = np.array([p[0] for p in pending], dtype=np.longdouble)
+            stops = np.array([p[1] for p in pending], dtype=np.longdouble)
+            half = (stops - starts) / 2
+            mids = starts + half
+            mjds = (mids[:, None] + half[:, None] * xs[None, :]).ravel()
+            freqs = np.tile(sample_freqs, len(pending))
+
+            if chunksize is None:
+                size = len(mjds)
+            else:
+                size = int(chunksize)
+            chunks = [slice(lo, lo + size) for lo in range(0, len(mjds), size)]
+            args = (
+                [model] * len(chunks),
+                [mjds[c] for c in chunks],
+                [freqs[c] for c in chunks],
+                [obs] * len(chunks),
+                [ephem] * len(chunks),
+            )
+            mapper = executor.map if executor is not None else map
+            results = list(mapper(_model_phases, *args))
+            phInt = np.concatenate([r[0] for r in results]).reshape(len(pending), -1)
+            phFrac = np.concatenate([r[1] for r in results]).reshape(len(pending), -1)
+
+            # Phase relative to the first sample, without the spin and
+            # dispersion terms, is small enough to fit in double precision
+            refInt = phInt[:, 0]
+            rel = (phInt - refInt[:, None]) + phFrac
+            rel -= F0 * (half[:, None] * xs[None, :]) * SECS_PER_DAY
+            rel -= dispersion_constant / freqs.reshape(len(pending), -1) ** 2
+            rel = rel.astype(float)
+            a, *_ = np.linalg.lstsq(V[:nfit], rel[:, :nfit].T, rcond=None)
+            err = np.max(np.abs(V @ a - rel.T), axis=0) / float(F0)
+
+            newpending = []
+            for i, (start, stop) in enumerate(pending):
+                if err[i] > tolerance and 2 * half[i] * MIN_PER_DAY >= 2 * minSegLength:
+                    newpending.append((start, mids[i]))
+                    newpending.append((mids[i], stop))
+                    continue
+                worst = max(worst, err[i])
+                coeffs = (
+                    a[: ncoeff_time * ncoeff_freq, i]
+                    .reshape(ncoeff_time, ncoeff_freq)
+                    .astype(np.longdouble)
+                )
+                segment_dc = dispersion_constant
+                if ncoeff_freq > 1:
+                    segment_dc = segment_dc + a[-1, i] * freqStart**2
+                # Restore the reference phase and the spin term, and double the
+                # zeroth-order terms to follow the tempo2 convention
+                coeffs[0, 0] += refInt[i]
+                coeffs[1, 0] += F0 * half[i] * SECS_PER_DAY
+                coeffs[0, :] *= 2
+                coeffs[:, 0] *= 2
+                done.append(
+                    ChebyModel(
+                        model.PSR.value,
+                        obs,
+                        start,
+                        stop,
+                        freqStart,
+                        freqEnd,
+                        segment_dc,
+                        coeffs,
+                    )
+                )
+            pending = newpending
+
+        if worst > tolerance:
+            log.warning(
+                f"Predictor only reaches an accuracy of {worst:.3g} s "
+                f"(tolerance {tolerance:.3g} s, precision floor {floor:.3g} s)"
+            )
+        done.sort(key=lambda s: s.mjd_start)
+        log.debug(f"Generated {len(done)} predictor segments")
+        return cls(done)
+
+    def pack(self):
+        """Packed array representation of the predictor segments.
+
+        Returns
+        -------
+        dict
+            ``mjd_start``, ``mjd_end``, ``freq_start``, ``freq_end``,
+            ``dispersion_constant`` and ``const_int`` arrays of length
+            n_segments, and ``coeffs`` of shape (n_segments, ncoeff_time,
+            ncoeff_freq) with the tempo2 halving of the zeroth-order terms
+            already applied and the integer part of the constant term moved
+            to ``const_int``
+
+        Notes
+        -----
+        The result is cached, keyed on the contents of the segments, so it
+        is recomputed if segments are added, removed or modified.
+        """
+        key = self._segments_key()
+        packed = getattr(self, "_packed", None)
+        if packed is not None and packed["key"] == key:
+            return packed
+        nx = max(s.ncoeff_time for s in self.segments)
+        ny = max(s.ncoeff_freq for s in self.segments)
+        coeffs = np.zeros((len(self.segments), nx, ny), dtype=np.longdouble)
+        for i, s in enumerate(self.segments):
+            c = s.coeffs.copy()
+            c[0, :] /= 2
+            c[:, 0] /= 2
+            coeffs[i, : s.ncoeff_time, : s.ncoeff_freq] = c
+        const_int = np.round(coeffs[:, 0, 0])
+        coeffs[:, 0, 0] -= const_int
+        mjd_start = np.array([s.mjd_start for s in self.segments], dtype=np.longdouble)
+        self._packed = {
+            "key": key,
+            "mjd_start": mjd_start,
+            "mjd_end": np.array(
+                [s.mjd_end for s in self.segments], dtype=np.longdouble
+            ),
+            "freq_start": np.array(
+                [s.freq_start for s in self.segments], dtype=np.longdouble
+            ),
+            "freq_end": np.array(
+                [s.freq_end for s in self.segments], dtype=np.longdouble
+            ),
+            "dispersion_constant": np.array(
+                [s.dispersion_constant for s in self.segments], dtype=np.longdouble
+            ),
+            "const_int": const_int,
+            "coeffs": coeffs,
+            "order": np.argsort(mjd_start, kind="stable"),
+        }
+        return self._packed
+
+    def _segments_key(self):
+        """Digest of the contents of the segments, used to validate the packed cache"""
+        h = hashlib.sha1()
+        for s in self.segments:
+            h.update(
+                np.array(
+                    [
+                        s.mjd_start,
+                        s.mjd_end,
+                        s.freq_start,
+                        s.freq_end,
+                        s.dispersion_constant,
+                    ],
+                    dtype=np.longdouble,
+                ).tobytes()
+            )
+            h.update(np.array(s.coeffs.shape).tobytes())
+            h.update(np.ascontiguousarray(s.coeffs, dtype=np.longdouble).tobytes())
+        return h.digest()
+
+    def _frequencies(self, idx, freq):
+        """Frequency for each time; defaults to the centre of each segment's range"""
+        packed = self.pack()
+        if freq is None:
+            return (packed["freq_start"][idx] + packed["freq_end"][idx]) / 2
+        if hasattr(freq, "unit"):
+            freq = freq.to_value(u.MHz)
+        freq = np.asarray(freq, dtype=np.longdouble)
+        freq = np.where(freq == 0, np.inf, freq)
+        return np.broadcast_to(freq, idx.shape)
+
+    def coverage(self, t, freq=None):
+        """Find the segment for each input time, without requiring full coverage.
+
+        Parameters
+        ---------
+        t : numpy.ndarray or float
+            A time array in MJD, in any order.
+        freq : numpy.ndarray or float, optional
+            Observing frequencies [MHz]; times whose frequency is outside
+            the segment's frequency range are not covered
+
+        Returns
+        -------
+        idx : numpy.ndarray
+            Index of the segment for each time
+        covered : numpy.ndarray
+            Boolean mask, True where the time (and frequency) lies within
+            that segment
+        """
+        t = np.atleast_1d(np.asarray(t)).astype(np.longdouble)
+        packed = self.pack()
+        order = packed["order"]
+        i = np.searchsorted(packed["mjd_start"][order], t, side="right") - 1
+        idx = order[np.maximum(i, 0)]
+        covered = (i >= 0) & (t <= packed["mjd_end"][idx])
+        if freq is not None:
+            f = self._frequencies(idx, freq)
+            covered &= (f >= packed["freq_start"][idx]) & (f <= packed["freq_end"][idx])
+        return idx, covered
+
+    def _prepare_eval(self, t, freq, return_mask):
+        """Segment indices, coverage mask, and normalized coordinates"""
+        t = np.atleast_1d(np.asarray(t)).astype(np.longdouble)
+        idx, covered = self.coverage(t, freq)
+        if not return_mask and not np.all(covered):
+            raise ValueError("Some input times not covered by the predictor.")
+        packed = self.pack()
+        start = packed["mjd_start"][idx]
+        x = 2 * (t - start) / (packed["mjd_end"][idx] - start) - 1
+        f = self._frequencies(idx, freq)
+        y = _freq_coordinate(f, packed["freq_start"][idx], packed["freq_end"][idx])
+        return idx, covered, x, y, f
+
+    def _freq_sums(self, idx, y):
+        """Coefficients contracted over the frequency polynomials, per time"""
+        coeffs = self.pack()["coeffs"]
+        ty_prev, ty = np.ones_like(y), y
+        sums = coeffs[idx, :, 0].copy()
+        for j in range(1, coeffs.shape[2]):
+            sums += coeffs[idx, :, j] * ty[:, None]
+            ty_prev, ty = ty, 2 * y * ty - ty_prev
+        return sums
+
+    def eval_abs_phase(self, t, freq=None, return_mask=False):
+        """Predicted absolute phase.
+
+        Parameters
+        ---------
+        t : numpy.ndarray or float
+            A time array in MJD, in any order
+        freq : numpy.ndarray or float, optional
+            Observing frequencies [MHz]; defaults to the centre of each
+            segment's frequency range
+        return_mask : bool, optional
+            If True, times not covered by any segment are returned as NaN
+            together with the coverage mask, rather than raising an error
+
+        Returns
+        -------
+        pint.phase.Phase
+            Predicted absolute phase
+        numpy.ndarray
+            Coverage mask (only if ``return_mask`` is True)
+        """
+        idx, covered, x, y, f = self._prepare_eval(t, freq, return_mask)
+        packed = self.pack()
+        sums = self._freq_sums(idx, y)
+        tx_prev, tx = np.ones_like(x), x
+        poly = sums[:, 0].copy()
+        for i in range(1, sums.shape[1]):
+            poly += sums[:, i] * tx
+            tx_prev, tx = tx, 2 * x * tx - tx_prev
+        with np.errstate(divide="ignore"):
+            poly += packed["dispersion_constant"][idx] / f**2
+        phase = Phase(packed["const_int"][idx]) + Phase(poly)
+        if return_mask:
+            phase = Phase(
+                np.where(covered, phase.int.value, np.nan),
+                np.where(covered, phase.frac.value, np.nan),
+            )
+            return phase, covered
+        return phase
+
+    def eval_phase(self, t, freq=None, return_mask=False):
+        """Predicted fractional phase.
+
+        Parameters and returns as for :meth:`eval_abs_phase`, but only the
+        fractional part of the phase is returned.
+        """
+        if return_mask:
+            phase, covered = self.eval_abs_phase(t, freq, return_mask=True)
+            return phase.frac, covered
+        return self.eval_abs_phase(t, freq).frac
+
+    def eval_spin_freq(self, t, freq=None, return_mask=False):
+        """Predicted apparent spin frequency.
+
+        Parameters
+        ---------
+        t : numpy.ndarray or float
+            A time array in MJD, in any order
+        freq : numpy.ndarray or float, optional
+            Observing frequencies [MHz]; defaults to the centre of each
+            segment's frequency range
+        return_mask : bool, optional
+            If True, times not covered by any segment are returned as NaN
+            together with the coverage mask, rather than raising an error
+
+        Returns
+        -------
+        numpy.ndarray
+            Spin frequency [Hz]
+        numpy.ndarray
+            Coverage mask (only if ``return_mask`` is True)
+        """
+        idx, covered, x, y, _ = self._prepare_eval(t, freq, return_mask)
+        packed = self.pack()
+        sums = self._freq_sums(idx, y)
+        # d T_i / dx = i U_{i-1}(x)
+        ux_prev, ux = np.zeros_like(x), np.ones_like(x)
+        deriv = np.zeros_like(x)
+        for i in range(1, sums.shape[1]):
+            deriv += i * sums[:, i] * ux
+            ux_prev, ux = ux, 2 * x * ux - ux_prev
+        span = (packed["mjd_end"][idx] - packed["mjd_start"][idx]) * SECS_PER_DAY
+        spinFreq = deriv * 2 / span
+        if return_mask:
+            return np.where(covered, spinFreq, np.nan), covered
+        return spinFreq
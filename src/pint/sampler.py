@@ -1,7 +1,105 @@
+import multiprocessing
+import os
+import pickle
+
 import emcee
 import numpy as np
+from loguru import logger as log
+
+__all__ = ["MCMCSampler", "EmceeSampler", "AutocorrConvergence"]
+
+
+class AutocorrConvergence:
+    """Autocorrelation-based convergence check for ensemble samplers.
+
+    The integrated autocorrelation time of the chains is estimated every
+    ``csteps`` iterations after the burn-in, and convergence is checked in two
+    stages:
+
+        1. the chain has to be longer than ``crit1`` times the estimated
+           autocorrelation time, and the estimate has to change by less than 10%;
+        2. after that, the same is checked every ``csteps/4`` iterations with
+           a 1% tolerance on the change.
 
-__all__ = ["MCMCSampler", "EmceeSampler"]
+    The sampler is considered converged once the second stage is satisfied and
+    at least ``min_steps`` iterations have been run after the burn-in.
+
+    Parameters
+    ----------
+    burnin : int
+        Number of iterations before the first check.
+    csteps : int
+        Interval at which the autocorrelation time is computed.
+    crit1 : float
+        The ratio of chain length to autocorrelation time to satisfy convergence.
+    min_steps : int
+        Minimum number of iterations after the burn-in.
+
+    Attributes
+    ----------
+    autocorr : list of float
+        The mean estimated autocorrelation times at each check.
+    """
+
+    def __init__(self, burnin=0, csteps=100, crit1=10, min_steps=1000):
+        self.burnin = burnin
+        self.csteps = csteps
+        self.crit1 = crit1
+        self.min_steps = min_steps
+        self.autocorr = []
+        self.old_tau = np.inf
+        self.converged1 = False
+        self.converged2 = False
+        self.converge_step = None
+
+    def _check(self, sampler, tol):
+        tau = sampler.get_autocorr_time(tol=0, quiet=True)
+        if np.any(np.isnan(tau)):
+            return None
+        self.autocorr.append(np.mean(tau))
+        converged = np.all(tau * self.crit1 < sampler.iteration)
+        converged &= np.all(np.abs(self.old_tau - tau) / tau < tol)
+        self.old_tau = tau
+        return converged
+
+    def __call__(self, sampler):
+        """Update the check with the current state of an
+        :class:`emcee.EnsembleSampler`; return True if the sampling can stop."""
+        iteration = sampler.iteration
+        if not self.converged1:
+            if iteration >= self.burnin and iteration % self.csteps == 0:
+                self.converged1 = bool(self._check(sampler, 0.1))
+                if self.converged1:
+                    log.info(
+                        "10 % convergence reached with a mean estimated integrated step: "
+                        + str(self.autocorr[-1])
+                    )
+            return False
+        if not self.converged2:
+            if iteration % int(self.csteps / 4) != 0:
+                return False
+            converged = self._check(sampler, 0.01)
+            if converged is None:
+                return False
+            self.converged2 = bool(converged)
+            self.converge_step = iteration
+        if self.converged2 and (iteration - self.burnin) >= self.min_steps:
+            log.info(f"Convergence reached at {self.converge_step}")
+            return True
+        return False
+
+
+# The log-posterior function held by each worker of an EmceeSampler pool
+_worker_lnpostfn = None
+
+
+def _init_worker(lnpostfn):
+    global _worker_lnpostfn
+    _worker_lnpostfn = lnpostfn
+
+
+def _worker_lnpost(theta):
+    return _worker_lnpostfn(theta)
 
 
 class MCMCSampler:
@@ -44,7 +142,7 @@ class MCMCSampler:
         """Give the initial position(s) for the fitter based on given values."""
         raise NotImplementedError
 
-    def run_mcmc(self, pos, nsteps):
+    def run_mcmc(self, pos, nsteps, autocorr=None):
         """Run the MCMC process from the given initial position
 
         Parameters
@@ -53,9 +151,22 @@ class MCMCSampler:
             The initial sampling point
         nstesps : int
             The number of iterations to run for
+        autocorr : AutocorrConvergence, optional
+            Convergence check used to stop the sampling early
         """
         raise NotImplementedError
 
+    def get_max_lnposterior(self):
+        """Return the highest log-posterior sampled so far and its parameters.
+
+        Samplers that do not keep track of this return None.
+        """
+        return None
+
+    def close(self):
+        """Release any resources (e.g., worker processes) used for sampling."""
+        pass
+
 
 class EmceeSampler(MCMCSampler):
     """Wrapper class around the emcee sampling package.
@@ -64,27 +175,103 @@ class EmceeSampler(MCMCSampler):
 
     Be warned: emcee can only handle double precision. You will never get a
     longdouble response back.
+
+    Parameters
+    ----------
+    nwalkers : int
+        Number of walkers
+    ncpu : int, optional
+        If given, evaluate the posterior over a pool of this many processes.
+        The posterior function (along with the model and the TOAs it holds) is
+        sent to each worker once, when the pool is created by
+        :meth:`initialize_sampler`; call :meth:`close` to shut the pool down
+        (:meth:`pint.mcmc_fitter.MCMCFitter.fit_toas` does this when done).
+    checkpoint : str or pathlib.Path, optional
+        File to which the chains are saved every ``checkpoint_interval``
+        iterations and at the end of :meth:`run_mcmc`. If the file exists when
+        :meth:`initialize_sampler` is called, the chains are loaded from it, and
+        :meth:`run_mcmc` resumes from the last saved iteration.
+    checkpoint_interval : int, optional
+        Number of iterations between checkpoints.
     """
 
-    def __init__(self, nwalkers):
+    def __init__(self, nwalkers, ncpu=None, checkpoint=None, checkpoint_interval=100):
         super().__init__()
         self.method = "Emcee"
         self.nwalkers = nwalkers
         self.sampler = None
+        self.ncpu = ncpu
+        self.pool = None
+        self.checkpoint = checkpoint
+        self.checkpoint_interval = checkpoint_interval
+        self.autocorr = None
+
+    def __getstate__(self):
+        # The pool cannot be pickled, e.g., when sending an MCMCFitter (which
+        # holds its sampler) to the workers
+        state = self.__dict__.copy()
+        state["pool"] = None
+        state["sampler"] = None
+        return state
 
     def is_initalized(self):
         """Simple way to check if the EmceeSampler can run yet."""
         return self.sampler is None
 
-    def initialize_sampler(self, lnpostfn, ndim):
+    def initialize_sampler(self, lnpostfn, ndim, **kwargs):
         """Initialize the internal sampler data.
 
         This is usually done after __init__ because ndim and lnpostfn are properties
-        of the Fitter that holds this sampler.
-
+        of the Fitter that holds this sampler. Extra keyword arguments (e.g.,
+        ``blobs_dtype``) are passed to :class:`emcee.EnsembleSampler`.
         """
         self.ndim = ndim
-        self.sampler = emcee.EnsembleSampler(self.nwalkers, self.ndim, lnpostfn)
+        if self.checkpoint is not None:
+            if "backend" in kwargs:
+                raise ValueError("Cannot use a backend along with a checkpoint file")
+            kwargs["backend"] = self._load_checkpoint()
+        if self.ncpu is not None:
+            self.close()
+            self.pool = multiprocessing.Pool(
+                self.ncpu, initializer=_init_worker, initargs=(lnpostfn,)
+            )
+            lnpostfn = _worker_lnpost
+        self.sampler = emcee.EnsembleSampler(
+            self.nwalkers, self.ndim, lnpostfn, pool=self.pool, **kwargs
+        )
+
+    def close(self):
+        """Shut down the worker pool, if any."""
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def _load_checkpoint(self):
+        if not os.path.exists(self.checkpoint):
+            return emcee.backends.Backend()
+        with open(self.checkpoint, "rb") as f:
+            backend = pickle.load(f)
+        if backend.shape != (self.nwalkers, self.ndim):
+            raise ValueError(
+                f"Checkpoint {self.checkpoint} has shape {backend.shape} "
+                f"but the sampler has shape {(self.nwalkers, self.ndim)}"
+            )
+        log.info(
+            f"Resuming from iteration {backend.iteration} of checkpoint {self.checkpoint}"
+        )
+        return backend
+
+    def save_checkpoint(self):
+        """Save the chains to the checkpoint file."""
+        if self.sampler is None:
+            raise ValueError("MCMCSampler object has not called initialize_sampler()")
+        # Write to a temporary file first so that an interruption doesn't
+        # destroy the previous checkpoint
+        tmpfile = f"{self.checkpoint}.tmp"
+        with open(tmpfile, "wb") as f:
+            pickle.dump(self.sampler.backend, f)
+        os.replace(tmpfile, self.checkpoint)
 
     def get_initial_pos(self, fitkeys, fitvals, fiterrs, errfact, **kwargs):
         """Get the initial positions for each walker of the sampler.
@@ -162,12 +349,51 @@ class EmceeSampler(MCMCSampler):
         chains = [samples[:, :, ii].T for ii in range(len(names))]
         return dict(zip(names, chains))
 
-    def run_mcmc(self, pos, nsteps):
+    def get_max_lnposterior(self):
+        """Return the highest log-posterior in the chains and its parameters."""
+        if self.sampler is None:
+            raise ValueError("MCMCSampler object has not called initialize_sampler()")
+        if self.sampler.iteration == 0:
+            return None
+        lnpost = self.sampler.get_log_prob()
+        ind = np.unravel_index(np.argmax(lnpost), lnpost.shape)
+        return lnpost[ind], self.sampler.get_chain()[ind]
+
+    def run_mcmc(self, pos, nsteps, autocorr=None):
         """
         Wraps around emcee.run_mcmc
+
+        Parameters
+        ----------
+        pos
+            The initial positions of the walkers. Ignored if there is a checkpoint
+            file, in which case the sampling continues from the end of the chains.
+        nsteps : int
+            The number of iterations to run for. If there is a checkpoint file,
+            this is the total number of iterations, including the saved ones.
+        autocorr : AutocorrConvergence, optional
+            If given, stop once the chains have converged according to this check.
+            It is stored as the ``autocorr`` attribute.
         """
         if self.sampler is None:
             raise ValueError("MCMCSampler object has not called initialize_sampler()")
-        self.sampler.run_mcmc(
-            pos, nsteps, progress=True, store=True, skip_initial_state_check=True
-        )
+        if self.checkpoint is not None and self.sampler.iteration > 0:
+            pos = self.sampler.get_last_sample()
+            nsteps -= self.sampler.iteration
+        self.autocorr = autocorr
+        for _ in self.sampler.sample(
+            pos,
+            iterations=max(nsteps, 0),
+            progress=True,
+            store=True,
+            skip_initial_state_check=True,
+        ):
+            if (
+                self.checkpoint is not None
+                and self.sampler.iteration % self.checkpoint_interval == 0
+            ):
+                self.save_checkpoint()
+            if autocorr is not None and autocorr(self.sampler):
+                break
+        if self.checkpoint is not None:
+            self.save_checkpoint()
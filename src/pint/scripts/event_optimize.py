@@ -3,6 +3,7 @@ import argparse
 import sys
 import os
 
+import astropy.units as u
 import matplotlib.pyplot as plt
 import numpy as np
 import scipy.optimize as op
@@ -21,6 +22,7 @@ from pint.eventstats import hm, hmw
 from pint.fitter import Fitter
 from pint.models.priors import Prior
 from pint.observatory.satellite_obs import get_satellite_observatory
+from pint.sampler import AutocorrConvergence, EmceeSampler
 
 
 __all__ = ["read_gaussfitfile", "marginalize_over_phase", "main"]
@@ -266,66 +268,140 @@ def run_sampler_autocorr(sampler, pos, nsteps, burnin, csteps=100, crit1=10):
     The sampler and the mean autocorrelation times
     Note
     ----
-    The function checks for convergence of the chains every specified number of steps.
-    The criteria to check for convergence is:
-        1. the chain has to be longer than the specified ratio times the estimated autocorrelation time
-        2. the change in the estimated autocorrelation time is less than 1%
+    The convergence check is done by :class:`pint.sampler.AutocorrConvergence`.
     """
-    autocorr = []
-    old_tau = np.inf
-    converged1 = False
-    converged2 = False
+    autocorr = AutocorrConvergence(burnin, csteps=csteps, crit1=crit1)
     for sample in sampler.sample(pos, iterations=nsteps, progress=True):
-        if not converged1:
-            # Checks if the iteration is past the burnin and checks for convergence at 10% tau change
-            if sampler.iteration >= burnin and sampler.iteration % csteps == 0:
-                tau = sampler.get_autocorr_time(tol=0, quiet=True)
-                if np.any(np.isnan(tau)):
-                    continue
-                else:
-                    x = np.mean(tau)
-                    autocorr.append(x)
-                    converged1 = np.all(tau * crit1 < sampler.iteration)
-                    converged1 &= np.all(np.abs(old_tau - tau) / tau < 0.1)
-                    # log.info("The mean estimated integrated autocorrelation step is: " + str(x))
-                    old_tau = tau
-                    if converged1:
-                        log.info(
-                            "10 % convergence reached with a mean estimated integrated step: "
-                            + str(x)
-                        )
-                    else:
-                        continue
-            else:
-                continue
-        else:
-            if not converged2:
-                # Checks for convergence at every 25 steps instead of 100 and tau change is 1%
-                if sampler.iteration % int(csteps / 4) == 0:
-                    tau = sampler.get_autocorr_time(tol=0, quiet=True)
-                    if np.any(np.isnan(tau)):
-                        continue
-                    else:
-                        x = np.mean(tau)
-                        autocorr.append(x)
-                        converged2 = np.all(tau * crit1 < sampler.iteration)
-                        converged2 &= np.all(np.abs(old_tau - tau) / tau < 0.01)
-                        # log.info("The mean estimated integrated autocorrelation step is: " + str(x))
-                        old_tau = tau
-                        converge_step = sampler.iteration
-                else:
+        if autocorr(sampler):
+            break
+    return autocorr.autocorr
+
+
+class LinearizedPhases:
+    """Photon phases from a Taylor expansion of the model around a reference point.
+
+    The phases and their derivatives with respect to the fit parameters
+    (including all the barycentric and binary delays) are computed once using
+    the full model, after which the phases for nearby parameter values are
+    ``phase0 + D @ (p - p0)``, which costs a single matrix-vector product.
+
+    The error of this approximation is bounded using the second derivatives
+    of the phase along each parameter, estimated by finite differences with the
+    given steps when this object is created. Whenever the bound exceeds
+    ``tolerance``, and every ``refresh`` evaluations, the exact phases are
+    computed instead. If the exact phases differ from the linearized ones by
+    more than ``tolerance``, or the bound is exceeded, the expansion is
+    recomputed around the current point; if they differ by more than the bound,
+    the second derivative estimates are scaled up accordingly.
+
+    Parameters
+    ----------
+    model : pint.models.timing_model.TimingModel
+        The timing model; the phases are computed at its current parameter values
+    toas : pint.toa.TOAs
+        The photon TOAs
+    params : list of str
+        The parameters that are varied
+    steps : array-like
+        Steps used to estimate the second derivatives, e.g., the parameter uncertainties
+    tolerance : float, optional
+        Maximum allowed phase error, in cycles
+    refresh : int, optional
+        Number of evaluations between checks against the exact phases
+    """
+
+    def __init__(self, model, toas, params, steps, tolerance=0.01, refresh=1000):
+        self.model = model
+        self.toas = toas
+        self.params = list(params)
+        self.tolerance = tolerance
+        self.refresh = refresh
+        self.ncalls = 0
+        self.nexact = 0
+        self.linearize()
+        self.curvature = self._estimate_curvature(np.asarray(steps, dtype=float))
+
+    def _values(self):
+        return np.array(
+            [getattr(self.model, p).value for p in self.params], dtype=np.longdouble
+        )
+
+    def _set_values(self, values):
+        for p, v in zip(self.params, values):
+            getattr(self.model, p).value = v
+
+    def linearize(self):
+        """Compute the phases and their derivatives at the current parameter values."""
+        delay = self.model.delay(self.toas)
+        self.ref_values = self._values()
+        self.ref_phase = self.model.phase(self.toas)
+        self.ref_frac = self.ref_phase.frac.value.astype(float)
+        self.D = np.transpose(
+            [
+                self.model.d_phase_d_param(self.toas, delay, p).to_value(
+                    1 / getattr(self.model, p).units,
+                    equivalencies=u.dimensionless_angles(),
+                )
+                for p in self.params
+            ]
+        ).astype(float)
+
+    def _estimate_curvature(self, steps):
+        curvature = np.zeros(len(self.params))
+        values = self._values()
+        try:
+            for i, h in enumerate(steps):
+                if h <= 0 or not np.isfinite(h):
                     continue
-            if converged2 and (sampler.iteration - burnin) >= 1000:
-                log.info(f"Convergence reached at {converge_step}")
-                break
-            else:
-                continue
-    return autocorr
+                d2 = 0
+                for sign in [1, -1]:
+                    shifted = values.copy()
+                    shifted[i] += sign * h
+                    self._set_values(shifted)
+                    d2 = d2 + (self.model.phase(self.toas) - self.ref_phase).value
+                curvature[i] = np.max(np.abs(d2.astype(float))) / h**2
+        finally:
+            self._set_values(values)
+        return curvature
+
+    def error_bound(self, delta):
+        """Bound on the phase error of the expansion for a parameter offset delta."""
+        return 0.5 * (np.sqrt(self.curvature) @ np.abs(delta)) ** 2
+
+    def phases(self):
+        """Return the phases (in [0, 1)) at the current parameter values of the model."""
+        self.ncalls += 1
+        delta = (self._values() - self.ref_values).astype(float)
+        bound = self.error_bound(delta)
+        linear = self.ref_frac + self.D @ delta
+        if bound <= self.tolerance and self.ncalls % self.refresh != 0:
+            return linear % 1
+
+        self.nexact += 1
+        exact = self.model.phase(self.toas).frac.value.astype(float)
+        error = np.max(np.abs((exact - linear + 0.5) % 1 - 0.5))
+        if bound > 0 and error > bound:
+            self.curvature *= error / bound
+        if error > self.tolerance or bound > self.tolerance:
+            log.debug(
+                f"Recomputing the phase expansion (error {error:.3g}, bound {bound:.3g})"
+            )
+            self.linearize()
+        return exact % 1
 
 
 class emcee_fitter(Fitter):
     def __init__(
-        self, toas=None, model=None, template=None, weights=None, phs=0.5, phserr=0.03
+        self,
+        toas=None,
+        model=None,
+        template=None,
+        weights=None,
+        phs=0.5,
+        phserr=0.03,
+        linearize=False,
+        tolerance=0.01,
+        refresh=1000,
     ):
         # super().__init__(model=model, toas=toas)
         self.toas = toas
@@ -339,11 +415,28 @@ class emcee_fitter(Fitter):
             self.model, phs, phserr
         )
         self.n_fit_params = len(self.fitvals)
+        self.linear_phases = (
+            LinearizedPhases(
+                self.model,
+                self.toas,
+                self.fitkeys[:-1],
+                self.fiterrs[:-1],
+                tolerance=tolerance,
+                refresh=refresh,
+            )
+            if linearize
+            else None
+        )
 
-    def get_event_phases(self):
+    def get_event_phases(self, linearized=False):
         """
         Return pulse phases based on the current model
+
+        If linearized is True and the fitter was created with linearize=True,
+        use the Taylor expansion of the phases (see :class:`LinearizedPhases`).
         """
+        if linearized and self.linear_phases is not None:
+            return self.linear_phases.phases()
         phss = self.model.phase(self.toas).frac
         return phss.value % 1
 
@@ -375,14 +468,14 @@ class emcee_fitter(Fitter):
             return -np.inf, -np.inf, -np.inf
 
         # Call PINT to compute the phases
-        phases = self.get_event_phases()
+        phases = self.get_event_phases(linearized=True)
         lnlikelihood = profile_likelihood(
             theta[-1], self.xtemp, phases, self.template, self.weights
         )
         lnpost = lnprior + lnlikelihood
         if lnpost > maxpost:
             log.info("New max: %f" % lnpost)
-            for name, val in zip(ftr.fitkeys, theta):
+            for name, val in zip(self.fitkeys, theta):
                 log.info("  %8s: %25.15g" % (name, val))
             maxpost = lnpost
             self.maxpost_fitvals = theta
@@ -397,7 +490,7 @@ class emcee_fitter(Fitter):
         self.set_params(dict(zip(self.fitkeys[:-1], ntheta)))
         if not np.isfinite(self.lnprior(ntheta)):
             return np.inf
-        phases = self.get_event_phases()
+        phases = self.get_event_phases(linearized=True)
         lnlikelihood = profile_likelihood(
             theta[-1], self.xtemp, phases, self.template, self.weights
         )
@@ -628,8 +721,43 @@ def main(argv=None):
         action="store_true",
         dest="noautocorr",
     )
+    parser.add_argument(
+        "--linearize",
+        help="Compute the photon phases in the posterior from a Taylor expansion of the model around the starting point",
+        default=False,
+        action="store_true",
+    )
+    parser.add_argument(
+        "--lin-tolerance",
+        type=float,
+        default=0.01,
+        help="Maximum phase error (in cycles) of the Taylor expansion of the photon phases",
+        dest="lin_tolerance",
+    )
+    parser.add_argument(
+        "--lin-refresh",
+        type=int,
+        default=1000,
+        help="Number of posterior evaluations between checks of the linearized phases against the exact ones",
+        dest="lin_refresh",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        help="Periodically save the chains to <basename>_checkpoint.pkl, and resume from it if it exists",
+        default=False,
+        action="store_true",
+    )
+    parser.add_argument(
+        "--checkpoint-interval",
+        type=int,
+        default=100,
+        help="Number of steps between checkpoints",
+        dest="checkpoint_interval",
+    )
 
     args = parser.parse_args(argv)
+    if args.checkpoint and args.backend:
+        parser.error("--checkpoint cannot be used together with --backend")
     pint.logging.setup(
         level=pint.logging.get_level(args.loglevel, args.verbosity, args.quiet)
     )
@@ -778,7 +906,17 @@ def main(argv=None):
             )
 
     # Now define the requirements for emcee
-    ftr = emcee_fitter(ts, modelin, gtemplate, weights, phs, args.phserr)
+    ftr = emcee_fitter(
+        ts,
+        modelin,
+        gtemplate,
+        weights,
+        phs,
+        args.phserr,
+        linearize=args.linearize,
+        tolerance=args.lin_tolerance,
+        refresh=args.lin_refresh,
+    )
 
     # Use this if you want to see the effect of setting minWeight
     if args.testWeights:
@@ -874,58 +1012,35 @@ def main(argv=None):
     import emcee
 
     # Setting up a backend to save the chains into an h5 file
+    kwargs = {}
     if args.backend:
         try:
             backend = emcee.backends.HDFBackend(filename + "_chains.h5")
             backend.reset(nwalkers, ndim)
+            kwargs["backend"] = backend
         except ImportError:
             log.warning("h5py package not installed. Backend set to None")
-            backend = None
-    else:
-        backend = None
 
     dtype = [("lnprior", float), ("lnlikelihood", float)]
 
-    # Following are for parallel processing tests...
-    if args.multicore:
-        try:
-            import pathos.multiprocessing as mp
-
-            def unwrapped_lnpost(theta):
-                return ftr.lnposterior(theta)
-
-            with mp.ProcessPool(nodes=ncores) as pool:
-                sampler = emcee.EnsembleSampler(
-                    nwalkers,
-                    ndim,
-                    unwrapped_lnpost,
-                    blobs_dtype=dtype,
-                    pool=pool,
-                    backend=backend,
-                )
-                if args.noautocorr:
-                    sampler.run_mcmc(pos, nsteps, progress=True)
-                else:
-                    autocorr = run_sampler_autocorr(sampler, pos, nsteps, burnin)
-            pool.close()
-            pool.join()
-        except ImportError:
-            log.info("Pathos module not available, using single core")
-            sampler = emcee.EnsembleSampler(
-                nwalkers, ndim, ftr.lnposterior, blobs_dtype=dtype, backend=backend
-            )
-            if args.noautocorr:
-                sampler.run_mcmc(pos, nsteps, progress=True)
-            else:
-                autocorr = run_sampler_autocorr(sampler, pos, nsteps, burnin)
-    else:
-        sampler = emcee.EnsembleSampler(
-            nwalkers, ndim, ftr.lnposterior, blobs_dtype=dtype, backend=backend
+    # With --multicore, the fitter (with the model and the events) is sent to
+    # each worker process once
+    esampler = EmceeSampler(
+        nwalkers,
+        ncpu=ncores if args.multicore else None,
+        checkpoint=filename + "_checkpoint.pkl" if args.checkpoint else None,
+        checkpoint_interval=args.checkpoint_interval,
+    )
+    try:
+        esampler.initialize_sampler(ftr.lnposterior, ndim, blobs_dtype=dtype, **kwargs)
+        esampler.run_mcmc(
+            pos,
+            nsteps,
+            autocorr=None if args.noautocorr else AutocorrConvergence(burnin),
         )
-        if args.noautocorr:
-            sampler.run_mcmc(pos, nsteps, progress=True)
-        else:
-            autocorr = run_sampler_autocorr(sampler, pos, nsteps, burnin)
+    finally:
+        esampler.close()
+    sampler = esampler.sampler
 
     def chains_to_dict(names, sampler):
         samples = np.transpose(sampler.get_chain(), (1, 0, 2))
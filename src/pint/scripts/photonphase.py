@@ -1,5 +1,12 @@
 #!/usr/bin/env python
+import collections
+import concurrent.futures
+import contextlib
+import os
+import shutil
 import sys
+import tempfile
+import time
 
 import astropy.io.fits as pyfits
 import numpy as np
@@ -12,16 +19,374 @@ pint.logging.setup(level=pint.logging.script_level)
 import pint.models
 import pint.residuals
 import pint.toa as toa
-from pint.event_toas import get_event_TOAs
-from pint.eventstats import h2sig, hm
+from pint.event_toas import get_event_TOAs, iter_event_TOAs
+from pint.eventstats import h2sig, harmonic_sums, hm
 from pint.fits_utils import read_fits_event_mjds
+from pint.observatory import Observatory
 from pint.observatory.satellite_obs import get_satellite_observatory
-from pint.plot_utils import phaseogram_binned
+from pint.plot_utils import phaseogram_binned, phaseogram_counts
 import pint.polycos as polycos
+from pint.predictor import ChebyPredictor
 
 __all__ = ["main"]
 
 
+def _copy_bytes(src, dst, nbytes, blocksize=2**24):
+    """Copy nbytes from the current position of src to dst."""
+    while nbytes > 0:
+        block = src.read(min(nbytes, blocksize))
+        if not block:
+            raise ValueError("Unexpected end of FITS file")
+        dst.write(block)
+        nbytes -= len(block)
+
+
+class _EventTableWriter:
+    """Write a copy of an event file with the given columns, one block of rows at a time.
+
+    The output is the event file itself if outfile is None. Missing columns are
+    added, filled with -1 for the rows without a value. Rather than building the
+    new table in memory, the records of the event table are read from the input
+    file in order and written out, with the new values, as each block of rows is
+    done. The output is written to a temporary file that only replaces the
+    output file once all the rows have been written.
+    """
+
+    def __init__(self, eventfile, outfile, columns):
+        self.eventfile = eventfile
+        self.outfile = eventfile if outfile is None else outfile
+        with pyfits.open(eventfile, memmap=True) as hdulist:
+            hdu = hdulist[1]
+            header = hdu.header.copy()
+            self.nrows = header["NAXIS2"]
+            self._datloc = hdulist.fileinfo(1)["datLoc"]
+            self._hdrloc = hdulist.fileinfo(1)["hdrLoc"]
+            self._restloc = hdulist.fileinfo(2)["hdrLoc"] if len(hdulist) > 2 else None
+            self._in_dtype = hdu.columns.dtype.newbyteorder(">")
+            if self._in_dtype.itemsize != header["NAXIS1"]:
+                raise ValueError(
+                    f"Cannot work out the record layout of the events table of {eventfile}"
+                )
+            missing = [key for key in columns if key not in hdu.columns.names]
+            for key in columns:
+                if key not in missing:
+                    log.info("Found existing %s column, overwriting..." % key)
+            # The scaling of existing columns, to write their raw values
+            self._scaling = {
+                key: (hdu.columns[key].bscale, hdu.columns[key].bzero)
+                for key in columns
+                if key not in missing
+            }
+            newcols = hdu.columns
+            for key in missing:
+                log.info("Adding new %s column." % key)
+                newcols = newcols + pyfits.ColDefs(
+                    [pyfits.Column(name=key, format=columns[key])]
+                )
+            # A header for the new table, with no rows
+            header = pyfits.BinTableHDU.from_columns(
+                newcols, header=header, nrows=0, name=hdu.name
+            ).header
+
+        self._heap = 0
+        self._theap = self._in_dtype.itemsize * self.nrows
+        if header.get("PCOUNT", 0) > 0:
+            self._theap = header.get("THEAP", self._theap)
+            self._heap = (
+                self._in_dtype.itemsize * self.nrows + header["PCOUNT"] - self._theap
+            )
+        header["NAXIS2"] = self.nrows
+        header["PCOUNT"] = self._heap
+        for key in ["THEAP", "CHECKSUM", "DATASUM"]:
+            header.remove(key, ignore_missing=True)
+        self._header = header
+
+        names = list(self._in_dtype.names)
+        formats = [self._in_dtype.fields[n][0] for n in names]
+        offsets = [self._in_dtype.fields[n][1] for n in names]
+        itemsize = self._in_dtype.itemsize
+        for key in missing:
+            names.append(key)
+            formats.append(">i8" if columns[key] == "K" else ">f8")
+            offsets.append(itemsize)
+            itemsize += 8
+        self._out_dtype = np.dtype(
+            {"names": names, "formats": formats, "offsets": offsets}
+        )
+        if itemsize != header["NAXIS1"]:
+            raise ValueError(
+                f"Cannot work out the record layout of the new events table of {eventfile}"
+            )
+        self._missing = missing
+        self._next_row = 0
+        self._src = self._dst = None
+
+    def __enter__(self):
+        directory = os.path.dirname(os.path.abspath(self.outfile))
+        fd, self._tmpname = tempfile.mkstemp(dir=directory, suffix=".fits")
+        self._dst = os.fdopen(fd, "wb")
+        self._src = open(self.eventfile, "rb")
+        _copy_bytes(self._src, self._dst, self._hdrloc)
+        self._dst.write(self._header.tostring().encode("ascii"))
+        self._src.seek(self._datloc)
+        return self
+
+    def write(self, rows, idx=None, values=None):
+        """Write the next block of rows, with the values of the columns at idx."""
+        if rows.start != self._next_row:
+            raise ValueError(
+                f"Rows must be written in order; expected row {self._next_row}"
+            )
+        nrows = rows.stop - rows.start
+        in_bytes = self._src.read(nrows * self._in_dtype.itemsize)
+        block = np.zeros(nrows, dtype=self._out_dtype)
+        block.view(np.uint8).reshape(nrows, -1)[
+            :, : self._in_dtype.itemsize
+        ] = np.frombuffer(in_bytes, dtype=np.uint8).reshape(nrows, -1)
+        for key in self._missing:
+            block[key] = -1
+        if values is not None:
+            for key in self._missing:
+                block[key][idx - rows.start] = values[key]
+            for key, (bscale, bzero) in self._scaling.items():
+                raw = values[key]
+                if bscale is not None or bzero is not None:
+                    raw = (raw - (bzero or 0)) / (bscale or 1)
+                block[key][idx - rows.start] = raw
+        self._dst.write(block.tobytes())
+        self._next_row = rows.stop
+
+    def _finish(self):
+        if self._next_row != self.nrows:
+            raise ValueError(f"Only {self._next_row} of {self.nrows} rows were written")
+        size = self._out_dtype.itemsize * self.nrows
+        if self._heap:
+            self._src.seek(self._datloc + self._theap)
+            _copy_bytes(self._src, self._dst, self._heap)
+            size += self._heap
+        self._dst.write(b"\0" * (-size % 2880))
+        if self._restloc is not None:
+            self._src.seek(self._restloc)
+            shutil.copyfileobj(self._src, self._dst)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        done = False
+        try:
+            if exc_type is None:
+                self._finish()
+                done = True
+        finally:
+            self._src.close()
+            self._dst.close()
+            if done:
+                if self.outfile == self.eventfile:
+                    log.info("Overwriting existing FITS file " + self.eventfile)
+                else:
+                    log.info("Writing output FITS file " + self.outfile)
+                os.replace(self._tmpname, self.outfile)
+            else:
+                os.remove(self._tmpname)
+
+
+class _PhaseStatistics:
+    """Running statistics of the phases of events processed in chunks.
+
+    Keeps the H-test harmonic sums, the range of MJDs and a phaseogram
+    histogram, so that the events themselves need not be kept. The time bins of
+    the phaseogram are a power of two days wide, made coarser as events arrive
+    so that there are at most ntimes of them.
+    """
+
+    def __init__(self, m=20, bins=100, ntimes=64):
+        self.m = m
+        self.bins = bins
+        self.ntimes = ntimes
+        self.n = 0
+        self.mjdmin = np.inf
+        self.mjdmax = -np.inf
+        self._sums = np.zeros(m, dtype=complex)
+        self._width = 2.0**-30
+        self._rows = {}
+
+    def add(self, mjds, phases):
+        if len(phases) == 0:
+            return
+        self.n += len(phases)
+        self.mjdmin = min(self.mjdmin, mjds.min())
+        self.mjdmax = max(self.mjdmax, mjds.max())
+        self._sums += harmonic_sums(phases, self.m)
+
+        # Coarsen the time bins until the MJD range fits in ntimes of them
+        first = np.floor(self.mjdmin / self._width)
+        last = np.floor(self.mjdmax / self._width)
+        scale = 1
+        while last // scale - first // scale >= self.ntimes:
+            scale *= 2
+        if scale > 1:
+            self._width *= scale
+            rows = {}
+            for key, counts in self._rows.items():
+                rows[key // scale] = rows.get(key // scale, 0) + counts
+            self._rows = rows
+
+        keys, inverse = np.unique(np.floor(mjds / self._width), return_inverse=True)
+        phasebins = np.minimum((phases * self.bins).astype(int), self.bins - 1)
+        counts = np.bincount(
+            inverse * self.bins + phasebins, minlength=len(keys) * self.bins
+        ).reshape(len(keys), self.bins)
+        for key, row in zip(keys, counts):
+            self._rows[key] = self._rows.get(key, 0) + row
+
+    def htest(self, c=4):
+        """The H statistic of all the phases so far, as :func:`pint.eventstats.hm`."""
+        z2 = (2.0 / self.n) * np.cumsum(np.abs(self._sums) ** 2)
+        return (z2 - c * np.arange(self.m)).max()
+
+    def phaseogram(self):
+        """Return the phaseogram counts and the MJDs at the edges of its time bins."""
+        first = min(self._rows)
+        last = max(self._rows)
+        counts = np.zeros((int(last - first) + 1, self.bins))
+        for key, row in self._rows.items():
+            counts[int(key - first)] = row
+        return counts, first * self._width, (last + 1) * self._width
+
+
+def _chunk_columns(modelin, ts, columns):
+    """Compute the requested output columns for a chunk of TOAs."""
+    iphss, phss = modelin.phase(ts, abs_phase=True)
+    result = {
+        "PULSE_PHASE": phss.value % 1,
+        "ABS_PHASE": np.asarray(iphss.value, dtype=np.int64),
+    }
+    if "BARY_TIME" in columns:
+        result["BARY_TIME"] = np.asarray(modelin.get_barycentric_toas(ts).value)
+    if "ORBIT_PHASE" in columns:
+        modelin.delay(ts)
+        orbits = modelin.binary_instance.orbits()
+        result["ORBIT_PHASE"] = orbits - np.floor(orbits)
+    return result
+
+
+def _compute_chunk(modelin, eventfile, telescope, columns, toa_kwargs, rows):
+    """Read a range of rows of the event file and compute its output columns.
+
+    Returns the indices of the events in the file, their MJDs and the columns,
+    or None if there are no events in the range.
+    """
+    for idx, ts in iter_event_TOAs(
+        eventfile, telescope, chunksize=rows.stop - rows.start, rows=rows, **toa_kwargs
+    ):
+        log.info(f"Computing phases for {len(ts)} events")
+        return idx, ts.get_mjds().value, _chunk_columns(modelin, ts, columns)
+    return None
+
+
+# The arguments of _compute_chunk() held by each worker process
+_worker_args = None
+
+
+def _init_worker(orbfile, *args):
+    global _worker_args
+    _worker_args = args
+    telescope = args[2]
+    if orbfile is not None and telescope not in Observatory.names():
+        get_satellite_observatory(telescope, orbfile)
+
+
+def _worker_compute_chunk(rows):
+    return _compute_chunk(*_worker_args, rows)
+
+
+def _phases_in_chunks(args, modelin, telescope, minmjd, maxmjd, use_planets):
+    """Compute the phases of the events one chunk at a time.
+
+    The chunks are contiguous, time-ordered ranges of rows of the event file. If
+    args.ncpu is more than 1, they are processed by a pool of worker processes,
+    each of which reads its chunks from the file and receives the model once.
+    Any requested output columns are written to the output file, in order, as
+    each chunk is done. Returns the :class:`_PhaseStatistics` of the events.
+    """
+    columns = {}
+    if args.addphase or args.addorbphase:
+        if args.addphase:
+            columns["PULSE_PHASE"] = "D"
+        if args.absphase:
+            columns["ABS_PHASE"] = "K"
+        if args.barytime:
+            columns["BARY_TIME"] = "D"
+        if args.addorbphase:
+            columns["ORBIT_PHASE"] = "D"
+
+    nrows = pyfits.getheader(args.eventfile, ext=1)["NAXIS2"]
+    chunks = [
+        slice(start, min(start + args.chunksize, nrows))
+        for start in range(0, nrows, args.chunksize)
+    ]
+    toa_kwargs = dict(
+        minmjd=minmjd,
+        maxmjd=maxmjd,
+        ephem=args.ephem,
+        include_bipm=args.use_bipm,
+        planets=use_planets,
+    )
+    chunk_args = (modelin, args.eventfile, telescope, columns, toa_kwargs)
+
+    stats = _PhaseStatistics()
+    with contextlib.ExitStack() as stack:
+        writer = None
+        if columns:
+            writer = stack.enter_context(
+                _EventTableWriter(args.eventfile, args.outfile, columns)
+            )
+        if args.ncpu > 1:
+            executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=args.ncpu,
+                initializer=_init_worker,
+                initargs=(args.orbfile,) + chunk_args,
+            )
+            pending = collections.deque()
+            stack.callback(_shutdown, executor, pending)
+            results = _map_bounded(
+                executor, _worker_compute_chunk, chunks, args.ncpu, pending
+            )
+        else:
+            results = (_compute_chunk(*chunk_args, rows) for rows in chunks)
+
+        for rows, result in zip(chunks, results):
+            if result is None:
+                if writer is not None:
+                    writer.write(rows)
+                continue
+            idx, chunk_mjds, values = result
+            stats.add(chunk_mjds, values["PULSE_PHASE"])
+            if writer is not None:
+                writer.write(rows, idx, values)
+    return stats
+
+
+def _map_bounded(executor, fn, items, nworkers, pending):
+    """Like executor.map, but with at most 2*nworkers tasks in flight, so that
+    finished chunks don't pile up in memory while waiting for an earlier one.
+
+    The futures not yet yielded are kept in the deque pending, so that they can
+    be cancelled with :func:`_shutdown` if the results are not all used.
+    """
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= 2 * nworkers:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _shutdown(executor, pending):
+    """Cancel the tasks that have not started and shut down the executor."""
+    for future in pending:
+        future.cancel()
+    executor.shutdown()
+
+
 def main(argv=None):
     import argparse
 
@@ -98,6 +463,24 @@ def main(argv=None):
         action="store_true",
         help="Use polycos to calculate phases; use when working with very large event files",
     )
+    parser.add_argument(
+        "--cheby",
+        default=False,
+        action="store_true",
+        help="Like --polycos, but use a Chebyshev phase predictor (see pint.predictor)",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        help="Process the events in chunks of this many, writing the output columns as each chunk is done; use when working with very large event files",
+    )
+    parser.add_argument(
+        "--ncpu",
+        type=int,
+        default=1,
+        help="Number of processes over which to spread the chunks of events; implies --chunksize 100000 if that is not given",
+    )
     parser.add_argument(
         "--log-level",
         type=str,
@@ -119,6 +502,10 @@ def main(argv=None):
     )
     #    parser.add_argument("--fix",help="Apply 1.0 second offset for NICER", action='store_true', default=False)
 
+    # The Chebyshev predictor takes the place of the polycos
+    if args.cheby:
+        args.polycos = True
+
     # If outfile is specified, that implies addphase
     if args.outfile is not None:
         args.addphase = True
@@ -165,6 +552,45 @@ def main(argv=None):
         )
         raise ValueError("Model missing AbsPhase component.")
 
+    if args.addorbphase and (not hasattr(modelin, "binary_model_name")):
+        log.error(
+            "TimingModel does not include a binary model, which is required for "
+            "computing orbital phases. Make sure you have BINARY and associated "
+            "model parameters in your par file!"
+        )
+        raise ValueError("Model missing BINARY component.")
+
+    if args.ncpu > 1 and args.chunksize is None:
+        args.chunksize = 100000
+
+    if args.chunksize is not None:
+        if args.polycos:
+            raise ValueError("Cannot use --chunksize with --polycos.")
+        tstart = time.perf_counter()
+        try:
+            stats = _phases_in_chunks(
+                args, modelin, telescope, minmjd, maxmjd, use_planets
+            )
+        except KeyError:
+            log.error(
+                "Observatory not recognized. This probably means you need to provide an orbit file or barycenter the event file."
+            )
+            sys.exit(1)
+        if stats.n == 0:
+            log.error("No TOAs, exiting!")
+            sys.exit(0)
+        elapsed = time.perf_counter() - tstart
+        print(
+            f"Processed {stats.n} events in {elapsed:.1f} s "
+            f"({stats.n / elapsed:.0f} events/s)"
+        )
+        print(stats.mjdmin, stats.mjdmax)
+        h = float(stats.htest())
+        print("Htest : {0:.2f} ({1:.2f} sigma)".format(h, h2sig(h)))
+        if args.plot:
+            phaseogram_counts(*stats.phaseogram(), plotfile=args.plotfile)
+        return
+
     # Read event file and return list of TOA objects, if not using polycos
     if args.polycos == False:
         try:
@@ -191,14 +617,6 @@ def main(argv=None):
             log.error("No TOAs, exiting!")
             sys.exit(0)
 
-    if args.addorbphase and (not hasattr(modelin, "binary_model_name")):
-        log.error(
-            "TimingModel does not include a binary model, which is required for "
-            "computing orbital phases. Make sure you have BINARY and associated "
-            "model parameters in your par file!"
-        )
-        raise ValueError("Model missing BINARY component.")
-
     # Use polycos to calculate pulse phases
     if args.polycos:
         log.info("Using polycos to get pulse phases.")
@@ -225,18 +643,28 @@ def main(argv=None):
             )
 
         # Create polycos table
-        log.debug("Generating polycos")
         telescope_n = "@"
-        p = polycos.Polycos()
-        ptable = p.generate_polycos(
-            modelin, minmjd, maxmjd, telescope_n, segLength, ncoeff, obsfreq
-        )
+        if args.cheby:
+            log.debug("Generating Chebyshev predictor")
+            ptable = ChebyPredictor.generate(
+                modelin, minmjd, maxmjd, telescope_n, obsfreq, segLength=segLength
+            )
+        else:
+            log.debug("Generating polycos")
+            p = polycos.Polycos()
+            ptable = p.generate_polycos(
+                modelin, minmjd, maxmjd, telescope_n, segLength, ncoeff, obsfreq
+            )
 
         # Calculate phases
         log.debug("Evaluating polycos")
-        phases = ptable.eval_phase(mjds)
+        phases, covered = ptable.eval_phase(mjds, return_mask=True)
+        if not np.all(covered):
+            log.warning(
+                f"{np.sum(~covered)} events not covered by the polycos; their phases are set to NaN"
+            )
         phases[phases < 0] += 1.0
-        h = float(hm(phases))
+        h = float(hm(phases[covered]))
         print("Htest : {0:.2f} ({1:.2f} sigma)".format(h, h2sig(h)))
     else:  # Normal mode, not polycos
         ts.filename = args.eventfile
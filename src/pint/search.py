@@ -0,0 +1,373 @@
+"""Periodicity searches of photon data over spin-parameter grids.
+
+Refining the spin parameters of a pulsar with photon data (or finding them
+in the first place near a known ephemeris) usually means computing the
+pulse phases for a grid of trial F0 (and F1, F2) values and evaluating the
+H-test or :math:`Z^2_m` for each trial.
+:func:`pint.search.periodicity_search` does this without recomputing the
+timing model for every trial: the photon phases and times since ``PEPOCH``
+(in the pulsar frame) are computed once from the model, and the phases for
+a trial are obtained by adding the Taylor terms of the spin-parameter
+offsets.  Along the (uniformly spaced) F0 axis the unit phasors
+:math:`e^{2\\pi i\\phi}` are updated by a constant factor per step, and
+all harmonics are obtained by recurrence, so only a few complex
+multiplications per photon are needed for each trial.  The grid is split
+into tiles which can be evaluated in parallel on an executor.
+
+Example usage::
+
+    >>> import numpy as np
+    >>> from pint.search import periodicity_search
+    >>> F0 = model.F0.value + np.linspace(-1e-6, 1e-6, 201)
+    >>> F1 = model.F1.value + np.linspace(-1e-14, 1e-14, 21)
+    >>> result = periodicity_search(model, toas, F0, F1, weights=weights)
+    >>> result.candidates(5).pprint()
+
+Here ``toas`` are photon TOAs (for instance from
+:func:`pint.event_toas.load_event_TOAs`) and ``weights`` optional photon
+weights.
+"""
+
+import concurrent.futures
+import multiprocessing
+
+import astropy.units as u
+import numpy as np
+from astropy.table import Table
+from loguru import logger as log
+from scipy.stats import chi2
+
+try:
+    from tqdm import tqdm
+except ModuleNotFoundError:
+    tqdm = None
+
+from pint.eventstats import phasor_sums, sf_hm, sig2sigma, sigma_trials
+from pint.logging import share_log
+
+__all__ = ["SearchResult", "periodicity_search"]
+
+# Target number of phasors (photons times trial frequencies) handled at a
+# time by _search_tile; bounds the size of the temporary arrays.
+_CHUNK_ELEMENTS = 2**18
+
+# Photon data used by worker processes; set once per worker by the initializer
+_worker_data = None
+
+
+class SearchResult:
+    """Result of a periodicity search.
+
+    Attributes
+    ----------
+    F0, F1, F2 : numpy.ndarray
+        Grid values [Hz, Hz/s, Hz/s^2]
+    stat : numpy.ndarray
+        Test statistic for each trial, with shape ``(len(F0), len(F1), len(F2))``
+    harmonics : numpy.ndarray
+        Number of harmonics of the statistic for each trial (for the H-test,
+        the number of harmonics at which the maximum is attained)
+    statistic : str
+        ``"h"`` for the H-test or ``"z2m"`` for :math:`Z^2_m`
+    m : int
+        Maximum number of harmonics
+    c : float
+        Offset per harmonic of the H-test
+    """
+
+    def __init__(self, F0, F1, F2, stat, harmonics, statistic, m, c):
+        self.F0 = F0
+        self.F1 = F1
+        self.F2 = F2
+        self.stat = stat
+        self.harmonics = harmonics
+        self.statistic = statistic
+        self.m = m
+        self.c = c
+
+    @property
+    def ntrials(self):
+        return self.stat.size
+
+    def logsf(self, stat=None):
+        """Natural logarithm of the single-trial chance probability
+
+        Parameters
+        ----------
+        stat : array-like, optional
+            Values of the statistic; default is the whole map.
+        """
+        stat = self.stat if stat is None else np.asarray(stat, dtype=float)
+        if self.statistic == "z2m":
+            return chi2.logsf(stat, 2 * self.m)
+        # sf_hm only takes scalars, and returns 1 for h=0 even for the log
+        return np.vectorize(
+            lambda h: 0.0 if h < 1e-16 else sf_hm(h, m=self.m, c=self.c, logprob=True)
+        )(stat)
+
+    def sigma(self, stat=None):
+        """Single-trial significance (in Gaussian sigma) of values of the statistic"""
+        return sig2sigma(self.logsf(stat), logprob=True)
+
+    def best(self):
+        """Return the (F0, F1, F2) of the trial with the largest statistic"""
+        i, j, k = np.unravel_index(np.argmax(self.stat), self.stat.shape)
+        return self.F0[i], self.F1[j], self.F2[k]
+
+    def candidates(self, n=10):
+        """Return the ``n`` trials with the largest statistic
+
+        Returns
+        -------
+        astropy.table.Table
+            With columns ``F0``, ``F1``, ``F2``, ``stat``, ``harmonics``,
+            ``logsf`` (single-trial), ``sigma`` (single-trial) and
+            ``sigma_trials`` (corrected for the number of trials in the grid).
+            Note that neighbouring grid points are strongly correlated, so
+            the trials correction is conservative.
+        """
+        flat = np.argsort(self.stat, axis=None)[::-1][:n]
+        i, j, k = np.unravel_index(flat, self.stat.shape)
+        stat = self.stat[i, j, k]
+        logsf = np.atleast_1d(self.logsf(stat))
+        sigma = np.atleast_1d(sig2sigma(logsf, logprob=True))
+        return Table(
+            {
+                "F0": self.F0[i] * u.Hz,
+                "F1": self.F1[j] * u.Hz / u.s,
+                "F2": self.F2[k] * u.Hz / u.s**2,
+                "stat": stat,
+                "harmonics": self.harmonics[i, j, k],
+                "logsf": logsf,
+                "sigma": sigma,
+                "sigma_trials": [sigma_trials(s, self.ntrials) for s in sigma],
+            },
+            meta={"statistic": self.statistic, "ntrials": self.ntrials},
+        )
+
+
+def _init_worker(data, logger_=None):
+    global _worker_data
+    _worker_data = data
+    if logger_ is not None:
+        # copy the log to all imported modules (including this one)
+        # this makes them respect the logger settings
+        share_log(logger_)
+
+
+def _search_tile(df0_start, df0_step, nf0, df1, df2, m, data=None):
+    """Harmonic sums for ``nf0`` F0 offsets starting at ``df0_start``
+
+    Returns the cumulative :math:`Z^2_k` (normalized by the weights),
+    shape ``(nf0, m)``.
+    """
+    phase0, dt, weights = _worker_data if data is None else data
+    n = len(phase0)
+    sums = np.zeros((nf0, m), dtype=complex)
+    nphot = max(1, min(n, _CHUNK_ELEMENTS))
+    ntrial = max(1, _CHUNK_ELEMENTS // nphot)
+    for lo in range(0, n, nphot):
+        t = dt[lo : lo + nphot]
+        w = None if weights is None else weights[lo : lo + nphot]
+        z0 = np.exp(
+            2j
+            * np.pi
+            * (phase0[lo : lo + nphot] + t * (df0_start + t * (df1 / 2 + t * df2 / 6)))
+        )
+        r = np.exp(2j * np.pi * df0_step * t)
+        # Phasors for a block of consecutive F0 values, stepped by r
+        z = np.empty((min(ntrial, nf0), len(t)), dtype=complex)
+        z[0] = z0
+        for i in range(1, len(z)):
+            z[i] = z[i - 1] * r
+        r_block = np.exp(2j * np.pi * len(z) * df0_step * t)
+        for first in range(0, nf0, len(z)):
+            nb = min(len(z), nf0 - first)
+            sums[first : first + nb] += phasor_sums(z[:nb], m, w)
+            z *= r_block
+    norm = n if weights is None else (weights**2).sum()
+    return np.cumsum(np.abs(sums) ** 2, axis=-1) * (2.0 / norm)
+
+
+def periodicity_search(
+    model,
+    toas,
+    F0,
+    F1=None,
+    F2=None,
+    weights=None,
+    statistic="h",
+    m=20,
+    c=4,
+    executor=None,
+    ncpu=None,
+    chunksize=256,
+    printprogress=False,
+):
+    """Evaluate the H-test or :math:`Z^2_m` over a grid of spin parameters.
+
+    Parameters
+    ----------
+    model : pint.models.timing_model.TimingModel
+        Timing model providing everything but the searched spin parameters
+        (astrometry, binary, ...) and the reference values of F0, F1, F2
+    toas : pint.toa.TOAs
+        Photon TOAs
+    F0 : astropy.units.Quantity or array-like
+        Uniformly spaced trial spin frequencies [Hz]
+    F1 : astropy.units.Quantity or array-like, optional
+        Trial spin frequency derivatives [Hz/s]; default is the model value
+    F2 : astropy.units.Quantity or array-like, optional
+        Trial second spin frequency derivatives [Hz/s^2]; default is the
+        model value (or 0)
+    weights : array-like, optional
+        Photon weights
+    statistic : str, optional
+        ``"h"`` for the (weighted) H-test, ``"z2m"`` for :math:`Z^2_m`
+    m : int, optional
+        Number of harmonics (maximum number for the H-test)
+    c : float, optional
+        Offset per harmonic for the H-test
+    executor : concurrent.futures.Executor or None, optional
+        Executor object to run multiple processes in parallel
+        If None, will use default :class:`concurrent.futures.ProcessPoolExecutor`, unless overridden by ``ncpu=1``
+    ncpu : int, optional
+        If an existing Executor is not supplied, one will be created with this number of workers.
+        If 1, will run single-processor version
+        If None, will use :func:`multiprocessing.cpu_count`
+    chunksize : int, optional
+        Number of F0 values in each tile of the grid handed to a worker
+    printprogress : bool, optional
+        Print indications of progress (requires :mod:`tqdm`)
+
+    Returns
+    -------
+    SearchResult
+
+    Notes
+    -----
+    The trial phases are :math:`\\phi + \\Delta F_0\\,dt + \\Delta F_1\\,dt^2/2
+    + \\Delta F_2\\,dt^3/6`, where :math:`\\phi` are the model phases,
+    :math:`dt` the time since ``PEPOCH`` in the pulsar frame and the
+    :math:`\\Delta F_i` the offsets from the model values; this is exact for
+    the spin parameters (the delays do not depend on them).
+
+    The behavior for different combinations of ``executor`` and ``ncpu`` is
+    the same as for :func:`pint.gridutils.grid_chisq`. Executors created
+    here send the photon data to each worker process once; with a
+    user-supplied executor it is sent with each tile.
+    """
+    if statistic not in ("h", "z2m"):
+        raise ValueError(f"Unknown statistic '{statistic}', use 'h' or 'z2m'")
+    if "Spindown" not in model.components:
+        raise ValueError("The timing model must have a Spindown component")
+
+    def reference(name):
+        return (
+            getattr(model, name).value
+            if name in model.params and getattr(model, name).value is not None
+            else 0.0
+        )
+
+    F0 = np.atleast_1d(u.Quantity(F0, u.Hz).value).astype(float)
+    F1 = np.atleast_1d(
+        reference("F1") if F1 is None else u.Quantity(F1, u.Hz / u.s).value
+    ).astype(float)
+    F2 = np.atleast_1d(
+        reference("F2") if F2 is None else u.Quantity(F2, u.Hz / u.s**2).value
+    ).astype(float)
+    if len(F0) > 1:
+        df0_step = (F0[-1] - F0[0]) / (len(F0) - 1)
+        if not np.allclose(np.diff(F0), df0_step, rtol=1e-3, atol=0):
+            raise ValueError("F0 grid must be uniformly spaced")
+    else:
+        df0_step = 0.0
+    df0_start = float(F0[0] - reference("F0"))
+    df1 = F1 - reference("F1")
+    df2 = F2 - reference("F2")
+
+    # Everything that does not depend on the spin parameters, computed once
+    delay = model.delay(toas)
+    dt = model.components["Spindown"].get_dt(toas, delay).to_value(u.s).astype(float)
+    phase0 = model.phase(toas, abs_phase=False).frac.value.astype(float)
+    if weights is not None:
+        weights = np.asarray(weights, dtype=float)
+        if weights.shape != dt.shape:
+            raise ValueError("There must be one weight per photon")
+    data = (phase0, dt, weights)
+
+    chunksize = max(1, int(chunksize))
+    tiles = [
+        (first, min(chunksize, len(F0) - first), j, k)
+        for j in range(len(F1))
+        for k in range(len(F2))
+        for first in range(0, len(F0), chunksize)
+    ]
+    log.debug(
+        f"Searching {len(F0) * len(F1) * len(F2)} trials with {len(toas)} photons in {len(tiles)} tiles"
+    )
+
+    own_executor = False
+    if isinstance(executor, concurrent.futures.Executor):
+        # the executor has already been created
+        executor = executor
+    elif executor is None and (ncpu is None or ncpu > 1):
+        # make the default type of Executor
+        if ncpu is None:
+            ncpu = multiprocessing.cpu_count()
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=min(ncpu, len(tiles)),
+            initializer=_init_worker,
+            initargs=(data, log),
+        )
+        own_executor = True
+
+    zcum = np.zeros((len(F0), len(F1), len(F2), m))
+    try:
+        if executor is None:
+            it = tiles
+            if printprogress and tqdm is not None:
+                it = tqdm(it, ascii=True)
+            for first, nf0, j, k in it:
+                zcum[first : first + nf0, j, k] = _search_tile(
+                    df0_start + first * df0_step,
+                    df0_step,
+                    nf0,
+                    df1[j],
+                    df2[k],
+                    m,
+                    data=data,
+                )
+        else:
+            futures = {
+                # Workers started here hold the photon data already
+                executor.submit(
+                    _search_tile,
+                    df0_start + first * df0_step,
+                    df0_step,
+                    nf0,
+                    df1[j],
+                    df2[k],
+                    m,
+                    None if own_executor else data,
+                ): (first, nf0, j, k)
+                for first, nf0, j, k in tiles
+            }
+            done = concurrent.futures.as_completed(futures)
+            if printprogress and tqdm is not None:
+                done = tqdm(done, total=len(futures), ascii=True)
+            for future in done:
+                first, nf0, j, k = futures[future]
+                zcum[first : first + nf0, j, k] = future.result()
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+    if statistic == "z2m":
+        stat = zcum[..., -1]
+        harmonics = np.full(stat.shape, m)
+    else:
+        penalized = zcum - c * np.arange(0, m)
+        harmonics = np.argmax(penalized, axis=-1) + 1
+        stat = np.max(penalized, axis=-1)
+    return SearchResult(F0, F1, F2, stat, harmonics, statistic, m, c)
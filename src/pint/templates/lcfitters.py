@@ -14,6 +14,11 @@ $Header: /nfs/slac/g/glast/ground/cvs/pointlike/python/uw/pulsar/lcfitters.py,v
 author: M. Kerr <matthew.kerr@gmail.com>
 
 """
+import concurrent.futures
+import contextlib
+import functools
+import multiprocessing
+
 import numpy as np
 import scipy
 from pint.eventstats import hm, hmw
@@ -50,6 +55,17 @@ def weighted_light_curve(nbins, phases, weights, normed=False, phase_shift=0):
     return bins, w1 / norm, errors / norm
 
 
+def _with_cache_settings(method):
+    """Run a fitter method with the cache settings of the fitter applied to its template."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._cache_settings():
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
 class LCFitter:
     def __init__(
         self,
@@ -61,6 +77,7 @@ class LCFitter:
         binned_bins=1000,
         binned_ebins=8,
         phase_shift=0,
+        use_cache=False,
     ):
         """Class for fitting light curves.
 
@@ -75,6 +92,12 @@ class LCFitter:
         binned_bins  [100]  phase bins to use in binned likelihood
         binned_ebins [8]    energy bins to use in binned likelihood
         phase_shift  [0]    set this if a phase shift has been applied
+        use_cache    [False] evaluate the unbinned likelihood and gradient
+                     by interpolating the template cache; for an energy-
+                     dependent template without cache energies, binned_ebins
+                     uniform energy bins spanning the photons are used
+                     while the fitter evaluates the template (the cache
+                     settings of the template are restored afterwards)
         """
         self.template = template
         self.phases = np.asarray(phases)
@@ -86,6 +109,12 @@ class LCFitter:
         self.binned_bins = binned_bins
         self.binned_ebins = binned_ebins  # TODO?
         self.phase_shift = phase_shift
+        self.use_cache = use_cache
+        self._cache_en_edges = None
+        if use_cache and template.is_energy_dependent() and (template.en_edges is None):
+            self._cache_en_edges = np.linspace(
+                self.log10_ens.min(), self.log10_ens.max(), binned_ebins + 1
+            )
         self.loglikelihood = self.unbinned_loglikelihood
         self.gradient = self.unbinned_gradient
 
@@ -109,12 +138,74 @@ class LCFitter:
 
     def __setstate__(self, state):
         self.__dict__ = state
+        if "use_cache" not in state:
+            self.use_cache = False
+        if "_cache_en_edges" not in state:
+            self._cache_en_edges = None
         self.loglikelihood = self.unbinned_loglikelihood
         self.gradient = self.unbinned_gradient
 
     def is_energy_dependent(self):
         return self.template.is_energy_dependent()
 
+    @contextlib.contextmanager
+    def _cache_settings(self):
+        """Give the template the cache energies of the fitter, restoring them on exit.
+
+        The template belongs to the caller, so its cache settings are only
+        changed while the fitter evaluates it.  Nested uses (e.g. likelihood
+        calls during a fit) find the settings in place and leave them alone.
+        """
+        t = self.template
+        if self._cache_en_edges is None or t.en_edges is not None:
+            yield
+            return
+        t.set_cache_properties(ncache=t.ncache, en_edges=self._cache_en_edges)
+        try:
+            yield
+        finally:
+            t.set_cache_properties(ncache=t.ncache, en_edges=None)
+
+    def _task_data(self):
+        """Return the data needed to rebuild this fitter in another process."""
+        kwargs = dict(
+            binned_bins=self.binned_bins,
+            binned_ebins=self.binned_ebins,
+            phase_shift=self.phase_shift,
+            use_cache=self.use_cache,
+        )
+        return self.template, self.phases, self.weights, self.log10_ens, kwargs
+
+    def _overall_phase_logl(self, phase):
+        self.template.set_overall_phase(phase)
+        return self.loglikelihood(self.template.get_parameters())
+
+    def _scan_overall_phase(self, dom, unbinned=True, executor=None, ncpu=1):
+        """Return the log likelihood with the template shifted to each phase.
+
+        If run serially, the template is left at the last phase of dom;
+        otherwise, the template is not changed.
+        """
+        data = self._task_data()
+        # a few shifts per task
+        chunks = np.array_split(dom, int(np.ceil(len(dom) / 8)))
+        executor, own_executor = _start_executor(executor, ncpu, data, len(chunks))
+        if executor is None:
+            return np.asarray([self._overall_phase_logl(x) for x in dom])
+        params = self.template.get_parameters().copy()
+        try:
+            cod = _run_tasks(
+                _position_logl,
+                [(params, chunk, unbinned) for chunk in chunks],
+                data,
+                executor,
+                own_executor,
+            )
+        finally:
+            if own_executor:
+                executor.shutdown()
+        return np.concatenate(cod)
+
     def _hist_setup(self):
         """Setup binning for a quick chi-squared fit."""
         h = hmw(self.phases, self.weights)
@@ -162,6 +253,7 @@ class LCFitter:
                 self.slices.append(slice(indices[mask].min(), indices[mask].max() + 1))
         self.counts_centers = np.asarray(self.counts_centers)
 
+    @_with_cache_settings
     def unbinned_loglikelihood(self, p, *args, **kwargs):
         t = self.template
         params_ok = t.set_parameters(p)
@@ -171,7 +263,7 @@ class LCFitter:
             return 2e20
         # TODO -- keep this formulation??
         arg = 1 + self.weights * (
-            t(self.phases, log10_ens=self.log10_ens, use_cache=False) - 1
+            t(self.phases, log10_ens=self.log10_ens, use_cache=self.use_cache) - 1
         )
         arg[arg <= 0] = 1e-300
         return -np.log(arg).sum()
@@ -196,6 +288,7 @@ class LCFitter:
         return -np.log(arg).sum()
         # return -np.log(1 + self.weights * phase_template_terms).sum()
 
+    @_with_cache_settings
     def unbinned_gradient(self, p, *args, **kwargs):
         t = self.template
         params_ok = t.set_parameters(p)
@@ -203,13 +296,31 @@ class LCFitter:
             return np.full(p.shape, 2e20)
         if (not params_ok) and ("skip_bounds_check" not in kwargs):
             return np.full(p.shape, 2e20)
-        g, tmpl = t.gradient(self.phases, log10_ens=self.log10_ens, template_too=True)
+        g, tmpl = t.gradient(
+            self.phases,
+            log10_ens=self.log10_ens,
+            template_too=True,
+            use_cache=self.use_cache,
+        )
         # numer = self.weights * t.gradient(self.phases,log10_ens=self.log10_ens)
         # denom = 1 + self.weights * (t(self.phases,log10_ens=self.log10_ens,use_cache=False) - 1)
         numer = self.weights * g
         denom = 1 + self.weights * (tmpl - 1)
         return -np.sum(numer / denom, axis=1)
 
+    def unbinned_hessian(self, p, *args, **kwargs):
+        """Return the analytic hessian of the unbinned (negative) log likelihood.
+
+        Requires a template supporting fused evaluation, see
+        LCTemplate.has_fused_evaluation.
+        """
+        t = self.template
+        t.set_parameters(p)
+        tmpl, g, h = t.evaluate_fused(self.phases, hessian=True)
+        a = self.weights / (1 + self.weights * (tmpl - 1))
+        ag = a * g
+        return np.einsum("ip,jp->ij", ag, ag) - np.einsum("ijp,p->ij", h, a)
+
     def binned_gradient(self, p, *args, **kwargs):
         t = self.template
         params_ok = t.set_parameters(p)
@@ -274,6 +385,7 @@ class LCFitter:
             self.loglikelihood = self.binned_loglikelihood
             self.gradient = self.binned_gradient
 
+    @_with_cache_settings
     def fit(
         self,
         quick_fit_first=False,
@@ -287,7 +399,20 @@ class LCFitter:
         unbinned_refit=True,
         try_bootstrap=True,
         quiet=False,
+        executor=None,
+        ncpu=1,
     ):
+        """Fit the template to the photons.
+
+        The brute force position scan (if overall_position_first is set)
+        and error estimates from bootstrapping (if the hessian fails) can
+        be run in parallel on ``executor`` (a
+        :class:`concurrent.futures.Executor`), or on a process pool of
+        ``ncpu`` workers (all CPUs if None).  By default, everything runs
+        serially.
+
+        Returns True if the fit succeeded.
+        """
         # NB use of priors currently not supported by quick_fit, positions first, etc.
         self._set_unbinned(unbinned)
         if (prior is not None) and (len(prior) > 0):
@@ -298,19 +423,16 @@ class LCFitter:
             grad_func = self.gradient
 
         if overall_position_first:
-            """do a brute force scan over profile down to <1mP."""
-
-            def logl(phase):
-                self.template.set_overall_phase(phase)
-                return self.loglikelihood(self.template.get_parameters())
-
+            # do a brute force scan over profile down to <1mP.
             # coarse grained
             dom = np.linspace(0, 1, 101)
-            cod = [logl(x) for x in 0.5 * (dom[1:] + dom[:-1])]
+            cod = self._scan_overall_phase(
+                0.5 * (dom[1:] + dom[:-1]), unbinned, executor, ncpu
+            )
             idx = np.argmin(cod)
             # fine grained
             dom = np.linspace(dom[idx], dom[idx + 1], 101)
-            cod = [logl(x) for x in dom]
+            cod = self._scan_overall_phase(dom, unbinned, executor, ncpu)
             # set to best fit phase shift
             ph0 = dom[np.argmin(cod)]
             self.template.set_overall_phase(ph0)
@@ -325,6 +447,8 @@ class LCFitter:
                 use_gradient=use_gradient,
                 positions_first=False,
                 quiet=quiet,
+                executor=executor,
+                ncpu=ncpu,
             )
             self._fix_state(restore_state)
 
@@ -361,6 +485,8 @@ class LCFitter:
                     positions_first=positions_first,
                     estimate_errors=estimate_errors,
                     prior=prior,
+                    executor=executor,
+                    ncpu=ncpu,
                 )
             self.bad_p = self.template.get_parameters().copy()
             self.bad_ll = self.ll
@@ -380,12 +506,15 @@ class LCFitter:
             and not self.hess_errors(use_gradient=use_gradient)
             and try_bootstrap
         ):
-            self.bootstrap_errors(set_errors=True)
+            self.bootstrap_errors(set_errors=True, executor=executor, ncpu=ncpu)
         if not quiet:
             print("Improved log likelihood by %.2f" % (self.ll - ll0))
         return True
 
-    def fit_position(self, unbinned=True, track=False, skip_coarse=False):
+    @_with_cache_settings
+    def fit_position(
+        self, unbinned=True, track=False, skip_coarse=False, executor=None, ncpu=1
+    ):
         """Fit overall template position.  Return shift and its error.
 
         Parameters
@@ -395,6 +524,13 @@ class LCFitter:
         track : bool
             Limit best-fit solution to +/- 0.2 periods of zero phase.
             Helps to avoid 0.5period ambiguity for two-peaked profiles.
+        skip_coarse : bool
+            Only scan within +/- 0.01 periods of the current position.
+        executor : concurrent.futures.Executor or None, optional
+            Executor to run the coarse position scan on.
+        ncpu : int or None, optional
+            If no executor is given, run the scan on a process pool with this
+            many workers (all CPUs if None); the default of 1 runs serially.
 
         Returns
         -------
@@ -423,7 +559,7 @@ class LCFitter:
                 dom = np.linspace(ph0 - 0.01, ph0 + 0.01, 21)
             else:
                 dom = np.linspace(0, 1, 101)
-        x0 = min(dom, key=logl)
+        x0 = dom[np.argmin(self._scan_overall_phase(dom, unbinned, executor, ncpu))]
         ph1 = fmin(logl, x0, full_output=True, disp=0, xtol=1e-6)[0][0]
         self.template.set_overall_phase(ph1)
 
@@ -527,22 +663,38 @@ class LCFitter:
         )
 
     def hess_errors(self, use_gradient=True):
-        """Set errors from hessian.  Fit should be called first..."""
+        """Set errors from hessian.  Fit should be called first...
+
+        For an unbinned fit of a template supporting fused evaluation, the
+        hessian is computed analytically; otherwise, it is estimated by
+        finite differences (of the gradient, if use_gradient is set).
+        """
         p = self.template.get_parameters()
         nump = len(p)
         self.cov_matrix = np.zeros([nump, nump], dtype=float)
         logl = lambda p: self.loglikelihood(p, skip_bounds_check=True)
         grad = lambda p: self.gradient(p, skip_counts_check=True)
-        ss = calc_step_size(logl, p.copy())
+        analytic = (
+            self.loglikelihood == self.unbinned_loglikelihood
+        ) and self.template.has_fused_evaluation()
         if use_gradient:
-            h1 = hess_from_grad(grad, p.copy(), step=ss)
-            c1 = scipy.linalg.inv(h1)
+            if analytic:
+                h1 = self.unbinned_hessian(p.copy())
+            else:
+                ss = calc_step_size(logl, p.copy())
+                h1 = hess_from_grad(grad, p.copy(), step=ss)
+            try:
+                c1 = scipy.linalg.inv(h1)
+            except scipy.linalg.LinAlgError:
+                print("Hessian matrix was singular!  Aborting.")
+                return False
             if np.all(np.diag(c1) > 0):
                 self.cov_matrix = c1
             else:
                 print("Could not estimate errors from hessian.")
                 return False
         else:
+            ss = calc_step_size(logl, p.copy())
             h1 = hessian(self.template, logl, delta=ss)
             try:
                 c1 = scipy.linalg.inv(h1)
@@ -567,39 +719,159 @@ class LCFitter:
         self.template.set_errors(np.diag(self.cov_matrix) ** 0.5)
         return True
 
-    def bootstrap_errors(self, nsamp=100, fit_kwargs={}, set_errors=False):
-        p0 = self.phases
-        w0 = self.weights
-        param0 = self.template.get_parameters().copy()
-        n = len(p0)
-        results = np.empty([nsamp, len(self.template.get_parameters())])
+    def bootstrap_errors(
+        self,
+        nsamp=100,
+        fit_kwargs=None,
+        set_errors=False,
+        executor=None,
+        ncpu=1,
+        seed=None,
+    ):
+        """Estimate parameter errors by refitting resampled photons.
+
+        Each bootstrap replicate draws the photons with replacement using
+        its own random seed, derived from ``seed``, so the results do not
+        depend on how the fits are distributed over workers.  Failed fits
+        are replaced by further replicates, up to 2*nsamp in total.
+
+        Parameters
+        ----------
+        nsamp : int
+            number of bootstrap replicates
+        fit_kwargs : dict, optional
+            keyword arguments for :meth:`LCFitter.fit`
+        set_errors : bool
+            set the template errors to the standard deviation of the fits
+        executor : concurrent.futures.Executor or None, optional
+            Executor to run the fits on.  The photon phases, weights, and
+            template are sent with each fit.
+        ncpu : int or None, optional
+            If no executor is given, run the fits on a process pool with this
+            many workers (all CPUs if None), each receiving the photon data
+            once; the default of 1 runs serially.
+        seed : int or None, optional
+            Seed for the resampling; if None, one is drawn from the global
+            :mod:`numpy.random` state.
+
+        Returns
+        -------
+        results : ndarray
+            nsamp x nparam fitted free parameters
+        """
+        fit_kwargs = {} if fit_kwargs is None else dict(fit_kwargs)
         fit_kwargs["estimate_errors"] = False  # never estimate errors
         if "unbinned" not in fit_kwargs.keys():
             fit_kwargs["unbinned"] = True
-        counter = 0
-        for i in range(nsamp * 2):
-            if counter == nsamp:
-                break
-            if i == (2 * nsamp - 1):
-                self.phases = p0
-                self.weights = w0
-                raise ValueError("Could not construct bootstrap sample.  Giving up.")
-            a = (np.random.rand(n) * n).astype(int)
-            self.phases = p0[a]
-            if w0 is not None:
-                self.weights = w0[a]
-            if not fit_kwargs["unbinned"]:
-                self._hist_setup()
-            if self.fit(**fit_kwargs):
-                results[counter, :] = self.template.get_parameters()
-                counter += 1
-            self.template.set_parameters(param0)
+        if seed is None:
+            seed = np.random.randint(2**31)
+        seeds = np.random.SeedSequence(seed).spawn(2 * nsamp)
+        param0 = self.template.get_parameters().copy()
+        data = self._task_data()
+        executor, own_executor = _start_executor(executor, ncpu, data, nsamp)
+        results = []
+        ntried = 0
+        try:
+            # replace failed fits by the next replicates until done
+            while (len(results) < nsamp) and (ntried < len(seeds)):
+                batch = seeds[ntried : ntried + nsamp - len(results)]
+                ntried += len(batch)
+                fits = _run_tasks(
+                    _bootstrap_fit,
+                    [(param0, s, fit_kwargs) for s in batch],
+                    data,
+                    executor,
+                    own_executor,
+                )
+                results.extend(p for p in fits if p is not None)
+        finally:
+            if own_executor:
+                executor.shutdown()
+        if len(results) < nsamp:
+            raise ValueError("Could not construct bootstrap sample.  Giving up.")
+        results = np.asarray(results)
         if set_errors:
             self.template.set_errors(np.std(results, axis=0))
-        self.phases = p0
-        self.weights = w0
         return results
 
+    def fit_restarts(
+        self,
+        nstart=8,
+        scatter=0.05,
+        fit_kwargs=None,
+        executor=None,
+        ncpu=1,
+        seed=None,
+    ):
+        """Fit from several starting points and keep the best fit.
+
+        The first fit starts from the current template.  For the others,
+        each free parameter is perturbed by a Gaussian with standard
+        deviation ``scatter`` times the width of its bounds (and clipped to
+        the bounds).  Of the successful fits, the one with the highest
+        likelihood is kept; ties go to the earliest start.
+
+        Parameters
+        ----------
+        nstart : int
+            number of starting points
+        scatter : float
+            size of the perturbations, relative to the parameter bounds
+        fit_kwargs : dict, optional
+            keyword arguments for :meth:`LCFitter.fit`; errors, if
+            requested, are only estimated for the best fit
+        executor : concurrent.futures.Executor or None, optional
+            Executor to run the fits on.
+        ncpu : int or None, optional
+            If no executor is given, run the fits on a process pool with this
+            many workers (all CPUs if None); the default of 1 runs serially.
+        seed : int or None, optional
+            Seed for the starting points.
+
+        Returns
+        -------
+        bool
+            True if any of the fits succeeded.
+        """
+        fit_kwargs = {} if fit_kwargs is None else dict(fit_kwargs)
+        estimate_errors = fit_kwargs.pop("estimate_errors", False)
+        fit_kwargs["estimate_errors"] = False
+        self._set_unbinned(fit_kwargs.get("unbinned", True))
+
+        rng = np.random.default_rng(seed)
+        p0 = self.template.get_parameters().copy()
+        lo, hi = np.asarray(self.template.get_bounds(), dtype=float).T
+        starts = [p0] + [
+            np.clip(p0 + scatter * (hi - lo) * rng.standard_normal(len(p0)), lo, hi)
+            for i in range(nstart - 1)
+        ]
+
+        data = self._task_data()
+        executor, own_executor = _start_executor(executor, ncpu, data, nstart)
+        try:
+            fits = _run_tasks(
+                _restart_fit,
+                [(p, fit_kwargs) for p in starts],
+                data,
+                executor,
+                own_executor,
+            )
+        finally:
+            if own_executor:
+                executor.shutdown()
+        self.restart_lls = np.asarray([ll if ok else np.nan for ok, ll, p in fits])
+
+        good = [i for i, (ok, ll, p) in enumerate(fits) if ok]
+        if len(good) == 0:
+            print("All fits failed -- keeping parameters.")
+            return False
+        best = max(good, key=lambda i: fits[i][1])
+        _, self.ll, self.fitvals = fits[best]
+        self.template.set_parameters(self.fitvals)
+        if estimate_errors:
+            self.hess_errors(use_gradient=fit_kwargs.get("use_gradient", True))
+        return True
+
     def write_template(self, outputfile="template.gauss"):
         s = self.template.prof_string(outputfile=outputfile)
 
@@ -864,6 +1136,104 @@ class LCFitter:
         return ts
 
 
+# Data for reconstructing a fitter, held by worker processes started by
+# _start_executor
+_worker_data = None
+
+
+def _init_worker(data):
+    """Store the fitter data in a worker process."""
+    global _worker_data
+    _worker_data = data
+
+
+def _start_executor(executor, ncpu, data, ntasks):
+    """Return an executor to use and whether it was started here.
+
+    If ``executor`` is None and ``ncpu`` is 1, return None (run serially).
+    If ``ncpu`` is None, use all CPUs.  Workers started here receive the
+    fitter data once, when they start.
+    """
+    if isinstance(executor, concurrent.futures.Executor):
+        return executor, False
+    if ncpu is None:
+        ncpu = multiprocessing.cpu_count()
+    if executor is None and ncpu > 1:
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=min(ncpu, ntasks),
+            initializer=_init_worker,
+            initargs=(data,),
+        )
+        return executor, True
+    return None, False
+
+
+def _run_tasks(func, tasks, data, executor=None, own_executor=False):
+    """Return [func(*task) for task in tasks], in order, using the executor.
+
+    The fitter data are passed along with each task unless the executor
+    was started by _start_executor, whose workers already hold them.
+    """
+    if executor is None:
+        return [func(*task, data=data) for task in tasks]
+    futures = [
+        executor.submit(func, *task, data=None if own_executor else data)
+        for task in tasks
+    ]
+    return [future.result() for future in futures]
+
+
+def _make_fitter(params, data=None, sample=None):
+    """Rebuild a fitter from the shipped data and free template parameters.
+
+    The template is copied, so tasks never modify a shared template.  If
+    ``sample`` is given, use only these photons (with repetition).
+    """
+    template, phases, weights, log10_ens, kwargs = (
+        _worker_data if data is None else data
+    )
+    template = template.copy()
+    template.set_parameters(params)
+    if sample is not None:
+        phases = phases[sample]
+        weights = weights[sample]
+        if isvector(log10_ens):
+            log10_ens = log10_ens[sample]
+    return LCFitter(template, phases, weights=weights, log10_ens=log10_ens, **kwargs)
+
+
+def _position_logl(params, shifts, unbinned=True, data=None):
+    """Return the log likelihood for each overall template phase."""
+    lcf = _make_fitter(params, data=data)
+    lcf._set_unbinned(unbinned)
+    return [lcf._overall_phase_logl(x) for x in shifts]
+
+
+def _bootstrap_fit(params, seed, fit_kwargs, data=None):
+    """Fit a bootstrap resampling of the photons.
+
+    Return the fitted free parameters, or None if the fit failed.
+    """
+    n = len((_worker_data if data is None else data)[1])
+    sample = np.random.default_rng(seed).integers(0, n, n)
+    lcf = _make_fitter(params, data=data, sample=sample)
+    if not fit_kwargs["unbinned"]:
+        lcf._hist_setup()
+    if lcf.fit(**fit_kwargs):
+        return lcf.template.get_parameters()
+    return None
+
+
+def _restart_fit(params, fit_kwargs, data=None):
+    """Fit starting from the given free parameters.
+
+    Return success, the log likelihood, and the fitted free parameters.
+    """
+    lcf = _make_fitter(params, data=data)
+    success = lcf.fit(**fit_kwargs)
+    return success, lcf.ll, lcf.template.get_parameters()
+
+
 def hessian(m, mf, *args, **kwargs):
     """Calculate the Hessian; mf is the minimizing function, m is the model,args additional arguments for mf."""
     p = m.get_parameters().copy()
@@ -1689,3 +1689,149 @@ class FastBessel(object):
 
     def __call__(self, x):
         return np.exp(self._interp(np.log(x)))
+
+
+def _fused_gaussian_terms(width, x0, phases, order=1):
+    """Stacked value, gradient, and hessian of wrapped Gaussians."""
+    width = width[:, None]
+    dx = phases[None, :] - x0[:, None]
+    f = np.zeros(dx.shape)
+    g = np.zeros((dx.shape[0], 2, dx.shape[1])) if order > 0 else None
+    h = np.zeros((dx.shape[0], 2, 2, dx.shape[1])) if order > 1 else None
+    for i in range(MAXWRAPS + 1):
+        t = np.zeros(dx.shape)
+        for index in [0] if i == 0 else [i, -i]:
+            z = (dx + index) / width
+            z2 = z**2
+            fi = (1.0 / (width * ROOT2PI)) * np.exp(-0.5 * z2)
+            t += fi
+            if order > 0:
+                q = fi / width
+                g[:, 0] += q * (z2 - 1.0)
+                g[:, 1] += q * z
+            if order > 1:
+                q = q / width
+                h[:, 0, 0] += q * (z2**2 - 5 * z2 + 2)
+                h[:, 0, 1] += q * (z2 - 3) * z
+                h[:, 1, 1] += q * (z2 - 1)
+        f += t
+        if (i >= MINWRAPS) and (np.all(t < WRAPEPS)):
+            break
+    else:
+        # add the DC component corresponding to truncation, as in
+        # LCWrappedFunction.__call__
+        z1 = (-i - x0) / width[:, 0]
+        z2 = (i + 1 - x0) / width[:, 0]
+        f += (1 - 0.5 * (erf(z2 / ROOT2) - erf(z1 / ROOT2)))[:, None]
+    if order > 1:
+        h[:, 1, 0] = h[:, 0, 1]
+    return f, g, h
+
+
+def _fused_lorentzian_terms(gamma, loc, phases, order=1):
+    """Stacked value, gradient, and hessian of wrapped Lorentzians."""
+    gamma = gamma[:, None]
+    z = TWOPI * (phases[None, :] - loc[:, None])
+    s1 = np.sinh(gamma)
+    c1 = np.cosh(gamma)
+    c = np.cos(z)
+    s = np.sin(z)
+    f = s1 / (c1 - c)
+    f2 = f**2
+    g = h = None
+    if order > 0:
+        g = np.empty((z.shape[0], 2, z.shape[1]))
+        g[:, 0] = f * (c1 / s1) - f2
+        g[:, 1] = f2 * (TWOPI / s1) * s
+    if order > 1:
+        h = np.empty((z.shape[0], 2, 2, z.shape[1]))
+        h[:, 0, 0] = f - 3 * (c1 / s1) * f2 + 2 * f2 * f
+        h[:, 0, 1] = (TWOPI * s) * f2 * (c1 / s1**2 - 2 * f / s1)
+        h[:, 1, 0] = h[:, 0, 1]
+        h[:, 1, 1] = (-(TWOPI**2) / s1) * f2 * (c - 2 * f * s**2 / s1)
+    return f, g, h
+
+
+def _fused_vonmises_terms(width, loc, phases, order=1):
+    """Stacked value, gradient, and hessian of von Mises peaks."""
+    kappa = 1.0 / width[:, None]
+    I0 = i0(kappa)
+    ratio = i1(kappa) / I0
+    z = TWOPI * (phases[None, :] - loc[:, None])
+    cz = np.cos(z)
+    sz = np.sin(z)
+    f = np.exp(cz * kappa) / I0
+    a = ratio - cz
+    g = h = None
+    if order > 0:
+        g = np.empty((z.shape[0], 2, z.shape[1]))
+        g[:, 0] = f * kappa**2 * a
+        g[:, 1] = f * (TWOPI * kappa) * sz
+    if order > 1:
+        # d(I1/I0)/dkappa
+        dratio = 1 - ratio / kappa - ratio**2
+        h = np.empty((z.shape[0], 2, 2, z.shape[1]))
+        h[:, 0, 0] = f * kappa**2 * (kappa**2 * (a**2 - dratio) - 2 * kappa * a)
+        h[:, 0, 1] = (-TWOPI) * kappa**2 * sz * f * (1 - kappa * a)
+        h[:, 1, 0] = h[:, 0, 1]
+        h[:, 1, 1] = (TWOPI**2 * kappa) * f * (kappa * sz**2 - cz)
+    return f, g, h
+
+
+_FUSED_TERMS = {
+    LCGaussian: _fused_gaussian_terms,
+    LCLorentzian: _fused_lorentzian_terms,
+    LCVonMises: _fused_vonmises_terms,
+}
+
+# primitive classes supported by fused_primitive_terms
+FUSED_PRIMITIVES = tuple(_FUSED_TERMS.keys())
+
+
+def fused_primitive_terms(primitives, phases, order=1):
+    """Evaluate several primitives at once, with stacked parameters.
+
+    Rather than calling each primitive in turn, the primitives of each
+    supported type are evaluated together, with parameters broadcast
+    against the phases.  The gradient and hessian are with respect to
+    all (free and fixed) parameters of each primitive.
+
+    Parameters
+    ----------
+    primitives : list
+        primitives, each an instance of one of FUSED_PRIMITIVES (subclasses,
+        e.g. energy-dependent primitives, are not supported)
+    phases : array_like
+        phases at which to evaluate the primitives
+    order : int
+        0 for values only, 1 to include the gradient, 2 to include the
+        hessian
+
+    Returns
+    -------
+    value : ndarray
+        nprim x nphase values
+    gradient : ndarray or None
+        nprim x 2 x nphase gradient if order >= 1
+    hessian : ndarray or None
+        nprim x 2 x 2 x nphase hessian if order >= 2
+    """
+    phases = np.asarray(phases, dtype=float)
+    if not all(type(p) in _FUSED_TERMS for p in primitives):
+        raise ValueError("Fused evaluation is not available for these primitives.")
+    n = len(primitives)
+    f = np.empty((n, len(phases)))
+    g = np.empty((n, 2, len(phases))) if order > 0 else None
+    h = np.empty((n, 2, 2, len(phases))) if order > 1 else None
+    for ptype, terms in _FUSED_TERMS.items():
+        idx = [i for i, p in enumerate(primitives) if type(p) is ptype]
+        if len(idx) == 0:
+            continue
+        p = np.asarray([primitives[i].p for i in idx], dtype=float)
+        fi, gi, hi = terms(p[:, 0], p[:, 1], phases, order=order)
+        f[idx] = fi
+        if order > 0:
+            g[idx] = gi
+        if order > 1:
+            h[idx] = hi
+    return f, g, h
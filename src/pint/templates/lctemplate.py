@@ -46,6 +46,7 @@ class LCTemplate:
         self._sanity_checks()
         self._cache = defaultdict(None)
         self._cache_dirty = defaultdict(lambda: True)
+        self._prim_cache = {}
         if cache_kwargs is None:
             cache_kwargs = {}
         self.set_cache_properties(**cache_kwargs)
@@ -60,6 +61,8 @@ class LCTemplate:
             # make _cache_dirty a defaultdict from a normal dict
             _cache_dirty.update(self._cache_dirty)
         self._cache_dirty = _cache_dirty
+        # primitive caches are keyed on object identity, so cannot be reused
+        self._prim_cache = {}
         if not hasattr(self, "ncache"):
             self.ncache = 1000
         if not hasattr(self, "ph_edges"):
@@ -73,6 +76,7 @@ class LCTemplate:
         # transform _cache_dirty into a normal dict, necessary to pickle it
         state = self.__dict__.copy()
         state["_cache_dirty"] = dict(state["_cache_dirty"])
+        state["_prim_cache"] = {}
         return state
 
     def _sanity_checks(self):
@@ -86,6 +90,16 @@ class LCTemplate:
     def has_bridge(self):
         return False
 
+    def has_fused_evaluation(self):
+        """Return True if all components can be evaluated together.
+
+        This is the case for energy-independent templates comprising only
+        Gaussian, Lorentzian, and von Mises primitives.
+        """
+        return (not self.norms.is_energy_dependent()) and all(
+            type(p) in FUSED_PRIMITIVES for p in self.primitives
+        )
+
     def __getitem__(self, index):
         if index < 0:
             index += len(self.primitives) + 1
@@ -123,6 +137,7 @@ class LCTemplate:
         energies that wil be used.
 
         Interpolation is always linear (bilinear in energy if applicable.)
+        The energy edges are assumed to be uniformly spaced.
         """
         if hasattr(self, "ncache") and (ncache == self.ncache):
             if (en_edges is None) and (self.en_edges is None):
@@ -140,6 +155,7 @@ class LCTemplate:
                 raise ValueError("len(en_edges) must be >=2.")
             self.en_edges = en_edges
             self.en_cens = 0.5 * (en_edges[1:] + en_edges[:-1])
+        self._prim_cache = {}
         self.mark_cache_dirty()
 
     def mark_cache_dirty(self):
@@ -156,34 +172,101 @@ class LCTemplate:
         assert rval.shape[-1] == (self.ncache + 1)
         return rval
 
+    def _cache_grid(self):
+        """Return the (flattened) phases and log10 energies of the cache nodes."""
+        if self.en_edges is None:
+            return self.ph_edges, 3
+        phases = np.tile(self.ph_edges, len(self.en_edges))
+        log10_ens = np.repeat(self.en_edges, len(self.ph_edges))
+        return phases, log10_ens
+
+    def _cache_shape(self):
+        if self.en_edges is None:
+            return (len(self.ph_edges),)
+        return (len(self.en_edges), len(self.ph_edges))
+
+    def _cache_norms(self):
+        """Return the normalizations, broadcastable against the cache grid."""
+        if self.en_edges is None:
+            return self.norms(log10_ens=3)
+        norms = self.norms(log10_ens=self.en_edges)
+        return norms[:, None, None] if len(norms.shape) == 1 else norms[..., None]
+
+    def _primitive_cache(self, index, gradient=False):
+        """Return the values (and full gradient) of a primitive on the cache grid.
+
+        Each primitive keeps its own cache, which is only recomputed when
+        the parameters of that primitive have changed.  Thus, e.g., when a
+        single component is varied, only that component is re-evaluated
+        when the template cache is rebuilt.
+        """
+        prim = self.primitives[index]
+        key = (
+            type(prim),
+            np.asarray(prim.get_parameters(free=False)).tobytes(),
+            np.asarray(prim.get_bounds(free=False)).tobytes(),
+        )
+        entry = self._prim_cache.get(id(prim))
+        if entry is None or entry[0] != key:
+            phases, log10_ens = self._cache_grid()
+            vals = prim(phases, log10_ens=log10_ens).reshape(self._cache_shape())
+            entry = [key, vals, None]
+            self._prim_cache[id(prim)] = entry
+        if gradient and entry[2] is None:
+            phases, log10_ens = self._cache_grid()
+            g = prim.gradient(phases, log10_ens=log10_ens, free=False)
+            entry[2] = g.reshape((len(g),) + self._cache_shape())
+        return entry[1], entry[2]
+
     def set_cache(self, order=0):
         """Populate the cache with values along the bin edges."""
-        ncache = self.ncache
-        if self.en_edges is None:
-            if order == 0:
-                new_cache = self(self.ph_edges)
-            else:
-                new_cache = self.derivative(self.ph_edges, order=order)
+        if order == 0:
+            norms = self._cache_norms()
+            rvals = np.zeros(self._cache_shape())
+            for i, n in enumerate(norms):
+                rvals += n * self._primitive_cache(i)[0]
+            new_cache = (1.0 - norms.sum(axis=0)) + rvals
+        elif self.en_edges is None:
+            new_cache = self.derivative(self.ph_edges, order=order)
         else:
             new_cache = np.empty((len(self.en_edges), len(self.ph_edges)))
-            if order == 0:
-                for ibin, en in enumerate(self.en_edges):
-                    new_cache[ibin] = self(self.ph_edges, log10_ens=en)
-            else:
-                for ibin, en in enumerate(self.en_edges):
-                    new_cache[ibin] = self.derivative(
-                        self.ph_edges, log10_ens=en, order=order
-                    )
+            for ibin, en in enumerate(self.en_edges):
+                new_cache[ibin] = self.derivative(
+                    self.ph_edges, log10_ens=en, order=order
+                )
         self._cache[order] = new_cache
         self._cache_dirty[order] = False
 
-    def eval_cache(self, phases, log10_ens=3, order=0):
-        """
-        Cached values are stored on edges in both phase and, if applicable,
-        energy, so lookup is straightforward.
+    def get_gradient_cache(self):
+        """Return the gradient with respect to all parameters on the cache grid.
+
+        The shape is nparam x [nenergy x] nphase.
         """
-        cache = self.get_cache(order=order)
+        if self._cache_dirty["gradient"]:
+            norms = self._cache_norms()
+            rows = []
+            prim_terms = []
+            for i, n in enumerate(norms):
+                vals, grads = self._primitive_cache(i, gradient=True)
+                rows.append(n * grads)
+                prim_terms.append(vals - 1)
+            prim_terms = np.asarray(prim_terms)
+            log10_ens = 3 if self.en_edges is None else self.en_edges
+            m = self.norms.gradient(log10_ens=log10_ens, free=False)
+            # see gradient for the meaning of this sum
+            if len(m.shape) == 2:
+                rows.append(np.einsum("i...,ij->j...", prim_terms, m))
+            else:
+                rows.append(np.einsum("iep,ije->jep", prim_terms, m))
+            self._cache["gradient"] = np.concatenate(rows)
+            self._cache_dirty["gradient"] = False
+        return self._cache["gradient"]
+
+    def _interpolate(self, cache, phases, log10_ens=3):
+        """Linearly interpolate values tabulated on the cache grid.
 
+        Any leading axes of the cache (e.g. parameters) are preserved.
+        """
         dphi = np.atleast_1d(phases) * self.ncache
         phind_lo = dphi.astype(int)
         phind_hi = phind_lo + (phind_lo < self.ncache)  # allows ph==1
@@ -196,23 +279,30 @@ class LCTemplate:
 
         edges = self.en_edges
         if edges is None:
-            return cache[phind_lo] * dphi_lo + cache[phind_hi] * dphi_hi
+            return cache[..., phind_lo] * dphi_lo + cache[..., phind_hi] * dphi_hi
 
-        de = (log10_ens - edges[0]) / (edges[1] - edges[0])
+        de = (np.asarray(log10_ens) - edges[0]) / (edges[1] - edges[0])
         eind_lo = de.astype(int)
-        eind_hi = eind_lo + 1
+        eind_hi = eind_lo + (eind_lo < len(edges) - 1)  # allows en==edges[-1]
         de_hi = de - eind_lo
         de_lo = 1.0 - de_hi
         assert np.all(de_hi >= 0)
         assert np.all(de_hi <= 1)
         assert np.all(de_lo >= 0)
         assert np.all(de_lo <= 1)
-        v00 = cache[eind_lo, phind_lo] * (de_lo * dphi_lo)
-        v01 = cache[eind_lo, phind_hi] * (de_lo * dphi_hi)
-        v10 = cache[eind_hi, phind_lo] * (de_hi * dphi_lo)
-        v11 = cache[eind_hi, phind_hi] * (de_hi * dphi_hi)
+        v00 = cache[..., eind_lo, phind_lo] * (de_lo * dphi_lo)
+        v01 = cache[..., eind_lo, phind_hi] * (de_lo * dphi_hi)
+        v10 = cache[..., eind_hi, phind_lo] * (de_hi * dphi_lo)
+        v11 = cache[..., eind_hi, phind_hi] * (de_hi * dphi_hi)
         return v00 + v01 + v10 + v11
 
+    def eval_cache(self, phases, log10_ens=3, order=0):
+        """
+        Cached values are stored on edges in both phase and, if applicable,
+        energy, so lookup is straightforward.
+        """
+        return self._interpolate(self.get_cache(order=order), phases, log10_ens)
+
     def set_parameters(self, p, free=True):
         start = 0
         params_ok = True
@@ -401,7 +491,7 @@ class LCTemplate:
         some of the template parameters)."""
 
         if use_cache:
-            return self.eval_cache(phases, order=order)
+            return self.eval_cache(phases, log10_ens=log10_ens, order=order)
         rvals = np.zeros_like(phases)
         norms = self.norms(log10_ens=log10_ens)
         for n, prim in zip(norms, self.primitives):
@@ -414,7 +504,19 @@ class LCTemplate:
         rvals = self.primitives[index](phases, log10_ens=log10_ens) * n[index]
         return rvals + n.sum(axis=0) if add_bg else rvals
 
-    def gradient(self, phases, log10_ens=3, free=True, template_too=False):
+    def gradient(
+        self, phases, log10_ens=3, free=True, template_too=False, use_cache=False
+    ):
+        if use_cache:
+            r = self._interpolate(self.get_gradient_cache(), phases, log10_ens)
+            if free:
+                r = r[self.get_free_mask()]
+            if template_too:
+                return r, self.eval_cache(phases, log10_ens=log10_ens)
+            return r
+        if self.has_fused_evaluation():
+            t, r = self.evaluate_fused(phases, free=free)
+            return (r, t) if template_too else r
         r = np.empty((self.num_parameters(free), len(phases)))
         c = 0
         rvals, norms, norm = self._get_scales(phases, log10_ens=log10_ens)
@@ -444,6 +546,60 @@ class LCTemplate:
             return r, rvals
         return r
 
+    def evaluate_fused(self, phases, free=True, hessian=False):
+        """Return the template value, gradient, and (optionally) hessian.
+
+        All primitives are evaluated in a single pass with stacked
+        parameters (see fused_primitive_terms), and the terms are combined
+        with the normalizations by array operations.  Only available if
+        has_fused_evaluation() is True.
+
+        Returns
+        -------
+        value : ndarray
+            template at the phases
+        gradient : ndarray
+            nparam x nphase gradient
+        hessian : ndarray
+            nparam x nparam x nphase hessian, if requested
+        """
+        phases = np.asarray(phases, dtype=float)
+        f, g, h = fused_primitive_terms(
+            self.primitives, phases, order=2 if hessian else 1
+        )
+        norms = self.norms()
+        m = self.norms.gradient(free=False)
+        nprim = len(self.primitives)
+        nprim_param = 2 * nprim
+        nparam = nprim_param + m.shape[1]
+        # the "prim_terms" of gradient, df/dn_i
+        prim_terms = f - 1
+        value = (1.0 - norms.sum()) + np.einsum("i,ip->p", norms, f)
+        grad = np.empty((nparam, len(phases)))
+        grad[:nprim_param] = (norms[:, None, None] * g).reshape(nprim_param, -1)
+        grad[nprim_param:] = np.einsum("ip,ij->jp", prim_terms, m)
+        mask = self.get_free_mask() if free else slice(None)
+        if not hessian:
+            return value, grad[mask]
+
+        # see hessian for the structure of the terms
+        hess = np.empty((nparam, nparam, len(phases)))
+        blocks = np.zeros((nprim, 2, nprim, 2, len(phases)))
+        iprim = np.arange(nprim)
+        blocks[iprim, :, iprim] = norms[:, None, None, None] * h
+        hess[:nprim_param, :nprim_param] = blocks.reshape(nprim_param, nprim_param, -1)
+        cross = (g[:, :, None, :] * m[:, None, :, None]).reshape(
+            nprim_param, -1, len(phases)
+        )
+        hess[:nprim_param, nprim_param:] = cross
+        hess[nprim_param:, :nprim_param] = cross.transpose(1, 0, 2)
+        hess[nprim_param:, nprim_param:] = np.einsum(
+            "ip,ijk->jkp", prim_terms, self.norms.hessian()
+        )
+        if free:
+            hess = hess[mask][:, mask]
+        return value, grad[mask], hess
+
     def gradient_derivative(self, phases, log10_ens=3, free=False):
         """Return d/dphi(gradient).  This is the derivative with respect
         to pulse phase of the gradient with respect to the parameters.
@@ -511,12 +667,14 @@ class LCTemplate:
         (3) for mixed derivatives, the product gradient of the norm
 
         In general, this is pretty complicated if some parameters are free
-        and some are not, and (currently) this method isn't used in
-        fitting, so for ease of implementation, simply evaluate the whole
-        hessian, then return only the relevant parts for the free
+        and some are not, so for ease of implementation, simply evaluate
+        the whole hessian, then return only the relevant parts for the free
         parameters.
 
+        If possible, the hessian is computed in one pass by evaluate_fused.
         """
+        if self.has_fused_evaluation():
+            return self.evaluate_fused(phases, free=free, hessian=True)[2]
 
         free_mask = self.get_free_mask()
         nparam = len(free_mask)
@@ -2919,7 +2919,7 @@ def bayesian_information_criterion(
             if "PhaseOffset" in model.components
             else len(model.free_params) + 1
         )
-        lnN = len(toas)
+        lnN = np.log(len(toas))
         lnL = Residuals(toas, model).lnlikelihood()
         return k * lnN - 2 * lnL
     else:
@@ -0,0 +1,116 @@
+import concurrent.futures
+import contextlib
+import json
+from io import StringIO
+
+import numpy as np
+import pytest
+
+import pint.fitter
+from pint.batch import fit_batch, fit_one, timing_report
+from pint.models import get_model
+from pint.simulation import make_fake_toas_uniform
+
+par = """
+    PSR {name}
+    ELAT    1.3
+    ELONG   2.5
+    F0      {f0}    1
+    F1      -1e-15  1
+    PEPOCH  55000
+    DM      10
+    EPHEM   DE421
+"""
+
+
+@pytest.fixture(scope="module")
+def pairs(tmp_path_factory):
+    d = tmp_path_factory.mktemp("batch")
+    pairs = []
+    for i, name in enumerate(["J0001+0001", "J0002+0002", "J0003+0003"]):
+        m = get_model(StringIO(par.format(name=name, f0=100 + i)))
+        t = make_fake_toas_uniform(54000, 56000, 50, m, obs="@", add_noise=True)
+        parfile, timfile = d / f"{name}.par", d / f"{name}.tim"
+        m.write_parfile(parfile)
+        t.write_TOA_file(timfile)
+        pairs.append((parfile, timfile))
+    return pairs
+
+
+def test_fit_one(pairs):
+    r = fit_one(*pairs[0])
+    assert r.success
+    assert r.name == "J0001+0001"
+    assert r.ntoas == 50
+    assert r.fitter == "DownhillWLSFitter"
+    assert set(r.timings) == {"load", "fit", "summary"}
+    assert "F0" in r.postfit_par
+
+
+def test_fit_one_failure(tmp_path):
+    r = fit_one(tmp_path / "missing.par", tmp_path / "missing.tim")
+    assert not r.success
+    assert "load" in r.timings
+
+
+@pytest.mark.parametrize("threads, ncpu", [(False, 1), (True, None), (False, 2)])
+def test_fit_batch(pairs, tmp_path, threads, ncpu):
+    bad = (tmp_path / "missing.par", tmp_path / "missing.tim")
+    with (
+        concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        if threads
+        else contextlib.nullcontext()
+    ) as executor:
+        results = fit_batch(
+            pairs + [bad],
+            outdir=tmp_path / "out",
+            fitter=pint.fitter.WLSFitter,
+            executor=executor,
+            ncpu=ncpu,
+        )
+    assert [r.name for r in results[:3]] == [
+        "J0001+0001",
+        "J0002+0002",
+        "J0003+0003",
+    ]
+    assert all(r.success for r in results[:3])
+    assert not results[3].success
+
+    lines = (tmp_path / "out" / "batch_results.jsonl").read_text().splitlines()
+    assert len(lines) == 4
+    assert {json.loads(l)["name"] for l in lines} == {r.name for r in results}
+    for r in results[:3]:
+        assert (tmp_path / "out" / f"{r.name}.par").exists()
+        assert (tmp_path / "out" / f"{r.name}.summary.txt").exists()
+        assert np.isfinite(r.chi2)
+
+    report = timing_report(results)
+    assert "3 pulsars (1 failed)" in report
+
+
+def test_fit_batch_same_pulsar(pairs, tmp_path):
+    # The same pulsar with another tim file, and a variant of its par file
+    parfile, timfile = pairs[0]
+    m = get_model(parfile)
+    t = make_fake_toas_uniform(54000, 56000, 30, m, obs="@", add_noise=True)
+    other_timfile = tmp_path / "other.tim"
+    t.write_TOA_file(other_timfile)
+    (tmp_path / "variant").mkdir()
+    variant_parfile = tmp_path / "variant" / parfile.name
+    m.write_parfile(variant_parfile)
+
+    results = fit_batch(
+        [(parfile, timfile), (parfile, other_timfile), (variant_parfile, timfile)],
+        outdir=tmp_path / "out",
+        ncpu=1,
+    )
+    assert all(r.success for r in results)
+    assert len({r.name for r in results}) == 1
+    # Each fit has its own output files
+    parfiles = sorted(p.name for p in (tmp_path / "out").glob("*.par"))
+    assert parfiles == [
+        "J0001+0001_J0001+0001_0.par",
+        "J0001+0001_J0001+0001_2.par",
+        "J0001+0001_other.par",
+    ]
+    assert len(list((tmp_path / "out").glob("*.summary.txt"))) == 3
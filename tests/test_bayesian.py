@@ -1,5 +1,6 @@
 """Tests for the bayesian interface."""
 
+import concurrent.futures
 import io
 import pytest
 import numpy as np
@@ -153,6 +154,66 @@ def test_bayesian_timing_funcs(data_NGC6440E_efac):
         bt.lnprior([1])
 
 
+def test_bayesian_timing_batch(data_NGC6440E_efac):
+    """Test the vectorized prior and posterior functions."""
+    model, toas = data_NGC6440E_efac
+
+    bt = BayesianTiming(model, toas)
+
+    rng = np.random.default_rng(42)
+    test_cube = rng.uniform(size=(6, bt.nparams))
+    test_params = bt.prior_transform(test_cube)
+    assert test_params.shape == (6, bt.nparams)
+    assert np.allclose(bt.prior_transform(test_cube[1]), test_params[1])
+    # one parameter vector outside the prior range
+    test_params[2] = bt.prior_transform(np.ones(bt.nparams)) + 1
+
+    lnpr = bt.lnprior(test_params)
+    assert np.allclose(lnpr, [bt.lnprior(p) for p in test_params])
+
+    lnp = [bt.lnposterior(p) for p in test_params]
+    assert np.allclose(bt.lnposterior_batch(test_params), lnp)
+    assert bt.lnposterior_batch(test_params)[2] == -np.inf
+    assert np.allclose(bt.lnposterior_batch(test_params, chunksize=4), lnp)
+
+    with bt.make_executor(2) as executor:
+        assert np.allclose(bt.lnposterior_batch(test_params, executor=executor), lnp)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        assert np.allclose(
+            bt.lnposterior_batch(test_params, executor=executor, nchunks=2), lnp
+        )
+
+
+def test_marginalized_lnlikelihood(data_NGC6440E_efac):
+    """The marginalized likelihood should be the Gaussian integral of the full
+    likelihood over the linear parameters."""
+    model, toas = data_NGC6440E_efac
+
+    bt_full = BayesianTiming(model, toas)
+    bt = BayesianTiming(model, toas, marginalize=["F0", "F1"])
+    assert bt.nparams == bt_full.nparams - 2
+    assert "F0" not in bt.param_labels and "EFAC1" in bt.param_labels
+
+    for efac in [1, 1.5]:
+        test_params = [
+            efac if par == "EFAC1" else getattr(model, par).value
+            for par in bt.param_labels
+        ]
+        xhat, cov = bt.linear_param_estimates(test_params)
+        assert np.all(np.diag(cov) > 0)
+
+        full_params = dict(zip(bt.param_labels, test_params))
+        full_params.update(zip(bt.marginalized_labels, xhat))
+        lnl_max = bt_full.lnlikelihood([full_params[p] for p in bt_full.param_labels])
+        lnl_marg = lnl_max + np.linalg.slogdet(cov)[1] / 2
+        assert np.isclose(bt.lnlikelihood(test_params), lnl_marg, atol=1e-3)
+
+    with pytest.raises(ValueError):
+        BayesianTiming(model, toas, marginalize=["EFAC1"])
+    with pytest.raises(ValueError):
+        BayesianTiming(model, toas, marginalize=["PEPOCH"])
+
+
 def test_prior_dict(data_NGC6440E_efac):
     model, toas = data_NGC6440E_efac
 
@@ -197,6 +258,11 @@ def test_wideband_data(data_J0740p6620_wb):
     lnp = bt.lnposterior(test_params)
     assert np.isfinite(lnp) and np.isclose(lnp, lnpr + lnl)
 
+    bt_marg = BayesianTiming(model, toas, marginalize=["F0", "DMX_0001"])
+    test_params = dict(zip(bt.param_labels, test_params))
+    lnl_marg = bt_marg.lnlikelihood([test_params[p] for p in bt_marg.param_labels])
+    assert np.isfinite(lnl_marg)
+
 
 def test_gls_exception(data_NGC6440E, data_NGC6440E_red):
     model, toas = data_NGC6440E_red
@@ -1,11 +1,22 @@
 """ Various of tests for the pint covariance."""
 
+import io
 import pytest
 import os
 
 import numpy as np
 import astropy.units as u
-from pint.pint_matrix import CovarianceMatrix, combine_covariance_matrix
+from pint.models import get_model
+from pint.pint_matrix import (
+    CovarianceBlock,
+    CovarianceMatrix,
+    CovarianceMatrixMaker,
+    StructuredCovarianceMatrix,
+    StructuredCovarianceMatrixMaker,
+    combine_covariance_matrix,
+)
+from pint.simulation import make_fake_toas_uniform
+from pint.toa import merge_TOAs
 
 from pinttestdata import datadir
 
@@ -79,3 +90,67 @@ class TestCovarianceMatrix:
         assert np.all(combine_cm.matrix[0:4, 4:7] == np.zeros((4, 3)))
         assert np.all(combine_cm.matrix[7:12, 4:7] == np.zeros((5, 3)))
         assert np.all(combine_cm.matrix[7:12, 0:4] == np.zeros((5, 4)))
+
+
+def test_structured_covariance_matrix():
+    rng = np.random.default_rng(0)
+    U = rng.standard_normal((6, 2))
+    blocks = [
+        CovarianceBlock(
+            "toa",
+            u.s,
+            ndiag=rng.uniform(1, 2, 6),
+            basis=U,
+            weights=np.array([3.0, 4.0]),
+        ),
+        CovarianceBlock("dm", u.pc / u.cm**3, ndiag=rng.uniform(1, 2, 4)),
+        CovarianceBlock("other", u.m, matrix=np.diag([2.0, 3.0]) + 0.5),
+    ]
+    scm = StructuredCovarianceMatrix(blocks)
+    dense = scm.to_covariance_matrix()
+    assert scm.shape == dense.shape == (12, 12)
+    assert dense.labels[0] == [
+        ("toa", (0, 6, u.s**2)),
+        ("dm", (6, 10, (u.pc / u.cm**3) ** 2)),
+        ("other", (10, 12, u.m**2)),
+    ]
+    assert np.all(dense.matrix[:6, 6:] == 0)
+
+    b = rng.standard_normal((12, 3))
+    assert np.allclose(scm.solve(b), np.linalg.solve(dense.matrix, b))
+    assert np.allclose(scm.solve(b[:, 0]), np.linalg.solve(dense.matrix, b[:, 0]))
+    assert np.isclose(scm.logdet(), np.linalg.slogdet(dense.matrix)[1])
+
+
+@pytest.mark.parametrize(
+    "noise", ["", "ECORR tel @ 1.5\nTNRedAmp -13\nTNRedGam 3\nTNRedC 5"]
+)
+def test_structured_covariance_matrix_maker(noise):
+    par = f"""
+    PSR J1234+5678
+    F0 100 1
+    PEPOCH 57000
+    DM 10
+    EPHEM DE421
+    EFAC tel @ 1.2
+    DMEFAC tel @ 1.1
+    {noise}
+    """
+    model = get_model(io.StringIO(par))
+    toas = merge_TOAs(
+        [
+            make_fake_toas_uniform(
+                57000, 57500, 20, model, freq=f * u.MHz, obs="@", wideband=True
+            )
+            for f in [1000, 2000]
+        ]
+    )
+    makers = [("toa", u.s), ("dm", u.pc / u.cm**3)]
+    dense = combine_covariance_matrix(
+        [CovarianceMatrixMaker(*m)(toas, model) for m in makers]
+    )
+    structured = StructuredCovarianceMatrix(
+        [StructuredCovarianceMatrixMaker(*m)(toas, model) for m in makers]
+    )
+    assert all(b.matrix is None for b in structured.blocks)
+    assert np.allclose(structured.to_covariance_matrix().matrix, dense.matrix)
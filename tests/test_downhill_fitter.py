@@ -170,6 +170,28 @@ def test_wideband_lm_full_procedure(model_eccentric_toas_wb, full_cov):
     assert abs(f.model.ECC.value - model_eccentric.ECC.value) < 1e-4
 
 
+def test_wideband_lm_broyden(model_eccentric_toas_wb):
+    model_eccentric, toas = model_eccentric_toas_wb
+    model_wrong = deepcopy(model_eccentric)
+    model_wrong.ECC.value = 0.5
+    model_wrong.free_params = ["F0", "ECC"]
+
+    f = pint.fitter.WidebandLMFitter(toas, deepcopy(model_wrong))
+    f.fit_toas()
+    f_broyden = pint.fitter.WidebandLMFitter(toas, deepcopy(model_wrong))
+    f_broyden.fit_toas(max_broyden_updates=5)
+
+    assert f_broyden.converged
+    assert not f_broyden.current_state.approximate_jacobian
+    assert f_broyden.jacobian_evaluations < f.jacobian_evaluations
+    for p in model_wrong.free_params:
+        assert (
+            abs(getattr(f_broyden.model, p).value - getattr(f.model, p).value)
+            < 3 * getattr(f.model, p).uncertainty_value
+        )
+    assert np.allclose(f_broyden.errors, f.errors)
+
+
 def test_wls_two_step(model_eccentric_toas):
     model_eccentric, toas = model_eccentric_toas
     model_wrong = deepcopy(model_eccentric)
@@ -12,7 +12,9 @@ import pytest
 import numpy as np
 import pickle
 import scipy.stats as stats
+from pint.models import get_model
 from pint.scripts import event_optimize
+from pint.simulation import make_fake_toas_uniform
 from pinttestdata import datadir
 
 
@@ -58,8 +60,6 @@ def test_parallel(tmp_path):
     event_optimize.maxpost = -9e99
     event_optimize.numcalls = 0
     try:
-        import pathos
-
         os.chdir(tmp_path)
         cmd = f"{eventfile} {parfile} {temfile} --weightcol=PSRJ0030+0451 --minWeight=0.9 --nwalkers=10 --nsteps=50 --burnin 10 --clobber"
         event_optimize.main(cmd.split())
@@ -70,7 +70,7 @@ def test_parallel(tmp_path):
         event_optimize.maxpost = -9e99
         event_optimize.numcalls = 0
 
-        cmd = f"{eventfile} {parfile} {temfile} --weightcol=PSRJ0030+0451 --minWeight=0.9 --nwalkers=10 --nsteps=50 --burnin 10 --multicore --clobber"
+        cmd = f"{eventfile} {parfile} {temfile} --weightcol=PSRJ0030+0451 --minWeight=0.9 --nwalkers=10 --nsteps=50 --burnin 10 --multicore --ncores 2 --clobber"
         event_optimize.main(cmd.split())
         with open("J0030+0451_samples.pickle", "rb") as f:
             samples2 = pickle.load(f)
@@ -78,13 +78,60 @@ def test_parallel(tmp_path):
 
         for i in range(samples1.shape[1]):
             assert stats.ks_2samp(samples1[:, i], samples2[:, i])[1] == 1.0
-    except ImportError:
-        pytest.skip(f"Pathos multiprocessing package not found")
     finally:
         os.chdir(p)
         sys.stdout = saved_stdout
 
 
+def test_checkpoint(tmp_path):
+    parfile = datadir / "PSRJ0030+0451_psrcat.par"
+    eventfile_orig = (
+        datadir
+        / "J0030+0451_P8_15.0deg_239557517_458611204_ft1weights_GEO_wt.gt.0.4.fits"
+    )
+    temfile = datadir / "templateJ0030.3gauss"
+    eventfile = tmp_path / "event.fits"
+    # We will write a pickle next to this file, let's make sure it's not under tests/
+    shutil.copy(eventfile_orig, eventfile)
+
+    p = Path.cwd()
+    saved_stdout, sys.stdout = (sys.stdout, StringIO("_"))
+    try:
+        os.chdir(tmp_path)
+        cmd = f"{eventfile} {parfile} {temfile} --weightcol=PSRJ0030+0451 --minWeight=0.9 --nwalkers=10 --nsteps=30 --burnin=10 --no-autocorr --checkpoint --checkpoint-interval=10 --clobber"
+        event_optimize.maxpost = -9e99
+        event_optimize.numcalls = 0
+        event_optimize.main(cmd.split())
+        with open("J0030+0451_checkpoint.pkl", "rb") as f:
+            chain1 = pickle.load(f).get_chain()
+        assert len(chain1) == 30
+
+        # Resume and run for longer
+        cmd = cmd.replace("--nsteps=30", "--nsteps=50")
+        event_optimize.maxpost = -9e99
+        event_optimize.numcalls = 0
+        event_optimize.main(cmd.split())
+        with open("J0030+0451_checkpoint.pkl", "rb") as f:
+            chain2 = pickle.load(f).get_chain()
+        assert len(chain2) == 50
+        assert np.all(chain2[:30] == chain1)
+    finally:
+        os.chdir(p)
+        sys.stdout = saved_stdout
+
+
+def test_checkpoint_with_backend():
+    parfile = datadir / "PSRJ0030+0451_psrcat.par"
+    eventfile = (
+        datadir
+        / "J0030+0451_P8_15.0deg_239557517_458611204_ft1weights_GEO_wt.gt.0.4.fits"
+    )
+    temfile = datadir / "templateJ0030.3gauss"
+    cmd = f"{eventfile} {parfile} {temfile} --checkpoint --backend"
+    with pytest.raises(SystemExit):
+        event_optimize.main(cmd.split())
+
+
 def test_backend(tmp_path):
     parfile = datadir / "PSRJ0030+0451_psrcat.par"
     eventfile_orig = (
@@ -153,3 +200,53 @@ def test_autocorr(tmp_path):
     samples = np.transpose(sampler.get_chain(discard=10), (1, 0, 2)).reshape((-1, ndim))
 
     assert len(samples) < nsteps
+
+
+def test_linearized_phases():
+    par = """
+    PSR J1234+5678
+    ELAT 10 1 1e-7
+    ELONG 20 1 1e-7
+    F0 100 1 1e-10
+    F1 -1e-14 1 1e-20
+    PEPOCH 55000
+    BINARY ELL1
+    PB 1.5 1 1e-8
+    A1 3.2 1 1e-6
+    TASC 55000.1 1 1e-7
+    EPS1 1e-5 1 1e-7
+    EPS2 -1e-5 1 1e-7
+    EPHEM DE421
+    """
+    model = get_model(StringIO(par))
+    toas = make_fake_toas_uniform(54000, 56000, 1000, model, obs="@")
+    params = model.free_params
+    values = np.array([getattr(model, p).value for p in params], dtype=np.longdouble)
+    steps = np.array([getattr(model, p).uncertainty_value for p in params])
+
+    lp = event_optimize.LinearizedPhases(
+        model, toas, params, steps, tolerance=0.01, refresh=5
+    )
+
+    def set_values(vals):
+        for p, v in zip(params, vals):
+            getattr(model, p).value = v
+
+    def phase_diff(a, b):
+        return np.max(np.abs((a - b + 0.5) % 1 - 0.5))
+
+    rng = np.random.default_rng(0)
+    for _ in range(4):
+        set_values(values + steps * rng.normal(size=len(params)))
+        exact = model.phase(toas).frac.value % 1
+        assert phase_diff(lp.phases(), exact) < 0.01
+    assert lp.nexact == 0
+
+    # Far from the reference point the exact phases are used and the
+    # expansion moves there
+    shifted = values + 1000 * steps
+    set_values(shifted)
+    exact = model.phase(toas).frac.value % 1
+    assert phase_diff(lp.phases(), exact) < 1e-9
+    assert lp.nexact == 1
+    assert np.allclose(lp.ref_values, shifted, rtol=1e-12, atol=0)
@@ -6,6 +6,9 @@ from astropy import units as u
 
 from pint.event_toas import read_mission_info_from_heasoft, create_mission_config
 from pint.event_toas import get_fits_TOAs, get_NICER_TOAs, _default_uncertainty
+from pint.event_toas import get_event_TOAs, iter_event_TOAs
+from pint.fits_utils import iter_fits_event_mjds, read_fits_event_mjds
+from astropy.io import fits
 from pinttestdata import datadir
 
 
@@ -83,3 +86,38 @@ def test_for_toa_errors_manual(errors):
         errors=errors,
     )
     assert np.all(ts.get_errors() == 2 * u.us)
+
+
+def test_iter_fits_event_mjds():
+    eventfile_nicer = datadir / "ngc300nicer_bary.evt"
+    with fits.open(eventfile_nicer) as hdul:
+        mjds = read_fits_event_mjds(hdul[1])
+        chunks = list(iter_fits_event_mjds(hdul[1], chunksize=1000, columns=["PI"]))
+        assert [len(c[1]) for c in chunks] == [1000, 1000, len(mjds) - 2000]
+        assert np.all(np.concatenate([c[1] for c in chunks]) == mjds)
+        assert np.all(
+            np.concatenate([c[2]["PI"] for c in chunks]) == hdul[1].data["PI"]
+        )
+
+
+def test_iter_event_toas():
+    eventfile_nicer = datadir / "ngc300nicer_bary.evt"
+    minmjd, maxmjd = 58155.7, 58155.75
+    ts = get_event_TOAs(eventfile_nicer, "nicer", minmjd=minmjd, maxmjd=maxmjd)
+    chunks = list(
+        iter_event_TOAs(
+            eventfile_nicer, "nicer", chunksize=700, minmjd=minmjd, maxmjd=maxmjd
+        )
+    )
+    assert len(chunks) > 1
+    assert all(len(rows) == len(t) for rows, t in chunks)
+    rows = np.concatenate([rows for rows, _ in chunks])
+    assert np.all(np.diff(rows) > 0)
+
+    with fits.open(eventfile_nicer) as hdul:
+        mjds = read_fits_event_mjds(hdul[1])
+    assert np.all((mjds[rows] > minmjd) & (mjds[rows] < maxmjd))
+    assert len(rows) == len(ts)
+    assert np.all(
+        np.concatenate([t.get_mjds().value for _, t in chunks]) == ts.get_mjds().value
+    )
@@ -40,3 +40,54 @@ def test_h_and_z():
     assert len(res) == 4
     ans = 45.05833019383544
     assert_allclose(res[3], ans, atol=1.0e-7)
+
+
+def test_harmonic_sums_chunked_and_batched(monkeypatch):
+    rng = np.random.default_rng(0)
+    phases = rng.uniform(size=(3, 1000))
+    weights = rng.uniform(size=1000)
+    k = np.arange(1, 11)[:, None]
+    for p in phases:
+        direct = (weights * np.cos(2 * np.pi * k * p)).sum(axis=1) ** 2 + (
+            weights * np.sin(2 * np.pi * k * p)
+        ).sum(axis=1) ** 2
+        assert_allclose(
+            es.z2mw(p, weights, m=10),
+            np.cumsum(direct) * 2 / (weights**2).sum(),
+            rtol=1e-10,
+        )
+
+    sums = es.harmonic_sums(phases, 10, weights=weights)
+    assert sums.shape == (3, 10)
+    assert_allclose(
+        sums[0],
+        (weights * np.exp(2j * np.pi * k * phases[0])).sum(axis=1),
+        rtol=1e-10,
+    )
+    # The sums of chunks of photons add up
+    assert_allclose(
+        es.harmonic_sums(phases[0, :400], 10, weights=weights[:400])
+        + es.harmonic_sums(phases[0, 400:], 10, weights=weights[400:]),
+        sums[0],
+        rtol=1e-10,
+    )
+
+    z = es.z2mw(phases, weights, m=10)
+    assert z.shape == (3, 10)
+    h = es.hm(phases)
+    assert h.shape == (3,)
+    monkeypatch.setattr(es, "_CHUNK_ELEMENTS", 100)
+    assert_allclose(es.z2mw(phases, weights, m=10), z, rtol=1e-12)
+    for i, p in enumerate(phases):
+        assert_allclose(es.hm(p), h[i], rtol=1e-12)
+        assert_allclose(es.z2mw(p, weights, m=10), z[i], rtol=1e-12)
+
+
+def test_phasor_sums_matches_harmonic_sums():
+    rng = np.random.default_rng(3)
+    phases = rng.uniform(size=(3, 500))
+    weights = rng.uniform(size=500)
+    z1 = np.exp(2j * np.pi * phases)
+    assert np.allclose(
+        es.phasor_sums(z1, 4, weights), es.harmonic_sums(phases, 4, weights)
+    )
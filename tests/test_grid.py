@@ -1,6 +1,7 @@
 """Test chi^2 gridding routines"""
 
 import concurrent.futures
+import pickle
 import pytest
 
 import astropy.units as u
@@ -9,6 +10,7 @@ import numpy as np
 import pint.config
 import pint.gridutils
 import pint.models.parameter as param
+import pint.residuals
 from pint.fitter import GLSFitter, WLSFitter, DownhillWLSFitter, DownhillGLSFitter
 from pint.models.model_builder import get_model_and_toas
 import pint.logging
@@ -90,6 +92,151 @@ def test_grid_multiprocessor(get_data_and_fit):
     assert np.isclose(bestfit, chi2grid.min())
 
 
+def test_grid_multiprocessor_shared_toas(get_data_and_fit):
+    f, bestfit = get_data_and_fit
+
+    F0 = np.linspace(
+        f.model.F0.quantity - 1 * f.model.F0.uncertainty,
+        f.model.F0.quantity + 1 * f.model.F0.uncertainty,
+        3,
+    )
+
+    chi2grid, extra = pint.gridutils.grid_chisq(
+        f, ("F0",), (F0,), ("DM",), ncpu=ncpu, printprogress=False
+    )
+    chi2grid_copied, extra_copied = pint.gridutils.grid_chisq(
+        f, ("F0",), (F0,), ("DM",), ncpu=ncpu, printprogress=False, share_toas=False
+    )
+
+    assert np.isclose(bestfit, chi2grid.min())
+    assert np.allclose(chi2grid, chi2grid_copied)
+    assert np.allclose(extra["DM"], extra_copied["DM"])
+
+
+def test_shared_toas(get_data_and_fit):
+    f, _ = get_data_and_fit
+    shared = pint.gridutils.SharedTOAs(f.toas)
+    try:
+        attached = pickle.loads(pickle.dumps(shared))
+        t = attached.attach()
+        assert t.table.colnames == f.toas.table.colnames
+        assert np.all(t.table["tdbld"] == f.toas.table["tdbld"])
+        assert t.table["ssb_obs_pos"].unit == f.toas.table["ssb_obs_pos"].unit
+        assert not t.table["tdbld"].data.flags.writeable
+        assert np.allclose(
+            pint.residuals.Residuals(t, f.model).time_resids,
+            f.resids.time_resids,
+        )
+        blocks = list(attached._attached_blocks)
+        attached.detach()
+        assert "tdbld" not in t.table.colnames
+        assert all(block.buf is None for block in blocks)
+    finally:
+        shared.close()
+
+
+def test_grid_adaptive(get_data_and_fit):
+    f, bestfit = get_data_and_fit
+
+    F0 = np.linspace(
+        f.model.F0.quantity - 6 * f.model.F0.uncertainty,
+        f.model.F0.quantity + 6 * f.model.F0.uncertainty,
+        13,
+    )
+    F1 = np.linspace(
+        f.model.F1.quantity - 6 * f.model.F1.uncertainty,
+        f.model.F1.quantity + 6 * f.model.F1.uncertainty,
+        11,
+    )
+
+    chi2grid, extra = pint.gridutils.grid_chisq(
+        f, ("F0", "F1"), (F0, F1), ("DM",), ncpu=1, printprogress=False
+    )
+    chi2grid_adaptive, extra_adaptive = pint.gridutils.grid_chisq_adaptive(
+        f, ("F0", "F1"), (F0, F1), ("DM",), ncpu=1, printprogress=False
+    )
+
+    assert chi2grid_adaptive.shape == chi2grid.shape
+    assert extra_adaptive["DM"].shape == extra["DM"].shape
+    near = chi2grid - chi2grid.min() < 14
+    assert np.allclose(chi2grid_adaptive[near], chi2grid[near], atol=1e-2)
+    assert np.allclose(chi2grid_adaptive, chi2grid, rtol=0.05)
+
+
+def test_grid_store_resume(get_data_and_fit, tmp_path):
+    f, bestfit = get_data_and_fit
+
+    F0 = np.linspace(
+        f.model.F0.quantity - 1 * f.model.F0.uncertainty,
+        f.model.F0.quantity + 1 * f.model.F0.uncertainty,
+        3,
+    )
+    F1 = np.linspace(
+        f.model.F1.quantity - 1 * f.model.F1.uncertainty,
+        f.model.F1.quantity + 1 * f.model.F1.uncertainty,
+        4,
+    )
+    store = tmp_path / "grid.jsonl"
+
+    chi2grid, extra = pint.gridutils.grid_chisq(
+        f, ("F0", "F1"), (F0, F1), ("F0", "DM"), ncpu=1, store=store
+    )
+
+    # simulate an interruption partway through writing a line
+    lines = store.read_text().splitlines(keepends=True)
+    store.write_text("".join(lines[:6]) + lines[6][:10])
+    chi2_partial, extra_partial, header = pint.gridutils.GridStore(store).read()
+    assert chi2_partial.shape == chi2grid.shape
+    assert np.sum(np.isfinite(chi2_partial)) == 5
+    assert header["parnames"] == ["F0", "F1"]
+
+    chi2grid_resumed, extra_resumed = pint.gridutils.grid_chisq(
+        f, ("F0", "F1"), (F0, F1), ("F0", "DM"), ncpu=1, store=store
+    )
+    assert np.allclose(chi2grid_resumed, chi2grid)
+    assert np.all(extra_resumed["F0"] == extra["F0"])
+    assert np.allclose(extra_resumed["DM"], extra["DM"])
+    assert np.all(np.isfinite(pint.gridutils.GridStore(store).read()[0]))
+
+    with pytest.raises(ValueError):
+        pint.gridutils.grid_chisq(f, ("F0",), (F0,), ncpu=1, store=store)
+
+
+def test_grid_linearized(get_data_and_fit):
+    f, bestfit = get_data_and_fit
+
+    F0 = np.linspace(
+        f.model.F0.quantity - 3 * f.model.F0.uncertainty,
+        f.model.F0.quantity + 3 * f.model.F0.uncertainty,
+        5,
+    )
+    F1 = np.linspace(
+        f.model.F1.quantity - 3 * f.model.F1.uncertainty,
+        f.model.F1.quantity + 3 * f.model.F1.uncertainty,
+        7,
+    )
+
+    chi2grid, extra = pint.gridutils.grid_chisq(
+        f, ("F0", "F1"), (F0, F1), ("DM", "F1"), ncpu=1, printprogress=False
+    )
+    chi2grid_lin, extra_lin = pint.gridutils.grid_chisq_linearized(
+        f, ("F0", "F1"), (F0, F1), ("DM", "F1")
+    )
+
+    assert chi2grid_lin.shape == chi2grid.shape
+    assert np.allclose(chi2grid_lin, chi2grid, atol=1e-3, rtol=1e-6)
+    assert np.allclose(extra_lin["DM"], extra["DM"])
+    assert np.all(extra_lin["F1"] == extra["F1"])
+
+
+@pytest.mark.parametrize("shape", [(7,), (5, 4), (3, 4, 5)])
+def test_snake_order(shape):
+    indices = list(np.ndindex(shape))
+    path = pint.gridutils._snake_order(indices[::-1])
+    assert sorted(map(tuple, path)) == indices
+    assert np.all(np.abs(np.diff(path, axis=0)).sum(axis=1) == 1)
+
+
 def test_grid_oneparam(get_data_and_fit):
     f, bestfit = get_data_and_fit
 
@@ -1,8 +1,9 @@
 from pint.mcmc_fitter import MCMCFitter, lnlikelihood_chi2, set_priors_basic
-from pint.sampler import EmceeSampler
+from pint.sampler import AutocorrConvergence, EmceeSampler
 from pint.models import get_model_and_toas
 from pint.config import examplefile
 
+import numpy as np
 import pytest
 
 
@@ -35,3 +36,60 @@ def test_mcmc_fitter(data_NGC6440E):
 
     assert set(chains.keys()) == set(m.free_params)
     assert all(chains[par].shape == (nsteps, nwalkers) for par in m.free_params)
+
+
+def test_mcmc_fitter_parallel_checkpoint(data_NGC6440E, tmp_path):
+    m, t = data_NGC6440E
+
+    nwalkers = 10
+    checkpoint = tmp_path / "checkpoint.pkl"
+
+    def make_fitter(sampler):
+        f = MCMCFitter(
+            t,
+            m,
+            sampler,
+            resids=True,
+            phs=0.50,
+            phserr=0.01,
+            lnlike=lnlikelihood_chi2,
+        )
+        set_priors_basic(f)
+        return f
+
+    sampler = EmceeSampler(
+        nwalkers, ncpu=2, checkpoint=checkpoint, checkpoint_interval=2
+    )
+    f = make_fitter(sampler)
+    f.fit_toas(3)
+    # fit_toas shuts the worker pool down
+    assert sampler.pool is None
+    assert checkpoint.exists()
+    chain = sampler.get_chain()
+    assert chain.shape[0] == 3
+    # The best point was found by the workers
+    assert np.isfinite(f.maxpost)
+
+    # Resume from the checkpoint
+    sampler2 = EmceeSampler(nwalkers, checkpoint=checkpoint)
+    f2 = make_fitter(sampler2)
+    f2.fit_toas(5)
+    chain2 = sampler2.get_chain()
+    assert chain2.shape[0] == 5
+    assert np.all(chain2[:3] == chain)
+
+
+def _lnprob_gaussian(theta):
+    return -0.5 * np.sum(theta**2)
+
+
+def test_sampler_autocorr():
+    nwalkers, ndim, nsteps = 10, 3, 100000
+    sampler = EmceeSampler(nwalkers)
+    sampler.initialize_sampler(_lnprob_gaussian, ndim)
+    autocorr = AutocorrConvergence(burnin=10)
+    sampler.run_mcmc(np.random.randn(nwalkers, ndim), nsteps, autocorr=autocorr)
+
+    assert autocorr.converged2
+    assert sampler.sampler.iteration < nsteps
+    assert len(autocorr.autocorr) > 0
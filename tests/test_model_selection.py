@@ -0,0 +1,117 @@
+import concurrent.futures
+from copy import deepcopy
+from io import StringIO
+
+import astropy.units as u
+import numpy as np
+import pytest
+
+import pint.fitter
+from pint.model_selection import Candidate, evaluate_candidates, linearized_chi2
+from pint.models import get_model
+from pint.models.parameter import prefixParameter
+from pint.simulation import make_fake_toas_uniform
+
+par = """
+    PSR J1234+5678
+    ELAT 10
+    ELONG 20
+    F0 100 1
+    F1 -1e-14 1
+    F2 1e-26
+    PEPOCH 55000
+    DM 10
+    EPHEM DE421
+"""
+
+
+def spindown_param(n, value=0.0):
+    return prefixParameter(
+        parameter_type="float",
+        name=f"F{n}",
+        value=value,
+        units=u.Hz / u.s**n,
+        frozen=False,
+        tcb2tdb_scale_factor=u.Quantity(1),
+    )
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    m = get_model(StringIO(par))
+    np.random.seed(0)
+    t = make_fake_toas_uniform(53000, 57000, 100, m, obs="@", add_noise=True)
+    m.remove_param("F2")
+    f = pint.fitter.DownhillWLSFitter(t, m)
+    f.fit_toas()
+    return f
+
+
+@pytest.fixture
+def candidates():
+    return [
+        Candidate("F1", remove=True),
+        (spindown_param(2), "Spindown"),
+        Candidate([spindown_param(2), spindown_param(3)], ["Spindown"] * 2),
+    ]
+
+
+def test_evaluate_candidates(fitted, candidates):
+    f = fitted
+    model = deepcopy(f.model)
+    table = evaluate_candidates(f, candidates, ncpu=1)
+
+    assert list(table["name"]) == ["+F2", "+F2+F3", "-F1"]
+    assert list(table["dk"]) == [1, 2, -1]
+    assert np.all(table["converged"])
+    assert table["delta_chi2"][0] < -100
+    assert table["delta_chi2"][2] > 100
+    assert np.all(np.diff(table["aic"]) > 0)
+    assert np.allclose(table["delta_aic"], table["delta_chi2"] + 2 * table["dk"])
+    assert np.allclose(
+        table["delta_bic"],
+        table["delta_chi2"] + np.log(f.toas.ntoas) * table["dk"],
+    )
+    assert np.isclose(table.meta["chi2"], f.resids.chi2)
+
+    ft = f.ftest(spindown_param(2), "Spindown", maxiter=20)["ft"]
+    assert np.isclose(table["ftest"][0], ft)
+
+    # The fitter is left alone
+    assert f.model.free_params == model.free_params
+    assert "F2" not in f.model.params
+
+
+@pytest.mark.parametrize(
+    "executor",
+    [
+        pytest.param(concurrent.futures.ThreadPoolExecutor(2), id="thread"),
+        pytest.param(None, id="process"),
+    ],
+)
+def test_evaluate_candidates_parallel(fitted, candidates, executor):
+    t1 = evaluate_candidates(fitted, candidates, ncpu=1, sort_by=None)
+    t2 = evaluate_candidates(
+        fitted, candidates, executor=executor, ncpu=2, sort_by=None
+    )
+    assert list(t1["name"]) == list(t2["name"])
+    assert np.allclose(t1["chi2"], t2["chi2"])
+
+
+def test_linearized_screen(fitted, candidates):
+    f = fitted
+    assert np.isclose(linearized_chi2(f.toas, f.model), f.resids.chi2, rtol=1e-6)
+
+    table = evaluate_candidates(f, candidates, ncpu=1, screen=0)
+    assert list(table["screened"]) == [False, False, True]
+    assert np.isnan(table["chi2"][2])
+    # F2 enters linearly, so the linearized fit is exact
+    assert np.isclose(table["lin_delta_chi2"][0], table["delta_chi2"][0], rtol=1e-3)
+
+
+def test_candidate_errors():
+    with pytest.raises(ValueError):
+        Candidate([spindown_param(2)], ["Spindown", "Spindown"])
+    m = get_model(StringIO(par))
+    with pytest.raises(ValueError):
+        Candidate(spindown_param(3), "NoSuchComponent").apply(m)
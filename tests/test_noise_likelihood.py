@@ -0,0 +1,123 @@
+from io import StringIO
+
+import astropy.units as u
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+from pint.models import get_model
+from pint.noise_likelihood import NoiseLikelihood
+from pint.residuals import Residuals
+from pint.simulation import make_fake_toas_uniform
+
+par_base = """
+    PSR J1234+5678
+    ELAT    1.3     1
+    ELONG   2.5     1
+    F0      100     1
+    F1      1e-13   1
+    PEPOCH  55000
+    EPHEM   DE421
+    EFAC mjd 50000 53000 2      1
+    EFAC mjd 52000 54000 1.3    1
+    EQUAD mjd 53000 55000 0.8   1
+"""
+
+par_ecorr = """
+    ECORR mjd 50000 53000 1.2   1
+    ECORR mjd 53000 55000 0.6   1
+"""
+
+par_rn = """
+    TNREDAMP -13.5  1
+    TNREDGAM 3.5    1
+    TNREDC 10
+"""
+
+
+def make_data(par):
+    m = get_model(StringIO(par))
+    np.random.seed(0)
+    t = make_fake_toas_uniform(
+        50000,
+        55000,
+        300,
+        m,
+        obs="@",
+        freq=np.array([1400, 800, 430]) * u.MHz,
+        multi_freqs_in_epoch=True,
+        add_noise=True,
+        add_correlated_noise=m.has_correlated_errors,
+    )
+    return m, t
+
+
+@pytest.fixture(
+    scope="module",
+    params=[
+        par_base,
+        par_base + par_ecorr + "PHOFF 0 1",
+        par_base + par_ecorr + par_rn,
+    ],
+    ids=["white", "ecorr", "ecorr_rednoise"],
+)
+def model_toas(request):
+    return make_data(request.param)
+
+
+def test_lnlikelihood(model_toas):
+    m, t = model_toas
+    res = Residuals(t, m)
+    nl = NoiseLikelihood(t, m, resids=res)
+    assert_allclose(nl.lnlikelihood(), res.lnlikelihood(), rtol=1e-10)
+
+    xs = nl.get_values() * 1.1
+    lnl = nl.lnlikelihood(xs)
+    assert_allclose(lnl, res.lnlikelihood(), rtol=1e-10)
+
+
+def test_gradient(model_toas):
+    m, t = model_toas
+    nl = NoiseLikelihood(t, m)
+    x0 = nl.get_values() * 1.05
+    _, grad = nl.lnlikelihood_and_gradient(x0)
+
+    for ii, x in enumerate(x0):
+        h = 1e-6 * max(abs(x), 1)
+        xp, xm = x0.copy(), x0.copy()
+        xp[ii] += h
+        xm[ii] -= h
+        num_grad = (nl.lnlikelihood(xp) - nl.lnlikelihood(xm)) / (2 * h)
+        assert_allclose(grad[ii], num_grad, rtol=1e-5, atol=1e-5)
+
+
+def test_white_noise_gradient_matches_residuals():
+    m, t = make_data(par_base)
+    res = Residuals(t, m)
+    nl = NoiseLikelihood(t, m, resids=res)
+    grad = nl.gradient()
+    for p, g in zip(nl.params, grad):
+        assert_allclose(g, res.d_lnlikelihood_d_param(p).value, rtol=1e-8)
+
+
+def test_efac_change_reuses_cache():
+    m, t = make_data(par_base + par_ecorr + "PHOFF 0 1")
+    m.EQUAD1.frozen = True
+    nl = NoiseLikelihood(t, m)
+    nl.lnlikelihood_and_gradient()
+    cached = [c[1] for c in nl._block_cache]
+
+    m.EFAC1.value *= 1.2
+    m.ECORR2.value *= 0.8
+    nl.lnlikelihood_and_gradient()
+    assert all(c[1] is p for c, p in zip(nl._block_cache, cached))
+
+    m.EQUAD1.value *= 1.2
+    nl.lnlikelihood_and_gradient()
+    assert any(c[1] is not p for c, p in zip(nl._block_cache, cached))
+
+
+def test_unsupported_param():
+    m, t = make_data(par_base + "DMEFAC mjd 50000 55000 1.1 1\nDM 10")
+    with pytest.raises(NotImplementedError):
+        NoiseLikelihood(t, m)
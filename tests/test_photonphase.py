@@ -139,3 +139,37 @@ def test_nicer_result_bary_polyco(capsys, tmp_path):
     phases2 = data2["PULSE_PHASE"]
 
     assert (phases - phases2).std() < 0.00001
+
+
+@pytest.mark.parametrize("ncpu", [1, 2])
+def test_nicer_result_bary_chunks(capsys, tmp_path, ncpu):
+    "Check that processing barycentered NICER data in chunks gives the same result."
+    outfile = tmp_path / "photonphase-test.evt"
+    cmd = f"--absphase --outfile {outfile} {eventfile_nicer} {parfile_nicer}"
+    photonphase.main(cmd.split())
+    outfile_chunks = tmp_path / "photonphase-chunks-test.evt"
+    plotfile = tmp_path / "photonphase-chunks-test.png"
+    cmd = f"--absphase --chunksize 1000 --ncpu {ncpu} --outfile {outfile_chunks} --plotfile {plotfile} {eventfile_nicer} {parfile_nicer}"
+    photonphase.main(cmd.split())
+    assert plotfile.exists()
+    out, err = capsys.readouterr()
+    v = 0.0
+    for l in out.split("\n"):
+        if l.startswith("Htest"):
+            v = float(l.split()[2])
+    # Check that H-test is 216.67
+    assert abs(v - 216.67) < 1
+    assert "events/s" in out
+
+    with fits.open(outfile) as hdul, fits.open(outfile_chunks) as hdul_chunks:
+        for col in ["PULSE_PHASE", "ABS_PHASE"]:
+            assert np.all(hdul[1].data[col] == hdul_chunks[1].data[col])
+        # The rest of the file is copied unchanged
+        with fits.open(eventfile_nicer) as hdul_in:
+            assert len(hdul_chunks) == len(hdul_in)
+            for col in hdul_in[1].columns.names:
+                if col in ["PULSE_PHASE", "ABS_PHASE"]:
+                    continue
+                a, b = hdul_chunks[1].data[col], hdul_in[1].data[col]
+                assert np.array_equal(a, b, equal_nan=a.dtype.kind == "f")
+            assert np.all(hdul_chunks[2].data == hdul_in[2].data)
@@ -1,12 +1,16 @@
 """Test polycos."""
 
+import concurrent.futures
+
 import pytest
 import numpy as np
-from pint.polycos import Polycos
+import pint.polycos
+from pint.polycos import Polycos, PolycoCache
 from pint.models import get_model
 import pint.toa as toa
 from pinttestdata import datadir
 from pathlib import Path
+from io import StringIO
 
 
 @pytest.fixture
@@ -94,3 +98,169 @@ def test_generate_polycos(tmpdir, par_file, obs, obsfreq, nspan, ncoeff):
     assert np.allclose(ph1.frac.value[0], ph3.frac.value[0])
     assert np.allclose(ph2.int.value[0], ph3.int.value[0])
     assert np.allclose(ph2.frac.value[0], ph3.frac.value[0])
+
+
+def test_generate_polycos_chunked_parallel(par_file):
+    model = get_model(str(par_file))
+    p = Polycos.generate_polycos(model, 55000, 55000.5, "ao", 60, 12, 1400.0)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+        q = Polycos.generate_polycos(
+            model,
+            55000,
+            55000.5,
+            "ao",
+            60,
+            12,
+            1400.0,
+            executor=executor,
+            chunksize=50,
+        )
+    assert len(p) == len(q)
+    for e1, e2 in zip(p.polycoTable["entry"], q.polycoTable["entry"]):
+        assert np.all(e1.coeffs == e2.coeffs)
+        assert e1.rphase == e2.rphase
+
+    mjds = np.linspace(55000.01, 55000.49, 101)
+    t = toa.get_TOAs_array(mjds, obs="ao", freqs=1400.0, ephem=model.EPHEM.value)
+    dphase = p.eval_abs_phase(mjds) - model.phase(t, abs_phase=True)
+    assert np.all(np.abs(dphase.int.value + dphase.frac.value) < 1e-5)
+
+
+def test_generate_polycos_cache(par_file, tmp_path, monkeypatch):
+    model = get_model(str(par_file))
+    generated = []
+    generate = pint.polycos._generate_polyco_entries
+
+    def counting_generate(model, tmids, *args, **kwargs):
+        generated.append(len(tmids))
+        return generate(model, tmids, *args, **kwargs)
+
+    monkeypatch.setattr(pint.polycos, "_generate_polyco_entries", counting_generate)
+    cache = PolycoCache(tmp_path)
+    p1 = Polycos.generate_polycos(
+        model, 55000, 55000.25, "ao", 60, 12, 1400.0, cache=cache
+    )
+    p2 = Polycos.generate_polycos(
+        model, 55000, 55000.5, "ao", 60, 12, 1400.0, cache=tmp_path
+    )
+    p3 = Polycos.generate_polycos(
+        model, 55000.1, 55000.4, "ao", 60, 12, 1400.0, cache=cache
+    )
+    # Only the segments not covered by the first call are computed again
+    assert generated == [len(p1), len(p2) - len(p1)]
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+    # Cached segments are restored exactly
+    assert p2.polycoTable.colnames == p1.polycoTable.colnames
+    for e1, e2 in zip(p1.polycoTable["entry"], p2.polycoTable["entry"]):
+        assert np.all(e1.coeffs == e2.coeffs)
+        assert e1.rphase == e2.rphase
+        assert e1.tmid == e2.tmid
+
+    p = Polycos.generate_polycos(model, 55000, 55000.5, "ao", 60, 12, 1400.0)
+    mjds = np.linspace(55000.11, 55000.39, 51)
+    dphase = p3.eval_abs_phase(mjds) - p.eval_abs_phase(mjds)
+    assert np.all(np.abs(dphase.int.value + dphase.frac.value) < 1e-9)
+
+
+def test_generate_polycos_cache_without_tzr(par_file, tmp_path, monkeypatch):
+    # A model without a TZR TOA shares cached segments between requests,
+    # even when it is loaded again for each of them
+    par = "".join(
+        line
+        for line in open(par_file)
+        if not line.startswith(("TZRMJD", "TZRFRQ", "TZRSITE"))
+    )
+    generated = []
+    generate = pint.polycos._generate_polyco_entries
+
+    def counting_generate(model, tmids, *args, **kwargs):
+        generated.append(len(tmids))
+        return generate(model, tmids, *args, **kwargs)
+
+    monkeypatch.setattr(pint.polycos, "_generate_polyco_entries", counting_generate)
+    p1 = Polycos.generate_polycos(
+        get_model(StringIO(par)), 55000, 55000.25, "ao", 60, 12, 1400.0, cache=tmp_path
+    )
+    p2 = Polycos.generate_polycos(
+        get_model(StringIO(par)), 55000.1, 55000.5, "ao", 60, 12, 1400.0, cache=tmp_path
+    )
+    shared = {e.tmid for e in p1.polycoTable["entry"]} & {
+        e.tmid for e in p2.polycoTable["entry"]
+    }
+    assert shared
+    assert generated == [len(p1), len(p2) - len(shared)]
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+    p = Polycos.generate_polycos(
+        get_model(StringIO(par)), 55000.1, 55000.5, "ao", 60, 12, 1400.0
+    )
+    mjds = np.linspace(55000.11, 55000.49, 51)
+    # The cached polycos only have a different absolute phase reference
+    dphase = p2.eval_abs_phase(mjds) - p.eval_abs_phase(mjds)
+    dphase = dphase.int.value + dphase.frac.value
+    assert np.all(np.abs(dphase - dphase[0]) < 1e-9)
+
+
+def test_generate_polycos_tzr_without_cache(par_file):
+    # Without a cache, the TZR TOA is still put at the first segment midpoint
+    par = "".join(
+        line
+        for line in open(par_file)
+        if not line.startswith(("TZRMJD", "TZRFRQ", "TZRSITE"))
+    )
+    model = get_model(StringIO(par))
+    p = Polycos.generate_polycos(model, 55000.1, 55000.5, "ao", 60, 12, 1400.0)
+    tmid = 55000 + 2 / 24
+    assert np.isclose(float(model.TZRMJD.value), tmid, rtol=0, atol=1e-9)
+
+    ref_model = get_model(StringIO(par))
+    ref_model.add_tzr_toa(
+        toa.get_TOAs_array(
+            ([55000.0], [2 / 24]), obs="ao", freqs=1400.0, ephem=ref_model.EPHEM.value
+        )
+    )
+    ref = Polycos.generate_polycos(ref_model, 55000.1, 55000.5, "ao", 60, 12, 1400.0)
+    mjds = np.linspace(55000.11, 55000.49, 51)
+    dphase = p.eval_abs_phase(mjds) - ref.eval_abs_phase(mjds)
+    assert np.all(np.abs(dphase.int.value + dphase.frac.value) < 1e-9)
+
+
+def test_polyco_cache_eviction(par_file, tmp_path):
+    model = get_model(str(par_file))
+    cache = PolycoCache(tmp_path, max_size=0)
+    Polycos.generate_polycos(model, 55000, 55000.1, "ao", 60, 12, 1400.0, cache=cache)
+    Polycos.generate_polycos(model, 55000, 55000.1, "ao", 60, 12, 1500.0, cache=cache)
+    # The most recently written file is always kept
+    assert len(list(tmp_path.glob("*.json"))) == 1
+    assert cache.get(cache.key(model, "ao", 1500.0, 60, 12, 20))
+    cache.clear()
+    assert not list(tmp_path.glob("*.json"))
+
+
+def test_eval_unsorted_with_mask(polyco_file):
+    p = Polycos.read(polyco_file)
+    rng = np.random.default_rng(0)
+    t = rng.uniform(54999.9, 55001.1, 500)
+
+    ph, covered = p.eval_abs_phase(t, return_mask=True)
+    _, covered2 = p.coverage(t)
+    assert np.all(covered == covered2)
+    assert 0 < covered.sum() < len(t)
+    assert np.all(np.isnan(ph.frac.value[~covered]))
+    with pytest.raises(ValueError):
+        p.eval_abs_phase(t)
+
+    tc = t[covered]
+    idx = p.find_entry(tc)
+    ph = p.eval_abs_phase(tc)
+    freq = p.eval_spin_freq(tc)
+    fdot = p.eval_spin_freq_derivative(tc)
+    for i, x, ph_int, ph_frac, f, fd in zip(
+        idx, tc, ph.int.value, ph.frac.value, freq, fdot
+    ):
+        entry = p[i]["entry"]
+        ref = entry.evalabsphase(x)
+        assert abs((ph_int - ref.int.value[0]) + (ph_frac - ref.frac.value[0])) < 1e-9
+        assert np.isclose(f, entry.evalfreq(x), rtol=1e-15)
+        assert np.isclose(fd, entry.evalfreqderiv(x), rtol=1e-9, atol=0)
@@ -0,0 +1,137 @@
+"""Test Chebyshev phase predictors."""
+
+import concurrent.futures
+import copy
+from io import StringIO
+
+import numpy as np
+import pytest
+
+import pint.toa as toa
+from pint.models import get_model
+from pint.predictor import ChebyPredictor
+
+par = """
+    PSR J1234+5678
+    ELAT    10
+    ELONG   20
+    F0      300     1
+    F1      -1e-14  1
+    PEPOCH  55000
+    DM      30
+    EPHEM   DE421
+"""
+
+
+@pytest.fixture(scope="module")
+def model():
+    return get_model(StringIO(par))
+
+
+@pytest.fixture(scope="module")
+def predictor(model):
+    return ChebyPredictor.generate(model, 55000, 55000.5, "@", 1100, 1900)
+
+
+def model_phase(model, mjds, freqs, obs="@"):
+    t = toa.get_TOAs_array(mjds, obs=obs, freqs=freqs, ephem=model.EPHEM.value)
+    return model.phase(t, abs_phase=True)
+
+
+@pytest.mark.parametrize("obs", ["@", "gbt"])
+def test_predictor_matches_model(model, obs):
+    p = ChebyPredictor.generate(model, 55000, 55000.5, obs, 1100, 1900)
+    rng = np.random.default_rng(0)
+    mjds = rng.uniform(55000, 55000.5, 200)
+    freqs = rng.uniform(1100, 1900, 200)
+
+    ph = p.eval_abs_phase(mjds, freq=freqs)
+    ph_model = model_phase(model, mjds, freqs, obs=obs)
+    dphase = (ph.int - ph_model.int).value + (ph.frac - ph_model.frac).value
+    assert np.all(np.abs(dphase) / model.F0.value < 5e-9)
+
+
+def test_single_frequency(model):
+    p = ChebyPredictor.generate(model, 55000, 55000.5, "@", 1400)
+    assert all(s.ncoeff_freq == 1 for s in p)
+    mjds = np.linspace(55000.01, 55000.49, 50)
+    ph = p.eval_abs_phase(mjds)
+    ph_model = model_phase(model, mjds, 1400)
+    dphase = (ph.int - ph_model.int).value + (ph.frac - ph_model.frac).value
+    assert np.all(np.abs(dphase) < 1e-5)
+
+
+def test_spin_freq(model, predictor):
+    mjds = np.linspace(55000.01, 55000.49, 20).astype(np.longdouble)
+    h = np.longdouble(1) / 86400
+    dphase = predictor.eval_abs_phase(mjds + h, freq=1400) - predictor.eval_abs_phase(
+        mjds - h, freq=1400
+    )
+    f_num = (dphase.int + dphase.frac).value / 2
+    assert np.allclose(predictor.eval_spin_freq(mjds, freq=1400), f_num, rtol=1e-9)
+
+
+def test_read_write_round_trip(tmp_path, predictor):
+    filename = tmp_path / "t2pred.dat"
+    predictor.write(filename)
+    q = ChebyPredictor.read(filename)
+    assert len(q) == len(predictor)
+
+    mjds = np.linspace(55000, 55000.5, 101)
+    ph1 = predictor.eval_abs_phase(mjds, freq=1500)
+    ph2 = q.eval_abs_phase(mjds, freq=1500)
+    assert np.all(ph1.int == ph2.int)
+    assert np.all(ph1.frac == ph2.frac)
+
+    q.write(tmp_path / "t2pred2.dat")
+    assert (tmp_path / "t2pred.dat").read_text() == (
+        tmp_path / "t2pred2.dat"
+    ).read_text()
+
+
+def test_coverage_mask(predictor):
+    mjds = np.array([55000.25, 54999.0, 55000.1, 55001.0])
+    freqs = np.array([1400, 1400, 2000, 1400])
+    phase, covered = predictor.eval_phase(mjds, freq=freqs, return_mask=True)
+    assert np.all(covered == [True, False, False, False])
+    assert np.all(np.isnan(phase[~covered]))
+    with pytest.raises(ValueError):
+        predictor.eval_phase(mjds, freq=freqs)
+
+
+def test_generate_parallel(model, predictor):
+    with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+        q = ChebyPredictor.generate(
+            model, 55000, 55000.5, "@", 1100, 1900, executor=executor, chunksize=100
+        )
+    assert len(q) == len(predictor)
+    for s1, s2 in zip(predictor, q):
+        assert np.all(s1.coeffs == s2.coeffs)
+
+
+def test_pack_follows_segment_changes(predictor):
+    p = ChebyPredictor(copy.deepcopy(predictor.segments))
+    mjds = np.array([55000.1, 55000.3])
+    phase = p.eval_abs_phase(mjds, freq=1400)
+    assert p.pack()["coeffs"].shape[0] == len(predictor)
+
+    # modify a segment in place; C_00 is halved twice (in time and frequency)
+    i = np.searchsorted([s.mjd_start for s in p], 55000.1) - 1
+    p[i].coeffs[0, 0] += 4
+    changed = p.eval_abs_phase(mjds, freq=1400)
+    dphase = (changed.int - phase.int) + (changed.frac - phase.frac)
+    assert np.allclose(dphase.value, [1, 0])
+
+    # and drop one
+    del p.segments[-1]
+    assert p.pack()["coeffs"].shape[0] == len(predictor) - 1
+
+
+def test_tolerance_floor(model):
+    # tolerances below the precision of the model phases are raised to it,
+    # which is also the default
+    p = ChebyPredictor.generate(model, 55000, 55000.1, "@", 1400, tolerance=1e-15)
+    q = ChebyPredictor.generate(model, 55000, 55000.1, "@", 1400)
+    assert len(p) == len(q)
+    for s1, s2 in zip(p, q):
+        assert np.all(s1.coeffs == s2.coeffs)
@@ -1,10 +1,11 @@
 import os
 import pytest
 
+import astropy.units as u
 from astropy.time import Time
 import numpy as np
 
-from pint.observatory.satellite_obs import get_satellite_observatory
+from pint.observatory.satellite_obs import get_satellite_observatory, load_orbit
 from pinttestdata import datadir
 
 
@@ -40,3 +41,46 @@ def test_bad_calls():
         fermi_obs._check_bounds(bad_time_end)
     with pytest.raises(ValueError):
         fermi_obs._check_bounds(bad_time_beg)
+
+
+def test_orbit_spline_matches_table():
+    ft2file = os.path.join(datadir, "lat_spacecraft_weekly_w323_p202_v001.fits")
+    fermi_obs = get_satellite_observatory("Fermi", ft2file, overwrite=True)
+    tt_mjd = np.asarray(fermi_obs.FT2["MJD_TT"])
+    t = Time(tt_mjd[100:200], format="mjd", scale="tt")
+    pv = fermi_obs.posvel_gcrs(t)
+    assert np.allclose(pv.pos[0], fermi_obs.FT2["X"].quantity[100:200], atol=1e-3 * u.m)
+    assert np.allclose(pv.vel[2], fermi_obs.FT2["Vz"].quantity[100:200])
+
+    # Unsorted times give the same result as sorted ones
+    mid = Time(tt_mjd[100:200] + 10.0 / 86400, format="mjd", scale="tt")
+    order = np.random.default_rng(0).permutation(len(mid))
+    pv_sorted = fermi_obs.posvel_gcrs(mid)
+    pv_shuffled = fermi_obs.posvel_gcrs(mid[order])
+    assert np.all(pv_shuffled.pos == pv_sorted.pos[:, order])
+    assert fermi_obs.get_gcrs(mid[0]).shape == (3,)
+
+
+def test_orbit_cache(tmp_path):
+    ft2file = os.path.join(datadir, "lat_spacecraft_weekly_w323_p202_v001.fits")
+    orb = load_orbit("Fermi", ft2file, cache=tmp_path)
+    (cache_file,) = tmp_path.glob("*.npz")
+    cached = load_orbit("Fermi", ft2file, cache=tmp_path)
+    assert cached.colnames == orb.colnames
+    for c in orb.colnames:
+        assert cached[c].unit == orb[c].unit
+        assert np.all(cached[c] == orb[c])
+
+
+def test_deprecated_component_splines():
+    ft2file = os.path.join(datadir, "lat_spacecraft_weekly_w323_p202_v001.fits")
+    fermi_obs = get_satellite_observatory("Fermi", ft2file, overwrite=True)
+    tt_mjd = np.asarray(fermi_obs.FT2["MJD_TT"])[100:200]
+    mid = tt_mjd + 10.0 / 86400
+    pv = fermi_obs.posvel_gcrs(Time(mid, format="mjd", scale="tt"))
+    with pytest.warns(DeprecationWarning):
+        x = fermi_obs.X(tt_mjd)
+    assert np.allclose(x, fermi_obs.FT2["X"][100:200], atol=1e-3)
+    with pytest.warns(DeprecationWarning):
+        vz = fermi_obs.Vz(mid)
+    assert np.allclose(vz * fermi_obs.FT2["Vz"].unit, pv.vel[2])
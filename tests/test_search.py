@@ -0,0 +1,98 @@
+"""Test periodicity searches over spin-parameter grids."""
+
+import concurrent.futures
+import copy
+from io import StringIO
+
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+import pint.toa as toa
+from pint.eventstats import hmw, z2m
+from pint.models import get_model
+from pint.search import periodicity_search
+
+par = """
+    PSR J1234+5678
+    ELAT    10
+    ELONG   20
+    F0      10      1
+    F1      -1e-12  1
+    PEPOCH  55000
+    EPHEM   DE421
+"""
+
+
+@pytest.fixture(scope="module")
+def model():
+    return get_model(StringIO(par))
+
+
+@pytest.fixture(scope="module")
+def photons(model):
+    # Pulsed photons, drawn from a sinusoidal profile by rejection
+    rng = np.random.default_rng(0)
+    mjds = np.sort(rng.uniform(54950, 55050, 20000))
+    t = toa.get_TOAs_array(mjds, obs="@", ephem=model.EPHEM.value)
+    phase = model.phase(t).frac.value
+    t = t[rng.uniform(size=len(phase)) < 0.5 * (1 + 0.5 * np.cos(2 * np.pi * phase))]
+    weights = rng.uniform(0.5, 1, len(t))
+    return t, weights
+
+
+F0 = 10 + np.linspace(-5e-7, 5e-7, 21)
+F1 = -1e-12 + np.linspace(-2e-13, 2e-13, 5)
+
+
+@pytest.fixture(scope="module")
+def result(model, photons):
+    t, weights = photons
+    return periodicity_search(model, t, F0, F1, weights=weights, ncpu=1)
+
+
+def test_search_finds_pulsar(model, result):
+    assert result.stat.shape == (len(F0), len(F1), 1)
+    f0, f1, f2 = result.best()
+    assert f0 == pytest.approx(model.F0.value, abs=6e-8)
+    assert f1 == pytest.approx(model.F1.value, abs=1.5e-13)
+    cands = result.candidates(3)
+    assert len(cands) == 3
+    assert np.all(np.diff(cands["stat"]) <= 0)
+    assert cands["sigma"][0] > 10
+    assert cands["sigma_trials"][0] < cands["sigma"][0]
+
+
+@pytest.mark.parametrize("i, j", [(10, 2), (3, 0), (18, 4)])
+def test_search_matches_model_phases(model, photons, result, i, j):
+    t, weights = photons
+    m = copy.deepcopy(model)
+    m.F0.value = F0[i]
+    m.F1.value = F1[j]
+    assert_allclose(
+        result.stat[i, j, 0], hmw(m.phase(t).frac.value, weights), rtol=1e-6
+    )
+
+
+def test_search_z2m_unweighted(model, photons):
+    t, _ = photons
+    r = periodicity_search(model, t, F0[8:13], statistic="z2m", m=2, ncpu=1)
+    m = copy.deepcopy(model)
+    m.F0.value = F0[9]
+    assert_allclose(r.stat[1, 0, 0], z2m(m.phase(t).frac.value, m=2)[-1], rtol=1e-6)
+    assert np.all(r.harmonics == 2)
+
+
+def test_search_parallel(model, photons, result):
+    t, weights = photons
+    with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+        r = periodicity_search(
+            model, t, F0, F1, weights=weights, executor=executor, chunksize=4
+        )
+    assert_allclose(r.stat, result.stat, rtol=1e-10)
+
+
+def test_search_nonuniform_grid(model, photons):
+    t, _ = photons
+    with pytest.raises(ValueError):
+        periodicity_search(model, t, [10, 10 + 1e-7, 10 + 3e-7], ncpu=1)
@@ -1,3 +1,5 @@
+import concurrent.futures
+
 import pytest
 
 import numpy as np
@@ -254,6 +256,95 @@ def test_template_caching():
     # assert(np.all(lct([0.1,0.2],log10_ens=[2.4,3.2],use_cache=True)==lct([0.1,0.2],log10_ens=[2.5,3.5])))
 
 
+def test_template_cache_incremental():
+    lct = lctemplate.get_gauss2(width1=0.03, width2=0.05, x1=0.1, x2=0.5)
+    lct.add_energy_dependence(0, slope_free=True)
+    lct[0].slope[1] = 0.05
+    lct.set_cache_properties(ncache=200, en_edges=np.linspace(2, 4, 11))
+    lct.get_cache()
+    cached = {id(p): lct._prim_cache[id(p)][1] for p in lct.primitives}
+
+    # changing one primitive only re-evaluates that primitive
+    lct[1].p[-1] += 0.01
+    lct.mark_cache_dirty()
+    lct.get_cache()
+    assert lct._prim_cache[id(lct[0])][1] is cached[id(lct[0])]
+    assert lct._prim_cache[id(lct[1])][1] is not cached[id(lct[1])]
+
+    # the recombined cache agrees with direct evaluation on the grid
+    for en in [2, 2.6, 4]:
+        assert np.allclose(
+            lct(lct.ph_edges, log10_ens=en, use_cache=True),
+            lct(lct.ph_edges, log10_ens=en),
+            rtol=1e-12,
+        )
+
+    # the cached gradient matches the analytic one on the grid nodes...
+    rng = np.random.default_rng(0)
+    ph = lct.ph_edges[rng.integers(0, 201, size=50)]
+    ens = lct.en_edges[rng.integers(0, 11, size=50)]
+    g1, t1 = lct.gradient(ph, log10_ens=ens, template_too=True, use_cache=True)
+    g2, t2 = lct.gradient(ph, log10_ens=ens, template_too=True)
+    assert np.allclose(t1, t2, rtol=1e-12)
+    assert np.allclose(g1, g2, rtol=1e-10, atol=1e-12)
+    # ...and is interpolated linearly in between
+    g = lct.gradient([0.1025], log10_ens=[2.1], use_cache=True)
+    g_nodes = lct.gradient(
+        [0.1, 0.105, 0.1, 0.105], log10_ens=[2, 2, 2.2, 2.2], use_cache=True
+    )
+    assert np.allclose(g[:, 0], g_nodes.mean(axis=1))
+    lct.norms.free[0] = False
+    assert lct.gradient(ph, log10_ens=ens, use_cache=True).shape == (
+        lct.num_parameters(),
+        len(ph),
+    )
+
+
+def test_fit_unbinned_cached():
+    lct = lctemplate.get_gauss2()
+    ph = np.loadtxt(datadir / "template_phases.asc")
+    lcf = lcfitters.LCFitter(lct, ph, use_cache=True)
+    p = lct.get_parameters()
+    assert abs(lcf.loglikelihood(p) - lcf.unbinned_loglikelihood(p)) < 1e-12
+    lcf.use_cache = False
+    ll = lcf.loglikelihood(p)
+    lcf.use_cache = True
+    assert abs(lcf.loglikelihood(p) - ll) < 0.1
+    lcf.fit(unbinned=True, quiet=True)
+    assert abs(lcf.ll - 1091.04) < 0.1
+    assert abs(lct[0].p[1] - 0.1007) < 1e-3
+
+
+def test_fit_cached_keeps_template_cache_settings():
+    lcg = lceprimitives.LCEGaussian(
+        p=[0.03, 0.5], slope=[0.002, 0.01], slope_free=[True, True]
+    )
+    lct = lctemplate.LCTemplate(
+        [lcg, lcprimitives.LCGaussian(p=[0.04, 0.8])], [0.4, 0.35]
+    )
+    np.random.seed(10)
+    log10_ens = np.random.rand(1000) * 2 + 2
+    ph = lct.random(1000, log10_ens=log10_ens)
+    assert lct.en_edges is None
+
+    lcf = lcfitters.LCFitter(lct, ph, log10_ens=log10_ens, use_cache=True)
+    assert lct.en_edges is None
+    p = lct.get_parameters()
+    ll = lcf.loglikelihood(p)
+    assert lct.en_edges is None
+    lcf.use_cache = False
+    assert abs(lcf.loglikelihood(p) - ll) < 0.1
+    lcf.use_cache = True
+    lcf.fit(unbinned=True, quiet=True)
+    assert lct.en_edges is None
+
+    # cache energies set by the caller are kept and used
+    lct.set_cache_properties(ncache=lct.ncache, en_edges=np.linspace(2, 4, 5))
+    lcf = lcfitters.LCFitter(lct, ph, log10_ens=log10_ens, use_cache=True)
+    lcf.loglikelihood(lct.get_parameters())
+    assert np.all(lct.en_edges == np.linspace(2, 4, 5))
+
+
 def test_component_manipulation():
     # test sorting components
     lct = default_template()
@@ -407,6 +498,69 @@ def test_template_gradient():
     assert lct.check_gradient(quiet=True, seed=0)
 
 
+def test_fused_evaluation():
+    prims = [
+        lcprimitives.LCGaussian(p=[0.03, 0.2]),
+        lcprimitives.LCLorentzian(p=[0.1, 0.45]),
+        lcprimitives.LCVonMises(p=[0.05, 0.7]),
+        lcprimitives.LCGaussian(p=[0.3, 0.9]),
+    ]
+    lct = lctemplate.LCTemplate(prims, [0.2, 0.15, 0.25, 0.1])
+    assert lct.has_fused_evaluation()
+    ph = np.linspace(0, 1, 501)
+    assert lct.check_gradient(quiet=True, ph=ph, en=np.full(len(ph), 3.0))
+    lct[2].free[0] = False
+    lct.norms.free[1] = False
+
+    t, g, h = lct.evaluate_fused(ph, hessian=True)
+    assert np.allclose(t, lct(ph), rtol=1e-14)
+    nparam = lct.num_parameters()
+    assert g.shape == (nparam, len(ph))
+    assert h.shape == (nparam, nparam, len(ph))
+
+    # agrees with evaluating the primitives one at a time
+    slow = lctemplate.LCTemplate(prims, lct.norms)
+    slow.has_fused_evaluation = lambda: False
+    assert np.allclose(g, slow.gradient(ph), rtol=1e-12, atol=1e-12)
+
+    # hessian agrees with finite differences of the gradient
+    p0 = lct.get_parameters().copy()
+    for i in range(nparam):
+        eps = 1e-6
+        p = p0.copy()
+        p[i] += eps
+        lct.set_parameters(p)
+        gup = lct.gradient(ph)
+        p[i] -= 2 * eps
+        lct.set_parameters(p)
+        gdn = lct.gradient(ph)
+        assert np.allclose((gup - gdn) / (2 * eps), h[i], atol=1e-6 * np.abs(h).max())
+    lct.set_parameters(p0)
+    assert np.allclose(h, h.transpose(1, 0, 2))
+
+    # energy-dependent templates use the per-primitive code
+    lct.add_energy_dependence(0)
+    assert not lct.has_fused_evaluation()
+
+
+def test_fitter_analytic_hessian():
+    lct = lctemplate.get_gauss2(pulse_frac=0.9)
+    ph = np.loadtxt(datadir / "template_phases.asc")
+    lcf = lcfitters.LCFitter(lct, ph)
+    p0 = lct.get_parameters().copy()
+    h = lcf.unbinned_hessian(p0)
+    eps = 1e-6
+    for i in range(len(p0)):
+        p = p0.copy()
+        p[i] += eps
+        gup = lcf.unbinned_gradient(p)
+        p[i] -= 2 * eps
+        gdn = lcf.unbinned_gradient(p)
+        assert np.allclose((gup - gdn) / (2 * eps), h[i], rtol=1e-4, atol=1e-3)
+    lcf.fit(unbinned=True, estimate_errors=True, quiet=True)
+    assert np.all(lct.get_errors() > 0)
+
+
 def test_fitter_gradient():
     # TODO -- idea here is to use a known template and an exact set of
     # phases/weights to make sure the gradient comes out correctly/close
@@ -502,6 +656,42 @@ Delta   : 0.4486 +\- 0.0016
         lcf.fit_position()
 
 
+def test_fitter_parallel():
+    lct = lctemplate.get_gauss2(pulse_frac=0.9)
+    ph = np.loadtxt(datadir / "template_phases.asc")
+    lcf = lcfitters.LCFitter(lct, ph)
+    lcf.fit(quiet=True)
+    p = lct.get_parameters().copy()
+
+    # bootstrap replicates are seeded individually
+    kwargs = dict(nsamp=4, seed=1, fit_kwargs=dict(quiet=True))
+    r1 = lcf.bootstrap_errors(**kwargs)
+    assert r1.shape == (4, len(p))
+    assert np.all(lct.get_parameters() == p)
+    r2 = lcf.bootstrap_errors(ncpu=2, **kwargs)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        r3 = lcf.bootstrap_errors(executor=executor, **kwargs)
+    assert np.all(r1 == r2)
+    assert np.all(r1 == r3)
+    assert not np.all(r1 == lcf.bootstrap_errors(nsamp=4, seed=2))
+
+    offset, error = lcf.fit_position(ncpu=2)
+    assert abs(offset) < 1e-6
+    assert abs(error - lcf.fit_position()[1]) < 1e-8
+
+    # restarts recover from a bad starting position
+    lct.set_overall_phase(0.6)
+    assert lcf.fit_restarts(
+        nstart=3,
+        seed=0,
+        ncpu=2,
+        fit_kwargs=dict(quiet=True, overall_position_first=True),
+    )
+    assert len(lcf.restart_lls) == 3
+    assert lcf.ll == np.nanmax(lcf.restart_lls)
+    assert abs(lct[0].get_location() - p[1]) < 1e-3
+
+
 def test_simple_fit_binned():
     """Make sure objects adequately implement mathematical intent."""
 